@@ -0,0 +1,161 @@
+-- =============================================================================
+-- Migration 040: HNSW vector indexes + index-friendly semantic match queries
+-- =============================================================================
+--
+-- 001 created ivfflat indexes with default lists (100) and pgvector's
+-- default of 1 probe. Two problems:
+--
+-- 1. ivfflat recall at probes=1 is poor, and the lists were trained on
+--    whatever rows existed when the index was built (often none).
+-- 2. match_recipe_semantic orders by <=> over ALL users' recipes and
+--    filters user_id afterwards. The index returns ~ef/probe-many global
+--    neighbours, most of which belong to other users, so a user's real
+--    matches are dropped before the filter ever sees them.
+--
+-- Changes:
+-- - ivfflat → HNSW (m=16, ef_construction=64) on all three vector columns.
+--   HNSW needs no training data and keeps recall as rows are added.
+-- - match_ingredient_semantic: ORDER BY <=> LIMIT n in a subquery (the
+--   shape the HNSW index scan serves), distance cutoff applied outside.
+--   A distance predicate in the same WHERE as the index ORDER BY makes
+--   the planner filter index output row by row; the subquery shape does not.
+-- - match_recipe_semantic with a user: the user's rows are selected first
+--   through idx_recipes_user_embedded (MATERIALIZED CTE keeps the planner
+--   from pushing the ORDER BY into the global HNSW scan), then ranked
+--   exactly. A user has hundreds of recipes, so this is an exact scan of
+--   a few hundred vectors: cheaper than HNSW and 100% recall.
+-- - match_recipe_semantic without a user: global HNSW shape, as above.
+-- - hnsw.ef_search = 100 for the global queries (default 40 is tuned for
+--   LIMIT ≤ 40 with no post-filtering).
+--
+-- Benchmark: scripts/bench_vector_indexes.py seeds a local Postgres +
+-- pgvector and reports latency/recall for each index type and query shape.
+--
+-- Requires pgvector >= 0.5.0 (HNSW). Index builds lock the table for
+-- writes; on large tables run the CREATE INDEX statements one at a time
+-- with CONCURRENTLY outside a transaction instead.
+-- =============================================================================
+
+-- =============================================================================
+-- Indexes
+-- =============================================================================
+
+DROP INDEX IF EXISTS idx_ingredients_embedding;
+DROP INDEX IF EXISTS idx_recipes_embedding;
+DROP INDEX IF EXISTS idx_conversation_memory_embedding;
+
+CREATE INDEX IF NOT EXISTS idx_ingredients_embedding_hnsw ON ingredients
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS idx_recipes_embedding_hnsw ON recipes
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS idx_conversation_memory_embedding_hnsw ON conversation_memory
+    USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+-- Per-user candidate set for exact ranking (only rows that can match)
+CREATE INDEX IF NOT EXISTS idx_recipes_user_embedded ON recipes(user_id)
+    WHERE embedding IS NOT NULL;
+
+-- =============================================================================
+-- match_ingredient_semantic
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION match_ingredient_semantic(
+    query_embedding VECTOR(1536),
+    limit_n INT DEFAULT 5,
+    max_distance FLOAT DEFAULT 0.5
+)
+RETURNS TABLE(
+    id UUID,
+    name TEXT,
+    category TEXT,
+    distance FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public, extensions
+SET hnsw.ef_search = 100
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT nearest.id, nearest.name, nearest.category, nearest.dist
+    FROM (
+        SELECT
+            i.id,
+            i.name,
+            i.category,
+            (i.embedding <=> query_embedding)::FLOAT AS dist
+        FROM ingredients i
+        WHERE i.embedding IS NOT NULL
+        ORDER BY i.embedding <=> query_embedding
+        LIMIT limit_n
+    ) AS nearest
+    WHERE nearest.dist <= max_distance
+    ORDER BY nearest.dist;
+END;
+$$;
+
+-- =============================================================================
+-- match_recipe_semantic
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION match_recipe_semantic(
+    query_embedding VECTOR(1536),
+    user_id_filter UUID DEFAULT NULL,
+    limit_n INT DEFAULT 10,
+    max_distance FLOAT DEFAULT 0.6
+)
+RETURNS TABLE(
+    id UUID,
+    name TEXT,
+    cuisine TEXT,
+    difficulty TEXT,
+    distance FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public, extensions
+SET hnsw.ef_search = 100
+AS $$
+BEGIN
+    IF user_id_filter IS NOT NULL THEN
+        -- Exact ranking over the user's own recipes
+        RETURN QUERY
+        WITH mine AS MATERIALIZED (
+            SELECT r.id, r.name, r.cuisine, r.difficulty, r.embedding
+            FROM recipes r
+            WHERE r.user_id = user_id_filter
+              AND r.embedding IS NOT NULL
+        )
+        SELECT
+            m.id,
+            m.name,
+            m.cuisine,
+            m.difficulty,
+            (m.embedding <=> query_embedding)::FLOAT AS dist
+        FROM mine m
+        WHERE (m.embedding <=> query_embedding) <= max_distance
+        ORDER BY m.embedding <=> query_embedding
+        LIMIT limit_n;
+    ELSE
+        -- Global search: HNSW index scan, cutoff outside
+        RETURN QUERY
+        SELECT nearest.id, nearest.name, nearest.cuisine, nearest.difficulty, nearest.dist
+        FROM (
+            SELECT
+                r.id,
+                r.name,
+                r.cuisine,
+                r.difficulty,
+                (r.embedding <=> query_embedding)::FLOAT AS dist
+            FROM recipes r
+            WHERE r.embedding IS NOT NULL
+            ORDER BY r.embedding <=> query_embedding
+            LIMIT limit_n
+        ) AS nearest
+        WHERE nearest.dist <= max_distance
+        ORDER BY nearest.dist;
+    END IF;
+END;
+$$;
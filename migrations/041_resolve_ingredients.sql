@@ -0,0 +1,167 @@
+-- =============================================================================
+-- Migration 041: Batched server-side ingredient resolution cascade
+-- =============================================================================
+--
+-- ingredient_lookup.lookup_ingredient ran its cascade client-side:
+-- match_ingredient_exact RPC → match_ingredient_fuzzy RPC → one ILIKE
+-- query per word (word-by-word) → match_ingredient_semantic RPC. That is
+-- up to 3 + N round-trips per name, repeated for every name in a batch.
+--
+-- resolve_ingredients() runs the whole cascade for an array of names in
+-- one call. It returns at most one row per input, tagged with the
+-- input's 0-based index. Inputs with no match produce no row.
+--
+-- Inputs (all arrays are aligned with `queries`):
+-- - queries: raw names. They are lowercased and trimmed here.
+-- - query_words: the word-by-word terms per name, space-joined. Python
+--   extracts these (_cascade_words: skip words, stemming), so the skip
+--   list has one source of truth. '' or NULL means no word step.
+-- - query_embeddings: a JSONB array of embeddings (or nulls). NULL skips
+--   the semantic step for all names.
+--
+-- The steps mirror the Python cascade:
+-- 1. exact   name or alias equals query               → confidence 1.0
+-- 2. fuzzy   trigram similarity ≥ fuzzy_threshold      → confidence = similarity
+-- 3. words   most input words present in the name's words, shortest name wins
+--            → 'exact' if all words matched else 'fuzzy', confidence = share matched
+-- 4. semantic nearest embedding within max_distance    → confidence = 1 - distance
+--
+-- Deliberate differences from the client-side version (for determinism):
+-- - fuzzy picks the highest similarity. match_ingredient_fuzzy's
+--   DISTINCT ON ordering returned the lowest UUID above the threshold.
+-- - words considers every ILIKE candidate, not the first 20 per word.
+-- - Ties break on name.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION resolve_ingredients(
+    queries TEXT[],
+    query_words TEXT[] DEFAULT NULL,
+    fuzzy_threshold FLOAT DEFAULT 0.85,
+    query_embeddings JSONB DEFAULT NULL,
+    max_distance FLOAT DEFAULT 0.7
+)
+RETURNS TABLE(
+    query_index INT,
+    id UUID,
+    name TEXT,
+    category TEXT,
+    match_type TEXT,
+    confidence FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public, extensions
+AS $$
+#variable_conflict use_column
+DECLARE
+    idx INT;
+    q TEXT;
+    words TEXT[];
+    n_words INT;
+    emb VECTOR(1536);
+    hit RECORD;
+BEGIN
+    FOR idx IN 1 .. coalesce(array_length(queries, 1), 0) LOOP
+        q := lower(btrim(coalesce(queries[idx], '')));
+        CONTINUE WHEN q = '';
+
+        -- 1. Exact name / alias
+        SELECT ing.id, ing.name, ing.category INTO hit
+        FROM ingredients ing
+        WHERE lower(ing.name) = q
+           OR q = ANY(SELECT lower(a) FROM unnest(ing.aliases) AS a)
+        ORDER BY (lower(ing.name) = q) DESC, ing.name
+        LIMIT 1;
+        IF FOUND THEN
+            RETURN QUERY SELECT idx - 1, hit.id, hit.name, hit.category, 'exact'::TEXT, 1.0::FLOAT;
+            CONTINUE;
+        END IF;
+
+        -- 2. Fuzzy whole-string (trigram)
+        SELECT c.id, c.name, c.category, c.sim INTO hit
+        FROM (
+            SELECT
+                ing.id,
+                ing.name,
+                ing.category,
+                GREATEST(
+                    similarity(lower(ing.name), q)::FLOAT,
+                    COALESCE((
+                        SELECT MAX(similarity(lower(a), q)::FLOAT)
+                        FROM unnest(ing.aliases) AS a
+                    ), 0::FLOAT)
+                ) AS sim
+            FROM ingredients ing
+        ) c
+        WHERE c.sim >= fuzzy_threshold
+        ORDER BY c.sim DESC, c.name
+        LIMIT 1;
+        IF FOUND THEN
+            RETURN QUERY SELECT idx - 1, hit.id, hit.name, hit.category, 'fuzzy'::TEXT, hit.sim;
+            CONTINUE;
+        END IF;
+
+        -- 3. Word-by-word: count input words among the name's (stemmed) words
+        words := CASE
+            WHEN query_words IS NULL THEN NULL
+            ELSE string_to_array(nullif(btrim(coalesce(query_words[idx], '')), ''), ' ')
+        END;
+        n_words := coalesce(array_length(words, 1), 0);
+        IF n_words > 0 THEN
+            SELECT c.id, c.name, c.category, c.matched INTO hit
+            FROM (
+                SELECT
+                    ing.id,
+                    ing.name,
+                    ing.category,
+                    (
+                        SELECT count(DISTINCT w)
+                        FROM unnest(words) AS w
+                        WHERE w = ANY(ARRAY(
+                            SELECT rtrim(lower(nw), 's')
+                            FROM regexp_split_to_table(btrim(ing.name), '\s+') AS nw
+                        ))
+                    ) AS matched
+                FROM ingredients ing
+                WHERE ing.name ILIKE ANY(ARRAY(SELECT '%' || w || '%' FROM unnest(words) AS w))
+            ) c
+            WHERE c.matched > 0
+            ORDER BY c.matched DESC, length(c.name), c.name
+            LIMIT 1;
+            IF FOUND THEN
+                RETURN QUERY SELECT
+                    idx - 1,
+                    hit.id,
+                    hit.name,
+                    hit.category,
+                    CASE WHEN hit.matched = n_words THEN 'exact' ELSE 'fuzzy' END::TEXT,
+                    (hit.matched::FLOAT / n_words);
+                CONTINUE;
+            END IF;
+        END IF;
+
+        -- 4. Semantic (only when an embedding was supplied for this name)
+        IF query_embeddings IS NOT NULL
+           AND jsonb_typeof(query_embeddings -> (idx - 1)) = 'array' THEN
+            emb := (query_embeddings -> (idx - 1))::TEXT::VECTOR(1536);
+            SELECT nearest.id, nearest.name, nearest.category, nearest.dist INTO hit
+            FROM (
+                SELECT
+                    ing.id,
+                    ing.name,
+                    ing.category,
+                    (ing.embedding <=> emb)::FLOAT AS dist
+                FROM ingredients ing
+                WHERE ing.embedding IS NOT NULL
+                ORDER BY ing.embedding <=> emb
+                LIMIT 1
+            ) nearest
+            WHERE nearest.dist <= max_distance;
+            IF FOUND THEN
+                RETURN QUERY SELECT idx - 1, hit.id, hit.name, hit.category, 'semantic'::TEXT, (1.0 - hit.dist)::FLOAT;
+            END IF;
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,157 @@
+-- =============================================================================
+-- Migration 042: Trigram indexes + ranked name search RPCs
+-- =============================================================================
+--
+-- Several paths search user tables with '%q%' ILIKE:
+-- - db_read rewrites recipe name equality to ILIKE
+--   (KitchenCRUDMiddleware.pre_read step 3), and the LLM writes
+--   `name ilike %x%` filters directly.
+-- - GET /api/context/entities (@-mention autocomplete) on recipes.name,
+--   inventory.name, shopping_list.name, tasks.title.
+-- - GET /api/ingredients/search on ingredients.name.
+--
+-- A leading-wildcard ILIKE cannot use a btree index, so every one of
+-- these was a sequential scan (016 only indexed ingredients.name).
+--
+-- Changes:
+-- - GIN (user_id, name gin_trgm_ops) on recipes, inventory, shopping_list
+--   and tasks (title). btree_gin lets user_id sit in the same GIN index,
+--   so "this user's rows whose name contains q" is one index scan. The
+--   index also serves name-only ILIKE (any subset of GIN columns works).
+-- - search_entity_names(): one call for autocomplete across tables,
+--   ranked exact > prefix > trigram similarity, top N per table.
+-- - search_ingredient_names(): same ranking for the ingredient catalog,
+--   using idx_ingredients_name_trgm from 016.
+--
+-- Both functions escape LIKE wildcards in the query (the old
+-- f"%{q}%" filters treated '%' and '_' in user input as wildcards).
+-- Trigram indexes only narrow the scan for queries of 3+ characters;
+-- shorter queries still work but read the whole index.
+--
+-- EXPLAIN fixtures: scripts/bench_name_search.py seeds a scratch schema
+-- and prints the plan for each search before and after the indexes.
+-- =============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- =============================================================================
+-- Indexes
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_recipes_user_name_trgm
+    ON recipes USING gin (user_id, name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_inventory_user_name_trgm
+    ON inventory USING gin (user_id, name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_shopping_list_user_name_trgm
+    ON shopping_list USING gin (user_id, name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_title_trgm
+    ON tasks USING gin (user_id, title gin_trgm_ops);
+
+-- =============================================================================
+-- search_entity_names
+-- =============================================================================
+-- Ranked substring search over the name column of user tables.
+-- Returns up to limit_per_table rows per table, tables in the order given,
+-- best match first within each table. With user_id_filter NULL the caller's
+-- RLS policies scope the rows (SECURITY INVOKER).
+
+CREATE OR REPLACE FUNCTION search_entity_names(
+    query TEXT,
+    tables TEXT[] DEFAULT ARRAY['recipes', 'inventory', 'shopping_list', 'tasks'],
+    limit_per_table INT DEFAULT 5,
+    user_id_filter UUID DEFAULT NULL
+)
+RETURNS TABLE(
+    table_name TEXT,
+    id UUID,
+    label TEXT,
+    score FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public, extensions
+AS $$
+DECLARE
+    q TEXT := lower(btrim(coalesce(query, '')));
+    escaped TEXT;
+    tbl TEXT;
+    col TEXT;
+BEGIN
+    IF q = '' THEN
+        RETURN;
+    END IF;
+    escaped := replace(replace(replace(q, '\', '\\'), '%', '\%'), '_', '\_');
+
+    FOREACH tbl IN ARRAY tables LOOP
+        col := CASE tbl
+            WHEN 'recipes' THEN 'name'
+            WHEN 'inventory' THEN 'name'
+            WHEN 'shopping_list' THEN 'name'
+            WHEN 'tasks' THEN 'title'
+        END;
+        CONTINUE WHEN col IS NULL;
+
+        -- Dynamic per table so each search is planned with its real values
+        RETURN QUERY EXECUTE format(
+            'SELECT %1$L::TEXT, t.id, t.%2$I, similarity(t.%2$I, $1)::FLOAT AS score
+             FROM %1$I t
+             WHERE t.%2$I ILIKE $2
+               AND ($3::UUID IS NULL OR t.user_id = $3)
+             ORDER BY lower(t.%2$I) = $1 DESC, t.%2$I ILIKE $4 DESC, score DESC, t.%2$I
+             LIMIT $5',
+            tbl, col
+        ) USING q, '%' || escaped || '%', user_id_filter, escaped || '%', limit_per_table;
+    END LOOP;
+END;
+$$;
+
+-- =============================================================================
+-- search_ingredient_names
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION search_ingredient_names(
+    query TEXT,
+    limit_n INT DEFAULT 50
+)
+RETURNS TABLE(
+    id UUID,
+    name TEXT,
+    category TEXT,
+    aliases TEXT[],
+    default_unit TEXT,
+    score FLOAT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public, extensions
+AS $$
+DECLARE
+    q TEXT := lower(btrim(coalesce(query, '')));
+    escaped TEXT;
+BEGIN
+    IF q = '' THEN
+        RETURN;
+    END IF;
+    escaped := replace(replace(replace(q, '\', '\\'), '%', '\%'), '_', '\_');
+
+    RETURN QUERY
+    SELECT i.id, i.name, i.category, i.aliases, i.default_unit, similarity(i.name, q)::FLOAT AS sim
+    FROM ingredients i
+    WHERE i.name ILIKE '%' || escaped || '%'
+    ORDER BY lower(i.name) = q DESC, i.name ILIKE escaped || '%' DESC, sim DESC, i.name
+    LIMIT limit_n;
+END;
+$$;
+
+-- =============================================================================
+-- Comments
+-- =============================================================================
+
+COMMENT ON FUNCTION search_entity_names IS
+    'Ranked name/title substring search across user tables (exact > prefix > trigram similarity), top N per table.';
+
+COMMENT ON FUNCTION search_ingredient_names IS
+    'Ranked ingredient name substring search (exact > prefix > trigram similarity).';
@@ -0,0 +1,78 @@
+-- =============================================================================
+-- Migration 043: kitchen_dashboard() aggregation RPC
+-- =============================================================================
+--
+-- build_kitchen_dashboard (profile_builder.py) issued five PostgREST
+-- requests per cache miss and pulled every inventory, recipe, meal plan,
+-- shopping and task row for the user, only to count them in Python.
+--
+-- kitchen_dashboard() does the same aggregation in one call and returns
+-- the KitchenDashboard fields as a single JSONB object:
+--
+--   inventory_count, inventory_by_location {location: n},
+--   recipe_count, recipes_by_cuisine {cuisine: n},
+--   recipe_names_by_cuisine {cuisine: [up to 3 names, newest first]},
+--   meal_plan_next_7_days, meal_plan_days_with_meals,
+--   shopping_list_count, tasks_incomplete
+--
+-- Same bucketing as the Python version: missing location → 'unknown',
+-- missing cuisine → 'Other', missing name → 'Unnamed'. `today` is passed
+-- by the caller so "next 7 days" follows the app server's date, as before.
+--
+-- Every aggregate is served by an existing per-user index
+-- (idx_inventory_user, idx_recipes_user, idx_meal_plans_user_date,
+-- idx_shopping_list_user, idx_tasks_user_completed).
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION kitchen_dashboard(
+    user_id_filter UUID,
+    today DATE DEFAULT CURRENT_DATE
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+    WITH inv AS (
+        SELECT COALESCE(NULLIF(location, ''), 'unknown') AS loc, count(*) AS n
+        FROM inventory
+        WHERE user_id = user_id_filter
+        GROUP BY 1
+    ),
+    rec AS (
+        SELECT
+            COALESCE(NULLIF(cuisine, ''), 'Other') AS cuisine,
+            count(*) AS n,
+            (array_agg(COALESCE(NULLIF(name, ''), 'Unnamed') ORDER BY created_at DESC, name))[1:3] AS names
+        FROM recipes
+        WHERE user_id = user_id_filter
+        GROUP BY 1
+    ),
+    meals AS (
+        SELECT count(*) AS slots, count(DISTINCT date) AS days
+        FROM meal_plans
+        WHERE user_id = user_id_filter
+          AND date BETWEEN today AND today + 7
+    )
+    SELECT jsonb_build_object(
+        'inventory_count', COALESCE((SELECT sum(n) FROM inv), 0),
+        'inventory_by_location', COALESCE((SELECT jsonb_object_agg(loc, n) FROM inv), '{}'::JSONB),
+        'recipe_count', COALESCE((SELECT sum(n) FROM rec), 0),
+        'recipes_by_cuisine', COALESCE((SELECT jsonb_object_agg(cuisine, n) FROM rec), '{}'::JSONB),
+        'recipe_names_by_cuisine', COALESCE((SELECT jsonb_object_agg(cuisine, to_jsonb(names)) FROM rec), '{}'::JSONB),
+        'meal_plan_next_7_days', (SELECT slots FROM meals),
+        'meal_plan_days_with_meals', (SELECT days FROM meals),
+        'shopping_list_count', (
+            SELECT count(*) FROM shopping_list
+            WHERE user_id = user_id_filter AND is_purchased = false
+        ),
+        'tasks_incomplete', (
+            SELECT count(*) FROM tasks
+            WHERE user_id = user_id_filter AND completed = false
+        )
+    );
+$$;
+
+COMMENT ON FUNCTION kitchen_dashboard IS
+    'Kitchen snapshot counts for the Think node (KitchenDashboard payload) in one call.';
@@ -0,0 +1,54 @@
+-- =============================================================================
+-- Migration 044: set_embeddings() bulk vector write
+-- =============================================================================
+--
+-- The background embedding worker (background/embedding_worker.py) embeds
+-- recipes and ingredients as they are written. Writing the vectors back
+-- row by row (`update().eq("id")`, as scripts/generate_embeddings.py does)
+-- costs one round trip per row, and a partial-column PostgREST upsert
+-- would trip the tables' NOT NULL columns.
+--
+-- set_embeddings() writes a whole batch with one UPDATE ... FROM unnest().
+-- Vectors are passed in pgvector's text format ('[0.1,0.2,...]') since
+-- PostgREST cannot bind vector[] parameters.
+--
+-- Only recipes and ingredients are accepted. Called with the service role;
+-- other roles cannot execute it.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION set_embeddings(
+    target TEXT,
+    ids UUID[],
+    embeddings TEXT[]
+)
+RETURNS INT
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public, extensions
+AS $$
+DECLARE
+    updated INT;
+BEGIN
+    IF target NOT IN ('recipes', 'ingredients') THEN
+        RAISE EXCEPTION 'set_embeddings: table % has no embedding column', target;
+    END IF;
+    IF cardinality(ids) IS DISTINCT FROM cardinality(embeddings) THEN
+        RAISE EXCEPTION 'set_embeddings: % ids but % embeddings', cardinality(ids), cardinality(embeddings);
+    END IF;
+
+    EXECUTE format(
+        'UPDATE %I AS t SET embedding = v.embedding::vector
+         FROM unnest($1, $2) AS v(id, embedding)
+         WHERE t.id = v.id',
+        target
+    ) USING ids, embeddings;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION set_embeddings(TEXT, UUID[], TEXT[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION set_embeddings(TEXT, UUID[], TEXT[]) TO service_role;
+
+COMMENT ON FUNCTION set_embeddings IS
+    'Bulk-write embedding vectors for recipes or ingredients (one UPDATE per batch).';
@@ -0,0 +1,66 @@
+-- =============================================================================
+-- Migration 045: Ingredient catalog version
+-- =============================================================================
+--
+-- The in-process ingredient embedding matrix (domain/tools/ingredient_index.py)
+-- answers semantic lookups locally instead of calling
+-- match_ingredient_semantic once per name. It needs a cheap way to tell
+-- when its copy of the catalog is stale.
+--
+-- catalog_versions holds a counter per catalog. A statement-level trigger
+-- bumps the 'ingredients' counter on any insert, delete or truncate, and on
+-- updates to the columns the matrix keeps (name, category, embedding).
+-- ingredient_catalog_version() returns it; the index reloads (or maps
+-- the matching .npy snapshot) when it changes.
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    catalog TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO catalog_versions (catalog) VALUES ('ingredients')
+ON CONFLICT (catalog) DO NOTHING;
+
+ALTER TABLE catalog_versions ENABLE ROW LEVEL SECURITY;
+-- No policies: read through ingredient_catalog_version(), written by the trigger
+
+CREATE OR REPLACE FUNCTION bump_ingredient_catalog_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    UPDATE catalog_versions
+    SET version = version + 1, updated_at = NOW()
+    WHERE catalog = 'ingredients';
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS ingredients_catalog_version ON ingredients;
+CREATE TRIGGER ingredients_catalog_version
+    AFTER INSERT OR DELETE OR UPDATE OF name, category, embedding ON ingredients
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_ingredient_catalog_version();
+
+DROP TRIGGER IF EXISTS ingredients_catalog_version_truncate ON ingredients;
+CREATE TRIGGER ingredients_catalog_version_truncate
+    AFTER TRUNCATE ON ingredients
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_ingredient_catalog_version();
+
+CREATE OR REPLACE FUNCTION ingredient_catalog_version()
+RETURNS BIGINT
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT version FROM catalog_versions WHERE catalog = 'ingredients';
+$$;
+
+GRANT EXECUTE ON FUNCTION ingredient_catalog_version() TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION ingredient_catalog_version IS
+    'Counter bumped on every ingredient catalog change (drives the in-process embedding matrix refresh).';
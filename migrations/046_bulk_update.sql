@@ -0,0 +1,68 @@
+-- =============================================================================
+-- Migration 046: bulk_update() partial-column batch write
+-- =============================================================================
+--
+-- The catalog maintenance scripts (cleanup_ingredients.py,
+-- relink_ingredients.py, resynthesize_guidance.py) enrich rows in LLM
+-- batches but wrote each result back with its own `update().eq("id")`.
+-- A PostgREST upsert of just the changed columns would trip the tables'
+-- NOT NULL columns, as with embeddings (migration 044).
+--
+-- bulk_update() writes a whole batch with one UPDATE ... FROM
+-- jsonb_populate_recordset(). Rows are JSON objects carrying the key column
+-- and the listed columns; values are cast with the target table's row type,
+-- so arrays, ints and JSONB need no per-column handling. Columns a row
+-- omits are written as NULL, so callers group rows by the columns they set.
+--
+-- Only the tables the scripts maintain are accepted. Called with the
+-- service role; other roles cannot execute it.
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION bulk_update(
+    target TEXT,
+    columns TEXT[],
+    rows JSONB,
+    key_column TEXT DEFAULT 'id'
+)
+RETURNS INT
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+    assignments TEXT;
+    updated INT;
+BEGIN
+    IF target NOT IN (
+        'ingredients', 'recipe_ingredients', 'inventory', 'shopping_list',
+        'preferences', 'onboarding_sessions'
+    ) THEN
+        RAISE EXCEPTION 'bulk_update: table % is not bulk-updatable', target;
+    END IF;
+    IF cardinality(columns) IS NULL OR cardinality(columns) = 0 THEN
+        RAISE EXCEPTION 'bulk_update: no columns given';
+    END IF;
+    IF key_column = ANY(columns) THEN
+        RAISE EXCEPTION 'bulk_update: key column % cannot be updated', key_column;
+    END IF;
+
+    SELECT string_agg(format('%I = v.%I', c, c), ', ')
+    INTO assignments
+    FROM unnest(columns) AS c;
+
+    EXECUTE format(
+        'UPDATE %1$I AS t SET %2$s
+         FROM jsonb_populate_recordset(NULL::%1$I, $1) AS v
+         WHERE t.%3$I = v.%3$I',
+        target, assignments, key_column
+    ) USING rows;
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$;
+
+REVOKE ALL ON FUNCTION bulk_update(TEXT, TEXT[], JSONB, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION bulk_update(TEXT, TEXT[], JSONB, TEXT) TO service_role;
+
+COMMENT ON FUNCTION bulk_update IS
+    'Bulk-write the given columns for a batch of rows keyed by id (or user_id); one UPDATE per batch.';
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Benchmark the per-user in-process recipe index against a simulated
+ivfflat + user_id post-filter (what match_recipe_semantic does today).
+
+For each per-user library size (default 100/1k/10k), generates clustered
+synthetic embeddings for the user plus other users' recipes, then reports:
+
+- In-process index: load time (from pgvector strings), query latency and
+  recall@k against exact float64 ground truth.
+- Simulated ivfflat (lists=100, as created by 001_core_tables.sql) over
+  the whole table, probing 1 list (pgvector default) and 10 lists, then
+  filtering by user and max_distance. This models recall only. SQL latency
+  needs a real database; see migrations for index changes.
+
+Usage:
+    python scripts/bench_recipe_index.py
+    python scripts/bench_recipe_index.py --sizes 100 1000 --dim 256 --queries 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np  # noqa: E402
+
+from alfred_kitchen.domain.tools.recipe_index import RecipeVectorIndex, top_k  # noqa: E402
+
+IVF_LISTS = 100
+MAX_DISTANCE = 0.7
+K = 20
+
+
+def clustered(rng: np.random.Generator, n: int, centers: np.ndarray, spread: float) -> np.ndarray:
+    picks = rng.integers(0, len(centers), size=n)
+    vectors = centers[picks] + rng.normal(scale=spread, size=(n, centers.shape[1]))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int, max_distance: float) -> list[int]:
+    distances = 1.0 - matrix.astype(np.float64) @ (query / np.linalg.norm(query))
+    order = np.argsort(distances)[:k]
+    return [int(i) for i in order if distances[i] <= max_distance]
+
+
+def kmeans(rng: np.random.Generator, data: np.ndarray, k: int, iterations: int = 5) -> np.ndarray:
+    """Spherical k-means (what ivfflat builds its lists with)."""
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        for c in range(k):
+            members = data[assign == c]
+            if len(members):
+                mean = members.mean(axis=0)
+                centroids[c] = mean / np.linalg.norm(mean)
+    return centroids
+
+
+def ivf_search(
+    data: np.ndarray,
+    owners: np.ndarray,
+    centroids: np.ndarray,
+    lists: np.ndarray,
+    query: np.ndarray,
+    user: int,
+    probes: int,
+) -> list[int]:
+    """ivfflat scan of the nearest `probes` lists, then WHERE user_id/distance, LIMIT k."""
+    q = query / np.linalg.norm(query)
+    probed = np.argsort(-(centroids @ q))[:probes]
+    candidates = np.flatnonzero(np.isin(lists, probed))
+    distances = 1.0 - data[candidates] @ q
+    order = np.argsort(distances)
+    hits = [int(candidates[i]) for i in order
+            if owners[candidates[i]] == user and distances[i] <= MAX_DISTANCE]
+    return hits[:K]
+
+
+def recall(got: list, expected: list) -> float:
+    if not expected:
+        return 1.0
+    return len(set(got) & set(expected)) / len(expected)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--other-rows", type=int, default=20_000, help="Other users' recipes in the table")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(40, args.dim))
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    spread = 1.0 / np.sqrt(args.dim)  # Keeps intra-cluster cosine distance ~0.3-0.5
+
+    others = clustered(rng, args.other_rows, centers, spread)
+
+    print(f"\nRecipe semantic search: k={K}, max_distance={MAX_DISTANCE}, dim={args.dim}, "
+          f"{args.queries} queries, {args.other_rows:,} other users' rows\n")
+    header = (f"{'recipes/user':>13}{'load ms':>10}{'query µs':>10}{'p95 µs':>9}"
+              f"{'recall':>8}{'ivf p=1':>9}{'ivf p=10':>10}")
+    print(header)
+    print("-" * len(header))
+
+    for n in args.sizes:
+        mine = clustered(rng, n, centers, spread)
+        rows = [{"id": str(i), "embedding": "[" + ",".join(f"{x:.6f}" for x in v) + "]"} for i, v in enumerate(mine)]
+
+        index = RecipeVectorIndex()
+        start = time.perf_counter()
+        entry = index.load("user", rows)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        # Table: other users' rows plus this user's, one ivfflat index over all of it
+        table = np.vstack([others, mine])
+        owners = np.concatenate([np.zeros(len(others), dtype=np.int32), np.ones(n, dtype=np.int32)])
+        centroids = kmeans(rng, table, IVF_LISTS)
+        lists = np.argmax(table @ centroids.T, axis=1)
+
+        latencies, recalls, ivf1, ivf10 = [], [], [], []
+        for _ in range(args.queries):
+            query = mine[rng.integers(n)] + rng.normal(scale=spread, size=args.dim)
+            expected = exact_top_k(mine, query, K, MAX_DISTANCE)
+
+            start = time.perf_counter()
+            got = top_k(entry.ids, entry.matrix, query, K, MAX_DISTANCE)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(recall([int(i) for i in got], expected))
+
+            expected_rows = [len(others) + i for i in expected]
+            ivf1.append(recall(ivf_search(table, owners, centroids, lists, query, 1, probes=1), expected_rows))
+            ivf10.append(recall(ivf_search(table, owners, centroids, lists, query, 1, probes=10), expected_rows))
+
+        latencies_us = np.array(latencies) * 1e6
+        print(f"{n:>13,}{load_ms:>10.1f}{np.mean(latencies_us):>10.0f}{np.percentile(latencies_us, 95):>9.0f}"
+              f"{np.mean(recalls):>8.3f}{np.mean(ivf1):>9.3f}{np.mean(ivf10):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Benchmark SessionIdRegistry serialization: legacy to_dict() vs to_wire().
+
+Builds a synthetic registry shaped like a long kitchen session (read
+recipes/inventory/meal plans, FK lazy registrations, generated recipes in
+pending_artifacts) and measures encode/decode time and persisted size.
+
+Usage:
+    python scripts/bench_registry_codec.py
+    python scripts/bench_registry_codec.py --refs 500 --artifacts 8 --iterations 200
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import alfred_kitchen  # noqa: F401,E402 - registers KITCHEN_DOMAIN
+from alfred.core.id_registry import SessionIdRegistry  # noqa: E402
+from alfred.core.registry_codec import msgpack, pack_registry, unpack_registry  # noqa: E402
+
+
+def build_registry(n_refs: int, n_artifacts: int) -> SessionIdRegistry:
+    registry = SessionIdRegistry(session_id="bench")
+    per_table = max(1, n_refs // 4)
+    for turn in range(1, 6):
+        registry.set_turn(turn)
+        registry.translate_read_output(
+            [{"id": str(uuid.uuid4()), "name": f"Recipe {turn}-{i}", "cuisine": "thai"}
+             for i in range(per_table // 5)],
+            "recipes",
+        )
+        registry.translate_read_output(
+            [{"id": str(uuid.uuid4()), "name": f"Item {turn}-{i}", "location": "pantry"}
+             for i in range(per_table // 5)],
+            "inventory",
+        )
+        registry.translate_read_output(
+            [{"id": str(uuid.uuid4()), "date": f"2026-01-{i % 28 + 1:02d}",
+              "meal_type": "dinner", "recipe_id": str(uuid.uuid4())}
+             for i in range(per_table // 5)],
+            "meal_plans",
+        )
+    for i in range(n_artifacts):
+        registry.register_generated(
+            "recipe",
+            f"Generated {i}",
+            {
+                "name": f"Generated {i}",
+                "description": "A weeknight curry with pantry staples. " * 4,
+                "ingredients": [
+                    {"name": f"ingredient {j}", "quantity": j, "unit": "cup", "notes": "chopped"}
+                    for j in range(14)
+                ],
+                "instructions": [f"Step {j}: do the thing carefully." * 2 for j in range(10)],
+                "tags": ["weeknight", "thai", "spicy"],
+            },
+        )
+    return registry
+
+
+def _time(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6  # µs per call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--refs", type=int, default=300)
+    parser.add_argument("--artifacts", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    # Steady state: each turn starts from the registry persisted by the last one
+    registry = SessionIdRegistry.from_dict(build_registry(args.refs, args.artifacts).to_wire())
+    n = args.iterations
+
+    legacy_dict = registry.to_dict()
+    # Materialize artifacts from a copy; reading them would disable the fast path
+    legacy_dict["pending_artifacts"] = SessionIdRegistry.from_dict(registry.to_wire()).pending_artifacts.copy()
+    legacy_json = json.dumps(legacy_dict, default=str)
+    wire = registry.to_wire()
+    wire_json = json.dumps(wire)
+
+    def wire_encode_changed() -> str:
+        registry._wire_cache = None
+        return json.dumps(registry.to_wire())
+
+    results = [
+        ("legacy encode  (to_dict + json.dumps)", _time(lambda: json.dumps(legacy_dict, default=str), n)),
+        ("legacy decode  (json.loads + from_dict)", _time(lambda: SessionIdRegistry.from_dict(json.loads(legacy_json)), n)),
+        ("wire encode    (changed, to_wire + json.dumps)", _time(wire_encode_changed, n)),
+        ("wire encode    (unchanged, to_wire + json.dumps)", _time(lambda: json.dumps(registry.to_wire()), n)),
+        ("to_wire only   (unchanged, fast path)", _time(registry.to_wire, n)),
+        ("wire decode    (json.loads + from_dict)", _time(lambda: SessionIdRegistry.from_dict(json.loads(wire_json)), n)),
+    ]
+    packed = pack_registry(registry)
+    results.append(("packed encode  (pack_registry, unchanged)", _time(lambda: pack_registry(registry), n)))
+    results.append(("packed decode  (unpack_registry)", _time(lambda: unpack_registry(packed), n)))
+
+    print(f"\nRegistry: {len(registry.ref_to_uuid)} refs, {len(registry.pending_artifacts)} pending artifacts")
+    print(f"Packed format: {'msgpack' if msgpack is not None else 'json (msgpack not installed)'}\n")
+    print(f"{'Operation':<50}{'µs/call':>10}")
+    print("-" * 60)
+    for name, micros in results:
+        print(f"{name:<50}{micros:>10.1f}")
+
+    print(f"\n{'Format':<50}{'bytes':>10}")
+    print("-" * 60)
+    print(f"{'legacy to_dict() JSON':<50}{len(legacy_json.encode()):>10}")
+    print(f"{'wire to_wire() JSON':<50}{len(wire_json.encode()):>10}")
+    print(f"{'pack_registry()':<50}{len(packed):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark per-request latency of the onboarding staples checklist.
+
+Compares the previous per-request ranking (score every candidate, sort,
+dedupe by family) against StaplesIndex on a synthetic candidate set, for
+a cold ranking (first request for a cuisines/restrictions selection) and
+a memoized one. Database time is excluded from both; the old path also
+paid one PostgREST round trip per request, the index one per refresh.
+"speedup" is old / cold; memoized selections are faster still.
+
+Usage:
+    python scripts/bench_staples.py
+    python scripts/bench_staples.py --candidates 300 3000 --requests 500
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from onboarding.staples import (  # noqa: E402
+    CORE_ANCHORS,
+    EXTRA_ANCHORS,
+    MAX_ESSENTIALS,
+    STAPLE_CATEGORIES,
+    StaplesIndex,
+    _compute_exclusions,
+    _is_excluded,
+)
+
+CUISINES = ["italian", "thai", "mexican", "indian", "japanese", "korean", "french", "chinese"]
+RESTRICTIONS = ["vegan", "vegetarian", "dairy-free", "gluten-free", "pescatarian"]
+
+
+def previous_ranking(rows: list[dict], cuisines: list[str], dietary_restrictions: list[str]) -> list[str]:
+    """The ranking get_staples_options ran on every request before the index."""
+    cuisines_set = {c.lower() for c in cuisines}
+    excluded = _compute_exclusions(dietary_restrictions)
+    items = [row for row in rows if not _is_excluded(row, excluded)]
+    core_lower = {a.lower() for a in CORE_ANCHORS}
+    extra_lower = {a.lower() for a in EXTRA_ANCHORS}
+
+    scored = []
+    for ing in items:
+        name_lower = ing["name"].lower()
+        anchor_score = 0.5 if name_lower in core_lower else 0.3 if name_lower in extra_lower else 0.0
+        tier_w = 1.0 if ing["tier"] == 1 else 0.5
+        cuisine_boost = 1.0 if cuisines_set & {c.lower() for c in (ing["cuisines"] or [])} else 0.0
+        scored.append((anchor_score + tier_w * 0.15 + cuisine_boost * 0.1, ing))
+    scored.sort(key=lambda x: (-x[0], x[1]["name"].lower()))
+
+    all_anchors = core_lower | extra_lower
+    family_best: dict[str, dict] = {}
+    for _score, ing in scored:
+        family = (ing["family"] or ing["name"]).lower().strip()
+        prev = family_best.get(family)
+        is_anchor = ing["name"].lower() in all_anchors
+        if prev is None:
+            family_best[family] = ing
+            continue
+        prev_anchor = prev["name"].lower() in all_anchors
+        if is_anchor and not prev_anchor:
+            family_best[family] = ing
+        elif is_anchor == prev_anchor and len(ing["name"]) < len(prev["name"]):
+            family_best[family] = ing
+    kept = {id(v) for v in family_best.values()}
+    return [str(ing["id"]) for _score, ing in scored if id(ing) in kept][:MAX_ESSENTIALS]
+
+
+def synthetic_rows(rng: random.Random, n: int) -> list[dict]:
+    anchors = sorted(CORE_ANCHORS | EXTRA_ANCHORS)
+    families = [a.split()[-1] for a in anchors] + ["flour", "pasta", "honey", "anchovy"]
+    rows = []
+    for i in range(n):
+        base = rng.choice(anchors) if rng.random() < 0.2 else f"staple {rng.randrange(n)}"
+        rows.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "name": base if rng.random() < 0.6 else f"{base} {rng.choice(['organic', 'whole', 'fine'])}",
+            "parent_category": rng.choice(STAPLE_CATEGORIES),
+            "family": rng.choice(families) if rng.random() < 0.7 else None,
+            "tier": rng.choice([1, 2]),
+            "cuisines": rng.sample(CUISINES, rng.randrange(3)) or None,
+            "default_unit": "container",
+        })
+    return rows
+
+
+def selections(rng: random.Random, count: int) -> list[tuple[list[str], list[str]]]:
+    return [
+        (rng.sample(CUISINES, rng.randrange(1, 4)), rng.sample(RESTRICTIONS, rng.randrange(3)))
+        for _ in range(count)
+    ]
+
+
+def timed(fn, requests) -> list[float]:
+    latencies = []
+    for cuisines, restrictions in requests:
+        start = time.perf_counter()
+        fn(cuisines, restrictions)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[300, 1_000, 3_000])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"\nStaples checklist ranking, {args.requests} requests (µs per request, excluding database time)\n")
+    header = (f"{'candidates':>11}{'build ms':>10}{'old mean':>10}{'old p95':>9}"
+              f"{'cold mean':>11}{'cold p95':>10}{'memo mean':>11}{'speedup':>9}")
+    print(header)
+    print("-" * len(header))
+
+    for n in args.candidates:
+        rows = synthetic_rows(rng, n)
+        requests = selections(rng, args.requests)
+
+        index = StaplesIndex()
+        start = time.perf_counter()
+        index.build(rows)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for cuisines, restrictions in requests[:20]:
+            expected = previous_ranking(rows, cuisines, restrictions)
+            if index.rank(cuisines, restrictions)["pre_selected_ids"] != expected:
+                raise SystemExit(f"Ranking differs for {cuisines} / {restrictions}")
+
+        uncached = StaplesIndex(max_cached_rankings=0)  # Every request ranks cold
+        uncached.build(rows)
+
+        old = timed(lambda c, r: previous_ranking(rows, c, r), requests)
+        cold = timed(uncached.rank, requests)
+        memo = timed(index.rank, requests + requests)[len(requests):]
+
+        def p95(values: list[float]) -> float:
+            return statistics.quantiles(values, n=20)[-1]
+
+        print(f"{n:>11,}{build_ms:>10.1f}{statistics.mean(old):>10.0f}{p95(old):>9.0f}"
+              f"{statistics.mean(cold):>11.0f}{p95(cold):>10.0f}{statistics.mean(memo):>11.1f}"
+              f"{statistics.mean(old) / statistics.mean(cold):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark SessionIdRegistry.translate_read_output on a large read.
+
+Translates a synthetic N-row read of recipes (with nested
+recipe_ingredients and FK lazy registration) and of meal_plans (FK-heavy)
+against the compiled domain lookups, and shows what the per-record domain
+accessors cost when rebuilt on every access (the pre-compilation path).
+
+Usage:
+    python scripts/bench_translate.py
+    python scripts/bench_translate.py --rows 500 --iterations 50
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import alfred_kitchen  # noqa: F401,E402 - registers KITCHEN_DOMAIN
+from alfred.core.id_registry import SessionIdRegistry  # noqa: E402
+from alfred.domain import get_compiled_domain, get_current_domain  # noqa: E402
+
+
+def recipe_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Recipe {i}",
+            "cuisine": "thai",
+            "instructions": ["Chop", "Cook", "Serve"],
+            "recipe_ingredients": [
+                {"id": str(uuid.uuid4()), "name": f"ingredient {j}", "ingredient_id": str(uuid.uuid4())}
+                for j in range(8)
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def meal_plan_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "date": f"2026-01-{i % 28 + 1:02d}",
+            "meal_type": "dinner",
+            "recipe_id": str(uuid.uuid4()),
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    n, iters = args.rows, args.iterations
+
+    print(f"\nTranslate {n}-row read ({iters} iterations, fresh registry each)\n")
+    print(f"{'Read':<28}{'ms/read':>10}{'rows/s':>12}")
+    print("-" * 50)
+    for table, rows in (("recipes", recipe_rows(n)), ("meal_plans", meal_plan_rows(n))):
+        seconds = _time(lambda: SessionIdRegistry(session_id="bench").translate_read_output(rows, table), iters)
+        print(f"{table:<28}{seconds * 1000:>10.2f}{n / seconds:>12,.0f}")
+
+    # Per-access cost of the lookups translation needs for each record
+    domain = get_current_domain()
+    compiled = get_compiled_domain()
+    lookups = 10_000
+    rebuilt = _time(lambda: (domain.table_to_type.get("recipes"), domain.entities.get("recipes"),
+                             domain.get_fk_enrich_map().get("recipe_id")), lookups)
+    frozen = _time(lambda: (compiled.table_to_type.get("recipes"), compiled.entities.get("recipes"),
+                            compiled.fk_enrich_map.get("recipe_id")), lookups)
+    print(f"\n{'Domain lookups per record':<28}{'µs':>10}")
+    print("-" * 38)
+    print(f"{'DomainConfig (rebuilt)':<28}{rebuilt * 1e6:>10.2f}")
+    print(f"{'CompiledDomain (frozen)':<28}{frozen * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ Uses GPT-4.1 to enrich ~2,500 ingredients with:
 
 Also handles deduplication and category migration.
 
+Batches go through the shared runner (alfred_kitchen.background.batch_jobs):
+several LLM calls in flight, rate-limit-aware retries, one bulk_update()
+per batch (migration 046) and checkpoints so an interrupted step resumes.
+
 Usage:
     python scripts/cleanup_ingredients.py dedupe           # Find/merge duplicates
     python scripts/cleanup_ingredients.py families         # Assign family to all
@@ -17,6 +21,7 @@ Usage:
     python scripts/cleanup_ingredients.py tiers            # Score 1-3
     python scripts/cleanup_ingredients.py cuisines         # Tag cuisine-specific only
     python scripts/cleanup_ingredients.py all              # Run all steps
+    python scripts/cleanup_ingredients.py tiers --concurrency 8 --fresh
 """
 
 import argparse
@@ -35,7 +40,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from alfred_kitchen.background.batch_jobs import DEFAULT_CONCURRENCY, BatchJobRunner, bulk_update
 
 # Use alfred's db client
 try:
@@ -61,6 +68,9 @@ BATCH_SIZE_CUISINES = 50
 
 TAXONOMY_PATH = Path(__file__).parent.parent / "config" / "taxonomy.yaml"
 
+# Completed batches per step; a rerun skips them (see --fresh)
+CHECKPOINT_DIR = Path(__file__).parent / "cleanup_logs" / "checkpoints"
+
 
 def load_taxonomy() -> dict:
     """Load taxonomy configuration."""
@@ -203,9 +213,9 @@ Return ONLY valid JSON, no other text. Use empty array for non-cuisine-specific
 # Helper Functions
 # =============================================================================
 
-def get_openai_client() -> OpenAI:
-    """Get OpenAI client."""
-    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+def get_openai_client() -> AsyncOpenAI:
+    """Get async OpenAI client (retries are left to the batch runner's backoff)."""
+    return AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0)
 
 
 def log_change(operation: str, ingredient_id: str, changes: dict):
@@ -247,11 +257,84 @@ def parse_llm_response(content: str) -> dict:
     return json.loads(content)
 
 
+async def complete_json(openai: AsyncOpenAI, system: str, prompt: str) -> dict:
+    """One chat completion, parsed as JSON (parse errors are retried by the runner)."""
+    response = await openai.chat.completions.create(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=4000,
+    )
+    return parse_llm_response(response.choices[0].message.content)
+
+
+async def run_enrichment(
+    step: str,
+    supabase,
+    ingredients: list[dict],
+    batch_size: int,
+    process,
+    options: argparse.Namespace,
+    on_written=None,
+) -> int:
+    """
+    Run one enrichment step over ingredients with the shared batch runner.
+
+    `process(batch)` returns `{"id", <column>: <value>}` rows; each batch's
+    rows are written with one bulk_update() call and logged to the audit
+    file. Completed batches are checkpointed, so rerunning an interrupted
+    step skips them (--fresh starts over). Returns rows written.
+    """
+    written = 0
+
+    async def write(rows: list[dict]):
+        nonlocal written
+        if not rows:
+            return
+        await asyncio.to_thread(bulk_update, supabase, "ingredients", rows)
+        for row in rows:
+            log_change(step, row["id"], {k: v for k, v in row.items() if k != "id"})
+            if on_written:
+                on_written(row)
+        written += len(rows)
+
+    runner = BatchJobRunner(
+        f"cleanup-{step}",
+        concurrency=options.concurrency,
+        checkpoint_dir=CHECKPOINT_DIR,
+        resume=not options.fresh,
+    )
+    stats = await runner.run(
+        ingredients,
+        key=lambda ing: ing["id"],
+        batch_size=batch_size,
+        process=process,
+        write=write,
+    )
+
+    print(f"\nBatches: {stats.completed}/{stats.batches} completed, {stats.failed} failed")
+    if stats.skipped:
+        print(f"Skipped {stats.skipped} ingredients done by an earlier run")
+    if stats.retries:
+        print(f"Retries: {stats.retries} ({stats.rate_limited} rate-limited)")
+    if stats.failed:
+        print(f"Rerun the same command to retry failed batches (checkpoint: {runner.checkpoint.path})")
+    return written
+
+
+def name_lookup(ingredients: list[dict]) -> dict[str, str]:
+    """Build name -> id lookup for reliable matching."""
+    return {ing["name"].lower(): ing["id"] for ing in ingredients}
+
+
 # =============================================================================
 # Cleanup Operations
 # =============================================================================
 
-async def dedupe_ingredients(dry_run: bool = True):
+async def dedupe_ingredients(options: argparse.Namespace, dry_run: bool = True):
     """Find and optionally merge duplicate ingredients."""
     print("\n" + "=" * 70)
     print("DEDUPLICATION")
@@ -274,10 +357,8 @@ async def dedupe_ingredients(dry_run: bool = True):
 
     all_merge_groups = []
 
-    for letter, batch in sorted(batches.items()):
-        if len(batch) < 2:
-            continue
-
+    async def process(letters: list[tuple[str, list[dict]]]):
+        letter, batch = letters[0]
         print(f"\nProcessing '{letter}' ({len(batch)} ingredients)...")
 
         # Format for LLM
@@ -286,26 +367,27 @@ async def dedupe_ingredients(dry_run: bool = True):
             for ing in batch
         ])
 
-        try:
-            response = openai.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a culinary expert helping clean up an ingredient database."},
-                    {"role": "user", "content": DEDUPE_PROMPT.format(ingredients=ing_list)}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-
-            data = parse_llm_response(response.choices[0].message.content)
-            merge_groups = data.get("merge_groups", [])
-
-            if merge_groups:
-                print(f"  Found {len(merge_groups)} merge groups")
-                all_merge_groups.extend(merge_groups)
-
-        except Exception as e:
-            print(f"  Error: {e}")
+        data = await complete_json(
+            openai,
+            "You are a culinary expert helping clean up an ingredient database.",
+            DEDUPE_PROMPT.format(ingredients=ing_list),
+        )
+        merge_groups = data.get("merge_groups", [])
+
+        if merge_groups:
+            print(f"  '{letter}': found {len(merge_groups)} merge groups")
+            all_merge_groups.extend(merge_groups)
+
+    # One letter per request; no checkpoint since the output is this report
+    runner = BatchJobRunner("cleanup-dedupe", concurrency=options.concurrency)
+    stats = await runner.run(
+        [(letter, batch) for letter, batch in sorted(batches.items()) if len(batch) >= 2],
+        key=lambda group: group[0],
+        batch_size=1,
+        process=process,
+    )
+    for error in stats.errors:
+        print(f"  Error: {error}")
 
     print(f"\n\nTotal merge groups found: {len(all_merge_groups)}")
 
@@ -353,7 +435,7 @@ def fetch_all_ingredients(supabase, select_cols: str, filter_fn=None) -> list[di
     return all_items
 
 
-async def assign_families():
+async def assign_families(options: argparse.Namespace):
     """Assign family to all ingredients."""
     print("\n" + "=" * 70)
     print("FAMILY ASSIGNMENT")
@@ -373,71 +455,48 @@ async def assign_families():
         print("All ingredients already have families assigned!")
         return
 
-    # Build name -> id lookup for reliable matching
-    name_to_id = {ing["name"].lower(): ing["id"] for ing in ingredients}
+    name_to_id = name_lookup(ingredients)
 
     print(f"Processing {len(ingredients)} ingredients without families")
 
-    total_assigned = 0
-
-    for i in range(0, len(ingredients), BATCH_SIZE_FAMILIES):
-        batch = ingredients[i:i + BATCH_SIZE_FAMILIES]
-        print(f"\nBatch {i // BATCH_SIZE_FAMILIES + 1}/{(len(ingredients) // BATCH_SIZE_FAMILIES) + 1}...")
-
+    async def process(batch: list[dict]) -> list[dict]:
         # Format for LLM - use name only, no IDs
         ing_list = "\n".join([
             f"- {ing['name']} (category: {ing.get('category', 'unknown')})"
             for ing in batch
         ])
 
-        try:
-            response = openai.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a culinary expert helping organize an ingredient database."},
-                    {"role": "user", "content": FAMILY_PROMPT.format(ingredients=ing_list)}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-
-            data = parse_llm_response(response.choices[0].message.content)
-            assignments = data.get("assignments", [])
-
-            # Apply assignments using name-based lookup
-            for assignment in assignments:
-                name = assignment.get("name", "").lower()
-                family = assignment.get("family")
-
-                if not name or not family:
-                    continue
-
-                # Look up ID by name
-                ing_id = name_to_id.get(name)
-                if not ing_id:
-                    print(f"  Warning: No ID found for '{name}'")
-                    continue
+        data = await complete_json(
+            openai,
+            "You are a culinary expert helping organize an ingredient database.",
+            FAMILY_PROMPT.format(ingredients=ing_list),
+        )
 
-                try:
-                    supabase.table("ingredients").update({
-                        "family": family
-                    }).eq("id", ing_id).execute()
+        rows = []
+        for assignment in data.get("assignments", []):
+            name = assignment.get("name", "").lower()
+            family = assignment.get("family")
 
-                    log_change("family", ing_id, {"family": family})
-                    total_assigned += 1
+            if not name or not family:
+                continue
 
-                except Exception as e:
-                    print(f"  Error updating {name}: {e}")
+            # Look up ID by name
+            ing_id = name_to_id.get(name)
+            if not ing_id:
+                print(f"  Warning: No ID found for '{name}'")
+                continue
 
-            print(f"  Assigned {len(assignments)} families")
+            rows.append({"id": ing_id, "family": family})
+        return rows
 
-        except Exception as e:
-            print(f"  Batch error: {e}")
+    total_assigned = await run_enrichment(
+        "family", supabase, ingredients, BATCH_SIZE_FAMILIES, process, options
+    )
 
     print(f"\n\nTotal families assigned: {total_assigned}")
 
 
-async def fix_categories():
+async def fix_categories(options: argparse.Namespace):
     """Map existing category to parent_category + category."""
     print("\n" + "=" * 70)
     print("CATEGORY MIGRATION")
@@ -464,90 +523,65 @@ async def fix_categories():
         print("All ingredients already have parent_category mapped!")
         return
 
-    # Build name -> id lookup for reliable matching
-    name_to_id = {ing["name"].lower(): ing["id"] for ing in ingredients}
+    name_to_id = name_lookup(ingredients)
+    valid_parents = set(taxonomy["parent_categories"].keys())
 
     print(f"Processing {len(ingredients)} ingredients needing category mapping")
 
-    total_mapped = 0
-
-    for i in range(0, len(ingredients), BATCH_SIZE_CATEGORIES):
-        batch = ingredients[i:i + BATCH_SIZE_CATEGORIES]
-        print(f"\nBatch {i // BATCH_SIZE_CATEGORIES + 1}/{(len(ingredients) // BATCH_SIZE_CATEGORIES) + 1}...")
-
+    async def process(batch: list[dict]) -> list[dict]:
         # Format for LLM - use name only, no IDs
         ing_list = "\n".join([
             f"- {ing['name']} (old_category: {ing.get('category', 'none')})"
             for ing in batch
         ])
 
-        try:
-            response = openai.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a culinary expert helping organize an ingredient database."},
-                    {"role": "user", "content": CATEGORY_PROMPT.format(
-                        taxonomy=taxonomy_str,
-                        ingredients=ing_list
-                    )}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-
-            data = parse_llm_response(response.choices[0].message.content)
-            assignments = data.get("assignments", [])
-
-            # Validate and apply using name-based lookup
-            valid_parents = set(taxonomy["parent_categories"].keys())
-
-            for assignment in assignments:
-                name = assignment.get("name", "").lower()
-                parent = assignment.get("parent_category")
-                category = assignment.get("category")
-
-                if not name or not parent:
-                    continue
-
-                # Look up ID by name
-                ing_id = name_to_id.get(name)
-                if not ing_id:
-                    print(f"  Warning: No ID found for '{name}'")
-                    continue
-
-                # Validate parent_category
-                if parent not in valid_parents:
-                    print(f"  Warning: Invalid parent_category '{parent}' for {name}")
-                    continue
-
-                # Validate category under parent
-                allowed_cats = taxonomy["parent_categories"][parent].get("categories", [])
-                if category and category not in allowed_cats:
-                    print(f"  Warning: Invalid category '{category}' under '{parent}' for {name}")
-                    category = None
-
-                try:
-                    update_data = {"parent_category": parent}
-                    if category:
-                        update_data["category"] = category
-
-                    supabase.table("ingredients").update(update_data).eq("id", ing_id).execute()
-
-                    log_change("category", ing_id, update_data)
-                    total_mapped += 1
-
-                except Exception as e:
-                    print(f"  Error updating {name}: {e}")
-
-            print(f"  Mapped {len(assignments)} categories")
-
-        except Exception as e:
-            print(f"  Batch error: {e}")
+        data = await complete_json(
+            openai,
+            "You are a culinary expert helping organize an ingredient database.",
+            CATEGORY_PROMPT.format(taxonomy=taxonomy_str, ingredients=ing_list),
+        )
+
+        # Validate using name-based lookup
+        rows = []
+        for assignment in data.get("assignments", []):
+            name = assignment.get("name", "").lower()
+            parent = assignment.get("parent_category")
+            category = assignment.get("category")
+
+            if not name or not parent:
+                continue
+
+            # Look up ID by name
+            ing_id = name_to_id.get(name)
+            if not ing_id:
+                print(f"  Warning: No ID found for '{name}'")
+                continue
+
+            # Validate parent_category
+            if parent not in valid_parents:
+                print(f"  Warning: Invalid parent_category '{parent}' for {name}")
+                continue
+
+            # Validate category under parent
+            allowed_cats = taxonomy["parent_categories"][parent].get("categories", [])
+            if category and category not in allowed_cats:
+                print(f"  Warning: Invalid category '{category}' under '{parent}' for {name}")
+                category = None
+
+            update_data = {"id": ing_id, "parent_category": parent}
+            if category:
+                update_data["category"] = category
+            rows.append(update_data)
+        return rows
+
+    total_mapped = await run_enrichment(
+        "category", supabase, ingredients, BATCH_SIZE_CATEGORIES, process, options
+    )
 
     print(f"\n\nTotal categories mapped: {total_mapped}")
 
 
-async def score_tiers():
+async def score_tiers(options: argparse.Namespace):
     """Assign tier (1, 2, 3) to all ingredients."""
     print("\n" + "=" * 70)
     print("TIER SCORING")
@@ -562,72 +596,52 @@ async def score_tiers():
         "id, name, category, parent_category, tier"
     )
 
-    # Build name -> id lookup for reliable matching
-    name_to_id = {ing["name"].lower(): ing["id"] for ing in ingredients}
+    name_to_id = name_lookup(ingredients)
 
     print(f"Processing {len(ingredients)} ingredients for tier scoring")
 
-    total_scored = 0
     tier_counts = {1: 0, 2: 0, 3: 0}
 
-    for i in range(0, len(ingredients), BATCH_SIZE_TIERS):
-        batch = ingredients[i:i + BATCH_SIZE_TIERS]
-        print(f"\nBatch {i // BATCH_SIZE_TIERS + 1}/{(len(ingredients) // BATCH_SIZE_TIERS) + 1}...")
-
+    async def process(batch: list[dict]) -> list[dict]:
         # Format for LLM - use name only, no IDs
         ing_list = "\n".join([
             f"- {ing['name']} (category: {ing.get('parent_category', 'unknown')}/{ing.get('category', 'unknown')})"
             for ing in batch
         ])
 
-        try:
-            response = openai.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a culinary expert helping organize an ingredient database by commonality."},
-                    {"role": "user", "content": TIER_PROMPT.format(ingredients=ing_list)}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-
-            data = parse_llm_response(response.choices[0].message.content)
-            assignments = data.get("assignments", [])
-
-            # Apply assignments using name-based lookup
-            for assignment in assignments:
-                name = assignment.get("name", "").lower()
-                tier = assignment.get("tier")
-
-                if not name:
-                    continue
+        data = await complete_json(
+            openai,
+            "You are a culinary expert helping organize an ingredient database by commonality.",
+            TIER_PROMPT.format(ingredients=ing_list),
+        )
 
-                if tier not in [1, 2, 3]:
-                    print(f"  Warning: Invalid tier '{tier}' for {name}")
-                    continue
+        rows = []
+        for assignment in data.get("assignments", []):
+            name = assignment.get("name", "").lower()
+            tier = assignment.get("tier")
 
-                # Look up ID by name
-                ing_id = name_to_id.get(name)
-                if not ing_id:
-                    print(f"  Warning: No ID found for '{name}'")
-                    continue
+            if not name:
+                continue
 
-                try:
-                    supabase.table("ingredients").update({
-                        "tier": tier
-                    }).eq("id", ing_id).execute()
+            if tier not in [1, 2, 3]:
+                print(f"  Warning: Invalid tier '{tier}' for {name}")
+                continue
 
-                    log_change("tier", ing_id, {"tier": tier})
-                    total_scored += 1
-                    tier_counts[tier] += 1
+            # Look up ID by name
+            ing_id = name_to_id.get(name)
+            if not ing_id:
+                print(f"  Warning: No ID found for '{name}'")
+                continue
 
-                except Exception as e:
-                    print(f"  Error updating {name}: {e}")
+            rows.append({"id": ing_id, "tier": tier})
+        return rows
 
-            print(f"  Scored {len(assignments)} ingredients")
+    def count_tier(row: dict):
+        tier_counts[row["tier"]] += 1
 
-        except Exception as e:
-            print(f"  Batch error: {e}")
+    total_scored = await run_enrichment(
+        "tier", supabase, ingredients, BATCH_SIZE_TIERS, process, options, on_written=count_tier
+    )
 
     print(f"\n\nTotal scored: {total_scored}")
     print(f"  Tier 1 (core): {tier_counts[1]}")
@@ -635,7 +649,7 @@ async def score_tiers():
     print(f"  Tier 3 (niche): {tier_counts[3]}")
 
 
-async def tag_cuisines():
+async def tag_cuisines(options: argparse.Namespace):
     """Tag cuisine-specific ingredients with their cuisines."""
     print("\n" + "=" * 70)
     print("CUISINE TAGGING")
@@ -662,88 +676,65 @@ async def tag_cuisines():
         print("No ingredients need cuisine tagging!")
         return
 
-    # Build name -> id lookup for reliable matching
-    name_to_id = {ing["name"].lower(): ing["id"] for ing in ingredients}
+    name_to_id = name_lookup(ingredients)
 
     print(f"Processing {len(ingredients)} potential cuisine-specific ingredients")
 
-    total_tagged = 0
-
-    for i in range(0, len(ingredients), BATCH_SIZE_CUISINES):
-        batch = ingredients[i:i + BATCH_SIZE_CUISINES]
-        print(f"\nBatch {i // BATCH_SIZE_CUISINES + 1}/{(len(ingredients) // BATCH_SIZE_CUISINES) + 1}...")
-
+    async def process(batch: list[dict]) -> list[dict]:
         # Format for LLM - use name only, no IDs
         ing_list = "\n".join([
             f"- {ing['name']} (category: {ing.get('category', 'unknown')})"
             for ing in batch
         ])
 
-        try:
-            response = openai.chat.completions.create(
-                model=MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a culinary expert helping tag ingredients by cuisine origin."},
-                    {"role": "user", "content": CUISINE_PROMPT.format(ingredients=ing_list)}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-
-            data = parse_llm_response(response.choices[0].message.content)
-            assignments = data.get("assignments", [])
-
-            # Apply assignments using name-based lookup
-            for assignment in assignments:
-                name = assignment.get("name", "").lower()
-                cuisines = assignment.get("cuisines", [])
-
-                if not name:
-                    continue
-
-                # Validate cuisines
-                cuisines = [c for c in cuisines if c in valid_cuisines]
+        data = await complete_json(
+            openai,
+            "You are a culinary expert helping tag ingredients by cuisine origin.",
+            CUISINE_PROMPT.format(ingredients=ing_list),
+        )
 
-                # Skip if no cuisines (generic ingredient)
-                if not cuisines:
-                    continue
+        rows = []
+        for assignment in data.get("assignments", []):
+            name = assignment.get("name", "").lower()
+            cuisines = assignment.get("cuisines", [])
 
-                # Look up ID by name
-                ing_id = name_to_id.get(name)
-                if not ing_id:
-                    print(f"  Warning: No ID found for '{name}'")
-                    continue
+            if not name:
+                continue
 
-                try:
-                    supabase.table("ingredients").update({
-                        "cuisines": cuisines
-                    }).eq("id", ing_id).execute()
+            # Validate cuisines
+            cuisines = [c for c in cuisines if c in valid_cuisines]
 
-                    log_change("cuisines", ing_id, {"cuisines": cuisines})
-                    total_tagged += 1
+            # Skip if no cuisines (generic ingredient)
+            if not cuisines:
+                continue
 
-                except Exception as e:
-                    print(f"  Error updating {name}: {e}")
+            # Look up ID by name
+            ing_id = name_to_id.get(name)
+            if not ing_id:
+                print(f"  Warning: No ID found for '{name}'")
+                continue
 
-            print(f"  Tagged {total_tagged} ingredients with cuisines in this batch")
+            rows.append({"id": ing_id, "cuisines": cuisines})
+        return rows
 
-        except Exception as e:
-            print(f"  Batch error: {e}")
+    total_tagged = await run_enrichment(
+        "cuisines", supabase, ingredients, BATCH_SIZE_CUISINES, process, options
+    )
 
     print(f"\n\nTotal cuisine-tagged: {total_tagged}")
 
 
-async def run_all():
+async def run_all(options: argparse.Namespace):
     """Run all cleanup operations in sequence."""
     print("\n" + "=" * 70)
     print("RUNNING ALL CLEANUP OPERATIONS")
     print("=" * 70)
 
-    await dedupe_ingredients(dry_run=True)  # Start with dry run
-    await assign_families()
-    await fix_categories()
-    await score_tiers()
-    await tag_cuisines()
+    await dedupe_ingredients(options, dry_run=True)  # Start with dry run
+    await assign_families(options)
+    await fix_categories(options)
+    await score_tiers(options)
+    await tag_cuisines(options)
 
     print("\n" + "=" * 70)
     print("ALL CLEANUP OPERATIONS COMPLETE")
@@ -766,6 +757,8 @@ Commands:
   tiers       Score commonality (1=core, 2=standard, 3=niche)
   cuisines    Tag cuisine-specific ingredients
   all         Run all cleanup operations
+
+Interrupted steps resume from scripts/cleanup_logs/checkpoints/ on rerun.
         """
     )
 
@@ -781,20 +774,33 @@ Commands:
         help="For dedupe: actually apply merges (default is dry run)"
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"LLM batches in flight at once (default {DEFAULT_CONCURRENCY})"
+    )
+
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore checkpoints from an interrupted run and start over"
+    )
+
     args = parser.parse_args()
 
     if args.command == "dedupe":
-        asyncio.run(dedupe_ingredients(dry_run=not args.apply))
+        asyncio.run(dedupe_ingredients(args, dry_run=not args.apply))
     elif args.command == "families":
-        asyncio.run(assign_families())
+        asyncio.run(assign_families(args))
     elif args.command == "categories":
-        asyncio.run(fix_categories())
+        asyncio.run(fix_categories(args))
     elif args.command == "tiers":
-        asyncio.run(score_tiers())
+        asyncio.run(score_tiers(args))
     elif args.command == "cuisines":
-        asyncio.run(tag_cuisines())
+        asyncio.run(tag_cuisines(args))
     elif args.command == "all":
-        asyncio.run(run_all())
+        asyncio.run(run_all(args))
 
 
 if __name__ == "__main__":
@@ -13,10 +13,17 @@ Usage:
 import argparse
 import asyncio
 import os
+import sys
+from pathlib import Path
 from typing import Literal
 
 from openai import OpenAI
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Same text as the background embedding worker, so vectors are comparable
+from alfred_kitchen.domain.tools.embedding_text import create_ingredient_text, create_recipe_text  # noqa: E402
+
 # Try to import from alfred, fallback to direct supabase if not in venv
 try:
     from alfred_kitchen.db.client import get_client
@@ -45,54 +52,6 @@ def get_openai_client() -> OpenAI:
     return OpenAI(api_key=OPENAI_API_KEY)
 
 
-def create_ingredient_text(ingredient: dict) -> str:
-    """
-    Create text representation of an ingredient for embedding.
-
-    Combines name, parent_category, family, category, aliases, and cuisines
-    into a single searchable text for semantic matching.
-    """
-    parts = [ingredient.get("name", "")]
-
-    # Add parent_category and family for better semantic grouping
-    if parent := ingredient.get("parent_category"):
-        parts.append(f"section: {parent}")
-
-    if family := ingredient.get("family"):
-        parts.append(f"family: {family}")
-
-    if category := ingredient.get("category"):
-        parts.append(f"type: {category}")
-
-    aliases = ingredient.get("aliases", [])
-    if aliases:
-        parts.append(f"also known as: {', '.join(aliases)}")
-
-    cuisines = ingredient.get("cuisines", [])
-    if cuisines:
-        parts.append(f"cuisines: {', '.join(cuisines)}")
-
-    return " | ".join(parts)
-
-
-def create_recipe_text(recipe: dict) -> str:
-    """
-    Create text representation of a recipe for embedding.
-    
-    LEAN: Just name + description. This captures the "vibe" of the recipe.
-    
-    For structured attributes (cuisine, difficulty, time, tags), use exact filters.
-    Semantic search is for ambiguous queries like "comfort food", "date night".
-    """
-    parts = [recipe.get("name", "")]
-    
-    # Description only - the "vibe" of the recipe
-    if description := recipe.get("description"):
-        parts.append(description[:300])
-    
-    return " | ".join(parts)
-
-
 def batch_embeddings(texts: list[str], client: OpenAI) -> list[list[float]]:
     """
     Generate embeddings for a batch of texts.
@@ -107,6 +66,15 @@ def batch_embeddings(texts: list[str], client: OpenAI) -> list[list[float]]:
     return [item.embedding for item in response.data]
 
 
+def write_embeddings(supabase, table: str, ids: list[str], embeddings: list[list[float]]) -> None:
+    """Write a batch of vectors with the set_embeddings RPC (pgvector text format)."""
+    supabase.rpc("set_embeddings", {
+        "target": table,
+        "ids": ids,
+        "embeddings": ["[" + ",".join(map(str, e)) + "]" for e in embeddings],
+    }).execute()
+
+
 def fetch_all_rows(supabase, table: str, select_cols: str, filter_null_embedding: bool = True) -> list[dict]:
     """Fetch all rows with pagination (Supabase limits to 1000 per query)."""
     all_items = []
@@ -166,12 +134,9 @@ async def generate_ingredient_embeddings(batch_size: int = 50, force: bool = Fal
             # Generate embeddings
             embeddings = batch_embeddings(texts, openai)
             
-            # Update each ingredient with its embedding
-            for ing, embedding in zip(batch, embeddings):
-                supabase.table("ingredients").update(
-                    {"embedding": embedding}
-                ).eq("id", ing["id"]).execute()
-                total_updated += 1
+            # One bulk UPDATE per batch (migration 044)
+            write_embeddings(supabase, "ingredients", [ing["id"] for ing in batch], embeddings)
+            total_updated += len(batch)
             
             print(f"  Processed batch {i // batch_size + 1}: {len(batch)} ingredients")
             
@@ -214,12 +179,9 @@ async def generate_recipe_embeddings(batch_size: int = 20, force: bool = False)
             # Generate embeddings
             embeddings = batch_embeddings(texts, openai)
             
-            # Update each recipe with its embedding
-            for recipe, embedding in zip(batch, embeddings):
-                supabase.table("recipes").update(
-                    {"embedding": embedding}
-                ).eq("id", recipe["id"]).execute()
-                total_updated += 1
+            # One bulk UPDATE per batch (migration 044)
+            write_embeddings(supabase, "recipes", [recipe["id"] for recipe in batch], embeddings)
+            total_updated += len(batch)
             
             print(f"  Processed batch {i // batch_size + 1}: {len(batch)} recipes")
             
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Profile CPU per Act iteration on a multi-step plan, with and without the
+per-turn section render cache.
+
+Drives act_node directly through a synthetic N-step plan (read steps with
+a db_read + step_complete each, plus analyze/generate steps). The LLM,
+CRUD and schema lookups are stubbed so only prompt assembly and
+bookkeeping are measured. The conversation carries realistic history and
+a populated ID registry so context sections have real size.
+
+Usage:
+    python scripts/profile_act.py
+    python scripts/profile_act.py --steps 10 --rows 40 --repeat 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import alfred_kitchen  # noqa: F401,E402 - registers KITCHEN_DOMAIN
+from alfred.core.id_registry import SessionIdRegistry  # noqa: E402
+from alfred.graph.nodes import act as act_module  # noqa: E402
+from alfred.graph.nodes.act import ActDecision, act_node  # noqa: E402
+from alfred.graph.state import ThinkOutput, ThinkStep  # noqa: E402
+from alfred.memory.conversation import initialize_conversation  # noqa: E402
+from alfred.prompts.render_cache import SectionCache  # noqa: E402
+
+SUBDOMAINS = ["recipes", "inventory", "shopping", "meal_plans"]
+
+
+def build_plan(n_steps: int) -> ThinkOutput:
+    steps = []
+    for i in range(n_steps):
+        step_type = "read" if i < n_steps - 2 else ("analyze" if i == n_steps - 2 else "generate")
+        steps.append(ThinkStep(
+            description=f"Step {i + 1}: look at {SUBDOMAINS[i % 4]}",
+            step_type=step_type,
+            subdomain=SUBDOMAINS[i % 4],
+            group=i,
+        ))
+    return ThinkOutput(goal="Plan a week of dinners", steps=steps)
+
+
+def build_conversation(registry: SessionIdRegistry) -> dict:
+    conversation = initialize_conversation()
+    conversation["history_summary"] = "The user has been planning meals and restocking the pantry. " * 20
+    conversation["recent_turns"] = [
+        {
+            "user": f"Turn {t}: what can I cook with what I have?",
+            "assistant": "Here are some ideas based on your inventory. " * 30,
+            "assistant_summary": "Suggested 4 recipes using pantry items.",
+            "timestamp": f"2026-01-0{t}T12:00:00",
+        }
+        for t in range(1, 4)
+    ]
+    for t in range(1, 4):
+        registry.set_turn(t)
+        registry.translate_read_output(
+            [{"id": str(uuid.uuid4()), "name": f"Recipe {t}-{i}", "instructions": ["Cook"]} for i in range(15)],
+            "recipes",
+        )
+        registry.translate_read_output(
+            [{"id": str(uuid.uuid4()), "name": f"Item {t}-{i}", "location": "pantry"} for i in range(25)],
+            "inventory",
+        )
+    return conversation
+
+
+class ScriptedLLM:
+    """Per step: db_read for read steps, then step_complete."""
+
+    def __init__(self, plan: ThinkOutput) -> None:
+        self.plan = plan
+        self.state: dict = {}
+
+    async def __call__(self, *, response_model, system_prompt, user_prompt, complexity, **_):
+        step = self.plan.steps[self.state["current_step_index"]]
+        if step.step_type == "read" and not self.state["current_step_tool_results"]:
+            return ActDecision(
+                action="tool_call", tool="db_read",
+                params={"table": step.subdomain if step.subdomain != "shopping" else "shopping_list",
+                        "filters": [], "limit": 50},
+            )
+        return ActDecision(
+            action="step_complete",
+            result_summary=f"Done with {step.subdomain}",
+            data={"summary": f"{step.subdomain} looked fine"},
+            note_for_next_step="Nothing special",
+        )
+
+
+def make_fake_crud(rows: int):
+    async def fake_execute_crud(tool, params, user_id, registry=None):
+        table = params["table"]
+        records = [{"id": str(uuid.uuid4()), "name": f"{table} row {i}", "quantity": i} for i in range(rows)]
+        return registry.translate_read_output(records, table) if registry else records
+    return fake_execute_crud
+
+
+async def fake_schema(subdomain: str) -> str:
+    return f"## {subdomain} schema\n" + "| column | type |\n|---|---|\n" + "| name | text |\n" * 40
+
+
+async def run_plan(n_steps: int, rows: int, use_cache: bool) -> list[float]:
+    """Run one plan to completion; returns CPU seconds per act_node call."""
+    plan = build_plan(n_steps)
+    registry = SessionIdRegistry(session_id="profile")
+    conversation = build_conversation(registry)
+    registry.set_turn(4)
+
+    state: dict = {
+        "user_id": "",  # No profile fetch
+        "user_message": "Plan dinners for the week",
+        "think_output": plan,
+        "current_step_index": 0,
+        "step_results": {},
+        "step_metadata": {},
+        "current_step_tool_results": [],
+        "schema_requests": 0,
+        "conversation": conversation,
+        "content_archive": {},
+        "id_registry": registry.to_dict(),
+        "current_turn": 4,
+        "act_render_cache": SectionCache() if use_cache else None,
+    }
+    llm = ScriptedLLM(plan)
+    llm.state = state
+    cpu_per_iteration = []
+
+    with patch.object(act_module, "call_llm", llm), \
+         patch.object(act_module, "execute_crud", make_fake_crud(rows)), \
+         patch.object(act_module, "get_schema_with_fallback", fake_schema):
+        while state["current_step_index"] < n_steps:
+            start = time.process_time()
+            update = await act_node(state)
+            cpu_per_iteration.append(time.process_time() - start)
+            state.update(update)  # Same merge LangGraph does for these keys
+
+    return cpu_per_iteration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=30, help="Rows returned per db_read")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    def mean_run(use_cache: bool) -> list[float]:
+        runs = [asyncio.run(run_plan(args.steps, args.rows, use_cache)) for _ in range(args.repeat)]
+        return [sum(col) / len(col) for col in zip(*runs)]
+
+    uncached = mean_run(False)
+    cached = mean_run(True)
+
+    print(f"\nAct CPU per iteration: {args.steps}-step plan, {len(cached)} iterations, "
+          f"{args.rows} rows/read, mean of {args.repeat}\n")
+    print(f"{'iter':>5}{'uncached ms':>14}{'cached ms':>12}")
+    print("-" * 31)
+    for i, (u, c) in enumerate(zip(uncached, cached), 1):
+        print(f"{i:>5}{u * 1000:>14.2f}{c * 1000:>12.2f}")
+    print("-" * 31)
+    print(f"{'total':>5}{sum(uncached) * 1000:>14.2f}{sum(cached) * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
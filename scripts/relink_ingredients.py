@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
 """
 Re-run ingredient matching across all linked tables using improved algorithm.
+
+Records are matched in batches with one resolve_ingredients() RPC each,
+several batches at a time, and changes are written with one bulk_update()
+per batch (migration 046). An interrupted --execute run resumes from its
+checkpoint on rerun (--fresh starts over).
+
+Usage:
+    python scripts/relink_ingredients.py                # Dry run
+    python scripts/relink_ingredients.py --execute [--concurrency 8] [--fresh]
 """
 
+import argparse
 import asyncio
 import sys
+from pathlib import Path
+
 sys.path.insert(0, "src")
 
 from supabase import create_client
@@ -13,7 +25,12 @@ import os
 
 load_dotenv()
 
-from alfred_kitchen.domain.tools.ingredient_lookup import lookup_ingredient
+from alfred_kitchen.background.batch_jobs import DEFAULT_CONCURRENCY, BatchJobRunner, bulk_update
+from alfred_kitchen.domain.tools.ingredient_lookup import resolve_ingredients
+
+BATCH_SIZE = 200
+PAGE_SIZE = 1000
+CHECKPOINT_DIR = Path(__file__).parent / "cleanup_logs" / "checkpoints"
 
 
 def get_supabase():
@@ -22,65 +39,109 @@ def get_supabase():
     return create_client(url, key)
 
 
-async def relink_table(sb, table_name: str, execute: bool = False):
+def fetch_records(sb, table_name: str) -> list[dict]:
+    """All linkable records (paginated; Supabase limits to 1000)."""
+    records = []
+    while True:
+        result = (
+            sb.table(table_name)
+            .select("id, name, ingredient_id")
+            .order("id")
+            .range(len(records), len(records) + PAGE_SIZE - 1)
+            .execute()
+        )
+        records.extend(result.data or [])
+        if len(result.data or []) < PAGE_SIZE:
+            return records
+
+
+async def relink_table(sb, table_name: str, options: argparse.Namespace):
     """Re-link ingredients in a table."""
     print(f"\n{'='*60}")
     print(f"TABLE: {table_name}")
     print(f"{'='*60}")
-    
+
     # Fetch all records
-    result = sb.table(table_name).select("id, name, ingredient_id").execute()
-    records = result.data
+    records = [rec for rec in fetch_records(sb, table_name) if rec.get("name")]
     print(f"Total records: {len(records)}")
-    
+
     changes = []
-    unchanged = 0
-    newly_linked = 0
-    relinked = 0
-    still_unlinked = 0
-    
-    for rec in records:
-        name = rec.get("name")
-        old_id = rec.get("ingredient_id")
-        
-        if not name:
-            continue
-        
-        # Run new matching
-        match = await lookup_ingredient(name, operation="write", use_semantic=False)
-        new_id = match.id if match else None
-        
-        if new_id == old_id:
-            unchanged += 1
-        elif old_id is None and new_id is not None:
-            newly_linked += 1
-            changes.append({
-                "id": rec["id"],
-                "name": name,
-                "old": None,
-                "new": match.name,
-                "new_id": new_id,
-                "category": match.category,
-            })
-        elif old_id is not None and new_id != old_id:
-            relinked += 1
-            changes.append({
-                "id": rec["id"],
-                "name": name,
-                "old_id": old_id,
-                "new": match.name if match else None,
-                "new_id": new_id,
-                "category": match.category if match else None,
-            })
-        else:
-            still_unlinked += 1
-    
+    counts = {"unchanged": 0, "newly_linked": 0, "relinked": 0, "still_unlinked": 0}
+    updated = 0
+
+    async def process(batch: list[dict]) -> list[dict]:
+        # Run new matching (one RPC for the batch)
+        matches = await resolve_ingredients([rec["name"] for rec in batch], use_semantic=False)
+        batch_changes = []
+        for rec in batch:
+            old_id = rec.get("ingredient_id")
+            match = matches.get(rec["name"])
+            new_id = match.id if match else None
+
+            if new_id == old_id:
+                counts["unchanged"] += 1
+            elif old_id is None and new_id is not None:
+                counts["newly_linked"] += 1
+                batch_changes.append({
+                    "id": rec["id"],
+                    "name": rec["name"],
+                    "old": None,
+                    "new": match.name,
+                    "new_id": new_id,
+                    "category": match.category,
+                })
+            elif old_id is not None and new_id != old_id:
+                counts["relinked"] += 1
+                batch_changes.append({
+                    "id": rec["id"],
+                    "name": rec["name"],
+                    "old_id": old_id,
+                    "new": match.name if match else None,
+                    "new_id": new_id,
+                    "category": match.category if match else None,
+                })
+            else:
+                counts["still_unlinked"] += 1
+        changes.extend(batch_changes)
+        return batch_changes
+
+    async def write(batch_changes: list[dict]):
+        nonlocal updated
+        rows = []
+        for c in batch_changes:
+            update_data = {"id": c["id"], "ingredient_id": c["new_id"]}
+            # Also copy category from the match
+            if c.get("category"):
+                update_data["category"] = c["category"]
+            rows.append(update_data)
+        await asyncio.to_thread(bulk_update, sb, table_name, rows)
+        updated += len(rows)
+
+    # Dry runs rewrite nothing, so they neither read nor leave checkpoints
+    runner = BatchJobRunner(
+        f"relink-{table_name}",
+        concurrency=options.concurrency,
+        checkpoint_dir=CHECKPOINT_DIR if options.execute else None,
+        resume=not options.fresh,
+    )
+    stats = await runner.run(
+        records,
+        key=lambda rec: rec["id"],
+        batch_size=BATCH_SIZE,
+        process=process,
+        write=write if options.execute else None,
+    )
+
     print(f"\nResults:")
-    print(f"  Unchanged: {unchanged}")
-    print(f"  Newly linked: {newly_linked}")
-    print(f"  Re-linked (different match): {relinked}")
-    print(f"  Still unlinked: {still_unlinked}")
-    
+    print(f"  Unchanged: {counts['unchanged']}")
+    print(f"  Newly linked: {counts['newly_linked']}")
+    print(f"  Re-linked (different match): {counts['relinked']}")
+    print(f"  Still unlinked: {counts['still_unlinked']}")
+    if stats.skipped:
+        print(f"  Skipped (done by an earlier run): {stats.skipped}")
+    if stats.failed:
+        print(f"  Failed batches: {stats.failed} (rerun to retry)")
+
     if changes:
         print(f"\nChanges ({len(changes)}):")
         for c in changes[:20]:
@@ -89,60 +150,59 @@ async def relink_table(sb, table_name: str, execute: bool = False):
             print(f"  '{c['name']}': {old} -> {new}")
         if len(changes) > 20:
             print(f"  ... and {len(changes) - 20} more")
-    
-    if execute and changes:
-        print(f"\nApplying changes...")
-        for c in changes:
-            update_data = {"ingredient_id": c["new_id"]}
-            # Also copy category from the match
-            if c.get("category"):
-                update_data["category"] = c["category"]
-            sb.table(table_name).update(update_data).eq("id", c["id"]).execute()
-        print(f"  Updated {len(changes)} records")
-    
+
+    if options.execute and changes:
+        print(f"\nUpdated {updated} records")
+
     return {
         "table": table_name,
         "total": len(records),
-        "unchanged": unchanged,
-        "newly_linked": newly_linked,
-        "relinked": relinked,
-        "still_unlinked": still_unlinked,
+        **counts,
     }
 
 
 async def main():
-    execute = "--execute" in sys.argv
-    
+    parser = argparse.ArgumentParser(description="Re-link ingredient references with the current matcher")
+    parser.add_argument("--execute", action="store_true", help="Apply changes (default is dry run)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Batches in flight at once (default {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument("--fresh", action="store_true", help="Ignore checkpoints and start over")
+    options = parser.parse_args()
+
     print("=" * 60)
     print("INGREDIENT RE-LINKING")
     print("=" * 60)
-    
-    if not execute:
+
+    if not options.execute:
         print("DRY RUN - use --execute to apply changes")
-    
+
     sb = get_supabase()
-    
+
     tables = ["recipe_ingredients", "inventory", "shopping_list"]
     results = []
-    
+
     for table in tables:
-        result = await relink_table(sb, table, execute)
+        result = await relink_table(sb, table, options)
         results.append(result)
-    
+
     # Summary
     print(f"\n{'='*60}")
     print("SUMMARY")
     print(f"{'='*60}")
-    
+
     total_newly = sum(r["newly_linked"] for r in results)
     total_relinked = sum(r["relinked"] for r in results)
     total_still = sum(r["still_unlinked"] for r in results)
-    
+
     print(f"Newly linked: {total_newly}")
     print(f"Re-linked: {total_relinked}")
     print(f"Still unlinked: {total_still}")
-    
-    if not execute:
+
+    if not options.execute:
         print(f"\nRun with --execute to apply changes")
 
 
@@ -1,31 +1,34 @@
-"""Re-synthesize guidance from existing interview answers."""
+"""
+Re-synthesize guidance from existing interview answers.
+
+Runs synthesis for one user (--user) or every onboarding session with
+interview answers (--all), several LLM calls at a time. Each batch's
+results are written with one upsert / bulk_update() per table
+(migration 046); an interrupted --all run resumes from its checkpoint
+on rerun (--fresh starts over).
+
+Usage:
+    python scripts/resynthesize_guidance.py --user <uuid>
+    python scripts/resynthesize_guidance.py --all [--concurrency 8] [--fresh]
+"""
+import argparse
 import sys
 sys.path.insert(0, "src")
 import asyncio
+from pathlib import Path
 
+from alfred_kitchen.background.batch_jobs import DEFAULT_CONCURRENCY, BatchJobRunner, bulk_update
 from alfred_kitchen.db.client import get_service_client
 
-USER_ID = "ec95ba05-d099-4c4e-aee6-162e80e980d3"
+BATCH_SIZE = 10
+CHECKPOINT_DIR = Path(__file__).parent / "cleanup_logs" / "checkpoints"
+DOMAINS = ["recipes", "meal_plans", "tasks", "shopping", "inventory"]
 
 
-async def resynthesize():
-    from onboarding.style_interview import synthesize_guidance
-    
-    sb = get_service_client()
-    
-    # 1. Get answers from session
-    sessions = sb.table("onboarding_sessions").select("state").eq("user_id", USER_ID).execute()
-    if not sessions.data:
-        print("[ERROR] No session found")
-        return
-    
-    state = sessions.data[0]["state"]
-    answers = state.get("payload_draft", {}).get("interview_answers", [])
-    print(f"[OK] Found {len(answers)} answers in session\n")
-    
-    # 2. Build user context from session
+def build_user_context(state: dict) -> dict:
+    """User context for synthesis, from the session state."""
     constraints = state.get("constraints", {})
-    user_context = {
+    return {
         "cooking_skill_level": constraints.get("cooking_skill_level", "intermediate"),
         "household_size": constraints.get("household_size", 2),
         "dietary_restrictions": constraints.get("dietary_restrictions", []),
@@ -33,62 +36,121 @@ async def resynthesize():
         "cuisines": state.get("cuisine_selections", []),
         "liked_ingredients": [],
     }
-    
-    print("User context:")
-    for k, v in user_context.items():
-        print(f"  {k}: {v}")
-    print()
-    
-    # 3. Call synthesis
-    print("Calling synthesis LLM...")
-    guidance = await synthesize_guidance(user_context, answers)
-    
-    print("\n=== NEW SYNTHESIZED GUIDANCE ===\n")
-    for domain in ["recipes", "meal_plans", "tasks", "shopping", "inventory"]:
-        text = getattr(guidance, domain)
-        print(f"**{domain}:**\n{text}\n")
-    
-    # 4. Update onboarding_data
-    print("\nUpdating onboarding_data...")
-    
-    # Get existing payload
-    existing = sb.table("onboarding_data").select("payload").eq("user_id", USER_ID).execute()
-    if existing.data:
-        payload = existing.data[0]["payload"]
-    else:
-        payload = {}
-    
-    # Update guidance and add answers
-    payload["subdomain_guidance"] = {
-        "recipes": guidance.recipes,
-        "meal_plans": guidance.meal_plans,
-        "tasks": guidance.tasks,
-        "shopping": guidance.shopping,
-        "inventory": guidance.inventory,
-    }
-    payload["interview_answers"] = answers
-    
-    sb.table("onboarding_data").upsert({
-        "user_id": USER_ID,
-        "payload": payload,
-    }).execute()
-    
-    # 5. Also update preferences table
-    print("Updating preferences table...")
-    sb.table("preferences").update({
-        "subdomain_guidance": payload["subdomain_guidance"]
-    }).eq("user_id", USER_ID).execute()
-    
-    # 6. Update session payload_draft so /complete works correctly
-    print("Updating session payload_draft...")
-    state["payload_draft"]["subdomain_guidance"] = payload["subdomain_guidance"]
-    state["payload_draft"]["interview_answers"] = answers
-    sb.table("onboarding_sessions").update({
-        "state": state
-    }).eq("user_id", USER_ID).execute()
-    
-    print("\n[OK] Done! New guidance is now active in Alfred and session is updated.")
+
+
+def fetch_sessions(sb, user_ids: list[str] | None) -> list[dict]:
+    """Onboarding sessions that have interview answers."""
+    query = sb.table("onboarding_sessions").select("user_id, state")
+    if user_ids:
+        query = query.in_("user_id", user_ids)
+    sessions = query.execute().data or []
+    return [
+        s for s in sessions
+        if (s.get("state") or {}).get("payload_draft", {}).get("interview_answers")
+    ]
+
+
+def write_guidance(sb, results: list[dict]) -> None:
+    """Write a batch of synthesized guidance to all three places it lives."""
+    if not results:
+        return
+    user_ids = [r["user_id"] for r in results]
+
+    # 1. onboarding_data payload (full rows, so a plain upsert)
+    existing = sb.table("onboarding_data").select("user_id, payload").in_("user_id", user_ids).execute()
+    payloads = {row["user_id"]: row.get("payload") or {} for row in existing.data or []}
+    upserts = []
+    for r in results:
+        payload = payloads.get(r["user_id"], {})
+        payload["subdomain_guidance"] = r["guidance"]
+        payload["interview_answers"] = r["answers"]
+        upserts.append({"user_id": r["user_id"], "payload": payload})
+    sb.table("onboarding_data").upsert(upserts).execute()
+
+    # 2. preferences table
+    bulk_update(sb, "preferences", [
+        {"user_id": r["user_id"], "subdomain_guidance": r["guidance"]} for r in results
+    ], key_column="user_id")
+
+    # 3. session payload_draft so /complete works correctly
+    bulk_update(sb, "onboarding_sessions", [
+        {"user_id": r["user_id"], "state": r["state"]} for r in results
+    ], key_column="user_id")
+
+
+async def resynthesize(options: argparse.Namespace):
+    from onboarding.style_interview import synthesize_guidance
+
+    sb = get_service_client()
+
+    # 1. Get answers from sessions
+    sessions = fetch_sessions(sb, None if options.all else options.user)
+    if not sessions:
+        print("[ERROR] No session with interview answers found")
+        return
+    print(f"[OK] Found {len(sessions)} sessions with interview answers\n")
+
+    async def process(batch: list[dict]) -> list[dict]:
+        # 2. Build user context and 3. call synthesis, concurrently within the batch
+        async def one(session: dict) -> dict:
+            state = session["state"]
+            answers = state["payload_draft"]["interview_answers"]
+            guidance = await synthesize_guidance(build_user_context(state), answers)
+            subdomain_guidance = {domain: getattr(guidance, domain) for domain in DOMAINS}
+            state["payload_draft"]["subdomain_guidance"] = subdomain_guidance
+            state["payload_draft"]["interview_answers"] = answers
+            return {
+                "user_id": session["user_id"],
+                "answers": answers,
+                "guidance": subdomain_guidance,
+                "state": state,
+            }
+
+        results = await asyncio.gather(*(one(s) for s in batch))
+        if len(sessions) == 1:
+            print("=== NEW SYNTHESIZED GUIDANCE ===\n")
+            for domain, text in results[0]["guidance"].items():
+                print(f"**{domain}:**\n{text}\n")
+        return results
+
+    # 4. Write each batch to onboarding_data, preferences and the session
+    runner = BatchJobRunner(
+        "resynthesize-guidance",
+        concurrency=options.concurrency,
+        checkpoint_dir=CHECKPOINT_DIR if options.all else None,
+        resume=not options.fresh,
+    )
+    stats = await runner.run(
+        sessions,
+        key=lambda session: session["user_id"],
+        batch_size=BATCH_SIZE,
+        process=process,
+        write=lambda results: write_guidance(sb, results),
+    )
+
+    print(f"Batches: {stats.completed}/{stats.batches} completed, {stats.failed} failed")
+    if stats.skipped:
+        print(f"Skipped {stats.skipped} users done by an earlier run")
+    for error in stats.errors:
+        print(f"[ERROR] {error}")
+    if not stats.failed:
+        print("\n[OK] Done! New guidance is now active in Alfred and sessions are updated.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-synthesize subdomain guidance from interview answers")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user", action="append", help="User id (repeatable)")
+    target.add_argument("--all", action="store_true", help="Every session with interview answers")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Batches in flight at once (default {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument("--fresh", action="store_true", help="Ignore checkpoints and start over")
+    asyncio.run(resynthesize(parser.parse_args()))
 
 
 if __name__ == "__main__":
-    asyncio.run(resynthesize())
+    main()
@@ -13,6 +13,7 @@ async def main():
     from alfred.graph.workflow import run_alfred
     from alfred.memory.conversation import initialize_conversation
     from alfred.config import settings
+    from alfred.core.id_registry import SessionIdRegistry
     
     user_id = settings.dev_user_id
     conv = initialize_conversation()
@@ -24,10 +25,11 @@ async def main():
     # Check registry after Turn 1
     reg = conv.get("id_registry")
     if reg:
-        count = len(reg.get("ref_to_uuid", {}))
+        reg = SessionIdRegistry.from_dict(reg)
+        count = len(reg.ref_to_uuid)
         print(f"\n✅ After Turn 1: Registry has {count} entities")
         if count > 0:
-            refs = list(reg.get("ref_to_uuid", {}).keys())[:5]
+            refs = list(reg.ref_to_uuid.keys())[:5]
             print(f"   Sample refs: {refs}")
     else:
         print("\n❌ After Turn 1: NO REGISTRY!")
@@ -38,7 +40,7 @@ async def main():
     
     reg2 = conv2.get("id_registry")
     if reg2:
-        count2 = len(reg2.get("ref_to_uuid", {}))
+        count2 = len(SessionIdRegistry.from_dict(reg2).ref_to_uuid)
         print(f"\n✅ After Turn 2: Registry has {count2} entities")
     else:
         print("\n❌ After Turn 2: NO REGISTRY!")
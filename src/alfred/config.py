@@ -41,6 +41,10 @@ class CoreSettings(BaseSettings):
     # ALFRED_LOG_PROMPTS=1 - log to local files (dev only)
     alfred_log_prompts: bool = False
 
+    # Optimistic Think: run Think alongside Understand, keep it when they agree
+    # ALFRED_SPECULATIVE_THINK=1 (see graph/speculation.py)
+    alfred_speculative_think: bool = False
+
     @property
     def is_development(self) -> bool:
         return self.alfred_env == "development"
@@ -22,6 +22,7 @@ import logging
 
 if TYPE_CHECKING:
     from alfred.domain.base import DomainConfig
+    from alfred.domain.compiled import CompiledDomain
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,12 @@ def _get_domain() -> "DomainConfig":
     return get_current_domain()
 
 
+def _get_compiled() -> "CompiledDomain":
+    """Get the current domain's frozen lookup tables (hot paths)."""
+    from alfred.domain import get_compiled_domain
+    return get_compiled_domain()
+
+
 @dataclass
 class SessionIdRegistry:
     """
@@ -71,6 +78,7 @@ class SessionIdRegistry:
     # V4: Store FULL CONTENT of generated artifacts (persists until saved or discarded)
     # Maps gen_* refs to their full artifact content
     # This is what allows cross-turn "generate now, save later" flow
+    # Loaded from the wire format this is a LazyArtifacts mapping (decoded on read)
     pending_artifacts: dict[str, dict] = field(default_factory=dict)
     
     # V4: Deterministic action tracking per ref
@@ -115,6 +123,10 @@ class SessionIdRegistry:
     # V10: Change tracking for frontend streaming
     # Tracks last snapshot of active refs to compute diffs
     _last_snapshot_refs: set[str] = field(default_factory=set)
+
+    # Wire format: last payload and the state it was built from, so to_wire()
+    # can skip re-encoding when nothing changed. See core/registry_codec.py.
+    _wire_cache: tuple[tuple, dict] | None = field(default=None, repr=False, compare=False)
     
     # =========================================================================
     # Ref Generation
@@ -185,8 +197,12 @@ class SessionIdRegistry:
         if not records:
             return records
         
-        entity_type = self._table_to_type(table)
-        fk_fields = self._get_fk_fields(table)
+        compiled = _get_compiled()
+        domain = compiled.source
+        entity_type = compiled.table_type(table)
+        fk_fields = compiled.fk_fields.get(table, ())
+        track_detail = entity_type in compiled.detail_tracked_types
+        nested_relations = compiled.nested_relations.get(table, ())
         translated = []
         
         for record in records:
@@ -214,8 +230,7 @@ class SessionIdRegistry:
 
                 # V7: Detail level tracking for entities with detail_tracking=True.
                 # Determined purely from the returned DB record shape via domain config.
-                domain = _get_domain()
-                detail_level = domain.detect_detail_level(entity_type, record)
+                detail_level = domain.detect_detail_level(entity_type, record) if track_detail else None
                 if detail_level is not None:
                     tracking = self.ref_detail_tracking.get(ref, {})
                     tracking["level"] = detail_level
@@ -224,7 +239,7 @@ class SessionIdRegistry:
                     self.ref_detail_tracking[ref] = tracking
                 
                 # Compute label based on entity type
-                label = self._compute_entity_label(record, entity_type, ref)
+                label = domain.compute_entity_label(record, entity_type, ref)
                 self.ref_labels[ref] = str(label)
                 
                 # V4 CONSOLIDATION: Temporal tracking
@@ -249,7 +264,7 @@ class SessionIdRegistry:
                             new_record[f"_{fk_field}_label"] = label
                     else:
                         # Lazy registration: assign a ref now so LLM never sees raw UUIDs
-                        fk_entity_type = self._fk_field_to_type(fk_field)
+                        fk_entity_type = compiled.fk_type(fk_field)
                         fk_ref = self._next_ref(fk_entity_type)
                         self.ref_to_uuid[fk_ref] = fk_uuid
                         self.uuid_to_ref[fk_uuid] = fk_ref
@@ -263,7 +278,7 @@ class SessionIdRegistry:
                         new_record[fk_field] = fk_ref
                         
                         # Queue for enrichment if table supports name lookup
-                        enrich_info = self._fk_field_to_enrich_info(fk_field)
+                        enrich_info = compiled.fk_enrich_map.get(fk_field)
                         if enrich_info and enrich_info[1]:  # Has name column
                             self._lazy_enrich_queue[fk_ref] = enrich_info
                         
@@ -272,14 +287,10 @@ class SessionIdRegistry:
             # Handle nested relations (e.g., recipe_ingredients inside recipes)
             # These need their IDs registered so Act can target them for updates.
             # Driven by EntityDefinition.nested_relations from domain config.
-            domain = _get_domain()
-            entity_def = domain.entities.get(table)
-            nested_keys = (entity_def.nested_relations or []) if entity_def else []
-            for nested_key in nested_keys:
+            for relation in nested_relations:
+                nested_key, nested_type = relation.key, relation.type_name
                 if nested_key not in record or not isinstance(record[nested_key], list):
                     continue
-                nested_entity = domain.entities.get(nested_key)
-                nested_type = nested_entity.type_name if nested_entity else nested_key.rstrip("s")
                 translated_nested = []
                 for item in record[nested_key]:
                     if isinstance(item, dict) and "id" in item and item["id"]:
@@ -659,11 +670,8 @@ class SessionIdRegistry:
             return data
         
         translated = data.copy()
-        fk_fields = self._get_fk_fields(table)
-        
-        # Also include all known FK fields from domain config (covers cross-table refs)
-        domain = _get_domain()
-        fk_fields = set(fk_fields) | set(domain.get_fk_enrich_map().keys())
+        # Table's own FK fields plus all enrichable FK fields (covers cross-table refs)
+        fk_fields = _get_compiled().payload_fk_fields_for(table)
         
         for fk_field in fk_fields:
             if fk_field in translated and translated[fk_field]:
@@ -801,40 +809,21 @@ class SessionIdRegistry:
     
     def _table_to_type(self, table: str) -> str:
         """Convert table name to entity type (singular, for refs)."""
-        # Phase 2: Use domain config instead of hardcoded mapping
-        domain = _get_domain()
-        return domain.table_to_type.get(table, table.rstrip("s"))
+        return _get_compiled().table_type(table)
     
     def _get_fk_fields(self, table: str) -> list[str]:
         """Get FK fields for a table."""
-        # Phase 2: Use domain config instead of hardcoded mapping
-        domain = _get_domain()
-        entity = domain.entities.get(table)
-        if entity:
-            return entity.fk_fields
-        return []
+        return list(_get_compiled().fk_fields.get(table, ()))
     
     def _fk_field_to_type(self, fk_field: str) -> str:
-        """Convert FK field name to entity type for lazy registration."""
-        # Phase 2: Derive from domain config
-        # FK field naming convention: <table>_id -> look up entity type
-        domain = _get_domain()
-
-        # Handle special cases first (parent_recipe_id -> recipe)
-        if fk_field == "parent_recipe_id":
-            fk_field = "recipe_id"
-
-        # Extract table name from FK field (e.g., "recipe_id" -> "recipes")
-        base_name = fk_field.replace("_id", "")
-
-        # Try common pluralizations
-        for table_name in [base_name + "s", base_name + "es", base_name]:
-            entity = domain.entities.get(table_name)
-            if entity:
-                return entity.type_name
+        """
+        Convert FK field name to entity type for lazy registration.
 
-        # Fallback: just strip _id
-        return base_name
+        Precomputed per FK field at domain compile time: enrich-map target
+        table first (parent_recipe_id → recipes → recipe), then the
+        <singular>_id naming convention.
+        """
+        return _get_compiled().fk_type(fk_field)
     
     def _compute_entity_label(self, record: dict, entity_type: str, ref: str) -> str:
         """
@@ -851,10 +840,7 @@ class SessionIdRegistry:
 
         Returns None if the FK type doesn't support name enrichment.
         """
-        # Phase 2: Use domain config
-        domain = _get_domain()
-        fk_enrich_map = domain.get_fk_enrich_map()
-        return fk_enrich_map.get(fk_field)
+        return _get_compiled().fk_enrich_map.get(fk_field)
     
     # =========================================================================
     # Prompt Formatting
@@ -919,6 +905,10 @@ class SessionIdRegistry:
         
         return "\n".join(lines)
     
+    def set_ref_action(self, ref: str, action: str) -> None:
+        """Set the action tag for a ref (e.g. "deleted" after db_delete)."""
+        self.ref_actions[ref] = action
+    
     def get_entities_by_action(self, action: str) -> list[str]:
         """Get all refs with a specific action."""
         return [ref for ref, act in self.ref_actions.items() if act == action]
@@ -946,16 +936,9 @@ class SessionIdRegistry:
         
         Returns the count of refs touched.
         """
-        import re
         touched = 0
-        # Build ref pattern dynamically from domain entity type names
-        domain = _get_domain()
-        type_names = sorted(
-            {e.type_name for e in domain.entities.values()},
-            key=len, reverse=True,  # Longest first for correct regex matching
-        )
-        type_alts = "|".join(re.escape(t) for t in type_names) if type_names else r"\w+"
-        ref_pattern = re.compile(rf'\b({type_alts})_\d+\b|\bgen_\w+_\d+\b')
+        # Precompiled from domain entity type names (whole-ref matches)
+        ref_pattern = _get_compiled().ref_pattern
         
         # Extract from data dict (recursively)
         def extract_refs_from_dict(d: dict | list | str) -> set[str]:
@@ -1138,9 +1121,25 @@ class SessionIdRegistry:
             "ref_active_reason": self.ref_active_reason,
         }
     
+    def to_wire(self) -> dict:
+        """
+        Serialize to the compact, versioned wire format for persistence.
+
+        Used for the conversation JSON stored between turns. pending_artifacts
+        that were never read are passed through without re-serializing, and
+        an unchanged registry returns its previous payload.
+        See core/registry_codec.py.
+        """
+        from alfred.core.registry_codec import encode_registry
+        return encode_registry(self)
+    
     @classmethod
     def from_dict(cls, data: dict) -> "SessionIdRegistry":
-        """Deserialize from dict."""
+        """Deserialize from dict (legacy to_dict() shape or to_wire() payload)."""
+        from alfred.core.registry_codec import decode_registry, is_wire_payload
+        if is_wire_payload(data):
+            return decode_registry(data)
+
         registry = cls(session_id=data.get("session_id", ""))
         registry.ref_to_uuid = data.get("ref_to_uuid", {})
         registry.uuid_to_ref = data.get("uuid_to_ref", {})
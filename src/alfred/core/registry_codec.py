@@ -0,0 +1,407 @@
+"""
+Alfred - Compact wire format for SessionIdRegistry.
+
+The registry is embedded in the persisted conversation JSON every turn.
+The legacy `to_dict()` shape repeats every ref as a key in ~10 parallel
+maps and inlines full generated artifacts (recipes, meal plans), so most
+of the persisted bytes are redundant keys and JSON we immediately re-parse.
+
+Wire format (version 3):
+- One flat column per per-ref field (refs, uuids, type/action indexes,
+  labels, created/last turns), aligned by position. Flat lists of scalars
+  are cheaper to build and to json.dumps than one row list per ref, so
+  encoding costs less than dumping the legacy dict.
+- Type names and action tags are interned into string tables
+- Sparse per-ref maps are stored as [ref_idx, value] pairs
+- pending_artifacts are stored as pre-encoded JSON strings and decoded
+  lazily on first access (most turns never touch them)
+
+Unchanged registries skip re-encoding: decode and encode remember the
+payload next to a shallow copy of the fields it was built from, and
+encode_registry() returns that payload when the copy still compares equal.
+Comparing dicts is much cheaper than rebuilding and re-dumping them, and
+unlike a mutation counter it needs no cooperation from code that writes the
+registry maps directly.
+
+The payload stays JSON-safe so it can live in the `conversations.state`
+jsonb column. `pack_registry()` additionally produces msgpack bytes when
+the optional `msgpack` package is installed.
+
+Legacy dicts (no version key) still load through `SessionIdRegistry.from_dict()`,
+as do version 2 payloads (one [ref, uuid, type_idx, action_idx, label,
+created, last] row per ref).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Iterable, Iterator, MutableMapping
+from itertools import compress, repeat
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from alfred.core.id_registry import SessionIdRegistry
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack  # type: ignore[import-untyped]
+except ImportError:
+    msgpack = None
+
+
+WIRE_VERSION = 3
+WIRE_VERSION_KEY = "__v"
+
+# Row-per-ref layout, still decoded
+_ROWS_WIRE_VERSION = 2
+
+# Stand-in for "__pending__{ref}" UUIDs of unsaved gen_* refs
+_PENDING_UUID = 1
+_PENDING_PREFIX = "__pending__"
+
+# pack_registry() format markers (first byte)
+_FORMAT_MSGPACK = b"M"
+_FORMAT_JSON = b"J"
+
+_JSON_SEPARATORS = (",", ":")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=_JSON_SEPARATORS, default=str)
+
+
+# =============================================================================
+# Lazy Artifacts
+# =============================================================================
+
+
+class LazyArtifacts(MutableMapping):
+    """
+    pending_artifacts mapping that keeps encoded JSON until a value is read.
+
+    Values that were never read are re-emitted verbatim on the next encode,
+    so an untouched recipe is never parsed or re-serialized.
+    """
+
+    __slots__ = ("_raw", "_decoded")
+
+    def __init__(self, raw: dict[str, str] | None = None) -> None:
+        self._raw: dict[str, str] = dict(raw or {})
+        self._decoded: dict[str, dict] = {}
+
+    def __getitem__(self, ref: str) -> dict:
+        if ref in self._decoded:
+            return self._decoded[ref]
+        raw = self._raw.pop(ref)  # KeyError propagates like a dict
+        value = json.loads(raw)
+        self._decoded[ref] = value
+        return value
+
+    def __setitem__(self, ref: str, value: dict) -> None:
+        self._raw.pop(ref, None)
+        self._decoded[ref] = value
+
+    def __delitem__(self, ref: str) -> None:
+        if ref in self._decoded:
+            del self._decoded[ref]
+        else:
+            del self._raw[ref]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._decoded)
+        yield from list(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._decoded) + len(self._raw)
+
+    def __contains__(self, ref: object) -> bool:
+        return ref in self._decoded or ref in self._raw
+
+    def __repr__(self) -> str:
+        return f"LazyArtifacts(decoded={list(self._decoded)}, encoded={list(self._raw)})"
+
+    def copy(self) -> dict[str, dict]:
+        """Materialize into a plain dict (decodes everything)."""
+        return {ref: self[ref] for ref in self}
+
+    def encoded_items(self) -> dict[str, str]:
+        """Return {ref: json_str}, reusing raw strings for untouched values."""
+        encoded = dict(self._raw)
+        for ref, value in self._decoded.items():
+            encoded[ref] = _dumps(value)
+        return encoded
+
+    @property
+    def decoded_count(self) -> int:
+        return len(self._decoded)
+
+
+# =============================================================================
+# Encode / Decode
+# =============================================================================
+
+
+def is_wire_payload(data: Any) -> bool:
+    """True if data is a versioned wire payload (vs a legacy to_dict() dict)."""
+    return isinstance(data, dict) and WIRE_VERSION_KEY in data
+
+
+def wire_ref_count(payload: dict) -> int:
+    """Number of live refs (with a UUID) in a wire payload, without decoding it."""
+    if payload.get(WIRE_VERSION_KEY) == _ROWS_WIRE_VERSION:
+        uuids = [row[1] for row in payload.get("refs", [])]
+    else:
+        uuids = payload.get("uuids", [])
+    return sum(1 for uuid in uuids if uuid is not None)
+
+
+def _fingerprint(registry: SessionIdRegistry) -> tuple | None:
+    """
+    Shallow copy of everything encode_registry() reads.
+
+    None when it can't vouch for the state: artifacts that were read may
+    have been edited in place.
+    """
+    artifacts = registry.pending_artifacts
+    if isinstance(artifacts, LazyArtifacts):
+        if artifacts.decoded_count:
+            return None
+        artifact_refs = list(artifacts._raw)
+    elif artifacts:
+        return None
+    else:
+        artifact_refs = []
+    return (
+        registry.session_id,
+        registry.current_turn,
+        dict(registry.counters),
+        dict(registry.gen_counters),
+        dict(registry.ref_to_uuid),
+        dict(registry.uuid_to_ref),
+        dict(registry.ref_types),
+        dict(registry.ref_actions),
+        dict(registry.ref_labels),
+        dict(registry.ref_turn_created),
+        dict(registry.ref_turn_last_ref),
+        dict(registry.ref_source_step),
+        dict(registry.ref_turn_promoted),
+        dict(registry.ref_active_reason),
+        {ref: dict(value) for ref, value in registry.ref_detail_tracking.items()},
+        artifact_refs,
+    )
+
+
+def _intern(values: Iterable[str | None]) -> dict[str, int]:
+    """Distinct values (in first-seen order) -> their index."""
+    distinct = dict.fromkeys(values)
+    distinct.pop(None, None)
+    return dict(zip(distinct, range(len(distinct))))
+
+
+def encode_registry(registry: SessionIdRegistry) -> dict:
+    """Encode a registry into the compact, JSON-safe wire payload."""
+    fingerprint = _fingerprint(registry)
+    cached = registry._wire_cache
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    ref_to_uuid = registry.ref_to_uuid
+    ref_types = registry.ref_types
+    ref_actions = registry.ref_actions
+    ref_labels = registry.ref_labels
+    ref_turn_created = registry.ref_turn_created
+    ref_turn_last_ref = registry.ref_turn_last_ref
+
+    # Ref table: everything in ref_to_uuid first, then refs that only linger
+    # in metadata maps (e.g. ref_actions survives remove_ref()).
+    # Subset checks skip building key sets in the usual no-lingering case.
+    known = ref_to_uuid.keys()
+    lingering: set[str] = set()
+    for values in (ref_types, ref_actions, ref_labels, ref_turn_created, ref_turn_last_ref):
+        if not values.keys() <= known:
+            lingering |= values.keys() - known
+    ref_order = list(ref_to_uuid) + sorted(lingering)
+    ref_index = dict(zip(ref_order, range(len(ref_order))))
+
+    # Interned tables; -1 marks "no type/action"
+    types = _intern(ref_types.values())
+    actions = _intern(ref_actions.values())
+    type_idx, action_idx = types.get, actions.get
+
+    # Unsaved gen_* refs ("__pending__{ref}" UUIDs) are a handful at most
+    pending = list(compress(ref_to_uuid, map(str.startswith, ref_to_uuid.values(), repeat(_PENDING_PREFIX))))
+    uuids = list(map(ref_to_uuid.get, ref_order))
+    for ref in pending:
+        if ref_to_uuid[ref] == _PENDING_PREFIX + ref:
+            uuids[ref_index[ref]] = _PENDING_UUID
+
+    # uuid_to_ref is the inverse of ref_to_uuid except for rare re-registrations;
+    # store only the entries that the inverse doesn't reproduce.
+    uuid_to_ref = registry.uuid_to_ref
+    inverse = dict(zip(uuid_to_ref.values(), uuid_to_ref))
+    if len(inverse) == len(uuid_to_ref) == len(ref_to_uuid) - len(pending) and inverse.items() <= ref_to_uuid.items():
+        # An exact inverse (one entry per saved ref): nothing to store
+        uuid_overrides: list[list[str]] = []
+        uuid_missing: list[str] = []
+    else:
+        derived: dict[str, str] = {
+            uuid: ref for ref, uuid in ref_to_uuid.items()
+            if not uuid.startswith(_PENDING_PREFIX)
+        }
+        uuid_overrides = [[uuid, ref] for uuid, ref in uuid_to_ref.items() if derived.get(uuid) != ref]
+        uuid_missing = [uuid for uuid in derived if uuid not in uuid_to_ref]
+
+    def sparse(values: dict[str, Any]) -> list[list[Any]]:
+        return [[ref_index[ref], value] for ref, value in values.items() if ref in ref_index]
+
+    def orphans(values: dict[str, Any]) -> dict[str, Any]:
+        return {ref: value for ref, value in values.items() if ref not in ref_index}
+
+    artifacts = registry.pending_artifacts
+    if isinstance(artifacts, LazyArtifacts):
+        encoded_artifacts = artifacts.encoded_items()
+    else:
+        encoded_artifacts = {ref: _dumps(value) for ref, value in artifacts.items()}
+
+    payload: dict[str, Any] = {
+        WIRE_VERSION_KEY: WIRE_VERSION,
+        "sid": registry.session_id,
+        "turn": registry.current_turn,
+        "types": list(types),
+        "actions": list(actions),
+        "refs": ref_order,
+        "uuids": uuids,
+        "type_idx": list(map(type_idx, map(ref_types.get, ref_order), repeat(-1))),
+        "action_idx": list(map(action_idx, map(ref_actions.get, ref_order), repeat(-1))),
+        # Placeholder labels equal to the ref are implied
+        "labels": [0 if label == ref else label for ref, label in zip(ref_order, map(ref_labels.get, ref_order))],
+        "created": list(map(ref_turn_created.get, ref_order)),
+        "last": list(map(ref_turn_last_ref.get, ref_order)),
+        "counters": dict(registry.counters),
+        "gen_counters": dict(registry.gen_counters),
+        "source_step": sparse(registry.ref_source_step),
+        "promoted": sparse(registry.ref_turn_promoted),
+        "detail": sparse(registry.ref_detail_tracking),
+        "reasons": sparse(registry.ref_active_reason),
+        "artifacts": encoded_artifacts,
+    }
+    if uuid_overrides:
+        payload["uuid_overrides"] = uuid_overrides
+    if uuid_missing:
+        payload["uuid_missing"] = uuid_missing
+    # Sparse maps keyed by refs outside the ref table (never expected, kept lossless)
+    extra = {
+        name: found
+        for name, values in (
+            ("ref_source_step", registry.ref_source_step),
+            ("ref_turn_promoted", registry.ref_turn_promoted),
+            ("ref_detail_tracking", registry.ref_detail_tracking),
+            ("ref_active_reason", registry.ref_active_reason),
+        )
+        if (found := orphans(values))
+    }
+    if extra:
+        payload["extra"] = extra
+
+    registry._wire_cache = (fingerprint, payload) if fingerprint is not None else None
+    return payload
+
+
+def decode_registry(payload: dict) -> SessionIdRegistry:
+    """Decode a wire payload produced by encode_registry()."""
+    from alfred.core.id_registry import SessionIdRegistry
+
+    version = payload.get(WIRE_VERSION_KEY)
+    if version == WIRE_VERSION:
+        columns = zip(
+            payload.get("refs", []), payload.get("uuids", []),
+            payload.get("type_idx", []), payload.get("action_idx", []),
+            payload.get("labels", []), payload.get("created", []), payload.get("last", []),
+            strict=True,
+        )
+    elif version == _ROWS_WIRE_VERSION:
+        columns = payload.get("refs", [])
+    else:
+        raise ValueError(f"Unsupported registry wire version: {version!r}")
+
+    types = payload.get("types", [])
+    actions = payload.get("actions", [])
+
+    registry = SessionIdRegistry(session_id=payload.get("sid", ""))
+    registry.current_turn = payload.get("turn", 0)
+    registry.counters = dict(payload.get("counters", {}))
+    registry.gen_counters = dict(payload.get("gen_counters", {}))
+
+    refs: list[str] = []
+    for ref, uuid, type_idx, action_idx, label, created, last in columns:
+        refs.append(ref)
+        if uuid == _PENDING_UUID:
+            registry.ref_to_uuid[ref] = f"{_PENDING_PREFIX}{ref}"
+        elif uuid is not None:
+            registry.ref_to_uuid[ref] = uuid
+            registry.uuid_to_ref[uuid] = ref
+        if type_idx >= 0:
+            registry.ref_types[ref] = types[type_idx]
+        if action_idx >= 0:
+            registry.ref_actions[ref] = actions[action_idx]
+        if label == 0:
+            registry.ref_labels[ref] = ref
+        elif label is not None:
+            registry.ref_labels[ref] = label
+        if created is not None:
+            registry.ref_turn_created[ref] = created
+        if last is not None:
+            registry.ref_turn_last_ref[ref] = last
+
+    for uuid, ref in payload.get("uuid_overrides", []):
+        registry.uuid_to_ref[uuid] = ref
+    for uuid in payload.get("uuid_missing", []):
+        registry.uuid_to_ref.pop(uuid, None)
+
+    registry.ref_source_step = {refs[i]: v for i, v in payload.get("source_step", [])}
+    registry.ref_turn_promoted = {refs[i]: v for i, v in payload.get("promoted", [])}
+    registry.ref_detail_tracking = {refs[i]: dict(v) for i, v in payload.get("detail", [])}
+    registry.ref_active_reason = {refs[i]: v for i, v in payload.get("reasons", [])}
+    for name, values in payload.get("extra", {}).items():
+        getattr(registry, name).update(values)
+
+    registry.pending_artifacts = LazyArtifacts(payload.get("artifacts", {}))
+    if version == WIRE_VERSION:
+        # Persisting it again unchanged hands back this payload
+        registry._wire_cache = (_fingerprint(registry), payload)
+    return registry
+
+
+# =============================================================================
+# Binary Packing
+# =============================================================================
+
+
+def pack_registry(registry: SessionIdRegistry) -> bytes:
+    """
+    Encode a registry to bytes.
+
+    Uses msgpack when installed (`pip install alfred[perf]`), otherwise
+    compact JSON. The first byte records which format was used.
+    """
+    payload = encode_registry(registry)
+    if msgpack is not None:
+        return _FORMAT_MSGPACK + msgpack.packb(payload, use_bin_type=True)
+    return _FORMAT_JSON + _dumps(payload).encode("utf-8")
+
+
+def unpack_registry(data: bytes) -> SessionIdRegistry:
+    """Decode bytes produced by pack_registry()."""
+    marker, body = data[:1], data[1:]
+    if marker == _FORMAT_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("Registry was packed with msgpack, which is not installed")
+        # strict_map_key=False: sparse maps use integer ref ids
+        payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    elif marker == _FORMAT_JSON:
+        payload = json.loads(body)
+    else:
+        raise ValueError(f"Unknown registry format marker: {marker!r}")
+    return decode_registry(payload)
@@ -15,6 +15,9 @@ Usage:
 
     # Anywhere in core:
     domain = get_current_domain()
+
+    # Hot paths (per-record lookups):
+    compiled = get_compiled_domain()
 """
 
 from alfred.domain.base import (
@@ -22,8 +25,10 @@ from alfred.domain.base import (
     EntityDefinition,
     SubdomainDefinition,
 )
+from alfred.domain.compiled import CompiledDomain, compile_domain
 
 _current_domain: DomainConfig | None = None
+_compiled_domain: CompiledDomain | None = None
 
 
 def register_domain(domain: DomainConfig) -> None:
@@ -32,12 +37,14 @@ def register_domain(domain: DomainConfig) -> None:
 
     Must be called at app startup before any core functions are used.
     Each domain application (kitchen, FPL, etc.) calls this once.
+    Also compiles the domain's lookup tables (see get_compiled_domain()).
 
     Args:
         domain: The DomainConfig implementation to use
     """
-    global _current_domain
+    global _current_domain, _compiled_domain
     _current_domain = domain
+    _compiled_domain = compile_domain(domain)
 
 
 def get_current_domain() -> DomainConfig:
@@ -65,15 +72,31 @@ def get_current_domain() -> DomainConfig:
     return _current_domain
 
 
+def get_compiled_domain() -> CompiledDomain:
+    """
+    Get the frozen lookup tables for the current domain.
+
+    Compiled by register_domain(); recompiled here only if the current
+    domain was swapped without going through it.
+    """
+    global _compiled_domain
+    domain = get_current_domain()
+    if _compiled_domain is None or _compiled_domain.source is not domain:
+        _compiled_domain = compile_domain(domain)
+    return _compiled_domain
+
+
 # Deprecated alias — use register_domain() instead
 set_current_domain = register_domain
 
 
 __all__ = [
+    "CompiledDomain",
     "DomainConfig",
     "EntityDefinition",
     "SubdomainDefinition",
     "register_domain",
     "get_current_domain",
+    "get_compiled_domain",
     "set_current_domain",  # deprecated alias
 ]
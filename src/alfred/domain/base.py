@@ -16,6 +16,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from collections.abc import Collection
 from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
@@ -152,6 +153,26 @@ class CRUDMiddleware:
         """
         return records
 
+    def after_write(
+        self,
+        table: str,
+        user_id: str,
+        rows: list[dict] | None = None,
+        updated_fields: Collection[str] | None = None,
+    ) -> None:
+        """
+        Called after a create/update/delete succeeds.
+
+        Use it to invalidate domain-side caches derived from the table, or
+        to schedule work on the written rows.
+
+        Args:
+            table: Table that was written
+            user_id: User whose data changed
+            rows: Rows created or updated (None for deletes)
+            updated_fields: Columns an update set (None for creates and deletes)
+        """
+
 
 class DomainConfig(ABC):
     """
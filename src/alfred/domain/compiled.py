@@ -0,0 +1,144 @@
+"""
+Compiled Domain Metadata.
+
+DomainConfig accessors are convenient but not cheap: `entities` and the
+derived `table_to_type`/`type_to_table` build fresh dicts on every access,
+and `get_fk_enrich_map()`-style accessors rebuild (sometimes re-import) on
+every call. The hot paths — ID translation per record and per FK field,
+ref scanning over step data — call them constantly.
+
+`compile_domain()` snapshots everything those paths need into one frozen
+structure. `register_domain()` compiles it once; core code reads it via
+`get_compiled_domain()`.
+
+Domain metadata is static for the life of the process. A domain that
+changes its entities at runtime must call register_domain() again.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping
+
+if TYPE_CHECKING:
+    from alfred.domain.base import DomainConfig, EntityDefinition
+
+
+@dataclass(frozen=True)
+class NestedRelation:
+    """A related table embedded in a parent's read results (e.g. recipe_ingredients)."""
+
+    key: str        # Field on the parent record
+    type_name: str  # Entity type for refs of the nested items
+
+
+@dataclass(frozen=True)
+class CompiledDomain:
+    """Frozen lookup tables derived from a DomainConfig."""
+
+    source: DomainConfig
+    name: str
+    entities: Mapping[str, EntityDefinition]         # table → definition
+    table_to_type: Mapping[str, str]
+    type_to_table: Mapping[str, str]
+    fk_fields: Mapping[str, tuple[str, ...]]         # table → own FK fields
+    payload_fk_fields: Mapping[str, frozenset[str]]  # table → FK fields translated on write
+    enrich_fk_fields: frozenset[str]                 # FK fields with an enrich target (any table)
+    fk_enrich_map: Mapping[str, tuple[str, str]]     # FK field → (table, name column)
+    fk_to_type: Mapping[str, str]                    # FK field → entity type
+    label_fields: Mapping[str, tuple[str, ...]]      # table → label fields
+    nested_relations: Mapping[str, tuple[NestedRelation, ...]]  # table → nested relations
+    detail_tracked_types: frozenset[str]             # types with detail_tracking=True
+    user_owned_tables: frozenset[str]
+    uuid_fields: frozenset[str]
+    ref_pattern: re.Pattern[str]                     # Matches "recipe_3", "gen_recipe_1", ...
+
+    def table_type(self, table: str) -> str:
+        """Entity type for a table (falls back to naive singular)."""
+        return self.table_to_type.get(table) or table.rstrip("s")
+
+    def fk_type(self, fk_field: str) -> str:
+        """Entity type referenced by an FK field (falls back to naming convention)."""
+        return self.fk_to_type.get(fk_field) or _infer_fk_type(fk_field, self.entities)
+
+    def payload_fk_fields_for(self, table: str) -> frozenset[str]:
+        return self.payload_fk_fields.get(table, self.enrich_fk_fields)
+
+    def find_refs(self, text: str) -> list[str]:
+        """All entity refs in a string."""
+        return self.ref_pattern.findall(text)
+
+
+def _infer_fk_type(fk_field: str, entities: Mapping[str, EntityDefinition]) -> str:
+    # FK naming convention: <singular>_id → look up the table by pluralization
+    base_name = fk_field.replace("_id", "")
+    for table_name in (base_name + "s", base_name + "es", base_name):
+        entity = entities.get(table_name)
+        if entity:
+            return entity.type_name
+    return base_name
+
+
+def compile_ref_pattern(type_names: set[str] | frozenset[str]) -> re.Pattern[str]:
+    """Regex matching `<type>_<n>` refs for the given types, plus `gen_<type>_<n>`."""
+    # Longest first so "meal_plan" wins over "meal"
+    ordered = sorted(type_names, key=len, reverse=True)
+    type_alts = "|".join(re.escape(t) for t in ordered) if ordered else r"\w+"
+    return re.compile(rf"\b(?:{type_alts})_\d+\b|\bgen_\w+_\d+\b")
+
+
+def compile_domain(domain: DomainConfig) -> CompiledDomain:
+    """Build the frozen lookup structure for a domain (call once per registration)."""
+    entities = dict(domain.entities)
+    fk_enrich_map = dict(domain.get_fk_enrich_map())
+    table_to_type = {e.table: e.type_name for e in entities.values()}
+    type_to_table = {e.type_name: e.table for e in entities.values()}
+
+    fk_fields = {table: tuple(e.fk_fields) for table, e in entities.items()}
+    enrich_fields = frozenset(fk_enrich_map)
+    all_fk_fields = enrich_fields | {f for fields in fk_fields.values() for f in fields}
+
+    fk_to_type: dict[str, str] = {}
+    for fk_field in all_fk_fields:
+        target = fk_enrich_map.get(fk_field)
+        if target and target[0] in table_to_type:
+            # e.g. parent_recipe_id → recipes → recipe
+            fk_to_type[fk_field] = table_to_type[target[0]]
+        else:
+            fk_to_type[fk_field] = _infer_fk_type(fk_field, entities)
+
+    nested: dict[str, tuple[NestedRelation, ...]] = {}
+    for table, entity in entities.items():
+        if entity.nested_relations:
+            nested[table] = tuple(
+                NestedRelation(
+                    key=key,
+                    type_name=entities[key].type_name if key in entities else key.rstrip("s"),
+                )
+                for key in entity.nested_relations
+            )
+
+    return CompiledDomain(
+        source=domain,
+        name=domain.name,
+        entities=MappingProxyType(entities),
+        table_to_type=MappingProxyType(table_to_type),
+        type_to_table=MappingProxyType(type_to_table),
+        fk_fields=MappingProxyType(fk_fields),
+        payload_fk_fields=MappingProxyType(
+            {table: frozenset(fields) | enrich_fields for table, fields in fk_fields.items()}
+        ),
+        enrich_fk_fields=enrich_fields,
+        fk_enrich_map=MappingProxyType(fk_enrich_map),
+        fk_to_type=MappingProxyType(fk_to_type),
+        label_fields=MappingProxyType(
+            {table: tuple(e.label_fields) for table, e in entities.items()}
+        ),
+        nested_relations=MappingProxyType(nested),
+        detail_tracked_types=frozenset(e.type_name for e in entities.values() if e.detail_tracking),
+        user_owned_tables=frozenset(domain.get_user_owned_tables()),
+        uuid_fields=frozenset(domain.get_uuid_fields()),
+        ref_pattern=compile_ref_pattern(frozenset(type_to_table)),
+    )
@@ -5,8 +5,13 @@ The graph implements: Router → Think → Act Loop → Reply → Summarize
 
 Uses generic CRUD tools with subdomain-based schema filtering.
 Maintains conversation memory across turns.
+
+The workflow (and with it LangGraph and the LLM clients) is imported on
+first use of one of its names, so importing the state contracts stays cheap.
 """
 
+from typing import Any
+
 # Import tools module
 import alfred.tools  # noqa: F401
 
@@ -26,12 +31,16 @@ from alfred.graph.state import (
     ThinkStep,
     ToolCallAction,
 )
-from alfred.graph.workflow import (
-    compile_alfred_graph,
-    create_alfred_graph,
-    run_alfred,
-    run_alfred_simple,
-)
+
+_WORKFLOW_EXPORTS = ("compile_alfred_graph", "create_alfred_graph", "run_alfred", "run_alfred_simple")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _WORKFLOW_EXPORTS:
+        from alfred.graph import workflow
+
+        return getattr(workflow, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     # State and contracts
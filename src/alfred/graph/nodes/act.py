@@ -36,6 +36,7 @@ from alfred.core.modes import Mode, ModeContext
 from alfred.core.id_registry import SessionIdRegistry
 from alfred.domain import get_current_domain
 from alfred.core.payload_compiler import compile_payloads, get_compiled_payload_for_step
+from alfred.graph.prefetch import PROFILE, fetch_profile, prefetched, schema_key
 from alfred.graph.state import (
     ACT_CONTEXT_THRESHOLD,
     FULL_DETAIL_STEPS,
@@ -56,7 +57,9 @@ from alfred.graph.state import (
 from alfred.llm.client import call_llm, set_current_node
 from alfred.memory.conversation import format_full_context
 from alfred.prompts.injection import build_act_user_prompt
-from alfred.tools.crud import execute_crud
+from alfred.prompts.registry import get_prompt_registry
+from alfred.prompts.render_cache import Identity, SectionCache
+from alfred.tools.crud import CrudBatchError, execute_crud, execute_crud_batch
 from alfred.tools.schema import get_schema_with_fallback
 
 
@@ -211,6 +214,13 @@ def _is_first_step_in_group(steps: list, step_index: int) -> bool:
 # =============================================================================
 
 
+class ToolCallSpec(BaseModel):
+    """One call in a multi-tool decision."""
+
+    tool: Literal["db_read", "db_create", "db_update", "db_delete"] = Field(description="CRUD tool to call")
+    params: dict[str, Any] = Field(description="Tool parameters")
+
+
 class ActDecision(BaseModel):
     """
     The LLM's decision for what action to take.
@@ -227,6 +237,11 @@ class ActDecision(BaseModel):
         default=None, description="CRUD tool to call"
     )
     params: dict[str, Any] | None = Field(default=None, description="Tool parameters")
+    tool_calls: list[ToolCallSpec] | None = Field(
+        default=None,
+        description="Several independent tool calls in one decision (instead of tool/params). "
+        "Reads run concurrently; writes run in order after the calls before them.",
+    )
 
     # For step_complete
     result_summary: str | None = Field(
@@ -276,6 +291,9 @@ def _decision_to_action(decision: ActDecision) -> ActAction:
     """Convert LLM decision to typed action."""
     match decision.action:
         case "tool_call":
+            if not decision.tool and decision.tool_calls:
+                last = decision.tool_calls[-1]
+                return ToolCallAction(tool=last.tool, params=last.params)
             return ToolCallAction(
                 tool=decision.tool or "db_read",
                 params=decision.params or {},
@@ -317,22 +335,11 @@ def _decision_to_action(decision: ActDecision) -> ActAction:
 # Act Node
 # =============================================================================
 
-# Prompt paths
-_PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts" / "templates" / "act"
-
-# Cache for loaded prompts
-_PROMPT_CACHE: dict[str, str] = {}
-
-
 def _load_prompt(filename: str) -> str:
-    """Load a prompt file from prompts/act/ directory."""
-    if filename not in _PROMPT_CACHE:
-        path = _PROMPTS_DIR / filename
-        if path.exists():
-            _PROMPT_CACHE[filename] = path.read_text(encoding="utf-8")
-        else:
-            _PROMPT_CACHE[filename] = ""
-    return _PROMPT_CACHE[filename]
+    """Get a precompiled prompts/templates/act/ template ("" if absent)."""
+    registry = get_prompt_registry()
+    name = f"act/{Path(filename).stem}"
+    return registry.get(name).text if registry.has(name) else ""
 
 
 def _get_system_prompt(step_type: str = "read") -> str:
@@ -972,9 +979,107 @@ def _format_previous_turn_steps(conversation: dict) -> str:
     return "\n".join(lines)
 
 
-# Maximum tool calls allowed within a single step (circuit breaker)
+def _format_archive_section(content_archive: dict) -> str:
+    """List content archived in previous turns (retrievable via retrieve_archive)."""
+    if not content_archive:
+        return ""
+    archive_lines = ["### Available Archives (from previous turns)"]
+    archive_lines.append("Use `{\"action\": \"retrieve_archive\", \"archive_key\": \"...\"}` to fetch full content.")
+    for key, val in content_archive.items():
+        desc = val.get("description", "No description")[:80]
+        archive_lines.append(f"- `{key}`: {desc}")
+    return "\n".join(archive_lines) + "\n"
+
+
+def _format_pending_artifacts(session_registry: SessionIdRegistry) -> str:
+    """Full JSON of generated-but-unsaved artifacts, with save status."""
+    pending = session_registry.get_all_pending_artifacts()
+    if not pending:
+        return ""
+    import json
+    pa_lines = ["### Generated Data"]
+    pa_lines.append("Full artifact content. For write steps, use `recipe_id: \"gen_recipe_X\"` for linked records.")
+    pa_lines.append("")
+    for ref, content in pending.items():
+        label = content.get("name") or content.get("title") or ref
+        # Show status: whether main record exists
+        action = session_registry.ref_actions.get(ref, "generated")
+        status = "[main record saved]" if action == "created" else "[needs main record]"
+        pa_lines.append(f"#### {ref}: {label} {status}")
+        pa_lines.append("```json")
+        pa_lines.append(json.dumps(content, indent=2, default=str))
+        pa_lines.append("```")
+        pa_lines.append("")
+    return "\n".join(pa_lines) + "\n"
+
+
+def _decision_tool_calls(decision: ActDecision) -> list[tuple[str, dict[str, Any]]]:
+    """The (tool, params) calls a tool_call decision asks for, in order (capped)."""
+    if decision.tool_calls:
+        calls = [(call.tool, call.params) for call in decision.tool_calls]
+        if len(calls) > MAX_TOOL_CALLS_PER_DECISION:
+            # The LLM sees what ran and can ask for the rest in its next decision
+            logger.warning(
+                f"Act: decision carried {len(calls)} tool calls, "
+                f"running the first {MAX_TOOL_CALLS_PER_DECISION}"
+            )
+            calls = calls[:MAX_TOOL_CALLS_PER_DECISION]
+        return calls
+    if decision.tool and decision.params:
+        return [(decision.tool, decision.params)]
+    return []
+
+
+def _mark_deleted_refs(session_registry: SessionIdRegistry, params: dict[str, Any]) -> None:
+    """Mark refs deleted by a db_delete (by id filter) in the registry."""
+    deleted_refs = []
+    for f in params.get("filters", []):
+        if f.get("field") == "id":
+            value = f.get("value")
+            if isinstance(value, str):
+                deleted_refs.append(value)
+            elif isinstance(value, list):
+                deleted_refs.extend(value)
+
+    if deleted_refs:
+        # Mark as deleted but KEEP UUID mapping for subsequent steps
+        # (e.g., need to search meal_plans by deleted recipe_id)
+        for ref in deleted_refs:
+            session_registry.set_ref_action(ref, "deleted")
+        logger.info(f"Act: Marked {len(deleted_refs)} entities as deleted: {deleted_refs}")
+
+
+def _mark_batch_items_created(batch_manifest: BatchManifest, result: Any) -> None:
+    """Match records from a db_create to pending batch items."""
+    if isinstance(result, list):
+        for record in result:
+            if isinstance(record, dict) and record.get("id"):
+                # Try to find matching batch item by name/label
+                record_name = record.get("name") or record.get("title") or ""
+                for item in batch_manifest.items:
+                    if item.status == "pending":
+                        # Match by label similarity or just take first pending
+                        if item.label.lower() in record_name.lower() or record_name.lower() in item.label.lower():
+                            batch_manifest.mark_completed(item.ref, str(record["id"]))
+                            break
+                else:
+                    # No match found, mark first pending item
+                    pending_items = [i for i in batch_manifest.items if i.status == "pending"]
+                    if pending_items:
+                        batch_manifest.mark_completed(pending_items[0].ref, str(record["id"]))
+    elif isinstance(result, dict) and result.get("id"):
+        # Single record created
+        pending_items = [i for i in batch_manifest.items if i.status == "pending"]
+        if pending_items:
+            batch_manifest.mark_completed(pending_items[0].ref, str(result["id"]))
+
+
+# Maximum tool-call decisions allowed within a single step (circuit breaker)
 # 3 is enough for: read main → read related → complete (or retry once)
-MAX_TOOL_CALLS_PER_STEP = 3
+MAX_DECISIONS_PER_STEP = 3
+
+# Maximum calls one multi-call decision may carry
+MAX_TOOL_CALLS_PER_DECISION = 4
 
 
 async def act_node(state: AlfredState) -> dict:
@@ -992,7 +1097,8 @@ async def act_node(state: AlfredState) -> dict:
     (e.g., create recipe, then create each recipe_ingredient).
 
     Now includes full conversation context (last 2 turns/steps in full detail).
-    Circuit breaker: Max 5 tool calls per step to prevent infinite loops.
+    Circuit breaker: Max 3 tool-call decisions per step (each running up to
+    4 calls) to prevent infinite loops.
 
     Args:
         state: Current graph state with think_output and current_step_index
@@ -1004,13 +1110,14 @@ async def act_node(state: AlfredState) -> dict:
     current_step_index = state.get("current_step_index", 0)
     step_results = state.get("step_results", {})
     current_step_tool_results = state.get("current_step_tool_results", [])
+    current_step_decisions = state.get("current_step_decisions", 0)
     user_id = state.get("user_id", "")
     schema_requests = state.get("schema_requests", 0)
     conversation = state.get("conversation", {})
     prev_step_note = state.get("prev_step_note")
     
-    # Circuit breaker - force step_complete if too many tool calls
-    if len(current_step_tool_results) >= MAX_TOOL_CALLS_PER_STEP:
+    # Circuit breaker - force step_complete after too many tool-call decisions
+    if current_step_decisions >= MAX_DECISIONS_PER_STEP:
         # Force step completion with whatever we have
         step_data = current_step_tool_results if current_step_tool_results else None
         new_step_results = step_results.copy()
@@ -1018,12 +1125,13 @@ async def act_node(state: AlfredState) -> dict:
         
         return {
             "pending_action": StepCompleteAction(
-                result_summary=f"Step completed (max {MAX_TOOL_CALLS_PER_STEP} tool calls reached)",
+                result_summary=f"Step completed (max {MAX_DECISIONS_PER_STEP} tool-call decisions reached)",
                 data=step_data,
             ),
             "current_step_index": current_step_index + 1,
             "step_results": new_step_results,
             "current_step_tool_results": [],
+            "current_step_decisions": 0,
             "schema_requests": 0,
         }
     
@@ -1048,6 +1156,7 @@ async def act_node(state: AlfredState) -> dict:
                             "current_step_index": current_step_index + 1,
                             "step_results": new_step_results,
                             "current_step_tool_results": [],
+                            "current_step_decisions": 0,
                             "schema_requests": 0,
                         }
                     empty_tables.add(table)
@@ -1078,35 +1187,44 @@ async def act_node(state: AlfredState) -> dict:
     tool_calls_made = len(current_step_tool_results)
 
     # Build context sections
+    # Sections are memoized per turn, keyed by their inputs (see prompts/render_cache.py);
+    # only this step's tool results are rebuilt on every iteration.
+    render_cache = state.get("act_render_cache") or SectionCache()
+
     # Previous step results (last FULL_DETAIL_STEPS in full, older summarized)
     # V4: Pass step_metadata and current step_type for artifact preservation
     step_metadata = state.get("step_metadata", {})
-    prev_step_section = _format_step_results(
-        step_results, 
-        current_step_index,
-        step_metadata=step_metadata,
-        current_step_type=step_type,
+    prev_step_section = render_cache.get(
+        "prev_steps",
+        (Identity(step_results), Identity(step_metadata), current_step_index, step_type),
+        lambda: _format_step_results(
+            step_results,
+            current_step_index,
+            step_metadata=step_metadata,
+            current_step_type=step_type,
+        ),
     )
     this_step_section = _format_current_step_results(current_step_tool_results, tool_calls_made)
     
     # Conversation context (full for Act - last 2 turns, entities, etc.)
-    conversation_section = format_full_context(
-        conversation, step_results, current_step_index, ACT_CONTEXT_THRESHOLD
+    conversation_section = render_cache.get(
+        "conversation",
+        (Identity(conversation), Identity(step_results), current_step_index),
+        lambda: format_full_context(
+            conversation, step_results, current_step_index, ACT_CONTEXT_THRESHOLD
+        ),
     )
     
     # V6: Previous turn steps (last 2 steps from prior turn for continuity)
-    prev_turn_section = _format_previous_turn_steps(conversation)
+    prev_turn_section = render_cache.get(
+        "prev_turn", Identity(conversation), lambda: _format_previous_turn_steps(conversation)
+    )
     
     # Content archive (generated content from previous turns)
     content_archive = state.get("content_archive", {})
-    archive_section = ""
-    if content_archive:
-        archive_lines = ["### Available Archives (from previous turns)"]
-        archive_lines.append("Use `{\"action\": \"retrieve_archive\", \"archive_key\": \"...\"}` to fetch full content.")
-        for key, val in content_archive.items():
-            desc = val.get("description", "No description")[:80]
-            archive_lines.append(f"- `{key}`: {desc}")
-        archive_section = "\n".join(archive_lines) + "\n"
+    archive_section = render_cache.get(
+        "archive", Identity(content_archive), lambda: _format_archive_section(content_archive)
+    )
 
     # V4 CONSOLIDATION: Load SessionIdRegistry - single source of truth
     registry_data = state.get("id_registry")
@@ -1118,49 +1236,44 @@ async def act_node(state: AlfredState) -> dict:
         session_registry = SessionIdRegistry.from_dict(registry_data)
     session_registry.set_turn(state.get("current_turn", 1))
     
-    # V4+V8: Inject generated content from SessionIdRegistry for steps that need it
-    # - write: Full JSON data for db_create calls
-    # - generate: Full JSON for modifying existing gen_* artifacts
-    # - analyze: Full JSON for reasoning about generated content
-    pending_artifacts_section = ""
-    if step_type in ("write", "generate", "analyze"):
-        pending = session_registry.get_all_pending_artifacts()
-        if pending:
-            import json
-            pa_lines = ["### Generated Data"]
-            pa_lines.append("Full artifact content. For write steps, use `recipe_id: \"gen_recipe_X\"` for linked records.")
-            pa_lines.append("")
-            for ref, content in pending.items():
-                label = content.get("name") or content.get("title") or ref
-                # Show status: whether main record exists
-                action = session_registry.ref_actions.get(ref, "generated")
-                status = "[main record saved]" if action == "created" else "[needs main record]"
-                pa_lines.append(f"#### {ref}: {label} {status}")
-                pa_lines.append("```json")
-                pa_lines.append(json.dumps(content, indent=2, default=str))
-                pa_lines.append("```")
-                pa_lines.append("")
-            pending_artifacts_section = "\n".join(pa_lines) + "\n"
-
     # V4 CONSOLIDATION: Use SessionIdRegistry for all entity display
     # Single source of truth - no separate WorkingSet or EntityContextModel
     
     # Mark referenced entities (from Understand) as touched this turn
     understand_output = state.get("understand_output")
+    referenced: tuple[str, ...] = ()
     if understand_output:
-        referenced = getattr(understand_output, "referenced_entities", []) or []
+        referenced = tuple(getattr(understand_output, "referenced_entities", []) or [])
         for ref in referenced:
             session_registry.touch_ref(ref)  # Updates last_ref timestamp
+
+    # Registry-derived sections depend on the registry as loaded from state
+    # plus the touches above (state's id_registry is replaced whenever it changes)
+    registry_key = (Identity(registry_data), session_registry.current_turn, referenced)
+    
+    # V4+V8: Inject generated content from SessionIdRegistry for steps that need it
+    # - write: Full JSON data for db_create calls
+    # - generate: Full JSON for modifying existing gen_* artifacts
+    # - analyze: Full JSON for reasoning about generated content
+    pending_artifacts_section = ""
+    if step_type in ("write", "generate", "analyze"):
+        pending_artifacts_section = render_cache.get(
+            "artifacts", registry_key, lambda: _format_pending_artifacts(session_registry)
+        )
     
     # V5: Build enhanced entity context with FULL DATA for active entities
     # Active = last 2 turns + current turn (matches token savings vs re-read cost)
     # Long-term = refs only (need re-read if data required)
     turn_step_results = conversation.get("turn_step_results", {})
-    working_set_section = build_act_entity_context(
-        session_registry=session_registry,
-        current_step_index=current_step_index,
-        current_step_results=step_results,
-        turn_step_results=turn_step_results,
+    working_set_section = render_cache.get(
+        "entities",
+        (registry_key, current_step_index, Identity(step_results), Identity(turn_step_results)),
+        lambda: build_act_entity_context(
+            session_registry=session_registry,
+            current_step_index=current_step_index,
+            current_step_results=step_results,
+            turn_step_results=turn_step_results,
+        ),
     )
 
     # Fetch user profile and subdomain guidance for analyze/generate/write steps
@@ -1170,10 +1283,12 @@ async def act_node(state: AlfredState) -> dict:
         try:
             user_id = state.get("user_id")
             if user_id:
-                domain = get_current_domain()
-                profile_section = await domain.get_user_profile(user_id)
+                # Fetched once per turn; the profile can't change mid-turn
+                profile_section, all_guidance = await render_cache.aget(
+                    "profile", user_id,
+                    lambda: prefetched(state, PROFILE, lambda: fetch_profile(user_id)),
+                )
                 # Subdomain guidance for all three step types
-                all_guidance = await domain.get_subdomain_guidance(user_id)
                 if all_guidance:
                     guidance = all_guidance.get(current_step.subdomain, "")
                     if guidance:
@@ -1193,7 +1308,13 @@ async def act_node(state: AlfredState) -> dict:
     # Get schema for read/write steps
     subdomain_schema = None
     if step_type in ("read", "write", "generate"):
-        subdomain_schema = await get_schema_with_fallback(current_step.subdomain)
+        subdomain_schema = await render_cache.aget(
+            "schema", current_step.subdomain,
+            lambda: prefetched(
+                state, schema_key(current_step.subdomain),
+                lambda: get_schema_with_fallback(current_step.subdomain),
+            ),
+        )
     
     # Get previous step's subdomain for cross-domain pattern detection
     prev_subdomain = None
@@ -1297,22 +1418,27 @@ async def act_node(state: AlfredState) -> dict:
         return {
             "pending_action": RetrieveStepAction(step_index=requested_idx),
             "current_step_tool_results": new_tool_results,
+            "current_step_decisions": current_step_decisions + 1,
         }
 
     # Handle tool_call - execute but DON'T advance step
     # LLM must explicitly call step_complete to advance
-    if decision.action == "tool_call" and decision.tool and decision.params:
+    calls = _decision_tool_calls(decision)
+    if decision.action == "tool_call" and calls:
         # Fix common LLM hallucinations and validate params
-        fixed_params, validation_error = _fix_and_validate_tool_params(decision.tool, decision.params)
-        if validation_error:
-            return {
-                "pending_action": BlockedAction(
-                    reason_code="TOOL_FAILURE",
-                    details=f"Invalid tool params (unfixable): {validation_error}",
-                    suggested_next="replan",
-                ),
-            }
-        
+        fixed_calls: list[tuple[str, dict[str, Any]]] = []
+        for tool, params in calls:
+            fixed_params, validation_error = _fix_and_validate_tool_params(tool, params)
+            if validation_error:
+                return {
+                    "pending_action": BlockedAction(
+                        reason_code="TOOL_FAILURE",
+                        details=f"Invalid tool params (unfixable): {validation_error}",
+                        suggested_next="replan",
+                    ),
+                }
+            fixed_calls.append((tool, fixed_params))
+
         # V4 CONSOLIDATION: Load SESSION ID registry - single source of truth
         # The registry sits between Act and CRUD - LLMs only see simple refs
         registry_data = state.get("id_registry")
@@ -1323,100 +1449,36 @@ async def act_node(state: AlfredState) -> dict:
         else:
             session_registry = SessionIdRegistry.from_dict(registry_data)
         session_registry.set_turn(state.get("current_turn", 1))
-        
+
         try:
             # V4: Execute CRUD with registry - handles ALL ID translation:
             # - Filters: recipe_1 → real UUID before query
             # - Payloads: FK refs → real UUIDs before insert/update
             # - Output: real UUIDs → refs (recipe_1, recipe_2) after query
-            result = await execute_crud(
-                tool=decision.tool,
-                params=fixed_params,
-                user_id=user_id,
-                registry=session_registry,  # V4: Session registry (persists across turns)
-            )
-
-            # Append to current step's tool results (accumulate within step)
-            # Store as (tool_name, table, result) tuple for entity card support
-            # NOTE: result now contains refs (recipe_1), not UUIDs
-            table_name = fixed_params.get("table", "unknown")
-            new_tool_results = current_step_tool_results + [(decision.tool, table_name, result)]
-
-            # V4 CONSOLIDATION: Clean up registry on delete
-            # This prevents ghost refs from persisting after entities are deleted
-            if decision.tool == "db_delete":
-                # Extract deleted refs from filters
-                filters = fixed_params.get("filters", [])
-                deleted_refs = []
-                for f in filters:
-                    if f.get("field") == "id":
-                        value = f.get("value")
-                        if isinstance(value, str):
-                            deleted_refs.append(value)
-                        elif isinstance(value, list):
-                            deleted_refs.extend(value)
-                
-                if deleted_refs:
-                    # Mark as deleted but KEEP UUID mapping for subsequent steps
-                    # (e.g., need to search meal_plans by deleted recipe_id)
-                    for ref in deleted_refs:
-                        session_registry.ref_actions[ref] = "deleted"
-                    logger.info(f"Act: Marked {len(deleted_refs)} entities as deleted: {deleted_refs}")
-            
-            # V4: Update batch manifest if present (track completed items)
-            updated_batch_manifest = None
-            batch_manifest_data = state.get("current_batch_manifest")
-            if batch_manifest_data and decision.tool == "db_create":
-                batch_manifest = BatchManifest(**batch_manifest_data)
-                
-                # Try to match created records to batch items
-                if isinstance(result, list):
-                    for record in result:
-                        if isinstance(record, dict) and record.get("id"):
-                            # Try to find matching batch item by name/label
-                            record_name = record.get("name") or record.get("title") or ""
-                            for item in batch_manifest.items:
-                                if item.status == "pending":
-                                    # Match by label similarity or just take first pending
-                                    if item.label.lower() in record_name.lower() or record_name.lower() in item.label.lower():
-                                        batch_manifest.mark_completed(item.ref, str(record["id"]))
-                                        break
-                            else:
-                                # No match found, mark first pending item
-                                pending_items = [i for i in batch_manifest.items if i.status == "pending"]
-                                if pending_items:
-                                    batch_manifest.mark_completed(pending_items[0].ref, str(record["id"]))
-                elif isinstance(result, dict) and result.get("id"):
-                    # Single record created
-                    pending_items = [i for i in batch_manifest.items if i.status == "pending"]
-                    if pending_items:
-                        batch_manifest.mark_completed(pending_items[0].ref, str(result["id"]))
-                
-                updated_batch_manifest = batch_manifest.model_dump()
-
-            # Return ToolCallAction - will loop back for more operations
-            action = ToolCallAction(
-                tool=decision.tool,
-                params=decision.params,
-            )
-
-            state_update = {
-                "pending_action": action,
-                "current_step_tool_results": new_tool_results,
-                "id_registry": session_registry.to_dict(),  # V4 CONSOLIDATION: Single source
-                # Note: NO step_index increment - step continues
-            }
-            
-            if updated_batch_manifest:
-                state_update["current_batch_manifest"] = updated_batch_manifest
-            
-            return state_update
-
+            if len(fixed_calls) == 1:
+                tool, fixed_params = fixed_calls[0]
+                results = [await execute_crud(
+                    tool=tool,
+                    params=fixed_params,
+                    user_id=user_id,
+                    registry=session_registry,  # V4: Session registry (persists across turns)
+                )]
+            else:
+                # Independent reads run concurrently; writes stay serialized
+                results = await execute_crud_batch(fixed_calls, user_id=user_id, registry=session_registry)
         except Exception as e:
+            if isinstance(e, CrudBatchError):
+                failed_tool, failed_params = fixed_calls[e.index]
+                completed = list(zip(fixed_calls[:len(e.completed)], e.completed, strict=True))
+                error = e.error
+            else:
+                (failed_tool, failed_params), completed, error = fixed_calls[0], [], e
+            logger.warning(f"Act: {failed_tool} failed after {len(completed)} completed call(s): {error}")
+
             # Tool call failed — build structured context about what was attempted
             attempted_items = []
-            table_name = fixed_params.get("table", "unknown")
-            batch_data = fixed_params.get("data", [])
+            table_name = failed_params.get("table", "unknown")
+            batch_data = failed_params.get("data", [])
             if isinstance(batch_data, list):
                 for item in batch_data:
                     attempted_items.append(
@@ -1427,18 +1489,67 @@ async def act_node(state: AlfredState) -> dict:
                     batch_data.get("name") or batch_data.get("title") or "unnamed"
                 )
 
-            return {
+            state_update = {
                 "pending_action": BlockedAction(
                     reason_code="TOOL_FAILURE",
-                    details=f"CRUD operation failed: {str(e)}",
+                    details=f"CRUD operation failed: {str(error)}",
                     suggested_next="ask_user",
                     attempted_context={
-                        "tool": decision.tool,
+                        "tool": failed_tool,
                         "table": table_name,
                         "items": attempted_items[:10],
                     },
                 ),
             }
+            if completed:
+                # Earlier calls in the batch already ran (writes are committed)
+                state_update["current_step_decisions"] = current_step_decisions + 1
+                state_update["current_step_tool_results"] = current_step_tool_results + [
+                    (tool, params.get("table", "unknown"), result)
+                    for (tool, params), result in completed
+                ]
+                state_update["id_registry"] = session_registry.to_dict()
+            return state_update
+
+        # Append to current step's tool results (accumulate within step), in call order
+        # Store as (tool_name, table, result) tuple for entity card support
+        # NOTE: result now contains refs (recipe_1), not UUIDs
+        new_tool_results = current_step_tool_results + [
+            (tool, params.get("table", "unknown"), result)
+            for (tool, params), result in zip(fixed_calls, results, strict=True)
+        ]
+
+        # V4: Update batch manifest if present (track completed items)
+        batch_manifest_data = state.get("current_batch_manifest")
+        batch_manifest = BatchManifest(**batch_manifest_data) if batch_manifest_data else None
+
+        for (tool, params), result in zip(fixed_calls, results, strict=True):
+            # V4 CONSOLIDATION: Clean up registry on delete
+            # This prevents ghost refs from persisting after entities are deleted
+            if tool == "db_delete":
+                _mark_deleted_refs(session_registry, params)
+            if batch_manifest and tool == "db_create":
+                _mark_batch_items_created(batch_manifest, result)
+
+        # Return ToolCallAction - will loop back for more operations
+        last_tool, last_params = calls[-1]
+        action = ToolCallAction(
+            tool=last_tool,
+            params=last_params,
+        )
+
+        state_update = {
+            "pending_action": action,
+            "current_step_tool_results": new_tool_results,
+            "current_step_decisions": current_step_decisions + 1,
+            "id_registry": session_registry.to_dict(),  # V4 CONSOLIDATION: Single source
+            # Note: NO step_index increment - step continues
+        }
+
+        if batch_manifest and any(tool == "db_create" for tool, _ in fixed_calls):
+            state_update["current_batch_manifest"] = batch_manifest.model_dump()
+
+        return state_update
 
     # Handle retrieve_archive - fetch generated content from previous turns
     if decision.action == "retrieve_archive" and decision.archive_key:
@@ -1452,6 +1563,7 @@ async def act_node(state: AlfredState) -> dict:
             return {
                 "pending_action": RetrieveStepAction(step_index=-1),  # Special marker
                 "current_step_tool_results": new_tool_results,
+                "current_step_decisions": current_step_decisions + 1,
             }
         else:
             # Archive key not found
@@ -1650,6 +1762,7 @@ async def act_node(state: AlfredState) -> dict:
             "step_results": new_step_results,
             "step_metadata": step_metadata,
             "current_step_tool_results": [],
+            "current_step_decisions": 0,
             "current_batch_manifest": None,
             "id_registry": session_registry.to_dict(),  # V4 CONSOLIDATION: Single source
             "schema_requests": 0,
@@ -1779,7 +1892,9 @@ async def act_quick_node(state: AlfredState) -> dict[str, Any]:
     logger.info(f"Act Quick: intent='{quick_intent}', subdomain='{quick_subdomain}'")
     
     # Get schema for the subdomain
-    subdomain_schema = await get_schema_with_fallback(quick_subdomain)
+    subdomain_schema = await prefetched(
+        state, schema_key(quick_subdomain), lambda: get_schema_with_fallback(quick_subdomain)
+    )
     
     # Build prompt using shared components
     user_id = state.get("user_id", "")
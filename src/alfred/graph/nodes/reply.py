@@ -7,7 +7,6 @@ based on execution results.
 Now includes conversation context for continuity awareness.
 """
 
-from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
@@ -25,14 +24,23 @@ from alfred.context.builders import build_reply_context
 from alfred.context.reasoning import get_reasoning_trace, format_reasoning
 from alfred.llm.client import call_llm, set_current_node
 from alfred.memory.conversation import format_condensed_context
+from alfred.prompts.registry import on_prompts_reloaded, render_template
 
 
-# Load prompts once at module level
-_REPLY_PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "templates" / "reply.md"
+# Built once from the prompt registry; dropped when templates hot-reload
 _REPLY_PROMPT: str | None = None
 _SYSTEM_PROMPT: str | None = None
 
 
+def _reset_prompt_cache() -> None:
+    global _REPLY_PROMPT, _SYSTEM_PROMPT
+    _REPLY_PROMPT = None
+    _SYSTEM_PROMPT = None
+
+
+on_prompts_reloaded(_reset_prompt_cache)
+
+
 def _get_prompts() -> tuple[str, str]:
     """Load the reply and system prompts, injecting domain-specific content."""
     global _REPLY_PROMPT, _SYSTEM_PROMPT
@@ -49,9 +57,9 @@ def _get_prompts() -> tuple[str, str]:
             _REPLY_PROMPT = domain_content
         else:
             # Fallback: core template + subdomain guide injection
-            raw = _REPLY_PROMPT_PATH.read_text(encoding="utf-8")
-            subdomain_guide = domain.get_reply_subdomain_guide()
-            _REPLY_PROMPT = raw.replace("{domain_subdomain_guide}", subdomain_guide)
+            _REPLY_PROMPT = render_template(
+                "reply", domain_subdomain_guide=domain.get_reply_subdomain_guide()
+            )
 
     return _SYSTEM_PROMPT, _REPLY_PROMPT
 
@@ -9,27 +9,33 @@ The Router classifies user intent and determines:
 Now includes conversation context for multi-turn awareness.
 """
 
-from pathlib import Path
-
 from alfred.graph.state import AlfredState, RouterOutput
 from alfred.llm.client import call_llm, set_current_node
 from alfred.memory.conversation import format_condensed_context
+from alfred.prompts.registry import on_prompts_reloaded, render_template
 
 
-# Load prompt once at module level
-_PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "templates" / "router.md"
+# Built once from the prompt registry; dropped when templates hot-reload
 _SYSTEM_PROMPT: str | None = None
 
 
+def _reset_prompt_cache() -> None:
+    global _SYSTEM_PROMPT
+    _SYSTEM_PROMPT = None
+
+
+on_prompts_reloaded(_reset_prompt_cache)
+
+
 def _get_system_prompt() -> str:
     """Load the router system prompt, injecting domain-specific content."""
     global _SYSTEM_PROMPT
     if _SYSTEM_PROMPT is None:
         from alfred.domain import get_current_domain
-        raw = _PROMPT_PATH.read_text(encoding="utf-8")
         domain = get_current_domain()
-        router_content = domain.get_router_prompt_injection()
-        _SYSTEM_PROMPT = raw.replace("{domain_router_content}", router_content)
+        _SYSTEM_PROMPT = render_template(
+            "router", domain_router_content=domain.get_router_prompt_injection()
+        )
     return _SYSTEM_PROMPT
 
 
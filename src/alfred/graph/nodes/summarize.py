@@ -9,6 +9,11 @@ V4 Responsibilities:
 3. Build SummarizeOutput (structured audit ledger, no LLM)
 4. Pass through entity_context for next turn's Understand to curate
 
+LLM work runs concurrently. With `defer_summary` set in state (web streaming),
+Summarize instead commits deterministic provisional summaries and returns a
+SummaryRefinement for the caller to finish in the background — see
+memory/summary_refinement.py.
+
 What Summarize does NOT do (V4):
 - Entity curation (Understand handles this)
 - Entity lifecycle management (Understand handles this)
@@ -18,6 +23,7 @@ The key insight: Entity relevance is intent-dependent, not time-dependent.
 Understand sees the user's intent and curates accordingly.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
@@ -42,6 +48,7 @@ from alfred.memory.conversation import (
     extract_entities_from_step_results,
     update_active_entities,
 )
+from alfred.memory.summary_refinement import SummaryRefinement, join_history
 
 logger = logging.getLogger(__name__)
 
@@ -163,7 +170,44 @@ async def summarize_node(state: AlfredState) -> dict:
     if think_output and hasattr(think_output, "decision"):
         is_proposal = think_output.decision in ("propose", "clarify")
     
-    assistant_summary = await _summarize_assistant_response(final_response, is_proposal)
+    # Turns beyond FULL_DETAIL_TURNS (counting the current one) get compressed.
+    # The current turn always stays in full detail, so both LLM calls below
+    # are independent of each other.
+    recent_turns = list(conversation.get("recent_turns", []))
+    conversation_summary = conversation.get("history_summary", "")
+    overflow = max(0, len(recent_turns) + 1 - FULL_DETAIL_TURNS)
+    turns_to_compress = recent_turns[:overflow]
+    recent_turns = recent_turns[overflow:]
+    
+    summary_refinement = None
+    if state.get("defer_summary"):
+        # Off the critical path: provisional text now, LLM merge later
+        assistant_summary = _provisional_assistant_summary(final_response, is_proposal)
+        provisional_part = _compress_turns_provisionally(turns_to_compress)
+        needs_llm = _needs_llm_summary(final_response, is_proposal)
+        if needs_llm or turns_to_compress:
+            summary_refinement = SummaryRefinement(
+                turn_timestamp="",  # Filled once the turn record exists
+                response=final_response,
+                is_proposal=is_proposal,
+                provisional_assistant_summary=assistant_summary if needs_llm else None,
+                base_history=conversation_summary,
+                turns_to_compress=turns_to_compress,
+                provisional_part=provisional_part,
+            )
+        if turns_to_compress:
+            conversation_summary = join_history(conversation_summary, provisional_part)
+    else:
+        assistant_summary, conversation_summary = await asyncio.gather(
+            _summarize_assistant_response(final_response, is_proposal),
+            # LLM-compress turns into narrative (no entity IDs, just conversation arc)
+            _compress_turns_to_narrative(
+                existing_summary=conversation_summary,
+                turns_to_compress=turns_to_compress,
+            ),
+        )
+    if turns_to_compress:
+        logger.info(f"Summarize: Compressed {len(turns_to_compress)} turns to narrative")
     
     current_turn = create_conversation_turn(
         user_message=user_message,
@@ -171,30 +215,15 @@ async def summarize_node(state: AlfredState) -> dict:
         assistant_summary=assistant_summary,
         routing=routing_info,
     )
+    if summary_refinement is not None:
+        summary_refinement.turn_timestamp = current_turn["timestamp"]
     
     # ==========================================================================
     # 2. Update conversation history
     # ==========================================================================
     
-    # Get recent turns
-    recent_turns = list(conversation.get("recent_turns", []))
     recent_turns.append(current_turn)
     
-    # Compress older turns if threshold exceeded (LLM call)
-    conversation_summary = conversation.get("history_summary", "")
-    
-    if len(recent_turns) > FULL_DETAIL_TURNS:
-        # Compress oldest turns into summary
-        turns_to_compress = recent_turns[:-FULL_DETAIL_TURNS]
-        recent_turns = recent_turns[-FULL_DETAIL_TURNS:]
-    
-        # LLM-compress turns into narrative (no entity IDs, just conversation arc)
-        conversation_summary = await _compress_turns_to_narrative(
-            existing_summary=conversation_summary,
-            turns_to_compress=turns_to_compress,
-        )
-        logger.info(f"Summarize: Compressed {len(turns_to_compress)} turns to narrative")
-    
     # V4 CONSOLIDATION: Persist id_registry across turns
     # This is what allows generated content to survive cross-turn references
     # CRITICAL: Serialize to dict for JSON storage in web sessions
@@ -209,13 +238,13 @@ async def summarize_node(state: AlfredState) -> dict:
         cleared = registry_obj.clear_turn_promoted_artifacts()
         if cleared > 0:
             logger.info(f"Summarize: Cleared {cleared} promoted artifacts (turn end)")
-        id_registry_data = registry_obj.to_dict()
+        id_registry_data = registry_obj.to_wire()
     else:
         # V4.1: Clear promoted artifacts at turn end
         cleared = id_registry.clear_turn_promoted_artifacts()
         if cleared > 0:
             logger.info(f"Summarize: Cleared {cleared} promoted artifacts (turn end)")
-        id_registry_data = id_registry.to_dict()
+        id_registry_data = id_registry.to_wire()
     
     updated_conversation = {
         "recent_turns": recent_turns,
@@ -225,7 +254,7 @@ async def summarize_node(state: AlfredState) -> dict:
         "all_entities": conversation.get("all_entities", {}),
         "content_archive": conversation.get("content_archive", {}),
         "step_summaries": conversation.get("step_summaries", []),
-        "id_registry": id_registry_data,  # V4: Serialized for JSON storage
+        "id_registry": id_registry_data,  # Compact wire format for JSON storage
     }
     
     # ==========================================================================
@@ -343,6 +372,7 @@ async def summarize_node(state: AlfredState) -> dict:
         "conversation": updated_conversation,
         "summarize_output": summarize_output.model_dump(),
         "current_turn": current_turn_num,
+        "summary_refinement": summary_refinement,  # Deferred mode only
     }
 
 
@@ -470,18 +500,8 @@ async def _summarize_assistant_response(response: str, is_proposal: bool = False
         response: The assistant's response text
         is_proposal: True if Think decided "propose" or "clarify" (not executed yet)
     """
-    # For proposals/clarifications: KEEP THE FULL TEXT (with reasonable truncation)
-    # Think NEEDS to see what was proposed to plan the next step correctly
-    if is_proposal:
-        # Proposals are usually short - just keep them (truncate at 500 chars if needed)
-        if len(response) < 500:
-            return response
-        else:
-            # Truncate but keep the essential proposal text
-            return response[:500] + "..."
-    
-    if len(response) < SUMMARIZE_THRESHOLD:
-        return response  # Short enough, keep as-is
+    if not _needs_llm_summary(response, is_proposal):
+        return _provisional_assistant_summary(response, is_proposal)
     
     # CRITICAL: Extract entity names from FULL response before truncation
     # This prevents losing entity names that appear late in long responses
@@ -520,8 +540,35 @@ Keep summaries specific with exact names or IDs when available.
         )
         return result.summary
     except Exception:
-        # Fallback: truncate with note
-        return response[:300] + "... [see step results for details]"
+        return _provisional_assistant_summary(response, is_proposal)
+
+
+def _needs_llm_summary(response: str, is_proposal: bool) -> bool:
+    """True if the response is long enough to be worth an LLM summary."""
+    return not is_proposal and len(response) >= SUMMARIZE_THRESHOLD
+
+
+def _provisional_assistant_summary(response: str, is_proposal: bool) -> str:
+    """
+    Deterministic assistant summary (no LLM).
+    
+    Final for short responses and proposals; for long responses it's the
+    stand-in used until an LLM summary lands (or if the LLM call fails).
+    """
+    # For proposals/clarifications: KEEP THE FULL TEXT (with reasonable truncation)
+    # Think NEEDS to see what was proposed to plan the next step correctly
+    if is_proposal:
+        # Proposals are usually short - just keep them (truncate at 500 chars if needed)
+        if len(response) < 500:
+            return response
+        # Truncate but keep the essential proposal text
+        return response[:500] + "..."
+    
+    if len(response) < SUMMARIZE_THRESHOLD:
+        return response  # Short enough, keep as-is
+    
+    # Truncate with note
+    return response[:300] + "... [see step results for details]"
 
 
 async def _compress_old_turns(
@@ -841,9 +888,8 @@ def _count_saved_in_result(result: Any) -> dict[str, int]:
 
 def _table_to_type(table: str) -> str:
     """Convert table name to entity type. Uses domain config."""
-    from alfred.domain import get_current_domain
-    domain = get_current_domain()
-    return domain.table_to_type.get(table, table)
+    from alfred.domain import get_compiled_domain
+    return get_compiled_domain().table_to_type.get(table, table)
 
 
 # =============================================================================
@@ -1113,6 +1159,20 @@ def _serialize_step_results(step_results: dict[int, Any]) -> dict[str, Any]:
     return serialized
 
 
+def _compress_turns_provisionally(turns: list[dict]) -> str:
+    """
+    Deterministic stand-in for _compress_turns_to_narrative (no LLM).
+    
+    Appended to history_summary until the LLM narrative merges in.
+    """
+    parts = []
+    for turn in turns:
+        user_msg = turn.get("user", "")[:120]
+        assistant_msg = (turn.get("assistant_summary") or turn.get("assistant", ""))[:200]
+        parts.append(f"User: {user_msg} → Alfred: {assistant_msg}")
+    return " | ".join(parts)
+
+
 def _compress_turn_summaries(
     existing_summary: str,
     summaries_to_compress: list[dict],
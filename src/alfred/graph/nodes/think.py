@@ -19,10 +19,9 @@ Output: ThinkOutput with steps (including group) or proposal/clarification.
 """
 
 from datetime import date
-from pathlib import Path
 
-from alfred.domain import get_current_domain
 from alfred.prompts.injection import format_all_subdomain_guidance
+from alfred.prompts.registry import on_prompts_reloaded, render_template
 from alfred.context.builders import build_think_context
 from alfred.context.reasoning import (
     get_reasoning_trace,
@@ -32,6 +31,7 @@ from alfred.context.reasoning import (
 )
 from alfred.core.id_registry import SessionIdRegistry
 from alfred.core.modes import Mode, ModeContext
+from alfred.graph.prefetch import PROFILE, SNAPSHOT, fetch_profile, fetch_snapshot, prefetched
 from alfred.graph.state import AlfredState, ThinkStep, ThinkOutput
 from alfred.llm.client import call_llm, set_current_node
 from alfred.memory.conversation import format_condensed_context
@@ -73,11 +73,18 @@ def adjust_step_complexity(step: ThinkStep) -> ThinkStep:
 # Now uses ThinkContext.format_entity_context() with recipe detail tracking.
 
 
-# Load prompt once at module level
-_PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "templates" / "think.md"
+# Built once from the prompt registry; dropped when templates hot-reload
 _SYSTEM_PROMPT: str | None = None
 
 
+def _reset_prompt_cache() -> None:
+    global _SYSTEM_PROMPT
+    _SYSTEM_PROMPT = None
+
+
+on_prompts_reloaded(_reset_prompt_cache)
+
+
 def _get_system_prompt() -> str:
     """Load the think system prompt, injecting domain-specific content."""
     global _SYSTEM_PROMPT
@@ -90,13 +97,10 @@ def _get_system_prompt() -> str:
             _SYSTEM_PROMPT = domain_content
         else:
             # Fallback: core template + injection variables
-            raw = _PROMPT_PATH.read_text(encoding="utf-8")
-            domain_context = domain.get_think_domain_context()
-            domain_guide = domain.get_think_planning_guide()
-            _SYSTEM_PROMPT = raw.replace(
-                "{domain_context}", domain_context
-            ).replace(
-                "{domain_planning_guide}", domain_guide
+            _SYSTEM_PROMPT = render_template(
+                "think",
+                domain_context=domain.get_think_domain_context(),
+                domain_planning_guide=domain.get_think_planning_guide(),
             )
     return _SYSTEM_PROMPT
 
@@ -180,12 +184,12 @@ async def think_node(state: AlfredState) -> dict:
     profile_section = ""
     dashboard_section = ""
     subdomain_guidance_section = ""
-    domain = get_current_domain()
     if user_id:
+        # Started at turn start (graph/prefetch.py); usually ready by now
         try:
-            profile_section = await domain.get_user_profile(user_id)
-            # Get subdomain guidance
-            guidance = await domain.get_subdomain_guidance(user_id)
+            profile_section, guidance = await prefetched(
+                state, PROFILE, lambda: fetch_profile(user_id)
+            )
             if guidance:
                 subdomain_guidance_section = format_all_subdomain_guidance(
                     {"subdomain_guidance": guidance}
@@ -194,7 +198,9 @@ async def think_node(state: AlfredState) -> dict:
             pass  # Profile is optional
 
         try:
-            dashboard_section = await domain.get_domain_snapshot(user_id)
+            dashboard_section = await prefetched(
+                state, SNAPSHOT, lambda: fetch_snapshot(user_id)
+            )
         except Exception:
             pass  # Dashboard is optional
     
@@ -241,6 +247,8 @@ If they modify → adjust the plan.
     # Build three XML sections that fill the placeholders
     
     # 1. Session Context (profile, dashboard, entities, reasoning trace)
+    # Ordered most static → most volatile (see prompts/assembly.py) so the
+    # system prompt + profile prefix stays byte-identical across turns.
     session_parts = []
     if profile_section:
         session_parts.append(profile_section)
@@ -10,7 +10,6 @@ Understand does NOT plan steps. That's Think's job.
 """
 
 import logging
-from pathlib import Path
 from typing import Any
 
 from alfred.core.modes import Mode, ModeContext
@@ -19,20 +18,17 @@ from alfred.domain import get_current_domain
 from alfred.graph.state import AlfredState, UnderstandOutput
 from alfred.context.builders import build_understand_context
 from alfred.llm.client import call_llm, set_current_node
+from alfred.prompts.registry import get_prompt_registry
 
 logger = logging.getLogger(__name__)
 
-# Load prompt template
-PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "templates" / "understand.md"
-
-
 def _load_prompt() -> str:
-    """Load the understand prompt template."""
-    if PROMPT_PATH.exists():
-        return PROMPT_PATH.read_text(encoding="utf-8")
-    else:
-        logger.warning(f"Understand prompt not found at {PROMPT_PATH}")
-        return "Analyze the user message and detect entity state changes."
+    """Get the precompiled understand prompt template."""
+    registry = get_prompt_registry()
+    if registry.has("understand"):
+        return registry.get("understand").text
+    logger.warning("Understand prompt template not found in prompt registry")
+    return "Analyze the user message and detect entity state changes."
 
 
 
@@ -0,0 +1,114 @@
+"""
+Alfred - Per-turn speculative context prefetch.
+
+Think needs the user profile, subdomain guidance and domain snapshot; Act
+needs the profile again and the schema of each step's subdomain. None of
+these depend on Understand's output, but they used to be fetched only
+after Understand's LLM call returned, so cache misses and cold DB reads
+added to the turn instead of overlapping with it.
+
+`TurnPrefetch.start()` launches them as background tasks at turn start
+(run_alfred / run_alfred_streaming). The handle lives in
+AlfredState["turn_prefetch"]; nodes read through `prefetched()`, which
+awaits the task if one was started and otherwise fetches inline (so nodes
+still work when invoked without it, e.g. in tests).
+
+The profile and snapshot fetches are coroutines but do blocking database
+I/O, so on the turn's loop they would only run before or after Understand,
+not alongside it. Each runs on its own loop in a worker thread instead.
+
+A failed prefetch re-raises in the node that awaits it, exactly as the
+inline call would. Tasks nobody awaited are cancelled when the turn ends
+(a fetch already running in its thread finishes there, unread).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE = "profile"
+SNAPSHOT = "snapshot"
+
+
+def schema_key(subdomain: str) -> tuple[str, str]:
+    return ("schema", subdomain)
+
+
+async def fetch_profile(user_id: str) -> tuple[str, dict[str, str]]:
+    """User profile section and per-subdomain guidance from the domain.
+
+    Fetched together so a profile cache miss is built once, not twice.
+    """
+    from alfred.domain import get_current_domain
+
+    domain = get_current_domain()
+    profile_section = await domain.get_user_profile(user_id)
+    all_guidance = await domain.get_subdomain_guidance(user_id)
+    return profile_section, all_guidance
+
+
+async def fetch_snapshot(user_id: str) -> str:
+    from alfred.domain import get_current_domain
+
+    return await get_current_domain().get_domain_snapshot(user_id)
+
+
+async def _in_thread(fetch: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """Run a blocking fetch coroutine to completion on a worker thread's own loop."""
+    return await asyncio.to_thread(lambda: asyncio.run(fetch(*args)))
+
+
+class TurnPrefetch:
+    """Background fetches for one turn, keyed by what they fetch."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    @classmethod
+    def start(cls, user_id: str | None) -> TurnPrefetch:
+        """Launch the profile, snapshot and schema fetches for this turn."""
+        from alfred.domain import get_current_domain
+        from alfred.tools.schema import get_schema_with_fallback
+
+        prefetch = cls()
+        if user_id:
+            prefetch.launch(PROFILE, _in_thread(fetch_profile, user_id))
+            prefetch.launch(SNAPSHOT, _in_thread(fetch_snapshot, user_id))
+        # Schemas are TTL-cached per process, so these are usually hits
+        for subdomain in get_current_domain().subdomains:
+            prefetch.launch(schema_key(subdomain), get_schema_with_fallback(subdomain))
+        return prefetch
+
+    def launch(self, key: Hashable, coro: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(coro)
+        # Mark failures as retrieved; they re-raise when (if) awaited
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks[key] = task
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Await the prefetched value for `key`, or fetch it inline."""
+        task = self._tasks.get(key)
+        if task is None or task.cancelled():
+            return await fetch()
+        return await asyncio.shield(task)
+
+    def cancel(self) -> None:
+        """Cancel fetches still pending at the end of the turn."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        self._tasks.clear()
+
+
+async def prefetched(state: Any, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+    """Read a prefetched value from the turn's handle, fetching inline without one."""
+    prefetch = state.get("turn_prefetch")
+    if prefetch is None:
+        return await fetch()
+    return await prefetch.get(key, fetch)
@@ -0,0 +1,187 @@
+"""
+Alfred - Optimistic Understand + Think.
+
+Think normally starts only after Understand's LLM call returns. For most
+turns (no pending clarification, no entity references, no curation)
+Understand changes nothing Think reads, so Think's plan would be the same
+if it had started at turn start.
+
+With ALFRED_SPECULATIVE_THINK=1 the understand node also launches Think on
+the pre-Understand state and runs both concurrently. When Understand
+returns, its output is checked for anything Think would have seen
+differently (see `conflict()`):
+
+- no conflict: the speculative task is handed to the think node, which
+  awaits it instead of making a second LLM call
+- conflict, or Understand routes away from Think (clarification, quick
+  mode): the task is cancelled and Think runs normally
+
+Speculation costs an extra Think call on every miss, so it is off by
+default. `get_speculation_stats()` reports the hit rate and the median
+latency saved per hit, to judge whether it pays off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from alfred.core.modes import ModeContext
+
+logger = logging.getLogger(__name__)
+
+Node = Callable[[Any], Awaitable[dict]]
+
+# Per-hit savings kept for the median
+MAX_SAMPLES = 1000
+
+
+@dataclass
+class Speculation:
+    """A Think call started alongside Understand."""
+
+    started: float
+    task: asyncio.Task | None = None
+    began: float = 0.0  # When Think first ran (0.0 if it never did)
+    understood: float = 0.0
+    finished: float = 0.0
+
+    def start(self, think: Node, state: Any) -> None:
+        self.task = asyncio.ensure_future(self._run(think, state))
+        self.task.add_done_callback(self._on_done)
+
+    async def _run(self, think: Node, state: Any) -> dict:
+        self.began = time.perf_counter()
+        return await think(state)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self.finished = time.perf_counter()
+        if not task.cancelled():
+            task.exception()  # Retrieved; re-raised where awaited
+
+    def overlap(self) -> float:
+        """Seconds Think ran while Understand was still running."""
+        if not self.began:
+            return 0.0
+        return max(0.0, min(self.finished, self.understood) - self.began)
+
+
+@dataclass
+class SpeculationStats:
+    hits: int = 0
+    misses: Counter = field(default_factory=Counter)  # reason -> count
+    saved_s: deque = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+
+    def summary(self) -> dict[str, Any]:
+        total = self.hits + sum(self.misses.values())
+        return {
+            "turns": total,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "misses": dict(self.misses),
+            "median_saved_ms": round(statistics.median(self.saved_s) * 1000, 1) if self.saved_s else 0.0,
+        }
+
+
+_stats = SpeculationStats()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    return _stats
+
+
+def speculation_enabled() -> bool:
+    from alfred.config import core_settings
+
+    return core_settings.alfred_speculative_think
+
+
+def can_speculate(state: Any) -> bool:
+    """Turns where Think's input is known before Understand runs."""
+    if (state.get("conversation") or {}).get("pending_clarification"):
+        return False  # Understand decides how the answer is read
+    mode_data = state.get("mode_context")
+    if mode_data and ModeContext.from_dict(mode_data).skip_think:
+        return False
+    return True
+
+
+def conflict(understand_output: Any) -> str | None:
+    """Why a Think planned before Understand can't be used, or None."""
+    if understand_output is None:
+        return None
+    if getattr(understand_output, "needs_clarification", False):
+        return "needs_clarification"
+    if getattr(understand_output, "needs_disambiguation", False):
+        return "needs_disambiguation"
+    if getattr(understand_output, "quick_mode", False):
+        return "quick_mode"
+    if getattr(understand_output, "referenced_entities", None):
+        return "referenced_entities"
+    if getattr(understand_output, "entity_updates", None):
+        return "entity_updates"
+    curation = getattr(understand_output, "entity_curation", None)
+    if curation is not None and (
+        curation.clear_all or curation.retain_active or curation.demote or curation.drop
+    ):
+        return "entity_curation"
+    return None
+
+
+def speculative_understand(understand: Node, think: Node) -> Node:
+    """Understand node that runs Think concurrently when speculation is on."""
+
+    async def node(state: Any) -> dict:
+        if not (speculation_enabled() and can_speculate(state)):
+            return await understand(state)
+
+        spec = Speculation(started=time.perf_counter())
+        spec.start(think, dict(state))
+        try:
+            update = await understand(state)
+        except BaseException:
+            spec.task.cancel()
+            raise
+        spec.understood = time.perf_counter()
+
+        reason = conflict(update.get("understand_output"))
+        if reason is not None:
+            spec.task.cancel()
+            _stats.misses[reason] += 1
+            logger.info(f"Speculation: discarded Think ({reason})")
+            return update
+        return {**update, "speculation": spec}
+
+    return node
+
+
+def speculative_think(think: Node) -> Node:
+    """Think node that reuses a speculative result when Understand agreed."""
+
+    async def node(state: Any) -> dict:
+        spec: Speculation | None = state.get("speculation")
+        if spec is None:
+            return await think(state)
+
+        try:
+            update = await spec.task
+        except Exception as e:
+            _stats.misses["error"] += 1
+            logger.warning(f"Speculation: speculative Think failed ({e}), rerunning")
+            return {**await think(state), "speculation": None}
+
+        # Sequentially, Think would have started when Understand returned and
+        # taken as long: the time both actually ran is what the turn saved.
+        # Measured from when Think got the loop, not when it was scheduled
+        saved = spec.overlap()
+        _stats.hits += 1
+        _stats.saved_s.append(saved)
+        logger.info(f"Speculation: reused Think, saved {saved * 1000:.0f}ms ({_stats.summary()['hit_rate']:.0%} hit rate)")
+        return {**update, "speculation": None}
+
+    return node
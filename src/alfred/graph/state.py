@@ -671,6 +671,10 @@ class AlfredState(TypedDict, total=False):
     # Keys: step index, Values: {step_type, subdomain, artifacts, data}
     step_metadata: dict[int, dict]
     current_step_tool_results: list[Any]  # Tool results within current step (multi-tool pattern)
+    current_step_decisions: int  # Tool-call decisions made in current step (circuit breaker)
+    act_render_cache: Any  # SectionCache - per-turn memo of Act prompt sections
+    turn_prefetch: Any  # TurnPrefetch - profile/snapshot/schema fetched at turn start
+    speculation: Any  # Speculation - Think started alongside Understand (or None)
     
     # V4: Batch tracking for multi-item operations
     # Set by Think when planning batch operations, tracked by Act
@@ -684,6 +688,10 @@ class AlfredState(TypedDict, total=False):
     
     # V4: Summarize output - structured audit ledger
     summarize_output: dict | None  # SummarizeOutput.model_dump()
+    # Deferred summarization: when set, Summarize commits provisional summaries
+    # and returns LLM work as summary_refinement (memory/summary_refinement.py)
+    defer_summary: bool
+    summary_refinement: Any | None  # SummaryRefinement
     current_subdomain: str | None  # Active subdomain for schema
     schema_requests: int  # Count of schema requests (for safeguard)
     pending_action: ActAction | None
@@ -23,11 +23,12 @@ Summarize maintains conversation memory and entity lifecycle after each exchange
 
 import logging
 import re
-from typing import Any
+from typing import Any, Mapping
 
 from langgraph.graph import END, StateGraph
 
 from alfred.core.id_registry import SessionIdRegistry
+from alfred.core.registry_codec import is_wire_payload, wire_ref_count
 
 logger = logging.getLogger(__name__)
 
@@ -35,12 +36,12 @@ logger = logging.getLogger(__name__)
 # Domain Configuration (Phase 2: Use DomainConfig instead of hardcoded mappings)
 # =============================================================================
 
-from alfred.domain import get_current_domain
+from alfred.domain import get_compiled_domain, get_current_domain
 
 
-def _get_type_to_table() -> dict[str, str]:
+def _get_type_to_table() -> Mapping[str, str]:
     """Get entity type → table mapping from domain config."""
-    return get_current_domain().type_to_table
+    return get_compiled_domain().type_to_table
 
 
 from alfred.core.modes import Mode, ModeContext
@@ -55,6 +56,10 @@ from alfred.graph.nodes import (
 )
 from alfred.graph.nodes.understand import understand_node
 from alfred.graph.state import AlfredState, RouterOutput, ThinkOutput
+from alfred.observability.node_profiler import profiled
+from alfred.graph.prefetch import TurnPrefetch
+from alfred.graph.speculation import speculative_think, speculative_understand
+from alfred.prompts.render_cache import SectionCache
 from alfred.observability.session_logger import get_session_logger
 
 
@@ -214,7 +219,8 @@ def _load_id_registry(
     Handles three cases:
     - None: No registry yet
     - SessionIdRegistry: Already an object (in-memory session)
-    - dict: Needs deserialization (web sessions store as JSON)
+    - dict: Needs deserialization (web sessions store as JSON, either the
+      compact wire format or a legacy to_dict() payload)
 
     Args:
         id_registry_data: Raw registry data from conversation context
@@ -230,6 +236,17 @@ def _load_id_registry(
     return SessionIdRegistry.from_dict(id_registry_data)
 
 
+def registry_entity_count(id_registry_data: SessionIdRegistry | dict | None) -> int:
+    """Count refs in a stored registry without fully decoding it."""
+    if not id_registry_data:
+        return 0
+    if isinstance(id_registry_data, SessionIdRegistry):
+        return len(id_registry_data.ref_to_uuid)
+    if is_wire_payload(id_registry_data):
+        return wire_ref_count(id_registry_data)
+    return len(id_registry_data.get("ref_to_uuid", {}))
+
+
 def _process_ui_changes(
     ui_changes: list[dict],
     id_registry: SessionIdRegistry,
@@ -452,12 +469,14 @@ def create_alfred_graph() -> StateGraph:
     
     # NOTE: Router node kept for future multi-agent support, but not in current flow
     # graph.add_node("router", router_node)
-    graph.add_node("understand", understand_node)
-    graph.add_node("think", think_node)
-    graph.add_node("act", act_node)
-    graph.add_node("act_quick", act_quick_node)  # Phase 3: Quick mode execution
-    graph.add_node("reply", reply_node)
-    graph.add_node("summarize", summarize_node)
+    # profiled(): pass-through unless node profiling is enabled (scenario_runner --replay)
+    # speculative_*: Think may start alongside Understand (ALFRED_SPECULATIVE_THINK)
+    graph.add_node("understand", profiled("understand", speculative_understand(understand_node, think_node)))
+    graph.add_node("think", profiled("think", speculative_think(think_node)))
+    graph.add_node("act", profiled("act", act_node))
+    graph.add_node("act_quick", profiled("act_quick", act_quick_node))  # Phase 3: Quick mode execution
+    graph.add_node("reply", profiled("reply", reply_node))
+    graph.add_node("summarize", profiled("summarize", summarize_node))
     
     # ==========================================================================
     # Add Edges
@@ -583,11 +602,9 @@ async def run_alfred(
     entity_registry = conv_context.get("entity_registry", {})
 
     # V4: Load id_registry using helper
-    id_registry_data = conv_context.get("id_registry", None)
-    if id_registry_data:
-        entity_count = len(id_registry_data.get("ref_to_uuid", {})) if isinstance(id_registry_data, dict) else "?"
-        logger.info(f"Workflow: Loaded registry with {entity_count} entities from prior turn")
-    id_registry = _load_id_registry(id_registry_data)
+    id_registry = _load_id_registry(conv_context.get("id_registry", None))
+    if id_registry:
+        logger.info(f"Workflow: Loaded registry with {len(id_registry.ref_to_uuid)} entities from prior turn")
 
     # V3: Get current turn number
     current_turn = conv_context.get("current_turn", 0) + 1
@@ -598,6 +615,9 @@ async def run_alfred(
             id_registry = SessionIdRegistry()
         _process_ui_changes(ui_changes, id_registry, conv_context, current_turn)
 
+    # Start Think/Act context fetches now so they overlap with Understand
+    turn_prefetch = TurnPrefetch.start(user_id)
+
     # Phase 3b: Extract @-mentions and inject entity data
     if not id_registry:
         id_registry = SessionIdRegistry()
@@ -626,6 +646,10 @@ async def run_alfred(
         "step_results": {},
         "group_results": {},  # V3
         "current_step_tool_results": [],
+        "current_step_decisions": 0,
+        "act_render_cache": SectionCache(),  # Per-turn Act prompt section memo
+        "turn_prefetch": turn_prefetch,
+        "speculation": None,
         "current_subdomain": None,
         "schema_requests": 0,
         "pending_action": None,
@@ -637,7 +661,10 @@ async def run_alfred(
     }
 
     # Run the graph
-    final_state = await app.ainvoke(initial_state)
+    try:
+        final_state = await app.ainvoke(initial_state)
+    finally:
+        turn_prefetch.cancel()
     
     # Extract response and updated conversation
     response = final_state.get("final_response", "I'm sorry, I couldn't process that request.")
@@ -646,8 +673,7 @@ async def run_alfred(
     # Debug: Check if registry was properly persisted
     registry_data = updated_conversation.get("id_registry")
     if registry_data:
-        entity_count = len(registry_data.get("ref_to_uuid", {}))
-        logger.info(f"Workflow: Returning conversation with {entity_count} entities in registry")
+        logger.info(f"Workflow: Returning conversation with {registry_entity_count(registry_data)} entities in registry")
     else:
         logger.warning("Workflow: Returning conversation with NO registry - entities will be lost!")
     
@@ -676,6 +702,7 @@ async def run_alfred_streaming(
     conversation: dict | None = None,
     mode: str = "plan",  # V3: Accept mode from UI/CLI
     ui_changes: list[dict] | None = None,  # Phase 3: UI CRUD tracking
+    defer_summary: bool = False,
 ):
     """
     Run Alfred with streaming updates.
@@ -693,6 +720,9 @@ async def run_alfred_streaming(
         conversation: Optional existing conversation context
         mode: The interaction mode ("quick" | "plan")
         ui_changes: Optional list of UI changes (create/update/delete) from frontend
+        defer_summary: Commit provisional summaries and return the LLM summary
+            work as `summary_refinement` on context_updated, for the caller to
+            finish in the background (see memory/summary_refinement.py)
 
     Yields:
         Dict with status updates
@@ -722,6 +752,9 @@ async def run_alfred_streaming(
             id_registry = SessionIdRegistry()
         _process_ui_changes(ui_changes, id_registry, conv_context, current_turn)
 
+    # Start Think/Act context fetches now so they overlap with Understand
+    turn_prefetch = TurnPrefetch.start(user_id)
+
     # Phase 3b: Extract @-mentions and inject entity data
     if not id_registry:
         id_registry = SessionIdRegistry()
@@ -750,6 +783,10 @@ async def run_alfred_streaming(
         "step_results": {},
         "group_results": {},  # V3
         "current_step_tool_results": [],
+        "current_step_decisions": 0,
+        "act_render_cache": SectionCache(),  # Per-turn Act prompt section memo
+        "turn_prefetch": turn_prefetch,
+        "speculation": None,
         "current_subdomain": None,
         "schema_requests": 0,
         "pending_action": None,
@@ -758,6 +795,7 @@ async def run_alfred_streaming(
         "conversation": conv_context,
         "final_response": None,
         "error": None,
+        "defer_summary": defer_summary,
     }
 
     yield {"type": "thinking", "message": "Planning..."}
@@ -777,12 +815,8 @@ async def run_alfred_streaming(
     # Helper to ensure registry is a SessionIdRegistry object
     def ensure_registry(reg: SessionIdRegistry | dict | None) -> SessionIdRegistry | None:
         """Convert dict to SessionIdRegistry if needed."""
-        if reg is None:
-            return None
-        if isinstance(reg, SessionIdRegistry):
-            return reg
-        if isinstance(reg, dict):
-            return SessionIdRegistry.from_dict(reg)
+        if isinstance(reg, (SessionIdRegistry, dict)):
+            return _load_id_registry(reg)
         return None
 
     # Helper to emit active_context event
@@ -939,6 +973,9 @@ async def run_alfred_streaming(
                     yield context_event
 
             elif node_name == "reply" and node_output:
+                # Think/Act are done; drop prefetches nobody needed
+                turn_prefetch.cancel()
+
                 # Update registry reference from state (may be dict or object)
                 updated_registry = ensure_registry(node_output.get("id_registry"))
                 if updated_registry:
@@ -987,7 +1024,10 @@ async def run_alfred_streaming(
                 yield {
                     "type": "context_updated",
                     "conversation": final_conversation,
+                    "summary_refinement": node_output.get("summary_refinement"),
                 }
     
+    turn_prefetch.cancel()
+
     # Note: We already yielded "done" after reply, so we don't yield it again here
     # This comment block replaces the old synchronous yield at the end
@@ -2,9 +2,13 @@
 Alfred V2 - LLM Client.
 
 Provides structured LLM calls via Instructor.
+
+The client (Instructor + OpenAI) is imported on first use, so modules that
+only need the prompt logger or model router don't pay for it.
 """
 
-from alfred.llm.client import call_llm, get_client
+from typing import Any
+
 from alfred.llm.model_router import get_model
 
 __all__ = [
@@ -12,3 +16,11 @@ __all__ = [
     "call_llm",
     "get_model",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("call_llm", "get_client"):
+        from alfred.llm import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
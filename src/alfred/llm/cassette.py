@@ -0,0 +1,233 @@
+"""
+Alfred - LLM record/replay cassettes.
+
+Lets the orchestration engine (context building, registry, CRUD
+translation, formatting) run without model latency or API cost:
+
+    record  — calls go to OpenAI as usual; each request/response/usage is
+              appended to a JSONL cassette
+    replay  — calls are served from the cassette, optionally sleeping for
+              the recorded latency (scaled) to simulate the model
+
+Requests are keyed by a hash of everything that determines the response
+(call kind, model, messages, response model, sampling params). Prompts that
+embed volatile values (dates, fresh UUIDs) won't hash identically on replay,
+so a miss falls back to the next unused recording for the same node, call
+kind and response model, in recorded order. Identical requests made more
+than once are served in recorded order too.
+
+Usage:
+    with use_cassette("tests/cassettes/gen_artifact_flow.jsonl", mode="replay"):
+        await run_alfred(...)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Iterator, Literal
+
+logger = logging.getLogger(__name__)
+
+CassetteMode = Literal["record", "replay"]
+
+CallKind = Literal["structured", "chat", "chat_stream"]
+
+# Request fields that don't affect the response
+_UNKEYED = frozenset({"max_retries", "store", "stream", "stream_options"})
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recording for a request."""
+
+
+@dataclass(frozen=True)
+class Recording:
+    """One recorded LLM call."""
+
+    key: str
+    kind: str
+    node: str
+    model: str
+    response_model: str
+    response: Any  # model_dump() for structured, text for chat, chunk list for streams
+    usage: dict[str, int] | None = None
+    latency_s: float = 0.0
+
+    def usage_object(self) -> Any:
+        """Usage in the shape the client's tracking code reads from OpenAI responses."""
+        if not self.usage:
+            return None
+        return SimpleNamespace(
+            prompt_tokens=self.usage.get("prompt_tokens", 0),
+            completion_tokens=self.usage.get("completion_tokens", 0),
+            prompt_tokens_details=SimpleNamespace(cached_tokens=self.usage.get("cached_tokens", 0)),
+        )
+
+
+def request_key(kind: str, api_kwargs: dict[str, Any]) -> str:
+    """Stable hash of a request's response-determining fields."""
+    keyed = {k: v for k, v in api_kwargs.items() if k not in _UNKEYED}
+    response_model = keyed.get("response_model")
+    if isinstance(response_model, type):
+        keyed["response_model"] = response_model.__name__
+    payload = json.dumps({"kind": kind, **keyed}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _usage_dict(usage: Any) -> dict[str, int] | None:
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+@dataclass
+class CassetteStats:
+    recorded: int = 0
+    exact_hits: int = 0
+    fallback_hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class LLMCassette:
+    """A JSONL file of recorded LLM calls, in record or replay mode."""
+
+    path: Path
+    mode: CassetteMode
+    latency_scale: float = 0.0  # Replay: sleep recorded latency × scale (0 = none)
+    stats: CassetteStats = field(default_factory=CassetteStats)
+
+    def __post_init__(self) -> None:
+        self.path = Path(self.path)
+        self._recordings: list[Recording] = []
+        self._used: set[int] = set()
+        self._by_key: dict[str, list[int]] = defaultdict(list)
+        self._by_slot: dict[tuple[str, str, str], list[int]] = defaultdict(list)
+
+        if self.mode == "replay":
+            if not self.path.exists():
+                raise FileNotFoundError(f"Cassette not found: {self.path}")
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(Recording(**json.loads(line)))
+        elif self.mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")  # Fresh recording
+        else:
+            raise ValueError(f"Unknown cassette mode: {self.mode}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def _index(self, recording: Recording) -> None:
+        i = len(self._recordings)
+        self._recordings.append(recording)
+        self._by_key[recording.key].append(i)
+        self._by_slot[(recording.kind, recording.node, recording.response_model)].append(i)
+
+    # -------------------------------------------------------------------------
+    # Record
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        kind: CallKind,
+        node: str,
+        api_kwargs: dict[str, Any],
+        response: Any,
+        usage: Any,
+        latency_s: float,
+    ) -> None:
+        response_model = api_kwargs.get("response_model")
+        recording = Recording(
+            key=request_key(kind, api_kwargs),
+            kind=kind,
+            node=node,
+            model=api_kwargs.get("model", ""),
+            response_model=response_model.__name__ if isinstance(response_model, type) else kind,
+            response=response,
+            usage=_usage_dict(usage),
+            latency_s=round(latency_s, 4),
+        )
+        self._index(recording)
+        self.stats.recorded += 1
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(recording), default=str) + "\n")
+
+    # -------------------------------------------------------------------------
+    # Replay
+    # -------------------------------------------------------------------------
+
+    def lookup(self, kind: CallKind, node: str, api_kwargs: dict[str, Any]) -> Recording:
+        """Next unused recording for this request (exact, then by node/kind/model)."""
+        for i in self._by_key.get(request_key(kind, api_kwargs), ()):
+            if i not in self._used:
+                self._used.add(i)
+                self.stats.exact_hits += 1
+                return self._recordings[i]
+
+        response_model = api_kwargs.get("response_model")
+        slot = (kind, node, response_model.__name__ if isinstance(response_model, type) else kind)
+        for i in self._by_slot.get(slot, ()):
+            if i not in self._used:
+                self._used.add(i)
+                self.stats.fallback_hits += 1
+                logger.debug(f"Cassette fallback match for {node}/{slot[2]}")
+                return self._recordings[i]
+
+        self.stats.misses += 1
+        raise CassetteMiss(f"No recording for {kind} call from '{node}' ({slot[2]}) in {self.path}")
+
+    async def play(self, kind: CallKind, node: str, api_kwargs: dict[str, Any]) -> Recording:
+        """lookup() plus simulated model latency."""
+        recording = self.lookup(kind, node, api_kwargs)
+        if self.latency_scale > 0 and recording.latency_s > 0:
+            await asyncio.sleep(recording.latency_s * self.latency_scale)
+        return recording
+
+
+_cassette: LLMCassette | None = None
+
+
+def get_cassette() -> LLMCassette | None:
+    """The active cassette, if any (checked by every LLM call)."""
+    return _cassette
+
+
+def set_cassette(cassette: LLMCassette | None) -> None:
+    global _cassette
+    _cassette = cassette
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path,
+    mode: CassetteMode = "replay",
+    latency_scale: float = 0.0,
+) -> Iterator[LLMCassette]:
+    """Activate a cassette for the duration of the block."""
+    previous = _cassette
+    cassette = LLMCassette(Path(path), mode, latency_scale)
+    set_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        set_cassette(previous)
@@ -3,16 +3,25 @@ Alfred V2 - LLM Client.
 
 Wraps OpenAI with Instructor for guaranteed structured outputs.
 All LLM calls go through here for consistency and observability.
+The Instructor client is synchronous, so call_llm runs it in a worker
+thread: concurrent calls (asyncio.gather, background tasks) overlap and
+the event loop keeps serving other requests meanwhile.
 
 Also provides raw chat functions (call_llm_chat, call_llm_chat_stream)
 for bypass modes that skip the graph and don't need structured output.
 
+Record/replay: when a cassette is active (llm/cassette.py), calls are
+recorded to or served from disk instead of going to the live API.
+
 Model support:
 - GPT-4.1-mini: Fast, non-reasoning (current default)
 - GPT-5 series: Reasoning models with reasoning_effort/verbosity (future)
 """
 
+import asyncio
+import time
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
 from typing import TypeVar
 
 import instructor
@@ -20,6 +29,7 @@ from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel
 
 from alfred.config import core_settings as settings
+from alfred.llm.cassette import get_cassette
 from alfred.llm.model_router import get_node_config
 from alfred.llm.prompt_logger import log_prompt
 from alfred.observability.langsmith import get_session_tracker
@@ -32,18 +42,37 @@ def _sanitize_text(text: str) -> str:
     """Remove surrogate characters that break UTF-8 encoding."""
     return text.encode("utf-8", errors="replace").decode("utf-8")
 
+
+def _cached_tokens(usage) -> int:
+    """Prompt tokens served from OpenAI's prompt cache (0 if not reported)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def _track_usage(usage, model: str, node: str) -> None:
+    """Record token usage (including cache hits) on the session tracker."""
+    if not usage:
+        return
+    get_session_tracker().add(
+        model=model,
+        input_tokens=usage.prompt_tokens,
+        output_tokens=usage.completion_tokens,
+        node=node,
+        cached_tokens=_cached_tokens(usage),
+    )
+
 # Singleton client instances
 _client: instructor.Instructor | None = None
 _raw_async_client: AsyncOpenAI | None = None
 
-# Track current node for logging and config
-_current_node: str = "unknown"
+# Track current node for logging and config. A ContextVar so background
+# tasks (deferred summary refinement) can't relabel a concurrent turn's calls.
+_current_node: ContextVar[str] = ContextVar("alfred_current_node", default="unknown")
 
 
 def set_current_node(node: str) -> None:
     """Set the current node name for prompt logging and config."""
-    global _current_node
-    _current_node = node
+    _current_node.set(node)
 
 
 def get_client() -> instructor.Instructor:
@@ -108,10 +137,10 @@ async def call_llm(
         )
         print(result.agent)  # "main"
     """
-    client = get_client()
+    node = _current_node.get()
 
     # Get node-specific config
-    config = get_node_config(_current_node, complexity)
+    config = get_node_config(node, complexity)
 
     # Apply verbosity override if provided
     if verbosity_override:
@@ -151,24 +180,32 @@ async def call_llm(
         api_kwargs["temperature"] = temperature
     # GPT-5 models use reasoning_effort without temperature
 
+    cassette = get_cassette()
+
     try:
-        # Make the call with Instructor (get raw completion for token tracking)
-        response, completion = client.chat.completions.create_with_completion(**api_kwargs)
-
-        # Track token usage and costs
-        usage = getattr(completion, "usage", None)
-        if usage:
-            tracker = get_session_tracker()
-            tracker.add(
-                model=model,
-                input_tokens=usage.prompt_tokens,
-                output_tokens=usage.completion_tokens,
-                node=_current_node,
+        if cassette is not None and cassette.replaying:
+            recording = await cassette.play("structured", node, api_kwargs)
+            response = response_model.model_validate(recording.response)
+            usage = recording.usage_object()
+        else:
+            # Make the call with Instructor (get raw completion for token tracking)
+            started = time.perf_counter()
+            response, completion = await asyncio.to_thread(
+                get_client().chat.completions.create_with_completion, **api_kwargs,
             )
+            usage = getattr(completion, "usage", None)
+            if cassette is not None:
+                cassette.record(
+                    "structured", node, api_kwargs, response.model_dump(mode="json"),
+                    usage, time.perf_counter() - started,
+                )
+
+        # Track token usage, prompt-cache hits, and costs
+        _track_usage(usage, model, node)
 
         # Log the prompt + response
         log_prompt(
-            node=_current_node,
+            node=node,
             model=model,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
@@ -177,6 +214,7 @@ async def call_llm(
             config=config,  # Include reasoning/verbosity for debugging
             prompt_tokens=usage.prompt_tokens if usage else None,
             completion_tokens=usage.completion_tokens if usage else None,
+            cached_tokens=_cached_tokens(usage) if usage else None,
         )
 
         return response
@@ -184,7 +222,7 @@ async def call_llm(
     except Exception as e:
         # Log the error case
         log_prompt(
-            node=_current_node,
+            node=node,
             model=model,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
@@ -223,6 +261,10 @@ def _build_chat_kwargs(
     elif not model.startswith("gpt-5"):
         api_kwargs["temperature"] = config.get("temperature", 0.5)
 
+    if stream:
+        # Final chunk carries usage (with cached_tokens) and no choices
+        api_kwargs["stream_options"] = {"include_usage": True}
+
     return api_kwargs
 
 
@@ -246,7 +288,6 @@ async def call_llm_chat(
     Returns:
         Raw text response.
     """
-    client = get_raw_async_client()
     config = get_node_config(node_name, complexity)
     model = config.pop("model", "gpt-4.1-mini")
 
@@ -254,9 +295,22 @@ async def call_llm_chat(
     system_prompt = next((m["content"] for m in messages if m["role"] == "system"), "")
     user_prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
 
+    cassette = get_cassette()
+
     try:
-        response = await client.chat.completions.create(**api_kwargs)
-        text = response.choices[0].message.content or ""
+        if cassette is not None and cassette.replaying:
+            recording = await cassette.play("chat", node_name, api_kwargs)
+            text = recording.response
+            usage = recording.usage_object()
+        else:
+            started = time.perf_counter()
+            response = await get_raw_async_client().chat.completions.create(**api_kwargs)
+            text = response.choices[0].message.content or ""
+            usage = getattr(response, "usage", None)
+            if cassette is not None:
+                cassette.record("chat", node_name, api_kwargs, text, usage, time.perf_counter() - started)
+
+        _track_usage(usage, model, node_name)
 
         # Log for observability
         log_prompt(
@@ -267,6 +321,9 @@ async def call_llm_chat(
             response_model="chat",
             response=text,
             config=config,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+            cached_tokens=_cached_tokens(usage) if usage else None,
         )
 
         return text
@@ -303,7 +360,6 @@ async def call_llm_chat_stream(
     Yields:
         Token strings as they arrive from the model.
     """
-    client = get_raw_async_client()
     config = get_node_config(node_name, complexity)
     model = config.pop("model", "gpt-4.1-mini")
 
@@ -312,13 +368,33 @@ async def call_llm_chat_stream(
     user_prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
 
     full_response = ""
+    usage = None
+    cassette = get_cassette()
     try:
-        stream = await client.chat.completions.create(**api_kwargs)
-        async for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                token = chunk.choices[0].delta.content
+        if cassette is not None and cassette.replaying:
+            recording = await cassette.play("chat_stream", node_name, api_kwargs)
+            usage = recording.usage_object()
+            for token in recording.response:
                 full_response += token
                 yield token
+        else:
+            started = time.perf_counter()
+            tokens: list[str] = []
+            stream = await get_raw_async_client().chat.completions.create(**api_kwargs)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    token = chunk.choices[0].delta.content
+                    full_response += token
+                    tokens.append(token)
+                    yield token
+            if cassette is not None:
+                cassette.record(
+                    "chat_stream", node_name, api_kwargs, tokens, usage, time.perf_counter() - started,
+                )
+
+        _track_usage(usage, model, node_name)
 
         # Log after stream completes
         log_prompt(
@@ -329,6 +405,9 @@ async def call_llm_chat_stream(
             response_model="chat_stream",
             response=full_response,
             config=config,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+            cached_tokens=_cached_tokens(usage) if usage else None,
         )
 
     except Exception as e:
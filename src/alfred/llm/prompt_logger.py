@@ -113,6 +113,7 @@ def _log_to_file(
     config: dict | None = None,
     prompt_tokens: int | None = None,
     completion_tokens: int | None = None,
+    cached_tokens: int | None = None,
 ) -> Path | None:
     """Log to local file."""
     global _call_counter
@@ -141,6 +142,8 @@ def _log_to_file(
         token_parts = []
         if prompt_tokens is not None:
             token_parts.append(f"input={prompt_tokens:,}")
+        if cached_tokens:
+            token_parts.append(f"cached={cached_tokens:,}")
         if completion_tokens is not None:
             token_parts.append(f"output={completion_tokens:,}")
         total = (prompt_tokens or 0) + (completion_tokens or 0)
@@ -280,6 +283,7 @@ def log_prompt(
     config: dict | None = None,
     prompt_tokens: int | None = None,
     completion_tokens: int | None = None,
+    cached_tokens: int | None = None,
 ) -> Path | None:
     """
     Log a prompt and response.
@@ -295,6 +299,7 @@ def log_prompt(
         config: Model config (reasoning_effort, verbosity, etc.)
         prompt_tokens: Token count for input (from API response)
         completion_tokens: Token count for output (from API response)
+        cached_tokens: Input tokens served from the prompt cache (from API response)
 
     Returns:
         Path to the log file (if file logging enabled), or None
@@ -320,6 +325,7 @@ def log_prompt(
             config=config,
             prompt_tokens=prompt_tokens,
             completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
         )
     
     # Log to DB if enabled
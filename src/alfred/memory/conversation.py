@@ -10,7 +10,7 @@ Handles:
 
 import json
 from datetime import datetime
-from typing import Any
+from typing import Any, Mapping
 
 from alfred.graph.state import (
     ACT_CONTEXT_THRESHOLD,
@@ -182,10 +182,10 @@ def estimate_context_tokens(context: ConversationContext) -> int:
 # =============================================================================
 
 
-def _get_table_to_entity_type() -> dict[str, str]:
+def _get_table_to_entity_type() -> Mapping[str, str]:
     """Get table → entity type mapping from domain config. Phase 2."""
-    from alfred.domain import get_current_domain
-    return get_current_domain().table_to_type
+    from alfred.domain import get_compiled_domain
+    return get_compiled_domain().table_to_type
 
 
 
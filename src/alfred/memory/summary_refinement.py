@@ -0,0 +1,240 @@
+"""
+Alfred - Deferred summary refinement.
+
+Summarize's LLM calls (condensing a long assistant response, compressing old
+turns into history_summary) never affect the reply the user is reading. With
+deferral on, Summarize commits deterministic provisional text and returns a
+SummaryRefinement. The LLM versions are produced in a background task and
+merged into whatever the conversation looks like by then. call_llm runs
+the client in a worker thread, so the task doesn't hold the event loop
+while later requests are served.
+
+Merge rules (idempotent, never clobber newer state):
+- assistant_summary: replaced only on the turn with the matching timestamp,
+  and only while it still holds the provisional text.
+- history_summary: provisional history is `base + " " + part`, and later
+  turns only append to it. If the current value starts with the provisional
+  history, that prefix is swapped for the refined narrative; anything
+  appended after it is kept.
+
+Refinements run one at a time per conversation key, so each one compresses
+on top of the previous refined narrative. Completed results are kept briefly
+and re-applied on every commit (`apply_completed`). That way a turn that
+started from an older snapshot can't overwrite a merge that landed while it
+was running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SEPARATOR = " "
+
+# Completed results kept per key for re-application on later commits
+KEEP_COMPLETED = 8
+
+
+def join_history(base: str, part: str) -> str:
+    """Append a compressed part to history_summary (provisional form)."""
+    if not base:
+        return part
+    if not part:
+        return base
+    return f"{base}{HISTORY_SEPARATOR}{part}"
+
+
+@dataclass(frozen=True)
+class RefinedSummary:
+    """LLM results for one turn, plus the provisional text they replace."""
+
+    turn_timestamp: str
+    provisional_assistant_summary: str | None
+    assistant_summary: str | None
+    provisional_history: str | None
+    history_summary: str | None
+
+
+@dataclass
+class SummaryRefinement:
+    """Deferred LLM summarization work for one turn."""
+
+    turn_timestamp: str
+    response: str = ""
+    is_proposal: bool = False
+    provisional_assistant_summary: str | None = None  # None = no LLM summary needed
+    base_history: str = ""
+    turns_to_compress: list[dict] = field(default_factory=list)
+    provisional_part: str = ""
+
+    @property
+    def provisional_history(self) -> str | None:
+        if not self.turns_to_compress:
+            return None
+        return join_history(self.base_history, self.provisional_part)
+
+    def rebase(self, done: RefinedSummary) -> None:
+        """Build on a predecessor's refined history instead of its provisional text."""
+        if (
+            done.history_summary
+            and done.provisional_history is not None
+            and self.base_history == done.provisional_history
+        ):
+            self.base_history = done.history_summary
+
+    async def run(self) -> RefinedSummary:
+        """Run the independent LLM calls concurrently."""
+        from alfred.graph.nodes.summarize import (
+            _compress_turns_to_narrative,
+            _summarize_assistant_response,
+        )
+        from alfred.llm.client import set_current_node
+
+        set_current_node("summarize")
+
+        async def assistant() -> str | None:
+            if self.provisional_assistant_summary is None:
+                return None
+            return await _summarize_assistant_response(self.response, self.is_proposal)
+
+        async def history() -> str | None:
+            if not self.turns_to_compress:
+                return None
+            narrative = await _compress_turns_to_narrative(
+                existing_summary=self.base_history,
+                turns_to_compress=self.turns_to_compress,
+            )
+            # The compressor falls back to the unchanged base on failure;
+            # keep the provisional text rather than dropping these turns.
+            if narrative == self.base_history:
+                return None
+            return narrative
+
+        assistant_summary, history_summary = await asyncio.gather(assistant(), history())
+        return RefinedSummary(
+            turn_timestamp=self.turn_timestamp,
+            provisional_assistant_summary=self.provisional_assistant_summary,
+            assistant_summary=assistant_summary,
+            provisional_history=self.provisional_history,
+            history_summary=history_summary,
+        )
+
+
+def apply_refined_summary(conversation: dict[str, Any], refined: RefinedSummary) -> bool:
+    """
+    Merge refined text into a conversation dict (in place). Returns True if changed.
+
+    Safe to call repeatedly with the same result.
+    """
+    changed = False
+
+    if refined.assistant_summary and refined.provisional_assistant_summary is not None:
+        turns = conversation.get("recent_turns") or []
+        for i, turn in enumerate(turns):
+            if (
+                turn.get("timestamp") == refined.turn_timestamp
+                and turn.get("assistant_summary") == refined.provisional_assistant_summary
+            ):
+                turns = list(turns)
+                turns[i] = {**turn, "assistant_summary": refined.assistant_summary}
+                conversation["recent_turns"] = turns
+                changed = True
+                break
+
+    if refined.history_summary and refined.provisional_history:
+        current = conversation.get("history_summary", "")
+        provisional = refined.provisional_history
+        if current == provisional:
+            conversation["history_summary"] = refined.history_summary
+            changed = True
+        elif current.startswith(provisional + HISTORY_SEPARATOR):
+            conversation["history_summary"] = refined.history_summary + current[len(provisional):]
+            changed = True
+
+    return changed
+
+
+OnRefined = Callable[[RefinedSummary], Awaitable[None] | None]
+
+
+class SummaryRefiner:
+    """Runs SummaryRefinements in the background, serialized per conversation key."""
+
+    def __init__(self, keep_completed: int = KEEP_COMPLETED) -> None:
+        self._queues: dict[str, deque[tuple[SummaryRefinement, OnRefined | None]]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._completed: dict[str, deque[RefinedSummary]] = {}
+        self._keep = keep_completed
+
+    def schedule(
+        self,
+        key: str,
+        refinement: SummaryRefinement,
+        on_refined: OnRefined | None = None,
+    ) -> None:
+        """Queue a refinement; `on_refined` runs after it completes (e.g. to re-commit)."""
+        for done in self._completed.get(key, ()):
+            refinement.rebase(done)
+        self._queues.setdefault(key, deque()).append((refinement, on_refined))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._run(key))
+
+    def apply_completed(self, key: str, conversation: dict[str, Any]) -> bool:
+        """Re-apply every retained result for `key` (idempotent)."""
+        changed = False
+        for done in self._completed.get(key, ()):
+            changed = apply_refined_summary(conversation, done) or changed
+        return changed
+
+    def pending(self, key: str) -> int:
+        queued = len(self._queues.get(key, ()))
+        return queued + (1 if key in self._workers else 0)
+
+    async def drain(self) -> None:
+        """Wait for all queued refinements (tests, graceful shutdown)."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def _run(self, key: str) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                refinement, on_refined = queue.popleft()
+                try:
+                    result = await refinement.run()
+                except Exception as e:
+                    logger.warning(f"Summary refinement failed for {key}: {e}")
+                    continue
+
+                self._completed.setdefault(key, deque(maxlen=self._keep)).append(result)
+                for queued, _ in queue:
+                    queued.rebase(result)
+
+                if on_refined is not None:
+                    try:
+                        outcome = on_refined(result)
+                        if inspect.isawaitable(outcome):
+                            await outcome
+                    except Exception as e:
+                        logger.warning(f"Summary refinement callback failed for {key}: {e}")
+        finally:
+            self._workers.pop(key, None)
+            if not queue:
+                self._queues.pop(key, None)
+
+
+_refiner: SummaryRefiner | None = None
+
+
+def get_summary_refiner() -> SummaryRefiner:
+    """Get the process-wide SummaryRefiner."""
+    global _refiner
+    if _refiner is None:
+        _refiner = SummaryRefiner()
+    return _refiner
@@ -0,0 +1,106 @@
+"""
+Alfred - Cold import profiling.
+
+Imports a module in a fresh interpreter under `python -X importtime` and
+parses the per-module timings, so startup regressions can be traced to the
+import that caused them (`alfred startup-profile`, tests/kitchen/test_startup.py).
+
+Wall time is measured separately (best of a few runs, minus bare
+interpreter startup): -X importtime itself adds overhead, so its numbers
+are for ranking modules, not for budgets.
+"""
+
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int  # 0 = the profiled module itself
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return self.timings[-1].cumulative_ms if self.timings else 0.0
+
+    def heaviest(self, n: int = 20) -> list[ImportTiming]:
+        """Modules with the largest cumulative import time."""
+        return sorted(self.timings, key=lambda t: t.cumulative_ms, reverse=True)[:n]
+
+    def loaded(self, *modules: str) -> list[str]:
+        """Which of `modules` (top-level names) the import pulled in."""
+        names = {t.module for t in self.timings}
+        return [m for m in modules if m in names]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing failed: {result.stderr.strip().splitlines()[-1:]}")
+    return result
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parse `-X importtime` output ("import time: self | cumulative | name")."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        indent = len(name) - len(name.lstrip(" "))
+        timings.append(ImportTiming(
+            module=name.strip(),
+            self_ms=int(self_us) / 1000,
+            cumulative_ms=int(cumulative_us) / 1000,
+            depth=(indent - 1) // 2,
+        ))
+    return timings
+
+
+def profile_import(module: str) -> ImportProfile:
+    """Per-module import timings for `import module` in a fresh interpreter.
+
+    Only the module's own import tree is kept, not interpreter startup (site).
+    """
+    result = _run(f"import {module}", "-X", "importtime")
+    timings = parse_importtime(result.stderr)
+    # Children are printed before their parent: the tree is the run of
+    # nested lines ending at the module's own top-level line
+    end = next(
+        (i for i in range(len(timings) - 1, -1, -1) if timings[i].depth == 0 and timings[i].module == module),
+        None,
+    )
+    if end is None:
+        return ImportProfile(module=module)
+    start = end
+    while start > 0 and timings[start - 1].depth > 0:
+        start -= 1
+    return ImportProfile(module=module, timings=timings[start:end + 1])
+
+
+def cold_import_seconds(module: str, runs: int = 3) -> float:
+    """Best-of-`runs` wall time to import `module`, net of interpreter startup."""
+
+    def best(code: str) -> float:
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            _run(code)
+            samples.append(time.perf_counter() - start)
+        return min(samples)
+
+    return max(0.0, best(f"import {module}") - best("pass"))
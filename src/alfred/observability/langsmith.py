@@ -176,12 +176,16 @@ class CostTracker:
         tracker.add("gpt-4.1-mini", 500, 100)
         tracker.add("gpt-4o", 200, 50)
         print(tracker.total_cost)
+
+    `cached_tokens` is the part of `input_tokens` served from OpenAI's
+    prompt cache (usage.prompt_tokens_details.cached_tokens).
     """
     
     def __init__(self):
         self.calls: list[dict] = []
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cached_tokens = 0
         self.total_cost = 0.0
     
     def add(
@@ -190,6 +194,7 @@ class CostTracker:
         input_tokens: int,
         output_tokens: int,
         node: str = "unknown",
+        cached_tokens: int = 0,
     ) -> float:
         """Add a call and return its estimated cost."""
         cost = estimate_cost(model, input_tokens, output_tokens)
@@ -200,14 +205,23 @@ class CostTracker:
             "node": node,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
+            "cached_tokens": cached_tokens,
             "cost": cost,
         })
         
         self.total_input_tokens += input_tokens
         self.total_output_tokens += output_tokens
+        self.total_cached_tokens += cached_tokens
         self.total_cost += cost
         
         return cost
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of all input tokens served from the prompt cache."""
+        if not self.total_input_tokens:
+            return 0.0
+        return self.total_cached_tokens / self.total_input_tokens
     
     def summary(self) -> dict:
         """Get a summary of tracked costs."""
@@ -215,9 +229,24 @@ class CostTracker:
             "total_calls": len(self.calls),
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
+            "total_cached_tokens": self.total_cached_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 4),
             "total_cost_usd": round(self.total_cost, 6),
             "by_model": self._costs_by_model(),
             "by_node": self._costs_by_node(),
+            "cache_hit_ratio_by_node": self.cache_hit_ratio_by_node(),
+        }
+
+    def cache_hit_ratio_by_node(self) -> dict[str, float]:
+        """Get cached_tokens / input_tokens grouped by node."""
+        totals: dict[str, list[int]] = {}
+        for call in self.calls:
+            node_totals = totals.setdefault(call["node"], [0, 0])
+            node_totals[0] += call.get("cached_tokens", 0)
+            node_totals[1] += call["input_tokens"]
+        return {
+            node: round(cached / total, 4) if total else 0.0
+            for node, (cached, total) in totals.items()
         }
     
     def _costs_by_model(self) -> dict[str, float]:
@@ -0,0 +1,98 @@
+"""
+Alfred - Per-node CPU/wall time profiling.
+
+Graph nodes are wrapped with `profiled()` at graph build time. The wrapper
+is a no-op pass-through until `enable_node_profiling()` is called, so it
+costs nothing in production.
+
+CPU time is process CPU (`time.process_time`) spent while the node was
+running. With LLM calls replayed from a cassette (llm/cassette.py), that
+is the orchestration engine's own cost: context building, registry
+lookups, CRUD translation, prompt formatting.
+"""
+
+import functools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+
+@dataclass
+class NodeTiming:
+    calls: int = 0
+    cpu_s: float = 0.0
+    wall_s: float = 0.0
+
+
+class NodeProfiler:
+    """Accumulates timings per node name."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, NodeTiming] = {}
+
+    def add(self, node: str, cpu_s: float, wall_s: float) -> None:
+        timing = self.timings.setdefault(node, NodeTiming())
+        timing.calls += 1
+        timing.cpu_s += cpu_s
+        timing.wall_s += wall_s
+
+    def reset(self) -> None:
+        self.timings.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Per-node totals in milliseconds, heaviest CPU first."""
+        ordered = sorted(self.timings.items(), key=lambda kv: kv[1].cpu_s, reverse=True)
+        return {
+            node: {
+                "calls": t.calls,
+                "cpu_ms": round(t.cpu_s * 1000, 2),
+                "wall_ms": round(t.wall_s * 1000, 2),
+            }
+            for node, t in ordered
+        }
+
+    def format_table(self) -> str:
+        lines = [f"{'Node':<14}{'calls':>7}{'cpu ms':>12}{'wall ms':>12}", "-" * 45]
+        total_cpu = total_wall = 0.0
+        for node, row in self.summary().items():
+            lines.append(f"{node:<14}{row['calls']:>7}{row['cpu_ms']:>12.1f}{row['wall_ms']:>12.1f}")
+            total_cpu += row["cpu_ms"]
+            total_wall += row["wall_ms"]
+        lines.append("-" * 45)
+        lines.append(f"{'total':<14}{'':>7}{total_cpu:>12.1f}{total_wall:>12.1f}")
+        return "\n".join(lines)
+
+
+_profiler = NodeProfiler()
+_enabled = False
+
+
+def enable_node_profiling(enabled: bool = True) -> NodeProfiler:
+    """Turn node timing on/off. Returns the process-wide profiler."""
+    global _enabled
+    _enabled = enabled
+    return _profiler
+
+
+def get_node_profiler() -> NodeProfiler:
+    return _profiler
+
+
+def profiled(
+    name: str,
+    node_fn: Callable[[Any], Awaitable[dict]],
+) -> Callable[[Any], Awaitable[dict]]:
+    """Wrap an async graph node so its CPU/wall time is recorded when enabled."""
+
+    @functools.wraps(node_fn)
+    async def wrapper(state):
+        if not _enabled:
+            return await node_fn(state)
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            return await node_fn(state)
+        finally:
+            _profiler.add(name, time.process_time() - cpu_start, time.perf_counter() - wall_start)
+
+    return wrapper
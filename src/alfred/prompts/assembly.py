@@ -0,0 +1,63 @@
+"""
+Alfred - Prefix-stable prompt assembly.
+
+OpenAI caches prompt prefixes automatically (≥1024 tokens, extended in
+128-token increments), but only when the leading bytes are identical to a
+recent call. A single volatile line near the top — a tool-call counter, a
+date, a step number — invalidates everything after it.
+
+Sections are therefore tagged with how often they change and assembled from
+most static to most volatile. Sections of equal stability keep the order
+they were given in, so callers still control reading order within a tier.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Iterable
+
+
+class Stability(IntEnum):
+    """How long a prompt section stays byte-identical. Lower sorts first."""
+
+    STATIC = 0  # Same for every call with this node/subdomain/step type (persona, schema)
+    USER = 1    # Same for every call for this user (profile, preferences)
+    STEP = 2    # Same across one step's tool-call loop (task, examples)
+    CALL = 3    # Changes between calls (status, results, entities, conversation)
+
+
+SECTION_DIVIDER = "---"
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """One block of a user prompt."""
+
+    name: str
+    content: str | None
+    stability: Stability
+    divider: bool = True  # Follow with a `---` rule
+
+
+def assemble_prompt(
+    sections: Iterable[PromptSection],
+    trailer: str | None = None,
+) -> str:
+    """
+    Join sections from most static to most volatile.
+
+    Empty sections are dropped. `trailer` (e.g. the decision prompt) is
+    always emitted last regardless of stability, since the closing
+    instruction must sit next to the data it refers to.
+    """
+    ordered = sorted(
+        (s for s in sections if s.content),
+        key=lambda s: s.stability,  # sorted() is stable: ties keep caller order
+    )
+    parts: list[str] = []
+    for section in ordered:
+        parts.append(section.content)
+        if section.divider:
+            parts.append(SECTION_DIVIDER)
+    if trailer:
+        parts.append(trailer)
+    return "\n\n".join(parts)
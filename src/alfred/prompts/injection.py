@@ -9,7 +9,9 @@ User prompts are built from two layers:
 1. COMMON SECTIONS (all step types): status, task, entity context, conversation, decision
 2. STEP-TYPE SECTIONS (varies): schema (read/write), guidance (analyze/generate), artifacts (write)
 
-The main entry point is `build_act_user_prompt()` which combines both layers.
+The main entry point is `build_act_user_prompt()` which combines both layers,
+ordering sections from most static to most volatile (see prompts/assembly.py)
+so repeated calls share a cacheable prefix.
 
 ## Step Types
 - read: Schema + filter syntax + CRUD examples
@@ -29,6 +31,8 @@ from datetime import date
 from typing import Any, TYPE_CHECKING
 
 from alfred.core.modes import Mode, MODE_CONFIG
+from alfred.prompts.assembly import PromptSection, Stability, assemble_prompt
+from alfred.prompts.registry import get_prompt_registry
 
 # V4 CONSOLIDATION: Only SessionIdRegistry needed now
 if TYPE_CHECKING:
@@ -138,78 +142,33 @@ def build_act_user_prompt(
     )
     
     # === Assemble final prompt ===
-    # Order: header → schema → status → profile → task → guidance → data → entities → context → decision
-    parts = []
-    
-    # 1. Subdomain header (step-type persona)
-    if specific.get("subdomain_header"):
-        parts.append(specific["subdomain_header"])
-        parts.append("---")
-    
-    # 2. Schema (read/write only) — right after header so examples can reference it
-    if specific.get("schema"):
-        parts.append(specific["schema"])
-        parts.append("---")
-    
-    # 3. User preferences for write steps (profile + subdomain guidance)
-    if step_type == "write":
-        if profile_section:
-            parts.append(profile_section)
-        if subdomain_guidance:
-            parts.append(subdomain_guidance)
-    
-    # 4. STATUS table
-    parts.append(common["status"])
-    parts.append("---")
-    
-    # 5. Previous step note (if any)
-    if specific.get("prev_note"):
-        parts.append(specific["prev_note"])
-        parts.append("---")
-    
-    # 6. User profile (analyze/generate only)
-    if profile_section and step_type in ("analyze", "generate"):
-        parts.append(profile_section)
-    
-    # 7. Subdomain guidance (user preferences - after profile for analyze/generate)
-    if step_type in ("analyze", "generate") and subdomain_guidance:
-        parts.append(subdomain_guidance)
-    
-    # 8. Task section
-    parts.append(common["task"])
-    parts.append("---")
-    
-    # 9. Batch manifest (write only)
-    if specific.get("batch_manifest"):
-        parts.append(specific["batch_manifest"])
-        parts.append("---")
-    
-    # 10. Step-type guidance/examples — now can reference schema above
-    if specific.get("guidance"):
-        parts.append(specific["guidance"])
-        parts.append("---")
-    
-    # 11. Data section (different label for analyze/generate vs read/write)
-    parts.append(common["data_section"])
-    parts.append("---")
-    
-    # 12. Entities in Context (ALWAYS included)
-    parts.append(common["entities"])
-    parts.append("---")
-    
-    # 13. Artifacts (write only)
-    if specific.get("artifacts"):
-        parts.append(specific["artifacts"])
-        parts.append("---")
-    
-    # 14. Conversation context
-    parts.append(common["conversation"])
-    parts.append("---")
-    
-    # 15. Decision prompt
-    parts.append(common["decision"])
-    
-    return "\n\n".join(parts)
+    # Sections are ordered most static → most volatile so consecutive calls
+    # (tool-call loop, later steps, later turns) share a byte-identical prefix
+    # that OpenAI can serve from its prompt cache. See prompts/assembly.py.
+    include_profile = step_type in ("write", "analyze", "generate")
+    sections = [
+        # Static per (subdomain, step_type)
+        PromptSection("subdomain_header", specific.get("subdomain_header"), Stability.STATIC),
+        # Schema right after header so examples can reference it
+        PromptSection("schema", specific.get("schema"), Stability.STATIC),
+        # Stable per user
+        PromptSection("profile", profile_section if include_profile else None, Stability.USER, divider=False),
+        PromptSection("subdomain_guidance", subdomain_guidance if include_profile else None, Stability.USER, divider=False),
+        # Stable for the whole step (every tool call in the loop)
+        PromptSection("guidance", specific.get("guidance"), Stability.STEP),
+        PromptSection("task", common["task"], Stability.STEP),
+        # Changes between calls
+        PromptSection("status", common["status"], Stability.CALL),
+        PromptSection("prev_note", specific.get("prev_note"), Stability.CALL),
+        PromptSection("batch_manifest", specific.get("batch_manifest"), Stability.CALL),
+        PromptSection("archive", specific.get("archive"), Stability.CALL),
+        PromptSection("data_section", common["data_section"], Stability.CALL),
+        PromptSection("entities", common["entities"], Stability.CALL),
+        PromptSection("artifacts", specific.get("artifacts"), Stability.CALL),
+        PromptSection("conversation", common["conversation"], Stability.CALL),
+    ]
+
+    return assemble_prompt(sections, trailer=common["decision"])
 
 
 def _build_common_sections(
@@ -351,6 +310,7 @@ def _build_step_type_sections(
     - batch_manifest (write) — batch progress table
     - artifacts (write) — generated content for saving
     - prev_note (read/write) — note from previous step
+    - archive (analyze/generate) — archives from prior turns
     """
     from alfred.domain import get_current_domain
     domain = get_current_domain()
@@ -395,12 +355,9 @@ def _build_step_type_sections(
 {prev_step_note}"""
     
     # === Archive section (analyze/generate) ===
+    # Kept separate from guidance: archives change per turn, guidance doesn't
     if step_type in ("analyze", "generate") and archive_section:
-        # Append to guidance or create new section
-        if "guidance" in result:
-            result["guidance"] += f"\n\n{archive_section}"
-        else:
-            result["guidance"] = archive_section
+        result["archive"] = archive_section
     
     return result
 
@@ -561,19 +518,12 @@ def build_act_quick_prompt(
     Returns:
         Tuple of (system_prompt, user_prompt)
     """
-    from pathlib import Path
     from alfred.domain import get_current_domain
     domain = get_current_domain()
 
-    # === SYSTEM PROMPT: Load Act's prompts, same as Act ===
-    prompts_dir = Path(__file__).parent / "templates" / "act"
-    
-    def load_prompt(filename: str) -> str:
-        path = prompts_dir / filename
-        return path.read_text(encoding="utf-8") if path.exists() else ""
-    
-    base = load_prompt("base.md")
-    crud = load_prompt("crud.md")
+    # === SYSTEM PROMPT: Act's precompiled CRUD reference, same as Act ===
+    registry = get_prompt_registry()
+    crud = registry.get("act/crud").text if registry.has("act/crud") else ""
     
     # Quick mode header replaces the looping mechanics
     quick_header = """# Alfred Quick Execution
@@ -0,0 +1,281 @@
+"""
+Alfred - Precompiled prompt template registry.
+
+All prompt templates (core `prompts/templates/` plus directories registered
+by domains) are read once, split into literal segments around their
+`{placeholder}` fields, and held in an immutable snapshot. Rendering joins
+precompiled segments instead of chaining `str.replace`, so a value that
+happens to contain `{something}` is never substituted twice.
+
+Templates are named by path relative to their root, without `.md`:
+    "think", "act/base"            — core templates
+    "kitchen/cook"                 — register_prompt_dir(dir, prefix="kitchen/")
+
+Development: `start_prompt_watcher()` polls template mtimes and swaps in a
+fresh snapshot when a file changes. Modules that derive cached prompts from
+templates register `on_prompts_reloaded()` callbacks to drop them.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+logger = logging.getLogger(__name__)
+
+CORE_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# `{identifier}` only — templates are full of JSON examples like `{"action": ...}`
+_PLACEHOLDER = re.compile(r"\{([a-z_][a-z0-9_]*)\}")
+
+
+# =============================================================================
+# Templates
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A template split into literal segments around its placeholders."""
+
+    name: str
+    path: Path
+    text: str
+    segments: tuple[str, ...]  # len(fields) + 1 literal chunks
+    fields: tuple[str, ...]    # placeholder names, in order of appearance
+    mtime_ns: int = 0
+
+    @classmethod
+    def compile(cls, name: str, text: str, path: Path, mtime_ns: int = 0) -> PromptTemplate:
+        parts = _PLACEHOLDER.split(text)
+        # re.split with one group alternates literal, field, literal, ...
+        return cls(
+            name=name,
+            path=path,
+            text=text,
+            segments=tuple(parts[0::2]),
+            fields=tuple(parts[1::2]),
+            mtime_ns=mtime_ns,
+        )
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        return frozenset(self.fields)
+
+    def render(self, /, **values: str) -> str:
+        """
+        Fill every placeholder. Raises KeyError for a missing value and
+        ValueError for a value the template doesn't declare.
+        """
+        if not self.fields:
+            if values:
+                raise ValueError(f"Prompt '{self.name}' has no placeholders, got {sorted(values)}")
+            return self.text
+
+        unknown = values.keys() - self.placeholders
+        if unknown:
+            raise ValueError(f"Prompt '{self.name}' has no placeholder(s) {sorted(unknown)}")
+
+        out = [self.segments[0]]
+        for field, segment in zip(self.fields, self.segments[1:]):
+            try:
+                out.append(values[field])
+            except KeyError:
+                raise KeyError(f"Prompt '{self.name}' requires '{field}'") from None
+            out.append(segment)
+        return "".join(out)
+
+
+def _load_dir(directory: Path, prefix: str) -> dict[str, PromptTemplate]:
+    templates: dict[str, PromptTemplate] = {}
+    for path in sorted(directory.rglob("*.md")):
+        name = prefix + path.relative_to(directory).with_suffix("").as_posix()
+        # Strict decode: a mis-encoded template should fail at startup, not mid-turn
+        text = path.read_bytes().decode("utf-8")
+        templates[name] = PromptTemplate.compile(name, text, path, path.stat().st_mtime_ns)
+    return templates
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+
+class PromptRegistry:
+    """
+    Immutable snapshot of compiled templates, keyed by name.
+
+    Reads never lock: `_templates` is replaced wholesale on load/reload.
+    """
+
+    def __init__(self) -> None:
+        self._roots: dict[str, Path] = {}  # prefix -> directory
+        self._templates: Mapping[str, PromptTemplate] = MappingProxyType({})
+        self._listeners: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def add_root(self, directory: Path, prefix: str = "") -> None:
+        """Register a template directory and load it immediately."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise FileNotFoundError(f"Prompt directory not found: {directory}")
+        with self._lock:
+            self._roots[prefix] = directory
+            merged = dict(self._templates)
+            merged.update(_load_dir(directory, prefix))
+            self._templates = MappingProxyType(merged)
+
+    @property
+    def templates(self) -> Mapping[str, PromptTemplate]:
+        return self._templates
+
+    def has(self, name: str) -> bool:
+        return name in self._templates
+
+    def get(self, name: str) -> PromptTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise KeyError(f"Unknown prompt template '{name}'") from None
+
+    def render(self, name: str, /, **values: str) -> str:
+        return self.get(name).render(**values)
+
+    def reload(self) -> list[str]:
+        """Re-read every root; notify listeners if anything changed. Returns changed names."""
+        with self._lock:
+            fresh: dict[str, PromptTemplate] = {}
+            for prefix, directory in self._roots.items():
+                fresh.update(_load_dir(directory, prefix))
+            old = self._templates
+            changed = sorted(
+                name for name in fresh.keys() | old.keys()
+                if name not in fresh or name not in old or fresh[name].text != old[name].text
+            )
+            self._templates = MappingProxyType(fresh)
+        if changed:
+            logger.info(f"Reloaded prompt templates: {', '.join(changed)}")
+            for listener in list(self._listeners):
+                listener()
+        return changed
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        self._listeners.append(callback)
+
+    def _mtimes(self) -> dict[Path, int]:
+        mtimes = {}
+        for directory in self._roots.values():
+            for path in directory.rglob("*.md"):
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except OSError:
+                    pass
+        return mtimes
+
+
+_registry: PromptRegistry | None = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide registry (core templates loaded on first use)."""
+    global _registry
+    if _registry is None:
+        registry = PromptRegistry()
+        registry.add_root(CORE_TEMPLATES_DIR)
+        _registry = registry
+    return _registry
+
+
+def register_prompt_dir(directory: Path, prefix: str) -> None:
+    """Register a domain's prompt directory (e.g. prefix="kitchen/")."""
+    get_prompt_registry().add_root(directory, prefix)
+
+
+def get_template(name: str) -> PromptTemplate:
+    return get_prompt_registry().get(name)
+
+
+def render_template(name: str, /, **values: str) -> str:
+    return get_prompt_registry().render(name, **values)
+
+
+def on_prompts_reloaded(callback: Callable[[], None]) -> None:
+    """Call `callback` after any template changes on reload (dev watcher)."""
+    get_prompt_registry().add_listener(callback)
+
+
+def warmup_prompts() -> int:
+    """
+    Load and compile all registered templates ahead of the first request.
+
+    Also primes the node-level system prompt caches so the first turn
+    doesn't pay for domain prompt assembly. Returns the template count.
+    """
+    registry = get_prompt_registry()
+
+    from alfred.graph.nodes import act, reply, router, think
+
+    think._get_system_prompt()
+    reply._get_prompts()
+    router._get_system_prompt()
+    for step_type in ("read", "write", "analyze", "generate"):
+        act._get_system_prompt(step_type)
+
+    return len(registry.templates)
+
+
+# =============================================================================
+# Dev File Watcher
+# =============================================================================
+
+
+_watcher: threading.Thread | None = None
+_watcher_stop = threading.Event()
+
+
+def start_prompt_watcher(interval: float = 1.0) -> bool:
+    """
+    Poll template mtimes and hot-reload on change. Development only.
+
+    Returns False (and does nothing) outside ALFRED_ENV=development.
+    """
+    global _watcher
+    from alfred.config import core_settings
+
+    if not core_settings.is_development:
+        logger.warning("Prompt watcher is development-only; not starting")
+        return False
+    if _watcher is not None and _watcher.is_alive():
+        return True
+
+    registry = get_prompt_registry()
+    _watcher_stop.clear()
+
+    def _poll() -> None:
+        seen = registry._mtimes()
+        while not _watcher_stop.wait(interval):
+            current = registry._mtimes()
+            if current != seen:
+                seen = current
+                try:
+                    registry.reload()
+                except Exception as e:  # Keep serving the last good snapshot
+                    logger.warning(f"Prompt reload failed: {e}")
+
+    _watcher = threading.Thread(target=_poll, name="prompt-watcher", daemon=True)
+    _watcher.start()
+    logger.info("Prompt watcher started")
+    return True
+
+
+def stop_prompt_watcher() -> None:
+    global _watcher
+    _watcher_stop.set()
+    if _watcher is not None:
+        _watcher.join(timeout=5)
+    _watcher = None
@@ -0,0 +1,89 @@
+"""
+Alfred - Per-turn prompt section render cache.
+
+Act runs once per tool call, and every iteration used to rebuild every
+prompt section: conversation context, previous step results, previous
+turn steps, entity context, artifacts, schema, profile. Most of them
+can't change between iterations of a step, and several can't change for
+the whole turn.
+
+`SectionCache` memoizes each section under a key made of its inputs, one
+slot per section name. A differing key re-renders and replaces the slot.
+
+Keys use *identity* for large state values (`Identity(obj)`) rather than
+hashing their content. LangGraph passes unchanged state values through
+as the same object, and Act always writes a *new* object when it changes
+one (`step_results.copy()`, `session_registry.to_dict()`). So identity
+equals "unchanged" at no cost. Each key holds a strong reference to its
+objects, which keeps ids from being recycled while the entry is alive.
+
+One cache lives in AlfredState["act_render_cache"] for the duration of a
+turn, so nothing leaks across turns.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class Identity:
+    """Key component compared by identity: (Identity(conversation), step_index)."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Identity) and other.obj is self.obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+    def __repr__(self) -> str:
+        return f"Identity({type(self.obj).__name__}@{id(self.obj):x})"
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class SectionCache:
+    """Per-turn memo of rendered prompt sections, one slot per section."""
+
+    _slots: dict[str, tuple[Hashable, Any]] = field(default_factory=dict)
+    stats: dict[str, CacheStats] = field(default_factory=dict)
+
+    def _lookup(self, section: str, key: Hashable) -> tuple[bool, Any]:
+        stats = self.stats.setdefault(section, CacheStats())
+        slot = self._slots.get(section)
+        if slot is not None and slot[0] == key:
+            stats.hits += 1
+            return True, slot[1]
+        stats.misses += 1
+        return False, None
+
+    def get(self, section: str, key: Hashable, render: Callable[[], T]) -> T:
+        """Return the cached section for `key`, rendering it on a miss."""
+        hit, value = self._lookup(section, key)
+        if not hit:
+            value = render()
+            self._slots[section] = (key, value)
+        return value
+
+    async def aget(self, section: str, key: Hashable, render: Callable[[], Awaitable[T]]) -> T:
+        """Async variant of get() for sections that fetch (profile, schema)."""
+        hit, value = self._lookup(section, key)
+        if not hit:
+            value = await render()
+            self._slots[section] = (key, value)
+        return value
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        return {name: {"hits": s.hits, "misses": s.misses} for name, s in self.stats.items()}
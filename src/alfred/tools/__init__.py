@@ -15,6 +15,7 @@ Schema:
 """
 
 from alfred.tools.crud import (
+    CrudBatchError,
     DbCreateParams,
     DbDeleteParams,
     DbReadParams,
@@ -25,6 +26,7 @@ from alfred.tools.crud import (
     db_read,
     db_update,
     execute_crud,
+    execute_crud_batch,
 )
 from alfred.tools.schema import (
     SUBDOMAIN_REGISTRY,
@@ -41,6 +43,8 @@ __all__ = [
     "db_update",
     "db_delete",
     "execute_crud",
+    "execute_crud_batch",
+    "CrudBatchError",
     # Parameter models
     "DbReadParams",
     "DbCreateParams",
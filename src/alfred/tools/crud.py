@@ -11,7 +11,9 @@ Domain-specific CRUD intelligence (semantic search, ingredient lookup,
 auto-includes) is provided by CRUDMiddleware via the DomainConfig.
 """
 
+import asyncio
 import logging
+from dataclasses import dataclass
 from typing import Any, Literal
 
 from pydantic import BaseModel
@@ -25,6 +27,12 @@ def _get_domain():
     return get_current_domain()
 
 
+def _get_compiled():
+    """Get the current domain's frozen lookup tables (user-owned tables, UUID fields)."""
+    from alfred.domain import get_compiled_domain
+    return get_compiled_domain()
+
+
 def _get_client():
     """Get database client via domain adapter."""
     return _get_domain().get_db_adapter()
@@ -159,8 +167,7 @@ async def db_read(params: DbReadParams, user_id: str, middleware=None) -> list[d
         List of matching rows as dicts
     """
     client = _get_client()
-    domain = _get_domain()
-    user_owned_tables = domain.get_user_owned_tables()
+    user_owned_tables = _get_compiled().user_owned_tables
 
     # --- Middleware pre-processing ---
     select_additions: list[str] = []
@@ -253,7 +260,7 @@ def _sanitize_uuid_fields(record: dict) -> dict:
     LLMs sometimes output "" instead of null for optional FK fields.
     UUID field set is provided by the domain config.
     """
-    uuid_fields = _get_domain().get_uuid_fields()
+    uuid_fields = _get_compiled().uuid_fields
     sanitized = {}
     for key, value in record.items():
         if key in uuid_fields and value == "":
@@ -279,8 +286,7 @@ async def db_create(params: DbCreateParams, user_id: str, middleware=None) -> di
         Single dict for single insert, list of dicts for batch
     """
     client = _get_client()
-    domain = _get_domain()
-    user_owned_tables = domain.get_user_owned_tables()
+    user_owned_tables = _get_compiled().user_owned_tables
 
     # Normalize to list for processing
     is_batch = isinstance(params.data, list)
@@ -322,7 +328,7 @@ async def db_update(params: DbUpdateParams, user_id: str) -> list[dict]:
         List of updated rows
     """
     client = _get_client()
-    user_owned_tables = _get_domain().get_user_owned_tables()
+    user_owned_tables = _get_compiled().user_owned_tables
 
     query = client.table(params.table).update(params.data)
 
@@ -350,7 +356,7 @@ async def db_delete(params: DbDeleteParams, user_id: str) -> list[dict]:
         List of deleted rows
     """
     client = _get_client()
-    user_owned_tables = _get_domain().get_user_owned_tables()
+    user_owned_tables = _get_compiled().user_owned_tables
 
     # Safety: Prevent empty-filter deletes on non-user-owned tables
     # (would result in DELETE with no WHERE clause → blocked by Supabase)
@@ -480,13 +486,33 @@ async def execute_crud(
     Returns:
         Tool result (with refs if registry provided, UUIDs otherwise)
     """
+    prepared = _prepare_call(tool, params, registry)
+    if prepared.result is not _PENDING:
+        return prepared.result
+    result = await _run_raw(tool, prepared.params, user_id)
+    return await _finish_call(tool, prepared.params, result, user_id, registry)
+
+
+_PENDING = object()
+
+
+@dataclass
+class _PreparedCall:
+    """Params ready for the raw operation, or a result that short-circuits it."""
+
+    params: dict[str, Any]
+    result: Any = _PENDING
+
+
+def _prepare_call(tool: str, params: dict[str, Any], registry: Any | None) -> _PreparedCall:
+    """Reroute, translate and sanitize a call's params (no I/O)."""
     # V8: Read rerouting for gen_* refs (MUST be BEFORE translation!)
     # If reading a gen_* ref that has __pending__ UUID, return from pending_artifacts.
     # This check needs the original refs (gen_recipe_1), not translated UUIDs.
     if tool == "db_read" and registry:
         rerouted = _try_reroute_pending_read(params, registry)
         if rerouted is not None:
-            return rerouted
+            return _PreparedCall(params=params, result=rerouted)
 
     # V4: Translate input refs to UUIDs (after read rerouting check)
     if registry:
@@ -497,33 +523,141 @@ async def execute_crud(
     if tool in ("db_create", "db_update") and "data" in params:
         params["data"] = _sanitize_payload(params["data"])
 
+    return _PreparedCall(params=params)
+
+
+async def _run_raw(tool: str, params: dict[str, Any], user_id: str) -> Any:
+    """Execute the raw operation (the only part that touches the database)."""
     # Get domain middleware for domain-aware operations
     middleware = _get_domain().get_crud_middleware()
 
-    # Execute the raw operation
+    # The Supabase client is synchronous, and so are the middleware's own
+    # lookups: run the operation on its own loop in a worker thread, so it
+    # doesn't hold the event loop and gathered reads really overlap
+    result = await asyncio.to_thread(
+        lambda: asyncio.run(_run_operation(tool, params, user_id, middleware)),
+    )
+    if tool == "db_read":
+        return result
+
+    if middleware:
+        rows = None
+        if tool != "db_delete":
+            rows = result if isinstance(result, list) else [result]
+        updated_fields = params["data"].keys() if tool == "db_update" else None
+        middleware.after_write(params["table"], user_id, rows, updated_fields)
+    return result
+
+
+async def _run_operation(tool: str, params: dict[str, Any], user_id: str, middleware: Any) -> Any:
     match tool:
         case "db_read":
-            result = await db_read(DbReadParams(**params), user_id, middleware=middleware)
+            return await db_read(DbReadParams(**params), user_id, middleware=middleware)
         case "db_create":
-            result = await db_create(DbCreateParams(**params), user_id, middleware=middleware)
+            return await db_create(DbCreateParams(**params), user_id, middleware=middleware)
         case "db_update":
-            result = await db_update(DbUpdateParams(**params), user_id)
+            return await db_update(DbUpdateParams(**params), user_id)
         case "db_delete":
-            result = await db_delete(DbDeleteParams(**params), user_id)
+            return await db_delete(DbDeleteParams(**params), user_id)
         case _:
             raise ValueError(f"Unknown tool: {tool}")
 
+
+async def _finish_call(tool: str, params: dict[str, Any], result: Any, user_id: str, registry: Any | None) -> Any:
+    """Translate output UUIDs to refs and enrich lazy FK labels."""
+    if not registry:
+        return result
+
     # V4: Translate output UUIDs to refs
-    if registry:
-        result = _translate_output(tool, result, params.get("table", ""), registry)
+    result = _translate_output(tool, result, params.get("table", ""), registry)
 
-        # V5: Enrich lazy-registered FK refs with names
-        await _enrich_lazy_registrations(registry, user_id)
+    # V5: Enrich lazy-registered FK refs with names
+    await _enrich_lazy_registrations(registry, user_id)
 
-        # V5: Post-process to add labels that were just enriched
-        result = _add_enriched_labels(result, params.get("table", ""), registry)
+    # V5: Post-process to add labels that were just enriched
+    return _add_enriched_labels(result, params.get("table", ""), registry)
 
-    return result
+
+# =============================================================================
+# Batched Execution
+# =============================================================================
+
+
+class CrudBatchError(Exception):
+    """A call in a batch failed; `completed` holds results of the calls before it."""
+
+    def __init__(self, index: int, completed: list[Any], error: Exception) -> None:
+        super().__init__(str(error))
+        self.index = index
+        self.completed = completed
+        self.error = error
+
+
+async def execute_crud_batch(
+    calls: list[tuple[str, dict[str, Any]]],
+    user_id: str,
+    registry: Any | None = None,
+) -> list[Any]:
+    """
+    Execute several tool calls, running independent reads concurrently.
+
+    Consecutive db_read calls form a group whose database round-trips run
+    concurrently. Any write (create/update/delete) is a barrier: it runs
+    alone, after everything before it has finished, so a write that
+    depends on an earlier result always sees it.
+
+    Registry work (ref translation, lazy enrichment) is not concurrency
+    safe, so it stays serialized: params are translated before a group
+    runs and outputs are translated in call order afterwards. Refs are
+    assigned exactly as if the calls had run one by one.
+
+    Returns:
+        Results in call order.
+
+    Raises:
+        CrudBatchError: On the first failing call. Calls after it in the
+            batch are not run (reads already in flight in its group finish
+            but their results are discarded).
+    """
+    results: list[Any] = []
+    index = 0
+    while index < len(calls):
+        end = index + 1
+        if calls[index][0] == "db_read":
+            while end < len(calls) and calls[end][0] == "db_read":
+                end += 1
+        group = calls[index:end]
+
+        try:
+            prepared = [_prepare_call(tool, dict(params), registry) for tool, params in group]
+        except Exception as e:
+            raise CrudBatchError(index, results, e) from e
+
+        raw = await asyncio.gather(
+            *(
+                _run_raw(tool, p.params, user_id)
+                for (tool, _), p in zip(group, prepared)
+                if p.result is _PENDING
+            ),
+            return_exceptions=True,
+        )
+
+        raw_iter = iter(raw)
+        for offset, ((tool, _), p) in enumerate(zip(group, prepared)):
+            try:
+                if p.result is not _PENDING:
+                    results.append(p.result)
+                    continue
+                result = next(raw_iter)
+                if isinstance(result, BaseException):
+                    raise result
+                results.append(await _finish_call(tool, p.params, result, user_id, registry))
+            except Exception as e:
+                raise CrudBatchError(index + offset, results, e) from e
+
+        index = end
+
+    return results
 
 
 def _add_enriched_labels(result: Any, table: str, registry: Any) -> Any:
@@ -0,0 +1,287 @@
+"""
+Alfred Kitchen - Batch job runner for catalog maintenance scripts.
+
+The enrichment scripts (scripts/cleanup_ingredients.py,
+scripts/relink_ingredients.py, scripts/resynthesize_guidance.py) sent
+their LLM batches one at a time and wrote every result with its own
+`update().eq("id")`, so a pass over the ~2,500-ingredient catalog took
+one model latency per batch plus one round trip per row, and an
+interrupted run started over.
+
+BatchJobRunner runs such a pass:
+
+- Items are split into batches; up to `concurrency` batches are in flight
+  at once (one asyncio task per batch, bounded by a semaphore).
+- Each batch's `process` (the LLM call) and `write` (the database write)
+  go through with_backoff(): rate limits wait for the server's
+  `retry-after` when it sends one, other transient errors back off
+  exponentially with jitter, and client errors fail at once.
+- A completed batch appends its item keys to a JSONL checkpoint. A rerun
+  skips keys already there, so an interrupted run resumes where it stopped.
+  A run with no failed batches deletes its checkpoint.
+- bulk_update() writes a batch's partial rows with one UPDATE (migration
+  046) instead of one request per row.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import random
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+# Retry policy (per process / write step)
+RETRY_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 60.0
+
+# Client errors that are still worth retrying (timeout, conflict, rate limit)
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 409, 429})
+
+
+# =============================================================================
+# Backoff
+# =============================================================================
+
+
+def _status_code(exc: BaseException) -> int | None:
+    status = getattr(exc, "status_code", None)
+    if status is None and (response := getattr(exc, "response", None)) is not None:
+        status = getattr(response, "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for HTTP 429 / openai.RateLimitError."""
+    return _status_code(exc) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """The delay the server asked for (`retry-after-ms` / `retry-after`), if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    if value := headers.get("retry-after"):
+        try:
+            return float(value)
+        except ValueError:
+            return None  # HTTP-date form; fall back to backoff
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, 5xx, timeouts, connection errors and bad model output; not other 4xx or bugs."""
+    status = _status_code(exc)
+    if status is not None and 400 <= status < 500:
+        return status in RETRYABLE_CLIENT_STATUSES
+    return not isinstance(exc, (TypeError, KeyError, AttributeError))
+
+
+async def with_backoff(
+    fn: Callable[..., Any],
+    *args: Any,
+    attempts: int = RETRY_ATTEMPTS,
+    base_delay: float = RETRY_BASE_SECONDS,
+    max_delay: float = RETRY_MAX_SECONDS,
+    on_retry: Callable[[BaseException, float], None] | None = None,
+) -> Any:
+    """
+    Call `fn(*args)` until it succeeds, retrying transient failures.
+
+    Coroutine functions are awaited; plain functions run in a thread.
+    Rate-limited calls wait at least the server's retry-after; others use
+    full-jitter exponential backoff capped at `max_delay`.
+    """
+    for attempt in range(attempts):
+        try:
+            if inspect.iscoroutinefunction(fn):
+                return await fn(*args)
+            return await asyncio.to_thread(fn, *args)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if is_rate_limited(e):
+                delay = max(delay, min(max_delay, retry_after_seconds(e) or base_delay))
+            if on_retry is not None:
+                on_retry(e, delay)
+            logger.warning(f"{getattr(fn, '__name__', 'call')} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+# =============================================================================
+# Checkpoints
+# =============================================================================
+
+
+class Checkpoint:
+    """Append-only JSONL record of the item keys a job has completed."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.done: set[str] = set()
+        if path.exists():
+            for line in path.read_text().splitlines():
+                try:
+                    self.done.update(json.loads(line)["keys"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # Torn last line from a killed run
+
+    def mark(self, keys: Sequence[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"at": datetime.now().isoformat(), "keys": list(keys)}) + "\n")
+        self.done.update(keys)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.done.clear()
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+
+@dataclass
+class BatchJobStats:
+    items: int = 0
+    skipped: int = 0
+    batches: int = 0
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class BatchJobRunner:
+    """Runs process → write over batches of items with bounded concurrency and checkpoints."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint_dir: str | Path | None = None,
+        resume: bool = True,
+        attempts: int = RETRY_ATTEMPTS,
+    ) -> None:
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.attempts = attempts
+        self.checkpoint = Checkpoint(Path(checkpoint_dir) / f"{name}.jsonl") if checkpoint_dir else None
+        if self.checkpoint is not None and not resume:
+            self.checkpoint.clear()
+        self.stats = BatchJobStats()
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        *,
+        key: Callable[[Any], str],
+        batch_size: int,
+        process: Callable[[list[Any]], Awaitable[Any]],
+        write: Callable[[Any], Any] | None = None,
+    ) -> BatchJobStats:
+        """
+        Process all items not yet checkpointed, `batch_size` at a time.
+
+        `process(batch)` is awaited (the LLM step); its result goes to
+        `write(result)` (sync functions run in a thread). A batch whose
+        steps still fail after retries is logged, counted and left out of
+        the checkpoint, so the next run picks it up again.
+        """
+        done = self.checkpoint.done if self.checkpoint is not None else set()
+        pending = []
+        for item in items:
+            self.stats.items += 1
+            if str(key(item)) in done:
+                self.stats.skipped += 1
+            else:
+                pending.append(item)
+        if self.stats.skipped:
+            logger.info(f"{self.name}: resuming, {self.stats.skipped} items already done")
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        self.stats.batches += len(batches)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_batch(number: int, batch: list[Any]) -> None:
+            async with semaphore:
+                try:
+                    result = await self._call(process, batch)
+                    if write is not None:
+                        await self._call(write, result)
+                except Exception as e:
+                    self.stats.failed += 1
+                    self.stats.errors.append(f"batch {number}: {e}")
+                    logger.error(f"{self.name}: batch {number}/{len(batches)} failed: {e}")
+                    return
+                if self.checkpoint is not None:
+                    self.checkpoint.mark([str(key(item)) for item in batch])
+                self.stats.completed += 1
+                logger.info(f"{self.name}: batch {number}/{len(batches)} done")
+
+        await asyncio.gather(*(run_batch(n, b) for n, b in enumerate(batches, 1)))
+
+        if self.checkpoint is not None and not self.stats.failed:
+            self.checkpoint.clear()
+        return self.stats
+
+    async def _call(self, fn: Callable[..., Any], arg: Any) -> Any:
+        return await with_backoff(fn, arg, attempts=self.attempts, on_retry=self._count_retry)
+
+    def _count_retry(self, exc: BaseException, delay: float) -> None:
+        self.stats.retries += 1
+        if is_rate_limited(exc):
+            self.stats.rate_limited += 1
+
+
+# =============================================================================
+# Bulk writes
+# =============================================================================
+
+
+def bulk_update(client: Any, table: str, rows: list[dict], key_column: str = "id") -> int:
+    """
+    Write partial rows with one bulk_update() call per column set (migration 046).
+
+    Each row holds `key_column` plus the columns to set. Rows are grouped
+    by their column set, since the RPC writes NULL for a listed column a
+    row leaves out. Returns the number of rows updated.
+    """
+    groups: dict[tuple[str, ...], list[dict]] = defaultdict(list)
+    for row in rows:
+        groups[tuple(sorted(c for c in row if c != key_column))].append(row)
+
+    updated = 0
+    for columns, group in groups.items():
+        if not columns:
+            continue
+        result = client.rpc("bulk_update", {
+            "target": table,
+            "columns": list(columns),
+            "rows": group,
+            "key_column": key_column,
+        }).execute()
+        updated += result.data if isinstance(result.data, int) else len(group)
+    return updated
@@ -0,0 +1,285 @@
+"""
+Background embedding worker.
+
+Keeps recipes.embedding and ingredients.embedding current as rows are
+written, so a new recipe shows up in semantic search without rerunning
+scripts/generate_embeddings.py.
+
+- Write paths call enqueue_embeddings(table, ids) after creating or
+  updating recipes/ingredients. Ids are deduplicated while pending.
+- One asyncio task drains the queue: it reads the rows' text columns,
+  embeds them in as few API calls as the embeddings input limits allow,
+  and writes each batch's vectors with one set_embeddings() call
+  (migration 044).
+- Each step is retried with exponential backoff. A batch that still fails
+  is dropped; its rows keep embedding IS NULL and are picked up by
+  backfill() on the next startup (or by the offline script).
+- stats() reports the backlog and counters (served on /health).
+- The worker serves every user, so it reads and writes with the service
+  client (set_embeddings is granted to service_role only), and its task
+  starts in a fresh context rather than the enqueuing request's.
+
+Embedding texts come from domain/tools/embedding_text.py, shared with
+scripts/generate_embeddings.py, so vectors from either path are comparable.
+"""
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from alfred_kitchen.db.client import get_service_client
+from alfred_kitchen.domain.tools.embedding_text import create_ingredient_text, create_recipe_text
+from alfred_kitchen.domain.tools.ingredient_lookup import generate_embeddings
+
+logger = logging.getLogger(__name__)
+
+# Embeddings API limits per request (text-embedding-3-small)
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = 300_000
+CHARS_PER_TOKEN = 3  # Conservative estimate (English averages ~4)
+
+# Ids per PostgREST `in.(...)` read, keeps the URL short
+FETCH_CHUNK = 200
+
+# Rows with embedding IS NULL enqueued per table by backfill()
+BACKFILL_LIMIT = 5000
+
+# Retry policy (per fetch / embed / write step)
+RETRY_ATTEMPTS = 4
+RETRY_DELAY_SECONDS = 1.0
+
+
+# table -> (columns to read, text builder)
+EMBEDDED_TABLES: dict[str, tuple[str, Callable[[dict], str]]] = {
+    "recipes": ("id, user_id, name, description", create_recipe_text),
+    "ingredients": ("id, name, category, aliases, parent_category, family, cuisines", create_ingredient_text),
+}
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _batches(rows: list[dict], text_for: Callable[[dict], str]) -> Iterator[list[tuple[dict, str]]]:
+    """Split rows into (row, text) batches within the per-request API limits."""
+    batch: list[tuple[dict, str]] = []
+    tokens = 0
+    for row in rows:
+        text = text_for(row)
+        cost = _estimate_tokens(text)
+        if batch and (len(batch) == MAX_BATCH_INPUTS or tokens + cost > MAX_BATCH_TOKENS):
+            yield batch
+            batch, tokens = [], 0
+        batch.append((row, text))
+        tokens += cost
+    if batch:
+        yield batch
+
+
+class EmbeddingWorker:
+    """Queue of rows needing embeddings, drained by one background task."""
+
+    def __init__(self) -> None:
+        # table -> pending ids (dict as an insertion-ordered set)
+        self._pending: dict[str, dict[str, None]] = {table: {} for table in EMBEDDED_TABLES}
+        self._worker: asyncio.Task | None = None
+        self._in_flight = 0
+        self._embedded = 0
+        self._failed = 0
+        self._retries = 0
+
+    def enqueue(self, table: str, ids: Iterable[str | None]) -> None:
+        """Queue rows for (re-)embedding. No-op outside an event loop."""
+        if table not in EMBEDDED_TABLES:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts): left for backfill / the offline script
+            return
+
+        pending = self._pending[table]
+        for row_id in ids:
+            if row_id:
+                pending[str(row_id)] = None
+        if self._worker is None and self.backlog():
+            # Not the request's context: its access token would scope the
+            # worker's reads to that user and fail the service-role RPC
+            self._worker = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def backfill(self, limit: int = BACKFILL_LIMIT) -> None:
+        """Enqueue rows that still have no embedding (missed or failed writes)."""
+        for table in EMBEDDED_TABLES:
+            try:
+                ids = await asyncio.to_thread(_select_missing_ids, table, limit)
+            except Exception as e:
+                logger.warning(f"Embedding backfill skipped for {table}: {e}")
+                continue
+            if ids:
+                logger.info(f"Embedding backfill: {len(ids)} {table} rows queued")
+                self.enqueue(table, ids)
+
+    def backlog(self) -> int:
+        """Rows waiting for an embedding (queued + being processed)."""
+        return sum(len(p) for p in self._pending.values()) + self._in_flight
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "backlog": self.backlog(),
+            "embedded": self._embedded,
+            "failed": self._failed,
+            "retries": self._retries,
+        }
+
+    async def drain(self) -> None:
+        """Wait until the queue is empty (tests, shutdown)."""
+        while self._worker is not None:
+            await asyncio.shield(self._worker)
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+
+    def _take(self) -> tuple[str, list[str]]:
+        for table, pending in self._pending.items():
+            if pending:
+                ids = list(islice(pending, MAX_BATCH_INPUTS))
+                for row_id in ids:
+                    del pending[row_id]
+                return table, ids
+        return "", []
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                table, ids = self._take()
+                if not ids:
+                    break
+                self._in_flight = len(ids)
+                try:
+                    await self._process(table, ids)
+                finally:
+                    self._in_flight = 0
+        finally:
+            self._worker = None
+
+    async def _process(self, table: str, ids: list[str]) -> None:
+        try:
+            rows = await self._with_retry(_fetch_rows, table, ids)
+        except Exception as e:
+            self._failed += len(ids)
+            logger.error(f"Embedding fetch failed for {len(ids)} {table} rows: {e}")
+            return
+
+        _, text_for = EMBEDDED_TABLES[table]
+        for batch in _batches(rows, text_for):
+            batch_ids = [row["id"] for row, _ in batch]
+            try:
+                vectors = await self._with_retry(_embed, [text for _, text in batch])
+                await self._with_retry(_write_embeddings, table, batch_ids, vectors)
+            except Exception as e:
+                self._failed += len(batch)
+                logger.error(f"Embedding batch failed for {len(batch)} {table} rows: {e}")
+                continue
+
+            self._embedded += len(batch)
+            self._in_flight -= len(batch)
+            if table == "recipes":
+                from alfred_kitchen.domain.tools.recipe_index import invalidate_recipe_index
+
+                for user_id in {row.get("user_id") for row, _ in batch}:
+                    if user_id:
+                        invalidate_recipe_index(user_id)
+            else:
+                from alfred_kitchen.domain.tools.ingredient_index import invalidate_ingredient_index
+
+                invalidate_ingredient_index()
+
+    async def _with_retry(self, fn: Callable[..., Any], *args: Any) -> Any:
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return await asyncio.to_thread(fn, *args)
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                self._retries += 1
+                delay = RETRY_DELAY_SECONDS * 2 ** attempt
+                logger.warning(f"Embedding step {fn.__name__} failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+
+# =============================================================================
+# Database / API calls
+# =============================================================================
+
+
+def _fetch_rows(table: str, ids: list[str]) -> list[dict]:
+    columns, _ = EMBEDDED_TABLES[table]
+    client = get_service_client()
+    rows: list[dict] = []
+    for i in range(0, len(ids), FETCH_CHUNK):
+        result = client.table(table).select(columns).in_("id", ids[i:i + FETCH_CHUNK]).execute()
+        rows.extend(result.data or [])
+    return rows
+
+
+def _embed(texts: list[str]) -> list[list[float]]:
+    vectors = generate_embeddings(texts)
+    if len(vectors) != len(texts):
+        raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+    return vectors
+
+
+def _write_embeddings(table: str, ids: list[str], vectors: list[list[float]]) -> None:
+    """One bulk UPDATE for the batch (set_embeddings RPC, migration 044)."""
+    get_service_client().rpc("set_embeddings", {
+        "target": table,
+        "ids": ids,
+        # pgvector text format; PostgREST has no vector[] parameter type
+        "embeddings": ["[" + ",".join(map(str, vector)) + "]" for vector in vectors],
+    }).execute()
+
+
+def _select_missing_ids(table: str, limit: int) -> list[str]:
+    result = (
+        get_service_client()
+        .table(table)
+        .select("id")
+        .is_("embedding", "null")
+        .limit(limit)
+        .execute()
+    )
+    return [row["id"] for row in result.data or []]
+
+
+# =============================================================================
+# Module API
+# =============================================================================
+
+_worker: EmbeddingWorker | None = None
+
+
+def get_embedding_worker() -> EmbeddingWorker | None:
+    """The process-wide worker, or None when disabled in settings."""
+    global _worker
+    from alfred_kitchen.config import settings
+
+    if not settings.embedding_worker:
+        return None
+    if _worker is None:
+        _worker = EmbeddingWorker()
+    return _worker
+
+
+def enqueue_embeddings(table: str, rows_or_ids: Iterable[dict | str] | None) -> None:
+    """Queue written rows (or their ids) for embedding; never raises."""
+    worker = get_embedding_worker()
+    if worker is None or not rows_or_ids or table not in EMBEDDED_TABLES:
+        return
+    try:
+        worker.enqueue(table, [r.get("id") if isinstance(r, dict) else r for r in rows_or_ids])
+    except Exception as e:
+        logger.warning(f"Failed to enqueue {table} embeddings: {e}")
@@ -12,7 +12,7 @@ reducing runtime prompt construction overhead.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from alfred_kitchen.db.client import get_client
 
@@ -345,7 +345,8 @@ async def build_kitchen_dashboard(user_id: str) -> KitchenDashboard:
     """
     Build a lightweight kitchen state summary.
     
-    Uses COUNT queries and simple aggregations - no raw data transfer.
+    One kitchen_dashboard RPC (migration 043) aggregates everything in
+    the database. Falls back to per-table queries if the RPC is missing.
     This is designed for Think node to understand data availability.
     
     Args:
@@ -355,6 +356,37 @@ async def build_kitchen_dashboard(user_id: str) -> KitchenDashboard:
         KitchenDashboard with counts and categories
     """
     client = get_client()
+    try:
+        result = client.rpc(
+            "kitchen_dashboard",
+            {"user_id_filter": user_id, "today": date.today().isoformat()},
+        ).execute()
+        if isinstance(result.data, dict):
+            return _dashboard_from_rpc(result.data)
+    except Exception:
+        pass
+    return await _build_kitchen_dashboard_by_table(user_id)
+
+
+def _dashboard_from_rpc(data: dict) -> KitchenDashboard:
+    """Map the kitchen_dashboard JSON payload onto KitchenDashboard."""
+    return KitchenDashboard(
+        inventory_count=int(data.get("inventory_count") or 0),
+        inventory_by_location={k: int(v) for k, v in (data.get("inventory_by_location") or {}).items()},
+        recipe_count=int(data.get("recipe_count") or 0),
+        recipes_by_cuisine={k: int(v) for k, v in (data.get("recipes_by_cuisine") or {}).items()},
+        recipe_names_by_cuisine=data.get("recipe_names_by_cuisine") or {},
+        meal_plan_next_7_days=int(data.get("meal_plan_next_7_days") or 0),
+        meal_plan_days_with_meals=int(data.get("meal_plan_days_with_meals") or 0),
+        shopping_list_count=int(data.get("shopping_list_count") or 0),
+        tasks_incomplete=int(data.get("tasks_incomplete") or 0),
+        last_updated=datetime.utcnow(),
+    )
+
+
+async def _build_kitchen_dashboard_by_table(user_id: str) -> KitchenDashboard:
+    """Pre-043 path: one query per table, aggregated in Python."""
+    client = get_client()
     dashboard = KitchenDashboard()
     
     # 1. Inventory count and breakdown by location
@@ -395,7 +427,6 @@ async def build_kitchen_dashboard(user_id: str) -> KitchenDashboard:
     
     # 3. Meal plan for next 7 days
     try:
-        from datetime import date
         today = date.today().isoformat()
         week_later = (date.today() + timedelta(days=7)).isoformat()
         
@@ -426,7 +457,7 @@ async def build_kitchen_dashboard(user_id: str) -> KitchenDashboard:
     try:
         tasks_result = client.table("tasks").select("id").eq(
             "user_id", user_id
-        ).eq("is_complete", False).execute()
+        ).eq("completed", False).execute()
         
         if tasks_result.data:
             dashboard.tasks_incomplete = len(tasks_result.data)
@@ -33,6 +33,23 @@ class KitchenSettings(CoreSettings):
     session_active_timeout_minutes: int = 30  # Prompt to resume after this
     session_expire_hours: int = 24  # Auto-clear session after this
 
+    # In-process per-user recipe vector index (needs numpy; SQL RPC otherwise)
+    recipe_vector_index: bool = True
+    recipe_vector_index_ttl_seconds: float = 300.0
+
+    # In-process ingredient embedding matrix (needs numpy and migration 045; SQL RPC otherwise).
+    # Snapshots: None = <tmp>/alfred-ingredient-vectors, "" = don't write them
+    ingredient_vector_index: bool = True
+    ingredient_vector_check_seconds: float = 60.0
+    ingredient_vector_snapshot_dir: str | None = None
+
+    # Background embedding of recipes/ingredients on write (see background/embedding_worker.py)
+    embedding_worker: bool = True
+
+    # Shared web-tier state for multiple workers/replicas (see web/backplane.py):
+    # memory:// (single worker), sqlite:///path.db (one host), redis://host:6379/0
+    state_backplane_url: str = "memory://"
+
 
 # Backwards compat alias
 Settings = KitchenSettings
@@ -9,13 +9,20 @@ Two client types:
 
 The get_request_client() function automatically uses the authenticated client
 when an access token is available in the request context.
+
+supabase is imported when the first client is created, not at import time.
 """
 
-from supabase import Client, create_client
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from alfred_kitchen.config import settings
 from alfred_kitchen.db.request_context import get_access_token
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Singleton service client instance (bypasses RLS)
 _service_client: Client | None = None
 
@@ -30,6 +37,8 @@ def get_service_client() -> Client:
     global _service_client
 
     if _service_client is None:
+        from supabase import create_client
+
         _service_client = create_client(
             settings.supabase_url,
             settings.supabase_service_role_key,
@@ -66,6 +75,8 @@ def get_authenticated_client(access_token: str) -> Client:
     Returns:
         Supabase client that will respect RLS policies for the authenticated user
     """
+    from supabase import create_client
+
     client = create_client(
         settings.supabase_url,
         settings.supabase_anon_key,
@@ -161,6 +172,10 @@ async def upsert_ingredient(ingredient: dict) -> dict:
     """Create or update an ingredient."""
     client = get_client()
     response = client.table("ingredients").upsert(ingredient).execute()
+
+    from alfred_kitchen.background.embedding_worker import enqueue_embeddings
+
+    enqueue_embeddings("ingredients", response.data)
     return response.data[0]
 
 
@@ -211,6 +226,12 @@ async def create_recipe(user_id: str, recipe: dict) -> dict:
     recipe_resp = client.table("recipes").insert(recipe_data).execute()
     created_recipe = recipe_resp.data[0]
 
+    from alfred_kitchen.background.embedding_worker import enqueue_embeddings
+    from alfred_kitchen.domain.tools.recipe_index import invalidate_recipe_index
+
+    invalidate_recipe_index(user_id)
+    enqueue_embeddings("recipes", [created_recipe])
+
     # Create recipe ingredients
     if ingredients:
         ingredient_data = [{"recipe_id": created_recipe["id"], **ing} for ing in ingredients]
@@ -295,3 +316,53 @@ async def mark_purchased(item_id: str) -> dict:
     response = client.table("shopping_list").update({"is_purchased": True}).eq("id", item_id).execute()
     return response.data[0]
 
+
+# =============================================================================
+# Name Search (ranked, trigram-indexed; migration 042)
+# =============================================================================
+
+# Tables searchable by search_entity_names, with the column searched
+NAME_SEARCH_COLUMNS = {
+    "recipes": "name",
+    "inventory": "name",
+    "shopping_list": "name",
+    "tasks": "title",
+}
+
+
+def search_entity_names(
+    client: Client,
+    query: str,
+    tables: list[str] | None = None,
+    limit_per_table: int = 5,
+    user_id: str | None = None,
+) -> list[dict]:
+    """
+    Ranked substring search on the name column of user tables, in one call.
+
+    Rows are {table_name, id, label, score}: tables in the order given,
+    best match first within each (exact > prefix > trigram similarity).
+    Without user_id, RLS on the client scopes the rows.
+
+    Raises if the RPC fails (e.g. migration 042 not applied) so callers
+    can fall back to ILIKE queries.
+    """
+    params: dict = {
+        "query": query,
+        "tables": tables or list(NAME_SEARCH_COLUMNS),
+        "limit_per_table": limit_per_table,
+    }
+    if user_id:
+        params["user_id_filter"] = user_id
+    return client.rpc("search_entity_names", params).execute().data or []
+
+
+def search_ingredient_names(client: Client, query: str, limit: int = 50) -> list[dict]:
+    """
+    Ranked substring search on ingredient names (exact > prefix > similarity).
+
+    Rows carry id, name, category, aliases, default_unit and score.
+    Raises if the RPC fails so callers can fall back to ILIKE.
+    """
+    result = client.rpc("search_ingredient_names", {"query": query, "limit_n": limit}).execute()
+    return result.data or []
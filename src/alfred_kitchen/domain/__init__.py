@@ -10,9 +10,14 @@ Usage:
     table = KITCHEN_DOMAIN.type_to_table["recipe"]  # "recipes"
 """
 
+from pathlib import Path
 from typing import Any, Callable
 
 from alfred.domain.base import DomainConfig, EntityDefinition, SubdomainDefinition
+from alfred.prompts.registry import get_template, register_prompt_dir
+
+# Precompile domain templates (system.md, cook.md, brainstorm.md) at import
+register_prompt_dir(Path(__file__).parent / "prompts", prefix="kitchen/")
 
 
 class KitchenConfig(DomainConfig):
@@ -477,9 +482,7 @@ class KitchenConfig(DomainConfig):
 
     def get_system_prompt(self) -> str:
         """Get kitchen system prompt."""
-        from pathlib import Path
-        prompt_path = Path(__file__).parent / "prompts" / "system.md"
-        return prompt_path.read_text(encoding="utf-8")
+        return get_template("kitchen/system").text
 
     def get_quick_write_confirmation(
         self, subdomain: str, count: int, action: str
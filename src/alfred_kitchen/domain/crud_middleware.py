@@ -11,6 +11,7 @@ Domain-specific CRUD intelligence for the kitchen domain:
 """
 
 import logging
+from collections.abc import Collection
 from typing import Any
 
 from alfred.domain.base import CRUDMiddleware, ReadPreprocessResult
@@ -68,15 +69,27 @@ async def _semantic_search_recipes(
     """
     Perform semantic search on recipes using pgvector embeddings.
 
+    Serves from the in-process per-user index when available (exact, and
+    independent of other users' rows); falls back to the
+    match_recipe_semantic RPC.
+
     Returns list of recipe UUIDs that semantically match the query.
     """
     from alfred_kitchen.db.client import get_client
     from alfred_kitchen.domain.tools.ingredient_lookup import generate_embedding
-
-    client = get_client()
+    from alfred_kitchen.domain.tools.recipe_index import get_recipe_index
 
     try:
         query_embedding = generate_embedding(query)
+
+        index = get_recipe_index()
+        if index is not None:
+            ids = await index.search(user_id, query_embedding, limit=limit, max_distance=max_distance)
+            if ids is not None:
+                logger.info(f"Semantic search '{query}' found {len(ids)} recipes (in-process index)")
+                return ids
+
+        client = get_client()
         result = client.rpc(
             "match_recipe_semantic",
             {
@@ -128,21 +141,17 @@ async def _enrich_records_with_ingredient_ids(records: list[dict]) -> list[dict]
     Uses high-confidence threshold (0.85) for writes — only auto-links on strong matches.
     """
     try:
-        from alfred_kitchen.domain.tools.ingredient_lookup import enrich_with_ingredient_id
+        from alfred_kitchen.domain.tools.ingredient_lookup import enrich_batch_with_ingredient_ids
     except ImportError:
         logger.warning("ingredient_lookup module not available, skipping enrichment")
         return records
 
-    enriched = []
-    for record in records:
-        try:
-            enriched_record = await enrich_with_ingredient_id(record, operation="write")
-            enriched.append(enriched_record)
-        except Exception as e:
-            logger.warning(f"Failed to enrich record with ingredient_id: {e}")
-            enriched.append(record)
-
-    return enriched
+    try:
+        # One resolve_ingredients RPC for the whole batch
+        return await enrich_batch_with_ingredient_ids(records, operation="write")
+    except Exception as e:
+        logger.warning(f"Failed to enrich records with ingredient_id: {e}")
+        return records
 
 
 def _deduplicate_batch(records: list[dict], table: str) -> list[dict]:
@@ -239,7 +248,10 @@ class KitchenCRUDMiddleware(CRUDMiddleware):
                 "ingredients(parent_category, family, tier, cuisines)"
             )
 
-        # 3. Fuzzy name matching for recipe searches
+        # 3. Fuzzy name matching for recipe searches. Stays a plain ILIKE
+        # filter: idx_recipes_user_name_trgm (migration 042) serves it with
+        # the user_id filter in the same query, and db_read's id pre-filter
+        # would drop search_entity_names' ranking anyway.
         if table == "recipes":
             for i, f in enumerate(filters):
                 if f.field == "name" and f.op == "=":
@@ -307,5 +319,27 @@ class KitchenCRUDMiddleware(CRUDMiddleware):
             records = await _enrich_records_with_ingredient_ids(records)
         return records
 
+    def after_write(
+        self,
+        table: str,
+        user_id: str,
+        rows: list[dict] | None = None,
+        updated_fields: Collection[str] | None = None,
+    ) -> None:
+        if table in SEMANTIC_SEARCH_TABLES:
+            from alfred_kitchen.domain.tools.recipe_index import invalidate_recipe_index
+
+            invalidate_recipe_index(user_id)
+        if table == "recipes" and updated_fields is not None:
+            from alfred_kitchen.domain.tools.embedding_text import RECIPE_TEXT_FIELDS
+
+            # Rating/tag/time edits don't change the embedded text
+            if RECIPE_TEXT_FIELDS.isdisjoint(updated_fields):
+                return
+        if rows:
+            from alfred_kitchen.background.embedding_worker import enqueue_embeddings
+
+            enqueue_embeddings(table, rows)
+
     def deduplicate_batch(self, table: str, records: list[dict]) -> list[dict]:
         return _deduplicate_batch(records, table)
@@ -11,7 +11,6 @@ On exit, generates a narrative handoff summary for Plan mode.
 import logging
 from collections.abc import AsyncGenerator
 from datetime import date, timedelta
-from pathlib import Path
 from typing import Any
 
 from alfred_kitchen.background.profile_builder import (
@@ -23,19 +22,17 @@ from alfred_kitchen.background.profile_builder import (
 from alfred_kitchen.db.client import get_client
 from alfred.llm.client import call_llm_chat_stream
 from alfred.modes.handoff import generate_session_handoff
+from alfred.prompts.registry import render_template
 
 logger = logging.getLogger(__name__)
 
-_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "brainstorm.md"
-
 # History cap: 40 messages = 20 user/assistant exchanges
 _MAX_HISTORY = 40
 
 
 def _load_brainstorm_prompt(brainstorm_context: str) -> str:
     """Load brainstorm.md and inject kitchen context."""
-    template = _PROMPT_PATH.read_text(encoding="utf-8")
-    return template.replace("{brainstorm_context}", brainstorm_context)
+    return render_template("kitchen/brainstorm", brainstorm_context=brainstorm_context)
 
 
 def _format_inventory_for_prompt(inventory_items: list[dict]) -> str:
@@ -7,26 +7,23 @@ On exit, generates a narrative handoff summary for Plan mode.
 
 import logging
 from collections.abc import AsyncGenerator
-from pathlib import Path
 from typing import Any
 
 from alfred_kitchen.background.profile_builder import format_profile_for_prompt, get_cached_profile
 from alfred.llm.client import call_llm_chat_stream
 from alfred.modes.handoff import generate_session_handoff
+from alfred.prompts.registry import render_template
 from alfred.tools.crud import db_read, DbReadParams, FilterClause
 
 logger = logging.getLogger(__name__)
 
-_PROMPT_PATH = Path(__file__).parent.parent / "prompts" / "cook.md"
-
 # History cap: 20 messages = 10 user/assistant exchanges
 _MAX_HISTORY = 20
 
 
 def _load_cook_prompt(cook_context: str, user_profile: str = "") -> str:
     """Load cook.md and inject frozen recipe context + user profile."""
-    template = _PROMPT_PATH.read_text(encoding="utf-8")
-    return template.replace("{cook_context}", cook_context).replace("{user_profile}", user_profile)
+    return render_template("kitchen/cook", cook_context=cook_context, user_profile=user_profile)
 
 
 def _format_recipe_context(recipe: dict, notes: str = "") -> str:
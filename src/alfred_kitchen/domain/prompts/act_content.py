@@ -214,6 +214,18 @@ Entity Context shows what entities exist and their IDs. Use it to:
 
 **Note:** `limit` and `columns` are TOP-LEVEL params, not inside `filters[]`.
 
+**Several tables at once:** if the step needs independent reads, send them together in `tool_calls` (up to 4) — they run at the same time:
+```json
+{
+  "action": "tool_call",
+  "tool_calls": [
+    {"tool": "db_read", "params": {"table": "inventory", "filters": []}},
+    {"tool": "db_read", "params": {"table": "shopping_list", "filters": []}}
+  ]
+}
+```
+Only batch reads that don't need each other's results.
+
 ---
 
 ## Using Entity IDs from Context
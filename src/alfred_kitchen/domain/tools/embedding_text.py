@@ -0,0 +1,41 @@
+"""
+Embedding text for recipes and ingredients.
+
+The one definition of what gets embedded, shared by the background
+embedding worker (background/embedding_worker.py) and the offline
+backfill (scripts/generate_embeddings.py), so vectors from either path
+are comparable.
+"""
+
+
+def create_ingredient_text(ingredient: dict) -> str:
+    """Name, section, family, category, aliases and cuisines as one string."""
+    parts = [ingredient.get("name") or ""]
+    if parent := ingredient.get("parent_category"):
+        parts.append(f"section: {parent}")
+    if family := ingredient.get("family"):
+        parts.append(f"family: {family}")
+    if category := ingredient.get("category"):
+        parts.append(f"type: {category}")
+    if aliases := ingredient.get("aliases"):
+        parts.append(f"also known as: {', '.join(aliases)}")
+    if cuisines := ingredient.get("cuisines"):
+        parts.append(f"cuisines: {', '.join(cuisines)}")
+    return " | ".join(parts)
+
+
+def create_recipe_text(recipe: dict) -> str:
+    """
+    Name + description: the recipe's "vibe".
+
+    Structured attributes (cuisine, difficulty, time, tags) use exact
+    filters; semantic search is for ambiguous queries like "comfort food".
+    """
+    parts = [recipe.get("name") or ""]
+    if description := recipe.get("description"):
+        parts.append(description[:300])
+    return " | ".join(parts)
+
+
+# Recipe fields the embedding text is built from (other updates keep the vector)
+RECIPE_TEXT_FIELDS = frozenset({"name", "description"})
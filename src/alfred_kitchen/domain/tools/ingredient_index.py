@@ -0,0 +1,294 @@
+"""
+Alfred Kitchen - In-process ingredient embedding matrix.
+
+The semantic step of ingredient lookup used to embed the name and call
+`match_ingredient_semantic` (or send the embeddings to
+`resolve_ingredients`) for every unresolved name, so each lookup paid a
+database round trip on top of the embeddings call.
+
+The catalog is small (~2,500 ingredients, ~15 MB of float32 at 1536
+dims), so it is held in one L2-normalized NumPy matrix per process:
+
+- A lookup is one matrix-vector product; a batch of names is one
+  matrix-matrix product. Distances are cosine, like pgvector's `<=>`, and
+  exact (the HNSW index behind the RPC is approximate).
+- Freshness follows `ingredient_catalog_version()` (migration 045), a
+  counter bumped by a trigger on every catalog change. It is checked at
+  most every `check_interval_seconds`, failed checks included; a new
+  version reloads the matrix in a worker thread, off the event loop.
+- Each version is written to an `.npy` snapshot and memory-mapped, so
+  restarts and sibling workers on the same host skip the reload and share
+  the pages.
+- NumPy is optional (`pip install alfred[perf]`). When it is missing, the
+  index is disabled, migration 045 isn't deployed or a load fails,
+  `nearest()` returns None and callers use the SQL RPCs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from alfred_kitchen.domain.tools.recipe_index import embedding_to_array
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# How often the catalog version is re-read (one cheap RPC)
+DEFAULT_CHECK_INTERVAL_SECONDS = 60.0
+
+# Rows per PostgREST page when loading the catalog (vectors are ~20 KB as text)
+FETCH_PAGE = 500
+
+SNAPSHOT_PREFIX = "ingredients-v"
+
+
+@dataclass
+class _Catalog:
+    version: int
+    ids: list[str]
+    names: list[str]
+    categories: list[str | None]
+    matrix: Any  # np.ndarray (n, dim), float32, rows L2-normalized; may be a memmap
+
+
+class IngredientVectorIndex:
+    """The ingredient catalog's embeddings with exact cosine nearest-neighbour search."""
+
+    def __init__(
+        self,
+        snapshot_dir: str | Path | None = None,
+        check_interval_seconds: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.check_interval_seconds = check_interval_seconds
+        self._catalog: _Catalog | None = None
+        self._checked_at = float("-inf")
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    @property
+    def version(self) -> int | None:
+        return self._catalog.version if self._catalog else None
+
+    def invalidate(self) -> None:
+        """Re-read the catalog version on the next lookup."""
+        self._checked_at = float("-inf")
+
+    def load(self, version: int, rows: list[dict]) -> _Catalog:
+        """Build the matrix from `{"id", "name", "category", "embedding"}` rows."""
+        rows = [r for r in rows if r.get("embedding") is not None]
+        if rows:
+            matrix = np.vstack([embedding_to_array(r["embedding"]) for r in rows])
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1.0, norms)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+
+        self._catalog = _Catalog(
+            version=version,
+            ids=[str(r["id"]) for r in rows],
+            names=[r["name"] for r in rows],
+            categories=[r.get("category") for r in rows],
+            matrix=matrix,
+        )
+        if self.snapshot_dir is not None:
+            try:
+                self._write_snapshot(self._catalog)
+            except OSError as e:
+                logger.warning(f"Ingredient index snapshot not written: {e}")
+        return self._catalog
+
+    def refresh(self) -> _Catalog:
+        """Make the matrix match the catalog's current version (blocking I/O)."""
+        # Before the RPC, so a failed check also waits out the interval
+        self._checked_at = time.monotonic()
+        version = _fetch_catalog_version()
+        if self._catalog is not None and self._catalog.version == version:
+            return self._catalog
+        catalog = self._read_snapshot(version)
+        if catalog is not None:
+            self._catalog = catalog
+            logger.info(f"Ingredient index: mapped snapshot v{version} ({len(catalog.ids)} rows)")
+            return catalog
+        catalog = self.load(version, _fetch_catalog_rows())
+        logger.info(f"Ingredient index: loaded v{version} ({len(catalog.ids)} rows)")
+        return catalog
+
+    async def _current(self) -> _Catalog | None:
+        """The catalog to search, or None until one has loaded."""
+        if time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return self._catalog
+        # Claim the check here: lookups arriving while the thread loads use
+        # the previous catalog (or SQL) instead of starting loads of their own
+        self._checked_at = time.monotonic()
+        return await asyncio.to_thread(self.refresh)
+
+    async def nearest(
+        self,
+        query_embeddings: list[list[float]],
+        limit: int = 1,
+        max_distance: float = 0.5,
+    ) -> list[list[dict]] | None:
+        """
+        Per query, the `limit` nearest ingredients within `max_distance`, nearest first.
+
+        Rows have the `match_ingredient_semantic` shape (id, name, category,
+        distance). Returns None when the index can't serve the queries and
+        the caller should use SQL.
+        """
+        if not self.available:
+            return None
+        try:
+            catalog = await self._current()
+        except Exception as e:
+            logger.warning(f"Ingredient index unavailable, using SQL: {e}")
+            return None
+        if catalog is None:
+            return None
+        if not query_embeddings:
+            return []
+        if not catalog.ids:
+            return [[] for _ in query_embeddings]
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1.0, norms)
+        distances = 1.0 - queries @ catalog.matrix.T  # (queries, catalog)
+
+        k = min(limit, len(catalog.ids))
+        if k < len(catalog.ids):
+            candidates = np.argpartition(distances, k, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(catalog.ids)), distances.shape)
+
+        results = []
+        for row, cols in zip(distances, candidates):
+            hits = []
+            for i in cols[np.argsort(row[cols], kind="stable")]:
+                if row[i] > max_distance:
+                    break
+                hits.append({
+                    "id": catalog.ids[i],
+                    "name": catalog.names[i],
+                    "category": catalog.categories[i],
+                    "distance": float(row[i]),
+                })
+            results.append(hits)
+        return results
+
+    # -------------------------------------------------------------------------
+    # Snapshots: <dir>/ingredients-v<version>.npy (+ .json with ids/names)
+    # -------------------------------------------------------------------------
+
+    def _snapshot_paths(self, version: int) -> tuple[Path, Path]:
+        stem = self.snapshot_dir / f"{SNAPSHOT_PREFIX}{version}"
+        return stem.with_suffix(".npy"), stem.with_suffix(".json")
+
+    def _read_snapshot(self, version: int) -> _Catalog | None:
+        if self.snapshot_dir is None:
+            return None
+        matrix_path, meta_path = self._snapshot_paths(version)
+        try:
+            meta = json.loads(meta_path.read_text())
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if matrix.ndim != 2 or len(meta["ids"]) != matrix.shape[0]:
+            return None
+        return _Catalog(version, meta["ids"], meta["names"], meta["categories"], matrix)
+
+    def _write_snapshot(self, catalog: _Catalog) -> None:
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        matrix_path, meta_path = self._snapshot_paths(catalog.version)
+        # Write-then-rename: a sibling worker never maps a half-written file
+        for path, write in (
+            (matrix_path, lambda f: np.save(f, catalog.matrix)),
+            (meta_path, lambda f: f.write(json.dumps({
+                "ids": catalog.ids, "names": catalog.names, "categories": catalog.categories,
+            }).encode())),
+        ):
+            fd, tmp = tempfile.mkstemp(dir=self.snapshot_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        # Keep only the current version
+        current = {matrix_path.name, meta_path.name}
+        for old in self.snapshot_dir.glob(f"{SNAPSHOT_PREFIX}*"):
+            if old.name not in current:
+                old.unlink(missing_ok=True)
+
+
+def _fetch_catalog_version() -> int:
+    from alfred_kitchen.db.client import get_service_client
+
+    version = get_service_client().rpc("ingredient_catalog_version", {}).execute().data
+    if not isinstance(version, int):
+        raise ValueError(f"ingredient_catalog_version() returned {version!r}")
+    return version
+
+
+def _fetch_catalog_rows() -> list[dict]:
+    from alfred_kitchen.db.client import get_service_client
+
+    client = get_service_client()
+    rows: list[dict] = []
+    while True:
+        page = (
+            client.table("ingredients")
+            .select("id, name, category, embedding")
+            .not_.is_("embedding", "null")
+            .order("id")
+            .range(len(rows), len(rows) + FETCH_PAGE - 1)
+            .execute()
+        ).data or []
+        rows.extend(page)
+        if len(page) < FETCH_PAGE:
+            return rows
+
+
+# =============================================================================
+# Module-level singleton
+# =============================================================================
+
+_index: IngredientVectorIndex | None = None
+
+
+def get_ingredient_index() -> IngredientVectorIndex | None:
+    """The process-wide index, or None when disabled in settings or NumPy is missing."""
+    global _index
+    from alfred_kitchen.config import settings
+
+    if not settings.ingredient_vector_index or np is None:
+        return None
+    if _index is None:
+        snapshot_dir = settings.ingredient_vector_snapshot_dir
+        if snapshot_dir is None:
+            # Per database: catalog versions of different projects don't compare
+            project = hashlib.sha256(settings.supabase_url.encode()).hexdigest()[:12]
+            snapshot_dir = Path(tempfile.gettempdir()) / "alfred-ingredient-vectors" / project
+        _index = IngredientVectorIndex(
+            snapshot_dir=snapshot_dir or None,
+            check_interval_seconds=settings.ingredient_vector_check_seconds,
+        )
+    return _index
+
+
+def invalidate_ingredient_index() -> None:
+    """Call after writing ingredients: re-check the catalog version on next lookup."""
+    if _index is not None:
+        _index.invalidate()
@@ -12,14 +12,18 @@ Threshold strategy varies by operation:
 - Read operations (search expansion): Lower threshold (0.6+) for broader matches
 """
 
+from __future__ import annotations
+
 import logging
 from dataclasses import dataclass
-from typing import Literal
-
-from openai import OpenAI
+from typing import TYPE_CHECKING, Literal
 
 from alfred_kitchen.config import settings
 from alfred_kitchen.db.client import get_client
+from alfred_kitchen.domain.tools.ingredient_index import IngredientVectorIndex, get_ingredient_index
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,9 @@ THRESHOLDS = {
 # Embedding model (same as generate_embeddings.py)
 EMBEDDING_MODEL = "text-embedding-3-small"
 
+# Semantic step cutoff (cosine distance), as resolve_ingredients() defaults
+SEMANTIC_MAX_DISTANCE = 0.7
+
 
 # =============================================================================
 # Data Classes
@@ -68,6 +75,8 @@ def _get_openai_client() -> OpenAI:
     """Get or create OpenAI client."""
     global _openai_client
     if _openai_client is None:
+        from openai import OpenAI
+
         _openai_client = OpenAI(api_key=settings.openai_api_key)
     return _openai_client
 
@@ -82,6 +91,16 @@ def generate_embedding(text: str) -> list[float]:
     return response.data[0].embedding
 
 
+def generate_embeddings(texts: list[str]) -> list[list[float]]:
+    """Generate embeddings for many strings in one API call (input order kept)."""
+    client = _get_openai_client()
+    response = client.embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=texts,
+    )
+    return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
 # =============================================================================
 # Lookup Functions
 # =============================================================================
@@ -181,26 +200,32 @@ async def lookup_ingredient_semantic(
     """
     Try semantic match using vector similarity.
     
-    Generates embedding for the query and searches against ingredient embeddings.
+    Generates embedding for the query and searches against ingredient embeddings
+    (the in-process matrix when available, else the match_ingredient_semantic RPC).
     """
     client = get_client()
     
     try:
         # Generate embedding for the query
         query_embedding = generate_embedding(name)
+
+        index = get_ingredient_index()
+        hits = await index.nearest([query_embedding], limit=1, max_distance=max_distance) if index else None
+        if hits is not None:
+            rows = hits[0]
+        else:
+            # Try using the Postgres function
+            rows = client.rpc(
+                "match_ingredient_semantic",
+                {
+                    "query_embedding": query_embedding,
+                    "limit_n": 1,
+                    "max_distance": max_distance
+                }
+            ).execute().data
         
-        # Try using the Postgres function
-        result = client.rpc(
-            "match_ingredient_semantic",
-            {
-                "query_embedding": query_embedding,
-                "limit_n": 1,
-                "max_distance": max_distance
-            }
-        ).execute()
-        
-        if result.data:
-            row = result.data[0]
+        if rows:
+            row = rows[0]
             # Convert distance to confidence (lower distance = higher confidence)
             confidence = 1.0 - row["distance"]
             return IngredientMatch(
@@ -235,7 +260,7 @@ async def lookup_ingredient(
         If limit=1: Single IngredientMatch or None
         If limit>1: List of IngredientMatch (may be empty)
     
-    Algorithm:
+    Algorithm (see resolve_ingredients):
     1. EXACT STRING MATCH - name/alias exact match
     2. FUZZY STRING (>0.85) - high confidence whole-string match  
     3. WORD-BY-WORD - extract words, score by match count + similarity sum
@@ -248,7 +273,120 @@ async def lookup_ingredient(
     if limit > 1:
         return await _lookup_ingredient_multi(name, limit, use_semantic)
     
-    # Single match (original behavior)
+    return (await resolve_ingredients([name], use_semantic=use_semantic))[name]
+
+
+async def resolve_ingredients(
+    names: list[str],
+    use_semantic: bool = True,
+) -> dict[str, IngredientMatch | None]:
+    """
+    Run the single-match cascade for many names in one RPC.
+
+    Uses the resolve_ingredients() Postgres function (migration 041):
+    exact → fuzzy (≥0.85) → word-by-word → semantic, all server-side.
+    Word extraction stays here (_cascade_words) so the skip list has one
+    source of truth.
+
+    The RPC first runs without embeddings. With use_semantic, only the
+    names it leaves unresolved are embedded (one API call) and matched:
+    locally in one matrix product when the in-process ingredient matrix
+    (ingredient_index.py) is available, else by a semantic-only RPC.
+    A batch whose names all match by string never calls the embeddings API.
+
+    Falls back to the client-side cascade, per name, if the function
+    isn't deployed.
+
+    Returns:
+        Dict mapping each input name to its IngredientMatch (or None)
+    """
+    unique = list(dict.fromkeys(n for n in names if n and n.strip()))
+    results: dict[str, IngredientMatch | None] = {n: None for n in names}
+    if not unique:
+        return results
+
+    params: dict = {
+        "queries": unique,
+        "query_words": [" ".join(sorted(_cascade_words(n))) for n in unique],
+        "fuzzy_threshold": 0.85,
+    }
+    try:
+        rows = get_client().rpc("resolve_ingredients", params).execute().data or []
+    except Exception as e:
+        logger.debug(f"resolve_ingredients RPC failed, using client-side cascade: {e}")
+        for n in unique:
+            results[n] = await _lookup_ingredient_cascade(n, use_semantic)
+        return results
+
+    for row in rows:
+        results[unique[row["query_index"]]] = _match_from_row(row)
+
+    unresolved = [n for n in unique if results[n] is None]
+    if use_semantic and unresolved:
+        results.update(await _resolve_semantic(get_ingredient_index(), unresolved))
+    return results
+
+
+def _match_from_row(row: dict) -> IngredientMatch:
+    return IngredientMatch(
+        id=row["id"],
+        name=row["name"],
+        category=row.get("category"),
+        match_type=row["match_type"],
+        confidence=row["confidence"],
+    )
+
+
+async def _resolve_semantic(
+    index: IngredientVectorIndex | None,
+    names: list[str],
+) -> dict[str, IngredientMatch]:
+    """Semantic step for names the RPC left unresolved: one embeddings call, one matrix product."""
+    try:
+        embeddings = generate_embeddings(names)
+    except Exception as e:
+        logger.debug(f"Batch embedding failed, skipping semantic step: {e}")
+        return {}
+
+    hits = None
+    if index is not None:
+        hits = await index.nearest(embeddings, limit=1, max_distance=SEMANTIC_MAX_DISTANCE)
+    if hits is None:
+        # No index, or it can't serve: let resolve_ingredients() run just the semantic step
+        try:
+            rows = get_client().rpc("resolve_ingredients", {
+                "queries": names,
+                "fuzzy_threshold": 0.85,
+                "query_embeddings": embeddings,
+            }).execute().data or []
+        except Exception as e:
+            logger.debug(f"resolve_ingredients semantic retry failed: {e}")
+            return {}
+        return {names[row["query_index"]]: _match_from_row(row) for row in rows}
+
+    return {
+        name: IngredientMatch(
+            id=found[0]["id"],
+            name=found[0]["name"],
+            category=found[0].get("category"),
+            match_type="semantic",
+            confidence=1.0 - found[0]["distance"],
+        )
+        for name, found in zip(names, hits)
+        if found
+    }
+
+
+def _cascade_words(name: str) -> set[str]:
+    """Word-by-word terms for a name: meaningful words, lowercased, trailing s stripped."""
+    return {w.lower().rstrip('s') for w in _extract_ingredient_words(name) if len(w) >= 3}
+
+
+async def _lookup_ingredient_cascade(
+    name: str,
+    use_semantic: bool = True,
+) -> IngredientMatch | None:
+    """Client-side cascade (one round-trip per step/word); fallback for resolve_ingredients."""
     # 1. EXACT STRING MATCH
     match = await lookup_ingredient_exact(name)
     if match:
@@ -368,7 +506,7 @@ async def _word_by_word_match(words: list[str]) -> IngredientMatch | None:
     if not words:
         return None
     
-    input_words = {w.lower().rstrip('s') for w in words if len(w) >= 3}
+    input_words = {w.lower().rstrip('s') for w in words if len(w) >= 3}  # == _cascade_words
     if not input_words:
         return None
     
@@ -474,10 +612,7 @@ async def lookup_ingredients_batch(
     Returns:
         Dict mapping each input name to its IngredientMatch (or None)
     """
-    results = {}
-    for name in names:
-        results[name] = await lookup_ingredient(name, operation, use_semantic)
-    return results
+    return await resolve_ingredients(names, use_semantic=use_semantic)
 
 
 # =============================================================================
@@ -546,7 +681,23 @@ async def enrich_batch_with_ingredient_ids(
     Returns:
         List of enriched records
     """
-    return [await enrich_with_ingredient_id(r, operation, use_resolver) for r in records]
+    if use_resolver:
+        return [await enrich_with_ingredient_id(r, operation, use_resolver) for r in records]
+
+    # One resolve_ingredients RPC for every record that needs linking
+    names = [r["name"] for r in records if r.get("name") and not r.get("ingredient_id")]
+    matches = await resolve_ingredients(names, use_semantic=False) if names else {}
+
+    enriched = []
+    for record in records:
+        match = matches.get(record.get("name")) if not record.get("ingredient_id") else None
+        if match:
+            record = {**record, "ingredient_id": match.id}
+            if match.category:
+                record["category"] = match.category
+            logger.info(f"Linked '{record['name']}' to ingredient '{match.name}' ({match.match_type})")
+        enriched.append(record)
+    return enriched
 
 
 async def expand_search_with_similar(
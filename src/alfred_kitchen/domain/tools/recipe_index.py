@@ -0,0 +1,218 @@
+"""
+Alfred Kitchen - Per-user in-process recipe vector index.
+
+`match_recipe_semantic` orders by `<=>` over an ivfflat index on *all*
+users' recipes and filters by user_id afterwards. With the default single
+probe, a user's best matches are often in lists the scan never visits, so
+recall is poor, and latency grows with the whole table rather than with
+the user's library.
+
+A user has at most a few hundred (rarely a few thousand) recipes, so an
+exact brute-force scan over their own embeddings is both faster and
+exact:
+
+- Embeddings are loaded lazily, once per user, into a float32 NumPy
+  matrix with L2-normalized rows. Cosine distance is then `1 - M @ q`.
+  The load (paged reads, parsing) runs in a worker thread, off the event
+  loop.
+- Every recipe write invalidates the user's entry
+  (`invalidate_recipe_index`). A TTL catches writes made by other
+  processes, such as the embedding backfill script.
+- NumPy is optional (`pip install alfred[perf]`). When it is missing, or
+  the index is disabled or a load fails, `search()` returns None and the
+  caller falls back to the SQL RPC.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Users kept in memory at once (LRU). ~6 KB per recipe at 1536 dims.
+MAX_USERS = 64
+
+# Reload after this long even without a local write (other processes write too)
+DEFAULT_TTL_SECONDS = 300.0
+
+# Rows per PostgREST page when loading a library (max-rows caps one select)
+FETCH_PAGE = 500
+
+
+def embedding_to_array(value: Any) -> Any:
+    """Parse a pgvector value (PostgREST returns "[0.1,0.2,...]") into float32."""
+    if isinstance(value, str):
+        # Parses straight to float32 (no intermediate list of Python floats)
+        return np.fromstring(value.strip("[]"), dtype=np.float32, sep=",")
+    return np.asarray(value, dtype=np.float32)
+
+
+@dataclass
+class _UserIndex:
+    ids: list[str]
+    matrix: Any  # np.ndarray (n, dim), float32, rows L2-normalized
+    loaded_at: float
+
+
+class RecipeVectorIndex:
+    """LRU of per-user recipe embedding matrices with exact cosine top-k."""
+
+    def __init__(self, max_users: int = MAX_USERS, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._users: OrderedDict[str, _UserIndex] = OrderedDict()
+        self._invalidations = 0
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """Drop one user's matrix (or all of them) so the next search reloads."""
+        self._invalidations += 1
+        if user_id is None:
+            self._users.clear()
+        else:
+            self._users.pop(user_id, None)
+
+    def load(self, user_id: str, rows: list[dict]) -> _UserIndex:
+        """Build a user's matrix from `{"id", "embedding"}` rows."""
+        return self._remember(user_id, _build_entry(rows))
+
+    def _remember(self, user_id: str, entry: _UserIndex) -> _UserIndex:
+        self._users[user_id] = entry
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return entry
+
+    async def _get(self, user_id: str) -> _UserIndex:
+        entry = self._users.get(user_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl_seconds:
+            self._users.move_to_end(user_id)
+            return entry
+        invalidations = self._invalidations
+        entry = await asyncio.to_thread(lambda: _build_entry(_fetch_recipe_embeddings(user_id)))
+        if invalidations != self._invalidations:
+            return entry  # A write landed mid-load: serve it, but don't cache it
+        return self._remember(user_id, entry)
+
+    async def search(
+        self,
+        user_id: str,
+        query_embedding: list[float],
+        limit: int = 20,
+        max_distance: float = 0.6,
+    ) -> list[str] | None:
+        """
+        Recipe IDs within `max_distance` (cosine) of the query, nearest first.
+
+        Same contract as the `match_recipe_semantic` RPC. Returns None when
+        the index can't serve the query and the caller should use SQL.
+        """
+        if not self.available:
+            return None
+        try:
+            entry = await self._get(user_id)
+        except Exception as e:
+            logger.warning(f"Recipe index load failed for {user_id}, using SQL: {e}")
+            return None
+        return top_k(entry.ids, entry.matrix, query_embedding, limit, max_distance)
+
+
+def top_k(
+    ids: list[str],
+    matrix: Any,
+    query_embedding: Any,
+    limit: int,
+    max_distance: float,
+) -> list[str]:
+    """Exact cosine top-k over L2-normalized rows."""
+    if not ids:
+        return []
+    query = np.asarray(query_embedding, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm == 0:
+        return []
+    distances = 1.0 - matrix @ (query / norm)
+
+    if limit < len(ids):
+        candidates = np.argpartition(distances, limit)[:limit]
+    else:
+        candidates = np.arange(len(ids))
+    candidates = candidates[distances[candidates] <= max_distance]
+    ordered = candidates[np.argsort(distances[candidates], kind="stable")]
+    return [ids[i] for i in ordered]
+
+
+def _build_entry(rows: list[dict]) -> _UserIndex:
+    ids: list[str] = []
+    vectors = []
+    for row in rows:
+        if row.get("embedding") is None:
+            continue
+        ids.append(str(row["id"]))
+        vectors.append(embedding_to_array(row["embedding"]))
+
+    if vectors:
+        matrix = np.vstack(vectors)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    return _UserIndex(ids=ids, matrix=matrix, loaded_at=time.monotonic())
+
+
+def _fetch_recipe_embeddings(user_id: str) -> list[dict]:
+    from alfred_kitchen.db.client import get_client
+
+    client = get_client()
+    rows: list[dict] = []
+    while True:
+        page = (
+            client.table("recipes")
+            .select("id, embedding")
+            .eq("user_id", user_id)
+            .not_.is_("embedding", "null")
+            .order("id")
+            .range(len(rows), len(rows) + FETCH_PAGE - 1)
+            .execute()
+        ).data or []
+        rows.extend(page)
+        if len(page) < FETCH_PAGE:
+            return rows
+
+
+# =============================================================================
+# Module-level singleton
+# =============================================================================
+
+_index: RecipeVectorIndex | None = None
+
+
+def get_recipe_index() -> RecipeVectorIndex | None:
+    """The process-wide index, or None when disabled in settings."""
+    global _index
+    from alfred_kitchen.config import settings
+
+    if not settings.recipe_vector_index:
+        return None
+    if _index is None:
+        _index = RecipeVectorIndex(ttl_seconds=settings.recipe_vector_index_ttl_seconds)
+    return _index
+
+
+def invalidate_recipe_index(user_id: str | None = None) -> None:
+    """Call after any write to a user's recipes."""
+    if _index is not None:
+        _index.invalidate(user_id)
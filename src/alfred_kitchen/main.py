@@ -168,6 +168,11 @@ def chat(
     if tracker.calls:
         summary = tracker.summary()
         console.print(f"\n[dim]Session Cost: ${summary['total_cost_usd']:.4f} ({summary['total_input_tokens']:,} in / {summary['total_output_tokens']:,} out tokens)[/dim]")
+        if summary["total_cached_tokens"]:
+            by_node = ", ".join(
+                f"{node} {ratio:.0%}" for node, ratio in summary["cache_hit_ratio_by_node"].items()
+            )
+            console.print(f"[dim]Prompt cache: {summary['cache_hit_ratio']:.0%} of input tokens ({by_node})[/dim]")
 
 
 def _show_conversation_context(conversation: dict, turn_count: int) -> None:
@@ -282,6 +287,39 @@ def version() -> None:
     console.print(f"Alfred V3 version {__version__}")
 
 
+@app.command("startup-profile")
+def startup_profile(
+    target: str = typer.Argument("web", help="web, cli, or a module name to import"),
+    top: int = typer.Option(20, "--top", "-n", help="Number of modules to show"),
+) -> None:
+    """Profile cold import time of the server, the CLI or any module."""
+    from rich.table import Table
+
+    from alfred.observability.import_profile import cold_import_seconds, profile_import
+    from alfred_kitchen.web.warmup import DEFERRED_MODULES
+
+    module = {"web": "alfred_kitchen.web.app", "cli": "alfred_kitchen.main"}.get(target, target)
+
+    with Live(Spinner("dots", text=f"Importing {module}..."), console=console, transient=True):
+        profile = profile_import(module)
+        wall_s = cold_import_seconds(module)
+
+    table = Table(title=f"Slowest imports under {module}")
+    table.add_column("Module")
+    table.add_column("Cumulative ms", justify="right")
+    table.add_column("Self ms", justify="right")
+    for timing in profile.heaviest(top):
+        table.add_row("  " * timing.depth + timing.module, f"{timing.cumulative_ms:.1f}", f"{timing.self_ms:.1f}")
+    console.print(table)
+
+    console.print(f"\n[bold]Cold import:[/bold] {wall_s * 1000:.0f}ms wall ({profile.total_ms:.0f}ms under -X importtime)")
+    loaded = profile.loaded(*DEFERRED_MODULES)
+    if loaded:
+        console.print(f"[yellow]WARN[/yellow] Deferred modules imported at load time: {', '.join(loaded)}")
+    else:
+        console.print("[green]OK[/green] No deferred modules imported at load time")
+
+
 @app.command()
 def serve(
     port: int = typer.Option(8000, "--port", "-p", help="Port to run on"),
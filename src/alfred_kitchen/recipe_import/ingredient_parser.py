@@ -12,8 +12,6 @@ import json
 import logging
 from dataclasses import dataclass
 
-from openai import AsyncOpenAI
-
 from alfred_kitchen.config import settings
 from alfred.tools.schema import get_table_schema
 
@@ -117,6 +115,8 @@ async def parse_ingredients_batch(
     if not raw_ingredients:
         return []
 
+    from openai import AsyncOpenAI
+
     client = AsyncOpenAI(api_key=settings.openai_api_key)
 
     # Get dynamic schema for prompt
@@ -204,24 +204,25 @@ async def parse_and_link_ingredients(
     Returns:
         List of dicts ready for recipe_ingredients table with ingredient_id
     """
-    from alfred_kitchen.domain.tools.ingredient_lookup import lookup_ingredient
+    from alfred_kitchen.domain.tools.ingredient_lookup import resolve_ingredients
 
     # Parse raw strings
     parsed = await parse_ingredients_batch(raw_ingredients)
 
-    # Link to master ingredients DB
+    # Link to master ingredients DB (one resolve_ingredients RPC for the recipe)
+    matches = {}
+    try:
+        matches = await resolve_ingredients([p.ingredient_name for p in parsed if p.ingredient_name.strip()])
+    except Exception as e:
+        logger.warning(f"Ingredient lookup failed for recipe import: {e}")
+
     results = []
     for p in parsed:
         # Skip empty ingredients
         if not p.ingredient_name.strip():
             continue
 
-        # Try to find matching ingredient in DB
-        match = None
-        try:
-            match = await lookup_ingredient(p.ingredient_name, operation="write")
-        except Exception as e:
-            logger.warning(f"Ingredient lookup failed for '{p.ingredient_name}': {e}")
+        match = matches.get(p.ingredient_name)
 
         results.append(
             {
@@ -7,6 +7,8 @@ Uses Supabase Auth with Google OAuth for authentication.
 import asyncio
 import json
 import logging
+import os
+import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -16,13 +18,12 @@ from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from supabase import Client
 
 from sse_starlette.sse import EventSourceResponse
 
-from alfred_kitchen.db.client import get_service_client, get_authenticated_client
+from alfred_kitchen.background.embedding_worker import get_embedding_worker
+from alfred_kitchen.db.client import get_service_client, get_authenticated_client, search_ingredient_names
 from alfred_kitchen.db.request_context import set_request_context, clear_request_context
-from alfred.graph.workflow import run_alfred
 from alfred.memory.conversation import initialize_conversation
 from alfred.graph.state import ConversationContext
 from alfred_kitchen.config import settings
@@ -37,7 +38,6 @@ from alfred_kitchen.web.session import (
 )
 from alfred_kitchen.web.jobs import (
     create_job,
-    start_job,
     complete_job,
     fail_job,
     acknowledge_job,
@@ -56,6 +56,9 @@ except ImportError:
 
 # Schema-driven UI routes
 from alfred_kitchen.web.auth import AuthenticatedUser, get_current_user
+from alfred_kitchen.web.backplane import get_backplane
+from alfred_kitchen.web.turns import Turn, get_turn_scheduler, turn_key
+from alfred_kitchen.web.warmup import warmup, warmup_status
 from alfred_kitchen.web.schema_routes import router as schema_router
 from alfred_kitchen.web.entity_routes import router as entity_router
 from alfred_kitchen.web.context_routes import router as context_router
@@ -63,21 +66,50 @@ from alfred_kitchen.web.recipe_import_routes import router as recipe_import_rout
 
 logger = logging.getLogger(__name__)
 
-# In-memory conversation store (keyed by user_id)
-# Note: In production, consider using Redis or database for persistence
-conversations: dict[str, dict[str, Any]] = {}
 
 app = FastAPI(title="Alfred", version="2.0.0")
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Log configuration on startup."""
+    """Log configuration and schedule warmup on startup."""
     from alfred.llm.prompt_logger import get_logging_status
+    from alfred.prompts.registry import start_prompt_watcher
     status = get_logging_status()
     logger.info(f"Alfred starting up...")
     logger.info(f"  Prompt file logging: {status['file_logging']} (ALFRED_LOG_PROMPTS={status['env_ALFRED_LOG_PROMPTS']})")
     logger.info(f"  Prompt DB logging: {status['db_logging']} (ALFRED_LOG_TO_DB={status['env_ALFRED_LOG_TO_DB']})")
+    # ALFRED_WATCH_PROMPTS=1 - hot-reload edited templates (development only)
+    if os.getenv("ALFRED_WATCH_PROMPTS", "").lower() in ("1", "true", "yes"):
+        start_prompt_watcher()
+    # Deferred imports load once the server is answering health checks
+    asyncio.create_task(_after_startup())
+
+
+async def _after_startup() -> None:
+    """Preload deferred modules and prompts, then backfill embeddings."""
+    from alfred.prompts.registry import warmup_prompts
+
+    await warmup()
+    logger.info(f"  Prompt templates: {warmup_prompts()} precompiled")
+    # Embed rows written while no worker was running (or whose batch failed)
+    embedding_worker = get_embedding_worker()
+    if embedding_worker is not None:
+        await embedding_worker.backfill()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush write-behind job updates, onboarding sessions and queued embeddings before the process exits."""
+    from alfred_kitchen.web.jobs import get_job_store
+    await get_job_store().drain()
+    embedding_worker = get_embedding_worker()
+    if embedding_worker is not None:
+        await embedding_worker.drain()
+    if ONBOARDING_AVAILABLE:
+        from onboarding.session_store import get_session_store
+        await get_session_store().flush_all()
+    await get_backplane().close()
 
 
 # CORS middleware for React frontend dev server
@@ -105,8 +137,17 @@ app.include_router(recipe_import_router, prefix="/api")
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for Railway."""
-    return {"status": "healthy"}
+    """Health check endpoint for Railway (plus background/speculation metrics)."""
+    health: dict[str, Any] = {"status": "healthy"}
+    health["warmup"] = warmup_status()
+    embedding_worker = get_embedding_worker()
+    if embedding_worker is not None:
+        health["embeddings"] = embedding_worker.stats()
+    health["turns"] = get_turn_scheduler().stats()
+    if settings.alfred_speculative_think:
+        from alfred.graph.speculation import get_speculation_stats
+        health["speculation"] = get_speculation_stats().summary()
+    return health
 
 
 # =============================================================================
@@ -142,19 +183,19 @@ class ChatRequest(BaseModel):
 # AuthenticatedUser and get_current_user imported from alfred_kitchen.web.auth
 
 
-def get_user_conversation(user_id: str, access_token: str | None = None) -> dict[str, Any]:
+async def get_user_conversation(user_id: str, access_token: str | None = None) -> dict[str, Any]:
     """Get or create conversation state for a user.
 
-    Uses memory cache first, falls back to database, creates fresh if neither exists.
+    Uses the backplane cache first, falls back to database, creates fresh if neither exists.
     Handles session expiration and ensures metadata is present.
 
     Args:
         user_id: User's UUID
         access_token: User's JWT for DB access (optional for backward compat)
     """
-    # 1. Check memory cache
-    if user_id in conversations:
-        conv = conversations[user_id]
+    # 1. Check the backplane cache
+    conv = await get_backplane().get_conversation(user_id)
+    if conv is not None:
         if not is_session_expired(conv):
             _ensure_metadata(conv)
             return conv
@@ -164,12 +205,12 @@ def get_user_conversation(user_id: str, access_token: str | None = None) -> dict
     if access_token:
         conv = load_conversation_from_db(access_token, user_id)
         if conv and not is_session_expired(conv):
-            conversations[user_id] = conv  # Cache it
+            await get_backplane().set_conversation(user_id, conv)  # Cache it
             return conv
 
     # 3. Create fresh session
     conv = create_fresh_session()
-    conversations[user_id] = conv
+    await get_backplane().set_conversation(user_id, conv)
     return conv
 
 
@@ -206,6 +247,7 @@ async def get_me(user: AuthenticatedUser = Depends(get_current_user)):
 @app.post("/api/chat")
 async def chat(req: ChatRequest, user: AuthenticatedUser = Depends(get_current_user)):
     """Send a message to Alfred."""
+    from alfred.graph.workflow import run_alfred
     from alfred.llm.prompt_logger import enable_prompt_logging, set_user_id, get_session_log_dir
 
     # Convert ui_changes to dict format for workflow
@@ -213,14 +255,12 @@ async def chat(req: ChatRequest, user: AuthenticatedUser = Depends(get_current_u
     if req.ui_changes:
         ui_changes_data = [c.model_dump() for c in req.ui_changes]
 
-    # Create and start job
-    job_id = create_job(user.access_token, user.id, {
+    # Create job (status "running"; the insert is written behind unless shared)
+    job_id = await create_job(user.access_token, user.id, {
         "message": req.message,
         "mode": req.mode,
         "ui_changes": ui_changes_data,
     })
-    if job_id:
-        start_job(user.access_token, job_id)
 
     try:
         # Enable prompt logging based on user preference
@@ -232,33 +272,35 @@ async def chat(req: ChatRequest, user: AuthenticatedUser = Depends(get_current_u
         # Set request context for authenticated DB access
         set_request_context(access_token=user.access_token, user_id=user.id)
 
-        # Get conversation from user's session (with DB fallback)
-        conversation = get_user_conversation(user.id, user.access_token)
+        # One turn at a time per user (shared with streamed turns)
+        async with get_backplane().turn_lock(user.id):
+            # Get conversation from user's session (with DB fallback)
+            conversation = await get_user_conversation(user.id, user.access_token)
 
-        # Run Alfred (will use authenticated client via request context)
-        response_text, updated_conversation = await run_alfred(
-            user_message=req.message,
-            user_id=user.id,
-            conversation=conversation,
-            mode=req.mode,
-            ui_changes=ui_changes_data,
-        )
+            # Run Alfred (will use authenticated client via request context)
+            response_text, updated_conversation = await run_alfred(
+                user_message=req.message,
+                user_id=user.id,
+                conversation=conversation,
+                mode=req.mode,
+                ui_changes=ui_changes_data,
+            )
 
-        # Get log directory
-        log_dir = get_session_log_dir()
+            # Get log directory
+            log_dir = get_session_log_dir()
 
-        # Complete job first, then commit conversation
-        if job_id:
-            try:
-                complete_job(user.access_token, job_id, {
-                    "response": response_text,
-                    "log_dir": str(log_dir) if log_dir else None,
-                })
-            except Exception as e:
-                logger.error(f"Failed to complete job {job_id}: {e}")
+            # Complete job first, then commit conversation
+            if job_id:
+                try:
+                    await complete_job(user.access_token, job_id, {
+                        "response": response_text,
+                        "log_dir": str(log_dir) if log_dir else None,
+                    })
+                except Exception as e:
+                    logger.error(f"Failed to complete job {job_id}: {e}")
 
-        # Single commit: stamp metadata + cache + persist to DB
-        commit_conversation(user.id, user.access_token, updated_conversation, conversations)
+            # Single commit: stamp metadata + cache + persist to DB
+            await commit_conversation(user.id, user.access_token, updated_conversation)
 
         return {
             "response": response_text,
@@ -269,7 +311,7 @@ async def chat(req: ChatRequest, user: AuthenticatedUser = Depends(get_current_u
     except Exception as e:
         logger.exception("Chat error")
         if job_id:
-            fail_job(user.access_token, job_id, str(e))
+            await fail_job(user.access_token, job_id, str(e))
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         # Clear request context
@@ -281,8 +323,11 @@ async def reset_chat(user: AuthenticatedUser = Depends(get_current_user)):
     """Reset conversation history and prompt logging session."""
     from alfred.llm.prompt_logger import reset_session
 
-    # Clear from memory
-    conversations[user.id] = create_fresh_session()
+    # Turns still waiting would run against the old conversation
+    get_turn_scheduler().cancel_queued(user.id)
+
+    # Clear from the backplane cache
+    await get_backplane().set_conversation(user.id, create_fresh_session())
 
     # Clear from database
     delete_conversation_from_db(user.access_token, user.id)
@@ -306,14 +351,14 @@ async def get_conversation_status(user: AuthenticatedUser = Depends(get_current_
 
     Note: Does NOT delete expired sessions. Cleanup happens on next chat request.
     """
-    # 1. Check memory cache
-    conv = conversations.get(user.id)
+    # 1. Check the backplane cache
+    conv = await get_backplane().get_conversation(user.id)
 
     # 2. If not in cache, try loading from database
     if not conv:
         conv = load_conversation_from_db(user.access_token, user.id)
         if conv:
-            conversations[user.id] = conv  # Cache it
+            await get_backplane().set_conversation(user.id, conv)  # Cache it
 
     # Build message history from recent_turns
     messages = []
@@ -323,7 +368,7 @@ async def get_conversation_status(user: AuthenticatedUser = Depends(get_current_
             messages.append({"id": f"a{i}", "role": "assistant", "content": turn["assistant"]})
 
     # Check for active job (unacknowledged running/complete)
-    active_job_data = get_active_job(user.access_token, user.id)
+    active_job_data = await get_active_job(user.access_token, user.id)
 
     return {
         **get_session_status(conv),
@@ -346,14 +391,14 @@ async def get_active_job_endpoint(user: AuthenticatedUser = Depends(get_current_
     Frontend calls this on reconnect/page load to recover missed responses.
     Returns null if no active job exists.
     """
-    job = get_active_job(user.access_token, user.id)
+    job = await get_active_job(user.access_token, user.id)
     return {"job": job}
 
 
 @app.get("/api/jobs/{job_id}")
 async def get_job_endpoint(job_id: str, user: AuthenticatedUser = Depends(get_current_user)):
     """Get a specific job by ID."""
-    job = get_job(user.access_token, job_id)
+    job = await get_job(user.access_token, job_id, user.id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return {"job": job}
@@ -365,7 +410,7 @@ async def acknowledge_job_endpoint(job_id: str, user: AuthenticatedUser = Depend
 
     Prevents showing stale responses on next load.
     """
-    acknowledge_job(user.access_token, job_id)
+    await acknowledge_job(user.access_token, job_id, user.id)
     return {"success": True}
 
 
@@ -381,117 +426,179 @@ async def chat_stream(req: ChatRequest, user: AuthenticatedUser = Depends(get_cu
     """Send a message to Alfred with streaming progress updates.
 
     Phase 3: Workflow runs in a background task. The SSE stream is just an
-    observer reading from an asyncio.Queue. If the client disconnects, the
-    background task keeps running and stores the result in the jobs table.
+    observer reading the job's event channel on the state backplane. If the
+    client disconnects, the background task keeps running and stores the
+    result in the jobs table; GET /api/jobs/{job_id}/events resumes the
+    stream, from any worker.
+
+    Turns run one at a time per user (web/turns.py): a duplicate of a
+    running or queued message streams that job, anything else waits its turn.
     """
-    from alfred_kitchen.web.background_worker import run_workflow_background, job_event_queues
-    from alfred.llm.prompt_logger import get_session_log_dir
+    from alfred_kitchen.web.background_worker import (
+        cancel_workflow_background,
+        run_workflow_background,
+    )
 
     # Convert ui_changes to dict format for workflow
     ui_changes_data = None
     if req.ui_changes:
         ui_changes_data = [c.model_dump() for c in req.ui_changes]
+    cook_init = req.cook_init.model_dump() if req.cook_init else None
 
-    # Create and start job
-    job_id = create_job(user.access_token, user.id, {
+    # A duplicate of a running or queued turn streams that turn's job
+    scheduler = get_turn_scheduler()
+    key = turn_key(
+        message=req.message,
+        mode=req.mode,
+        ui_changes=ui_changes_data,
+        cook_init=cook_init,
+        brainstorm_init=req.brainstorm_init,
+    )
+    existing = scheduler.coalesce(user.id, key)
+    if existing is not None:
+        logger.info(f"Coalesced duplicate message onto job {existing.job_id}")
+        return EventSourceResponse(_job_event_stream(existing.job_id, existing.channel, announce=True))
+
+    # Create job (status "running"; the insert is written behind unless shared)
+    job_id = await create_job(user.access_token, user.id, {
         "message": req.message,
         "mode": req.mode,
         "ui_changes": ui_changes_data,
     })
-    if job_id:
-        start_job(user.access_token, job_id)
 
-    # Create event queue for this job
-    queue: asyncio.Queue = asyncio.Queue(maxsize=100)
-    if job_id:
-        job_event_queues[job_id] = queue
+    # Event channel for this job
+    channel = job_id or f"stream-{uuid.uuid4()}"
+
+    async def run() -> None:
+        # Read after the previous turn committed, not at request time
+        set_request_context(access_token=user.access_token, user_id=user.id)
+        conversation = await get_user_conversation(user.id, user.access_token)
+        await run_workflow_background(
+            job_id=job_id,
+            channel=channel,
+            user_id=user.id,
+            access_token=user.access_token,
+            message=req.message,
+            mode=req.mode,
+            conversation=conversation,
+            ui_changes=ui_changes_data,
+            log_prompts=req.log_prompts,
+            cook_init=cook_init,
+            brainstorm_init=req.brainstorm_init,
+        )
 
-    # Get conversation before launching background task
-    set_request_context(access_token=user.access_token, user_id=user.id)
-    conversation = get_user_conversation(user.id, user.access_token)
+    async def cancel(reason: str) -> None:
+        await cancel_workflow_background(job_id, channel, user.access_token, reason)
 
-    # Launch workflow in background task (survives client disconnect)
-    asyncio.create_task(run_workflow_background(
-        job_id=job_id,
-        event_queue=queue,
+    # Run in a background task behind the user's earlier turns
+    # (survives client disconnect)
+    scheduler.submit(Turn(
         user_id=user.id,
-        access_token=user.access_token,
-        message=req.message,
-        mode=req.mode,
-        conversation=conversation,
-        ui_changes=ui_changes_data,
-        conversations_cache=conversations,
-        log_prompts=req.log_prompts,
-        cook_init=req.cook_init.model_dump() if req.cook_init else None,
-        brainstorm_init=req.brainstorm_init,
+        key=key,
+        job_id=job_id,
+        channel=channel,
+        run=run,
+        cancel=cancel,
     ))
 
-    async def event_generator():
-        try:
-            # Send job_id immediately so frontend can poll on early disconnect
-            if job_id:
+    return EventSourceResponse(_job_event_stream(job_id, channel, announce=True))
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def resume_job_stream(
+    job_id: str,
+    request: Request,
+    after: str | None = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Resume a job's SSE stream after the last event id the client saw.
+
+    The cursor comes from `?after=` or the Last-Event-ID header. Events are
+    kept for a couple of minutes after the job ends (background_worker.
+    EVENTS_TTL_SECONDS); after that, use GET /api/jobs/{job_id}.
+    """
+    if not await get_job(user.access_token, job_id, user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    cursor = after or request.headers.get("last-event-id") or "0"
+    return EventSourceResponse(_job_event_stream(job_id, job_id, after=cursor))
+
+
+async def _job_event_stream(
+    job_id: str | None,
+    channel: str,
+    after: str = "0",
+    announce: bool = False,
+):
+    """SSE events for a job, read from its backplane channel."""
+    from alfred.llm.prompt_logger import get_session_log_dir
+
+    try:
+        # Send job_id immediately so frontend can poll on early disconnect
+        if announce and job_id:
+            yield {
+                "event": "job_started",
+                "data": json.dumps({"job_id": job_id}),
+            }
+
+        async for cursor, update in get_backplane().subscribe(channel, after=after, timeout=30):
+            if update is None:
+                # Keep-alive ping to prevent proxy/browser timeout
+                yield {"event": "ping", "data": ""}
+                continue
+
+            if update["type"] == "stream_end":
+                break
+            elif update["type"] == "done":
+                log_dir = get_session_log_dir()
                 yield {
-                    "event": "job_started",
-                    "data": json.dumps({"job_id": job_id}),
+                    "id": cursor,
+                    "event": "done",
+                    "data": json.dumps({
+                        "response": update["response"],
+                        "log_dir": str(log_dir) if log_dir else None,
+                        "job_id": job_id,
+                    }),
                 }
-
-            while True:
-                try:
-                    update = await asyncio.wait_for(queue.get(), timeout=30)
-                except asyncio.TimeoutError:
-                    # Keep-alive ping to prevent proxy/browser timeout
-                    yield {"event": "ping", "data": ""}
-                    continue
-
-                if update["type"] == "stream_end":
-                    break
-                elif update["type"] == "done":
-                    log_dir = get_session_log_dir()
-                    yield {
-                        "event": "done",
-                        "data": json.dumps({
-                            "response": update["response"],
-                            "log_dir": str(log_dir) if log_dir else None,
-                            "job_id": job_id,
-                        }),
-                    }
-                elif update["type"] == "context_updated":
-                    yield {
-                        "event": "context_updated",
-                        "data": json.dumps({"status": "ready"}),
-                    }
-                elif update["type"] == "chunk":
-                    yield {
-                        "event": "chunk",
-                        "data": json.dumps({"content": update["content"]}),
-                    }
-                elif update["type"] == "handoff":
-                    yield {
-                        "event": "handoff",
-                        "data": json.dumps({
-                            "summary": update["summary"],
-                            "action": update["action"],
-                            "action_detail": update["action_detail"],
-                        }),
-                    }
-                elif update["type"] == "error":
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({"error": update.get("error", "Unknown error")}),
-                    }
-                else:
-                    yield {
-                        "event": "progress",
-                        "data": json.dumps(update),
-                    }
-        except asyncio.CancelledError:
-            # Client disconnected — that's fine, background task continues.
-            # Response will be recoverable via GET /api/jobs/active
-            logger.info(f"Client disconnected for job {job_id}, workflow continues in background")
-        finally:
-            clear_request_context()
-
-    return EventSourceResponse(event_generator())
+            elif update["type"] == "context_updated":
+                yield {
+                    "id": cursor,
+                    "event": "context_updated",
+                    "data": json.dumps({"status": "ready"}),
+                }
+            elif update["type"] == "chunk":
+                yield {
+                    "id": cursor,
+                    "event": "chunk",
+                    "data": json.dumps({"content": update["content"]}),
+                }
+            elif update["type"] == "handoff":
+                yield {
+                    "id": cursor,
+                    "event": "handoff",
+                    "data": json.dumps({
+                        "summary": update["summary"],
+                        "action": update["action"],
+                        "action_detail": update["action_detail"],
+                    }),
+                }
+            elif update["type"] == "error":
+                yield {
+                    "id": cursor,
+                    "event": "error",
+                    "data": json.dumps({"error": update.get("error", "Unknown error")}),
+                }
+            else:
+                yield {
+                    "id": cursor,
+                    "event": "progress",
+                    "data": json.dumps(update),
+                }
+    except asyncio.CancelledError:
+        # Client disconnected — that's fine, background task continues.
+        # Response will be recoverable via GET /api/jobs/active
+        logger.info(f"Client disconnected for job {job_id}, workflow continues in background")
+    finally:
+        clear_request_context()
 
 
 # =============================================================================
@@ -544,8 +651,14 @@ async def get_ingredients_by_category(category: str, user: AuthenticatedUser = D
 
 @app.get("/api/ingredients/search")
 async def search_ingredients(q: str, user: AuthenticatedUser = Depends(get_current_user)):
-    """Search ingredients by name (limited results)."""
+    """Search ingredients by name (limited results, best match first)."""
     client = get_authenticated_client(user.access_token)
+    if q.strip():
+        try:
+            rows = search_ingredient_names(client, q, limit=50)
+            return {"data": [{k: v for k, v in row.items() if k != "score"} for row in rows]}
+        except Exception as e:
+            logger.warning(f"Ranked ingredient search failed, falling back to ILIKE: {e}")
     result = client.table("ingredients").select("id, name, category, aliases, default_unit").ilike("name", f"%{q}%").limit(50).execute()
     return {"data": result.data}
 
@@ -4,47 +4,62 @@ Background workflow execution for Alfred.
 Decouples the LLM workflow from the SSE request lifecycle so that
 workflows complete even if the client disconnects (phone locks, network blip).
 
-The SSE endpoint creates an asyncio.Queue, launches the workflow as a
-background task, and reads events from the queue. If the client disconnects,
-the background task keeps running and stores the result in the jobs table.
+The SSE endpoint launches the workflow as a background task and reads its
+events from the job's channel on the state backplane (web/backplane.py),
+so a stream can also be resumed from another worker. If the client
+disconnects, the background task keeps running and stores the result in
+the jobs table.
 
 See: docs/ideas/job-durability-spec.md (Phase 3)
 """
 
-import asyncio
 import logging
 from typing import Any
 
 from alfred_kitchen.db.request_context import clear_request_context, set_request_context
 from alfred.graph.workflow import run_alfred_streaming
+from alfred.memory.summary_refinement import RefinedSummary, get_summary_refiner
+from alfred_kitchen.web.backplane import get_backplane
 from alfred_kitchen.web.jobs import complete_job, fail_job
 from alfred_kitchen.web.session import commit_conversation
 
 logger = logging.getLogger(__name__)
 
-# In-memory event queues keyed by job_id (for cleanup tracking only).
-# The queue is passed directly to the background worker; this dict
-# allows deferred cleanup after the background task finishes.
-job_event_queues: dict[str, asyncio.Queue] = {}
+# Seconds a finished job's events stay available for stream resumption
+EVENTS_TTL_SECONDS = 120
+
+# Workflow-internal fields the SSE stream never sends (not JSON-able)
+_PRIVATE_EVENT_FIELDS = ("conversation", "summary_refinement")
+
+
+def _relay_event(update: dict[str, Any]) -> dict[str, Any]:
+    """The part of a workflow update that goes on the job's channel."""
+    return {k: v for k, v in update.items() if k not in _PRIVATE_EVENT_FIELDS}
+
+
+async def _publish(channel: str, event: dict[str, Any]) -> None:
+    try:
+        await get_backplane().publish(channel, event)
+    except Exception as e:
+        logger.error(f"Failed to publish {event.get('type')} event on {channel}: {e}")
 
 
 async def run_workflow_background(
     job_id: str | None,
-    event_queue: asyncio.Queue,
+    channel: str,
     user_id: str,
     access_token: str,
     message: str,
     mode: str,
     conversation: dict[str, Any],
     ui_changes: list[dict] | None,
-    conversations_cache: dict[str, dict[str, Any]],
     log_prompts: bool = False,
     cook_init: dict | None = None,
     brainstorm_init: bool = False,
 ) -> None:
     """Run Alfred workflow independent of request lifecycle.
 
-    Yields events into the provided queue (if any SSE listener is connected).
+    Publishes events on the backplane channel (read by any SSE listener).
     Stores final result in jobs table regardless of client connection state.
 
     For cook/brainstorm modes, bypasses the graph entirely and uses
@@ -52,8 +67,6 @@ async def run_workflow_background(
     """
     from alfred.llm.prompt_logger import enable_prompt_logging, set_user_id
 
-    queue = event_queue
-
     try:
         # Set up context for this task
         set_request_context(access_token=access_token, user_id=user_id)
@@ -87,63 +100,76 @@ async def run_workflow_background(
                 conversation=conversation,
                 mode=mode,
                 ui_changes=ui_changes,
+                defer_summary=True,
             )
 
         async for update in generator:
-            # Relay event to SSE listener (if still connected)
-            if queue:
+            # Terminal state is durable before the client hears "done"
+            if update["type"] == "done" and job_id:
                 try:
-                    queue.put_nowait(update)
-                except asyncio.QueueFull:
-                    pass  # Drop event if queue is full (client too slow)
+                    await complete_job(access_token, job_id, {
+                        "response": update["response"],
+                        "active_context": update.get("active_context"),
+                    })
+                except Exception as e:
+                    logger.error(f"Failed to complete job {job_id}: {e}")
+
+            # Relay event to SSE listeners (if any are connected)
+            await _publish(channel, _relay_event(update))
 
             # Handle terminal events
             if update["type"] == "done":
-                if job_id:
-                    try:
-                        complete_job(access_token, job_id, {
-                            "response": update["response"],
-                            "active_context": update.get("active_context"),
-                        })
-                    except Exception as e:
-                        logger.error(f"Failed to complete job {job_id}: {e}")
-
-                commit_conversation(
-                    user_id, access_token,
-                    update["conversation"], conversations_cache,
-                )
+                await commit_conversation(user_id, access_token, update["conversation"])
 
             elif update["type"] == "context_updated":
                 # Post-summarization conversation update
-                commit_conversation(
-                    user_id, access_token,
-                    update["conversation"], conversations_cache,
-                )
+                await commit_conversation(user_id, access_token, update["conversation"])
+
+                # Summary LLM work finishes after the user already has the reply
+                refinement = update.get("summary_refinement")
+                if refinement is not None:
+                    async def recommit(_: RefinedSummary) -> None:
+                        # commit_conversation merges completed refinements
+                        conv = await get_backplane().get_conversation(user_id)
+                        if conv is not None:
+                            await commit_conversation(user_id, access_token, conv)
+
+                    get_summary_refiner().schedule(user_id, refinement, on_refined=recommit)
 
     except Exception as e:
         logger.exception(f"Background workflow failed for job {job_id}")
         if job_id:
-            fail_job(access_token, job_id, str(e))
-        if queue:
-            try:
-                queue.put_nowait({"type": "error", "error": str(e)})
-            except asyncio.QueueFull:
-                pass
+            await fail_job(access_token, job_id, str(e))
+        await _publish(channel, {"type": "error", "error": str(e)})
 
     finally:
-        # Signal end-of-stream to SSE listener
-        if queue:
-            try:
-                queue.put_nowait({"type": "stream_end"})
-            except asyncio.QueueFull:
-                pass
+        # Signal end-of-stream to SSE listeners
+        await _publish(channel, {"type": "stream_end"})
 
         clear_request_context()
 
-        # Clean up queue after a delay (give SSE time to drain)
-        if job_id:
-            async def cleanup():
-                await asyncio.sleep(30)
-                job_event_queues.pop(job_id, None)
+        # Keep the events a while for late or resumed streams
+        try:
+            await get_backplane().expire(channel, EVENTS_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to expire events on {channel}: {e}")
+
+
+async def cancel_workflow_background(
+    job_id: str | None,
+    channel: str,
+    access_token: str,
+    reason: str,
+) -> None:
+    """End a turn that never ran (superseded in the per-user queue).
 
-            asyncio.create_task(cleanup())
+    Listeners get the same error + stream_end a failed workflow sends.
+    """
+    if job_id:
+        await fail_job(access_token, job_id, reason)
+    await _publish(channel, {"type": "error", "error": reason})
+    await _publish(channel, {"type": "stream_end"})
+    try:
+        await get_backplane().expire(channel, EVENTS_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to expire events on {channel}: {e}")
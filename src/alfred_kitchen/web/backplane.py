@@ -0,0 +1,448 @@
+"""
+State backplane for the web tier.
+
+The web app kept three kinds of state in process memory: the conversation
+cache, the per-job event queues the SSE stream reads from, and (implicitly)
+the fact that one event loop sees every turn of a user. That pins a
+deployment to a single uvicorn worker. The backplane moves them behind one
+interface so several workers or replicas can share them:
+
+- `get_conversation` / `set_conversation` / `delete_conversation`:
+  user_id -> conversation state (the cache in front of the conversations
+  table)
+- `publish` / `subscribe`: an append-only event log per job. Each event
+  gets an opaque cursor; a subscriber on any worker can resume after the
+  last cursor it saw (GET /api/jobs/{job_id}/events).
+- `turn_lock(user_id)`: a cross-worker mutex around a user's turn
+
+Every operation is a coroutine: SQLite calls run in a worker thread
+(asyncio.to_thread) and Redis goes through redis.asyncio, so neither
+blocks the event loop.
+
+Implementations, chosen by `state_backplane_url` in settings:
+
+- memory://            one process (the default; previous behaviour)
+- sqlite:///path.db    several workers on one host sharing a SQLite file
+- redis://host:6379/0  (or rediss://, unix:///path.sock) any number of
+                       replicas; needs the `redis` package
+                       (pip install "alfred[backplane]")
+
+SQLite and Redis store conversations and events as JSON. Events carry only
+what the SSE stream sends (see background_worker._relay_event).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+# Events kept per job channel (oldest dropped first)
+MAX_EVENTS_PER_CHANNEL = 1000
+
+# A turn lock held longer than this is presumed abandoned (worker died)
+LOCK_LEASE_SECONDS = 600.0
+
+# Polling interval for backends without blocking reads (SQLite)
+POLL_INTERVAL_SECONDS = 0.05
+
+# Redis keys expire with the session (KitchenSettings.session_expire_hours)
+CONVERSATION_TTL_SECONDS = 24 * 3600
+
+Event = dict[str, Any]
+
+
+class StateBackplane(ABC):
+    """Shared web-tier state: conversation cache, job events, turn locks."""
+
+    # True when other workers see this state (anything but memory://)
+    shared: bool = True
+
+    @abstractmethod
+    async def get_conversation(self, user_id: str) -> dict[str, Any] | None:
+        """The cached conversation state for a user, or None."""
+
+    @abstractmethod
+    async def set_conversation(self, user_id: str, state: dict[str, Any]) -> None:
+        """Cache a user's conversation state."""
+
+    @abstractmethod
+    async def delete_conversation(self, user_id: str) -> None:
+        """Drop a user's cached conversation state (no-op if absent)."""
+
+    @abstractmethod
+    async def publish(self, channel: str, event: Event) -> str:
+        """Append an event to a channel. Returns its cursor."""
+
+    @abstractmethod
+    def subscribe(
+        self, channel: str, after: str = "0", timeout: float | None = None,
+    ) -> AsyncIterator[tuple[str, Event | None]]:
+        """Yield (cursor, event) for events after `after`, waiting for new ones.
+
+        Yields (cursor, None) when nothing arrives within `timeout` seconds,
+        so the caller can send keep-alives. Never ends on its own.
+        """
+
+    @abstractmethod
+    async def expire(self, channel: str, ttl_seconds: float) -> None:
+        """Drop a channel's events `ttl_seconds` from now."""
+
+    @abstractmethod
+    def turn_lock(self, user_id: str) -> Any:
+        """Async context manager held for the duration of a user's turn."""
+
+    async def close(self) -> None:
+        """Release connections (shutdown)."""
+
+
+# =============================================================================
+# In-memory (single process)
+# =============================================================================
+
+
+@dataclass
+class _Channel:
+    events: deque = field(default_factory=lambda: deque(maxlen=MAX_EVENTS_PER_CHANNEL))
+    first_seq: int = 1  # seq of events[0]
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def publish(self, event: Event) -> int:
+        if len(self.events) == self.events.maxlen:
+            self.first_seq += 1
+        self.events.append(event)
+        self.changed.set()
+        self.changed = asyncio.Event()
+        return self.first_seq + len(self.events) - 1
+
+
+class MemoryBackplane(StateBackplane):
+    """Everything in this process: correct for exactly one worker."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._conversations: dict[str, dict[str, Any]] = {}
+        self._channels: dict[str, _Channel] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _channel(self, channel: str) -> _Channel:
+        if channel not in self._channels:
+            self._channels[channel] = _Channel()
+        return self._channels[channel]
+
+    async def get_conversation(self, user_id: str) -> dict[str, Any] | None:
+        return self._conversations.get(user_id)
+
+    async def set_conversation(self, user_id: str, state: dict[str, Any]) -> None:
+        self._conversations[user_id] = state
+
+    async def delete_conversation(self, user_id: str) -> None:
+        self._conversations.pop(user_id, None)
+
+    async def publish(self, channel: str, event: Event) -> str:
+        return str(self._channel(channel).publish(event))
+
+    async def subscribe(
+        self, channel: str, after: str = "0", timeout: float | None = None,
+    ) -> AsyncIterator[tuple[str, Event | None]]:
+        seq = int(after) + 1
+        while True:
+            ch = self._channel(channel)
+            changed = ch.changed
+            seq = max(seq, ch.first_seq)
+            while seq < ch.first_seq + len(ch.events):
+                yield str(seq), ch.events[seq - ch.first_seq]
+                seq += 1
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except TimeoutError:
+                yield str(seq - 1), None
+
+    async def expire(self, channel: str, ttl_seconds: float) -> None:
+        ch = self._channels.get(channel)
+        if ch is not None:
+            asyncio.get_running_loop().call_later(ttl_seconds, self._drop, channel, ch)
+
+    def _drop(self, channel: str, ch: _Channel) -> None:
+        if self._channels.get(channel) is ch:
+            del self._channels[channel]
+
+    @asynccontextmanager
+    async def turn_lock(self, user_id: str):
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            yield
+
+
+# =============================================================================
+# SQLite (several workers on one host)
+# =============================================================================
+
+
+class SqliteBackplane(StateBackplane):
+    """Shared SQLite file (WAL): every worker on the host opens the same path.
+
+    Statements run in a worker thread, serialized on one connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._mutex = threading.Lock()
+        self._owner = uuid.uuid4().hex
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS conversations (
+                user_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_events (
+                channel TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                event TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (channel, seq)
+            );
+            CREATE TABLE IF NOT EXISTS turn_locks (
+                user_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+
+    def _execute_sync(self, sql: str, params: tuple) -> int:
+        with self._mutex:
+            return self._conn.execute(sql, params).rowcount
+
+    def _query_sync(self, sql: str, params: tuple) -> list[tuple]:
+        with self._mutex:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _execute(self, sql: str, params: tuple = ()) -> int:
+        return await asyncio.to_thread(self._execute_sync, sql, params)
+
+    async def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        return await asyncio.to_thread(self._query_sync, sql, params)
+
+    async def _query_one(self, sql: str, params: tuple = ()) -> tuple | None:
+        rows = await self._query(sql, params)
+        return rows[0] if rows else None
+
+    async def get_conversation(self, user_id: str) -> dict[str, Any] | None:
+        row = await self._query_one("SELECT state FROM conversations WHERE user_id = ?", (user_id,))
+        return json.loads(row[0]) if row is not None else None
+
+    async def set_conversation(self, user_id: str, state: dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT INTO conversations (user_id, state) VALUES (?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET state = excluded.state",
+            (user_id, json.dumps(state)),
+        )
+
+    async def delete_conversation(self, user_id: str) -> None:
+        await self._execute("DELETE FROM conversations WHERE user_id = ?", (user_id,))
+
+    def _publish_sync(self, channel: str, event: str) -> int:
+        with self._mutex:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM job_events WHERE expires_at < ?", (time.time(),))
+                seq = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE channel = ?", (channel,)
+                ).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO job_events (channel, seq, event) VALUES (?, ?, ?)",
+                    (channel, seq, event),
+                )
+                self._conn.execute(
+                    "DELETE FROM job_events WHERE channel = ? AND seq <= ?",
+                    (channel, seq - MAX_EVENTS_PER_CHANNEL),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    async def publish(self, channel: str, event: Event) -> str:
+        seq = await asyncio.to_thread(self._publish_sync, channel, json.dumps(event))
+        return str(seq)
+
+    async def subscribe(
+        self, channel: str, after: str = "0", timeout: float | None = None,
+    ) -> AsyncIterator[tuple[str, Event | None]]:
+        seq = int(after)
+        idle_since = time.monotonic()
+        while True:
+            rows = await self._query(
+                "SELECT seq, event FROM job_events WHERE channel = ? AND seq > ? ORDER BY seq",
+                (channel, seq),
+            )
+            for row_seq, event in rows:
+                seq = row_seq
+                yield str(seq), json.loads(event)
+            if rows:
+                idle_since = time.monotonic()
+            elif timeout is not None and time.monotonic() - idle_since >= timeout:
+                idle_since = time.monotonic()
+                yield str(seq), None
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def expire(self, channel: str, ttl_seconds: float) -> None:
+        await self._execute(
+            "UPDATE job_events SET expires_at = ? WHERE channel = ?",
+            (time.time() + ttl_seconds, channel),
+        )
+
+    @asynccontextmanager
+    async def turn_lock(self, user_id: str):
+        token = f"{self._owner}:{uuid.uuid4().hex}"
+        while True:
+            now = time.time()
+            acquired = await self._execute(
+                "INSERT INTO turn_locks (user_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE turn_locks.expires_at < ?",
+                (user_id, token, now + LOCK_LEASE_SECONDS, now),
+            )
+            if acquired:
+                break
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        try:
+            yield
+        finally:
+            await self._execute("DELETE FROM turn_locks WHERE user_id = ? AND owner = ?", (user_id, token))
+
+    def _close_sync(self) -> None:
+        with self._mutex:
+            self._conn.close()
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close_sync)
+
+
+# =============================================================================
+# Redis (any number of replicas)
+# =============================================================================
+
+# Delete the lock only if we still own it
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackplane(StateBackplane):
+    """Redis keys, streams (XADD/XREAD) and SET NX locks."""
+
+    def __init__(self, url: str, prefix: str = "alfred:") -> None:
+        if aioredis is None:
+            raise RuntimeError('The redis backplane needs the redis package: pip install "alfred[backplane]"')
+        self._prefix = prefix
+        self._client = aioredis.Redis.from_url(url)
+
+    def _conversation_key(self, user_id: str) -> str:
+        return f"{self._prefix}conv:{user_id}"
+
+    async def get_conversation(self, user_id: str) -> dict[str, Any] | None:
+        raw = await self._client.get(self._conversation_key(user_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def set_conversation(self, user_id: str, state: dict[str, Any]) -> None:
+        await self._client.set(
+            self._conversation_key(user_id), json.dumps(state), ex=CONVERSATION_TTL_SECONDS,
+        )
+
+    async def delete_conversation(self, user_id: str) -> None:
+        await self._client.delete(self._conversation_key(user_id))
+
+    def _stream(self, channel: str) -> str:
+        return f"{self._prefix}events:{channel}"
+
+    async def publish(self, channel: str, event: Event) -> str:
+        cursor = await self._client.xadd(
+            self._stream(channel), {"event": json.dumps(event)},
+            maxlen=MAX_EVENTS_PER_CHANNEL, approximate=True,
+        )
+        return cursor.decode()
+
+    async def subscribe(
+        self, channel: str, after: str = "0", timeout: float | None = None,
+    ) -> AsyncIterator[tuple[str, Event | None]]:
+        stream = self._stream(channel)
+        # XREAD BLOCK 0 waits forever
+        block_ms = int(timeout * 1000) if timeout is not None else 0
+        while True:
+            result = await self._client.xread({stream: after}, block=block_ms)
+            if not result:
+                yield after, None
+                continue
+            for _, entries in result:
+                for cursor, fields in entries:
+                    after = cursor.decode()
+                    yield after, json.loads(fields[b"event"])
+
+    async def expire(self, channel: str, ttl_seconds: float) -> None:
+        await self._client.expire(self._stream(channel), max(1, int(ttl_seconds)))
+
+    @asynccontextmanager
+    async def turn_lock(self, user_id: str):
+        key = f"{self._prefix}turn:{user_id}"
+        token = uuid.uuid4().hex
+        while not await self._client.set(key, token, nx=True, px=int(LOCK_LEASE_SECONDS * 1000)):
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        try:
+            yield
+        finally:
+            await self._client.eval(_RELEASE_LOCK, 1, key, token)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# =============================================================================
+# Module API
+# =============================================================================
+
+
+def create_backplane(url: str) -> StateBackplane:
+    """Build a backplane from a URL (memory://, sqlite:///path, redis://...)."""
+    if url in ("", "memory", "memory://"):
+        return MemoryBackplane()
+    if url.startswith("sqlite://"):
+        path = url.removeprefix("sqlite://")
+        if not path.startswith("/"):
+            raise ValueError(f"SQLite backplane needs an absolute path (sqlite:///path.db): {url}")
+        return SqliteBackplane(path)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackplane(url)
+    raise ValueError(f"Unknown state backplane URL: {url}")
+
+
+_backplane: StateBackplane | None = None
+
+
+def get_backplane() -> StateBackplane:
+    """The process-wide backplane, built from settings.state_backplane_url."""
+    global _backplane
+    if _backplane is None:
+        from alfred_kitchen.config import settings
+
+        _backplane = create_backplane(settings.state_backplane_url)
+    return _backplane
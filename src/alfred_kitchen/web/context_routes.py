@@ -10,7 +10,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
-from alfred_kitchen.db.client import get_authenticated_client
+from alfred_kitchen.db.client import get_authenticated_client, search_entity_names
 from alfred_kitchen.web.auth import AuthenticatedUser, get_current_user
 
 logger = logging.getLogger(__name__)
@@ -75,6 +75,51 @@ async def search_entities(
     Empty query returns recent entities from each type.
     """
     client = get_authenticated_client(user.access_token)
+
+    if q.strip():
+        try:
+            return _ranked_search(client, q.strip())
+        except Exception as e:
+            logger.warning(f"Ranked entity search failed, falling back to ILIKE: {e}")
+
+    return _search_by_table(client, q)
+
+
+def _ranked_search(client: Any, q: str) -> EntitySearchResponse:
+    """One search_entity_names RPC for all types (trigram-indexed, best match first)."""
+    rows = search_entity_names(
+        client,
+        q,
+        tables=[entity_config["table"] for entity_config in ENTITY_TYPES],
+        limit_per_table=LIMIT_PER_TYPE,
+    )
+
+    by_table: dict[str, list[EntityItem]] = {}
+    for row in rows:
+        by_table.setdefault(row["table_name"], []).append(
+            EntityItem(id=str(row["id"]), label=row["label"] or "(unnamed)")
+        )
+
+    groups: list[EntityGroup] = []
+    total_count = 0
+    for entity_config in ENTITY_TYPES:
+        remaining = min(LIMIT_PER_TYPE, TOTAL_LIMIT - total_count)
+        if remaining <= 0:
+            break
+        items = by_table.get(entity_config["table"], [])[:remaining]
+        if items:
+            groups.append(EntityGroup(
+                type=entity_config["type"],
+                label=entity_config["label"],
+                items=items
+            ))
+            total_count += len(items)
+
+    return EntitySearchResponse(groups=groups)
+
+
+def _search_by_table(client: Any, q: str) -> EntitySearchResponse:
+    """One query per type: ILIKE on the name field, or most recent when q is empty."""
     groups: list[EntityGroup] = []
     total_count = 0
 
@@ -13,6 +13,9 @@ from pydantic import BaseModel
 
 from alfred_kitchen.db.client import get_authenticated_client
 from alfred_kitchen.domain.crud_middleware import USER_OWNED_TABLES
+from alfred_kitchen.background.embedding_worker import enqueue_embeddings
+from alfred_kitchen.domain.tools.embedding_text import RECIPE_TEXT_FIELDS
+from alfred_kitchen.domain.tools.recipe_index import invalidate_recipe_index
 from alfred_kitchen.web.auth import AuthenticatedUser, get_current_user
 
 router = APIRouter(prefix="/entities", tags=["entities"])
@@ -151,6 +154,9 @@ async def create_entity(
         raise HTTPException(status_code=500, detail="Failed to create entity")
 
     created = result.data[0]
+    if table == "recipes":
+        invalidate_recipe_index(user.id)
+        enqueue_embeddings(table, result.data)
 
     return EntityResponse(
         data=created,
@@ -193,6 +199,10 @@ async def update_entity(
 
     if not result.data:
         raise HTTPException(status_code=404, detail=f"{table} item not found")
+    if table == "recipes":
+        invalidate_recipe_index(user.id)
+        if RECIPE_TEXT_FIELDS & update_data.keys():
+            enqueue_embeddings(table, result.data)
 
     return EntityResponse(
         data=result.data[0],
@@ -224,6 +234,8 @@ async def delete_entity(
 
     if not result.data:
         raise HTTPException(status_code=404, detail=f"{table} item not found")
+    if table == "recipes":
+        invalidate_recipe_index(user.id)
 
     return {
         "success": True,
@@ -278,6 +290,8 @@ async def create_recipe_with_ingredients(
 
     recipe = recipe_result.data[0]
     recipe_id = recipe["id"]
+    invalidate_recipe_index(user.id)
+    enqueue_embeddings("recipes", [recipe_id])
 
     # Create ingredients if provided
     if body.ingredients:
@@ -351,6 +365,9 @@ async def update_recipe_with_ingredients(
         if not recipe_result.data:
             raise HTTPException(status_code=404, detail="Recipe not found")
         recipe = recipe_result.data[0]
+        invalidate_recipe_index(user.id)
+        if RECIPE_TEXT_FIELDS & recipe_updates.keys():
+            enqueue_embeddings("recipes", [recipe_id])
     else:
         # Just fetch the recipe if only updating ingredients
         recipe_result = client.table("recipes").select("*").eq("id", recipe_id).execute()
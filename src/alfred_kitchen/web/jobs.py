@@ -1,109 +1,286 @@
 """
 Job lifecycle management for Alfred.
 
-Tracks chat request lifecycle (pending → running → complete → failed) so
-responses survive client disconnects. Single-owner module — all job mutations
-go through functions in this file.
+Tracks chat request lifecycle (running → complete → failed) so responses
+survive client disconnects. Single-owner module — all job mutations go
+through functions in this file.
+
+Writes go through a process-wide JobStore:
+- create_job builds the row (status "running") in memory and returns its
+  id immediately; the single INSERT is written behind.
+- Non-terminal writes (the insert, acknowledgement) go through an async
+  write-behind queue, off the request's critical path.
+- Terminal states (complete/failed) are upserted durably before
+  complete_job/fail_job return, so a response is in the jobs table before
+  the client is told it is done.
+- An in-memory index of each user's unacknowledged running/complete jobs
+  serves get_active_job (/api/jobs/active polling). The DB is read once
+  per user per process, since every mutation passes through this module.
+
+That memoization only holds while one process serves every request. With
+a shared state backplane (several workers, see web/backplane.py) another
+worker may own a user's jobs, so the store runs in shared mode: the
+insert and acknowledgement are written through before returning, and
+get_job/get_active_job always read the DB.
 
 See: docs/ideas/job-durability-spec.md (Phase 2.5)
 """
 
+import asyncio
 import logging
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from alfred_kitchen.db.client import get_authenticated_client
+from alfred_kitchen.web.backplane import get_backplane
 
 logger = logging.getLogger(__name__)
 
+# Most recent jobs kept in memory for get_job
+MAX_CACHED_JOBS = 1000
+
+# Write-behind retry policy (per queued write)
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_DELAY_SECONDS = 0.5
+
+ACTIVE_STATUSES = ("running", "complete")
+
 
 def _utc_now() -> str:
     """Get current UTC time as ISO string."""
     return datetime.now(UTC).isoformat()
 
 
-def create_job(access_token: str, user_id: str, input_data: dict[str, Any]) -> str | None:
-    """Create a pending job. Returns job_id or None on failure."""
-    try:
-        client = get_authenticated_client(access_token)
-        result = (
-            client.table("jobs")
-            .insert(
-                {
-                    "user_id": user_id,
-                    "status": "pending",
-                    "input": input_data,
-                }
-            )
-            .execute()
-        )
-        if result.data and len(result.data) > 0:
-            return result.data[0]["id"]
-        return None
-    except Exception as e:
-        logger.error(f"Failed to create job for user {user_id}: {e}")
-        return None
+def _is_active(row: dict[str, Any]) -> bool:
+    return row.get("status") in ACTIVE_STATUSES and not row.get("acknowledged_at")
 
 
-def start_job(access_token: str, job_id: str) -> None:
-    """Mark job as running with started_at timestamp."""
-    try:
-        client = get_authenticated_client(access_token)
-        client.table("jobs").update(
-            {
-                "status": "running",
-                "started_at": _utc_now(),
-            }
-        ).eq("id", job_id).execute()
-    except Exception as e:
-        logger.error(f"Failed to start job {job_id}: {e}")
+@dataclass
+class _Write:
+    """A queued write. Fields are read from the live row when it runs."""
+    row: dict[str, Any]
+    access_token: str
+    kind: str  # "insert" | "update"
+    fields: tuple[str, ...] = ()
 
 
-def complete_job(access_token: str, job_id: str, output: dict[str, Any]) -> None:
-    """Mark job as complete with response and completed_at timestamp."""
-    try:
-        client = get_authenticated_client(access_token)
-        client.table("jobs").update(
-            {
-                "status": "complete",
-                "output": output,
-                "completed_at": _utc_now(),
-            }
-        ).eq("id", job_id).execute()
-    except Exception as e:
-        logger.error(f"Failed to complete job {job_id}: {e}")
+class JobStore:
+    """In-memory job rows with write-behind persistence to the jobs table.
 
+    shared=True (other workers serve the same users) writes through and
+    serves reads from the DB instead.
+    """
 
-def fail_job(access_token: str, job_id: str, error: str) -> None:
-    """Mark job as failed with error message and completed_at timestamp."""
-    try:
-        client = get_authenticated_client(access_token)
-        client.table("jobs").update(
-            {
-                "status": "failed",
-                "error": error,
-                "completed_at": _utc_now(),
-            }
-        ).eq("id", job_id).execute()
-    except Exception as e:
-        logger.error(f"Failed to mark job {job_id} as failed: {e}")
+    def __init__(self, max_cached_jobs: int = MAX_CACHED_JOBS, shared: bool = False) -> None:
+        self._shared = shared
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._max_cached = max_cached_jobs
+        # user_id -> that user's unacknowledged running/complete rows, oldest first
+        self._active: dict[str, list[dict[str, Any]]] = {}
+        # Users whose pre-existing active job has been read from the DB
+        self._loaded_users: set[str] = set()
+        # Jobs whose full row has been durably upserted (terminal)
+        self._final: set[str] = set()
+        self._queue: deque[_Write] = deque()
+        self._worker: asyncio.Task | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
 
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
 
-def acknowledge_job(access_token: str, job_id: str) -> None:
-    """Mark job as acknowledged (client received the response)."""
-    try:
-        client = get_authenticated_client(access_token)
-        client.table("jobs").update(
-            {
-                "acknowledged_at": _utc_now(),
-            }
-        ).eq("id", job_id).execute()
-    except Exception as e:
-        logger.error(f"Failed to acknowledge job {job_id}: {e}")
+    async def create(self, access_token: str, user_id: str, input_data: dict[str, Any]) -> str:
+        """Create a running job; the INSERT is written behind (through when shared)."""
+        now = _utc_now()
+        row: dict[str, Any] = {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "status": "running",
+            "input": input_data,
+            "output": None,
+            "error": None,
+            "steps": [],
+            "created_at": now,
+            "started_at": now,
+            "completed_at": None,
+            "acknowledged_at": None,
+        }
+        if self._shared:
+            # Any worker may be asked for this job next
+            await asyncio.to_thread(_insert, access_token, dict(row))
+            self._remember(row)
+            return row["id"]
+
+        self._remember(row)
+        self._active.setdefault(user_id, []).append(row)
+        # The DB can't know more than memory from here on: its copy of this
+        # job may lag behind queued writes (e.g. an acknowledgement)
+        self._loaded_users.add(user_id)
+        self._enqueue(_Write(row, access_token, "insert"))
+        return row["id"]
+
+    async def complete(self, access_token: str, job_id: str, output: dict[str, Any]) -> None:
+        """Mark complete and durably write the row before returning."""
+        await self._finish(access_token, job_id, status="complete", output=output)
+
+    async def fail(self, access_token: str, job_id: str, error: str) -> None:
+        """Mark failed and durably write the row before returning."""
+        await self._finish(access_token, job_id, status="failed", error=error)
+
+    async def acknowledge(self, access_token: str, job_id: str, user_id: str | None = None) -> None:
+        """Mark acknowledged; written behind when the row is in memory."""
+        row = self._jobs.get(job_id)
+        if row is not None and user_id is not None and row["user_id"] != user_id:
+            return
+
+        acknowledged_at = _utc_now()
+        if row is not None:
+            row["acknowledged_at"] = acknowledged_at
+            self._drop_active(row)
+        if row is None or user_id is None or self._shared:
+            # Unknown job or caller, or other workers read the DB: write
+            # straight through (RLS decides)
+            await asyncio.to_thread(_update, access_token, job_id, {"acknowledged_at": acknowledged_at})
+            return
+        self._enqueue(_Write(row, access_token, "update", ("acknowledged_at",)))
+
+    async def _finish(self, access_token: str, job_id: str, **changes: Any) -> None:
+        row = self._jobs.get(job_id)
+        if row is None:
+            # Not created by this process (or evicted): plain update
+            await asyncio.to_thread(_update, access_token, job_id, {**changes, "completed_at": _utc_now()})
+            return
+
+        row.update(changes, completed_at=_utc_now())
+        if not _is_active(row):
+            self._drop_active(row)
+
+        # Let an in-flight INSERT land first; a queued one is skipped (the
+        # upsert below writes the whole row)
+        self._final.add(job_id)
+        inflight = self._inflight.get(job_id)
+        if inflight is not None:
+            await asyncio.shield(inflight)
+        await asyncio.to_thread(_upsert, access_token, dict(row))
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    async def get(self, access_token: str, job_id: str, user_id: str | None = None) -> dict[str, Any] | None:
+        """Get a job by id; memory first when the caller's user_id is known."""
+        row = self._jobs.get(job_id)
+        if row is not None and user_id is not None and not self._shared:
+            return dict(row) if row["user_id"] == user_id else None
+        return await asyncio.to_thread(_select_job, access_token, job_id)
+
+    async def get_active(self, access_token: str, user_id: str) -> dict[str, Any] | None:
+        """The user's most recent unacknowledged running/complete job."""
+        if self._shared:
+            return await asyncio.to_thread(_select_active_job, access_token, user_id)
+
+        rows = self._active.get(user_id)
+        if rows:
+            return dict(rows[-1])
+        if user_id in self._loaded_users:
+            return None
+
+        row = await asyncio.to_thread(_select_active_job, access_token, user_id)
+        self._loaded_users.add(user_id)
+        if row is None:
+            return None
+        known = self._jobs.get(row["id"])
+        if known is not None:
+            # Memory is ahead of the DB (writes behind): never replace it
+            return dict(known) if _is_active(known) else None
+        self._remember(row)
+        # Older than anything created since, so it goes first
+        self._active.setdefault(user_id, []).insert(0, row)
+        return dict(row)
+
+    # -------------------------------------------------------------------------
+    # Write-behind
+    # -------------------------------------------------------------------------
+
+    async def drain(self) -> None:
+        """Wait until every queued write has been attempted (tests, shutdown)."""
+        while self._worker is not None:
+            await asyncio.shield(self._worker)
+
+    def _enqueue(self, write: _Write) -> None:
+        self._queue.append(write)
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            while self._queue:
+                write = self._queue.popleft()
+                job_id = write.row["id"]
+                if write.kind == "insert" and job_id in self._final:
+                    continue
+
+                done = asyncio.get_running_loop().create_future()
+                self._inflight[job_id] = done
+                try:
+                    for attempt in range(WRITE_ATTEMPTS):
+                        try:
+                            await asyncio.to_thread(self._execute, write)
+                            break
+                        except Exception as e:
+                            if attempt == WRITE_ATTEMPTS - 1:
+                                logger.error(f"Job write-behind ({write.kind}) failed for {job_id}: {e}")
+                            else:
+                                await asyncio.sleep(WRITE_RETRY_DELAY_SECONDS * 2 ** attempt)
+                finally:
+                    self._inflight.pop(job_id, None)
+                    done.set_result(None)
+        finally:
+            self._worker = None
 
+    def _execute(self, write: _Write) -> None:
+        if write.kind == "insert":
+            _insert(write.access_token, dict(write.row))
+        else:
+            _update(write.access_token, write.row["id"], {f: write.row[f] for f in write.fields})
 
-def get_job(access_token: str, job_id: str) -> dict[str, Any] | None:
-    """Get job by ID."""
+    # -------------------------------------------------------------------------
+    # Index maintenance
+    # -------------------------------------------------------------------------
+
+    def _remember(self, row: dict[str, Any]) -> None:
+        self._jobs[row["id"]] = row
+        while len(self._jobs) > self._max_cached:
+            evicted, _ = self._jobs.popitem(last=False)
+            self._final.discard(evicted)
+
+    def _drop_active(self, row: dict[str, Any]) -> None:
+        rows = self._active.get(row["user_id"])
+        if rows:
+            rows[:] = [r for r in rows if r["id"] != row["id"]]
+
+
+# =============================================================================
+# PostgREST calls
+# =============================================================================
+
+
+def _insert(access_token: str, row: dict[str, Any]) -> None:
+    get_authenticated_client(access_token).table("jobs").insert(row).execute()
+
+
+def _upsert(access_token: str, row: dict[str, Any]) -> None:
+    get_authenticated_client(access_token).table("jobs").upsert(row).execute()
+
+
+def _update(access_token: str, job_id: str, fields: dict[str, Any]) -> None:
+    get_authenticated_client(access_token).table("jobs").update(fields).eq("id", job_id).execute()
+
+
+def _select_job(access_token: str, job_id: str) -> dict[str, Any] | None:
     try:
         client = get_authenticated_client(access_token)
         result = (
@@ -121,12 +298,7 @@ def get_job(access_token: str, job_id: str) -> dict[str, Any] | None:
         return None
 
 
-def get_active_job(access_token: str, user_id: str) -> dict[str, Any] | None:
-    """Get the user's most recent unacknowledged running/complete job.
-
-    Returns None if no active job exists. Used by frontend on reconnect
-    to recover missed responses.
-    """
+def _select_active_job(access_token: str, user_id: str) -> dict[str, Any] | None:
     try:
         client = get_authenticated_client(access_token)
         result = (
@@ -134,7 +306,7 @@ def get_active_job(access_token: str, user_id: str) -> dict[str, Any] | None:
             .select("*")
             .eq("user_id", user_id)
             .is_("acknowledged_at", "null")
-            .in_("status", ["running", "complete"])
+            .in_("status", list(ACTIVE_STATUSES))
             .order("created_at", desc=True)
             .limit(1)
             .maybe_single()
@@ -146,3 +318,66 @@ def get_active_job(access_token: str, user_id: str) -> dict[str, Any] | None:
     except Exception as e:
         logger.error(f"Failed to get active job for user {user_id}: {e}")
         return None
+
+
+# =============================================================================
+# Module API
+# =============================================================================
+
+_store: JobStore | None = None
+
+
+def get_job_store() -> JobStore:
+    """Get the process-wide JobStore (shared mode with a shared backplane)."""
+    global _store
+    if _store is None:
+        _store = JobStore(shared=get_backplane().shared)
+    return _store
+
+
+async def create_job(access_token: str, user_id: str, input_data: dict[str, Any]) -> str | None:
+    """Create a running job. Returns job_id or None on failure."""
+    try:
+        return await get_job_store().create(access_token, user_id, input_data)
+    except Exception as e:
+        logger.error(f"Failed to create job for user {user_id}: {e}")
+        return None
+
+
+async def complete_job(access_token: str, job_id: str, output: dict[str, Any]) -> None:
+    """Mark job as complete with response and completed_at timestamp (durable)."""
+    try:
+        await get_job_store().complete(access_token, job_id, output)
+    except Exception as e:
+        logger.error(f"Failed to complete job {job_id}: {e}")
+
+
+async def fail_job(access_token: str, job_id: str, error: str) -> None:
+    """Mark job as failed with error message and completed_at timestamp (durable)."""
+    try:
+        await get_job_store().fail(access_token, job_id, error)
+    except Exception as e:
+        logger.error(f"Failed to mark job {job_id} as failed: {e}")
+
+
+async def acknowledge_job(access_token: str, job_id: str, user_id: str | None = None) -> None:
+    """Mark job as acknowledged (client received the response)."""
+    try:
+        await get_job_store().acknowledge(access_token, job_id, user_id)
+    except Exception as e:
+        logger.error(f"Failed to acknowledge job {job_id}: {e}")
+
+
+async def get_job(access_token: str, job_id: str, user_id: str | None = None) -> dict[str, Any] | None:
+    """Get job by ID (served from memory when user_id is given)."""
+    return await get_job_store().get(access_token, job_id, user_id)
+
+
+async def get_active_job(access_token: str, user_id: str) -> dict[str, Any] | None:
+    """Get the user's most recent unacknowledged running/complete job.
+
+    Returns None if no active job exists. Used by frontend on reconnect
+    to recover missed responses. Served from the in-memory index after
+    the first lookup per user (from the DB with a shared backplane).
+    """
+    return await get_job_store().get_active(access_token, user_id)
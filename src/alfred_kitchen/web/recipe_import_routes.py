@@ -8,6 +8,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, HttpUrl
 
 from alfred_kitchen.db.client import get_authenticated_client
+from alfred_kitchen.background.embedding_worker import enqueue_embeddings
+from alfred_kitchen.domain.tools.recipe_index import invalidate_recipe_index
 from alfred_kitchen.recipe_import import extract_recipe, ExtractionMethod, parse_and_link_ingredients
 from alfred_kitchen.web.auth import AuthenticatedUser, get_current_user
 
@@ -231,6 +233,8 @@ async def confirm_import(
 
         recipe = recipe_result.data[0]
         recipe_id = recipe["id"]
+        invalidate_recipe_index(user.id)
+        enqueue_embeddings("recipes", [recipe_id])
 
         # Create ingredients if provided
         if req.ingredients:
@@ -11,7 +11,9 @@ from typing import Any, Literal, TypedDict
 
 from alfred_kitchen.config import get_settings
 from alfred_kitchen.db.client import get_authenticated_client
+from alfred_kitchen.web.backplane import get_backplane
 from alfred.memory.conversation import initialize_conversation
+from alfred.memory.summary_refinement import get_summary_refiner
 
 logger = logging.getLogger(__name__)
 
@@ -199,24 +201,27 @@ def load_conversation_from_db(access_token: str, user_id: str) -> dict[str, Any]
         return None
 
 
-def commit_conversation(
+async def commit_conversation(
     user_id: str,
     access_token: str,
     conv_state: dict[str, Any],
-    cache: dict[str, dict[str, Any]],
 ) -> None:
     """Single point of mutation for all conversation state updates.
 
-    Handles: timestamp stamping + memory cache + DB persistence.
+    Handles: timestamp stamping + backplane cache + DB persistence.
     Every code path that changes conversation state MUST call this.
     No other code should directly write to cache or call _save_to_db.
     """
+    # Background summary refinements land here, including on top of a turn
+    # that started from an older snapshot
+    get_summary_refiner().apply_completed(user_id, conv_state)
+
     now = _utc_now().isoformat()
     conv_state["last_active_at"] = now
     if "created_at" not in conv_state:
         conv_state["created_at"] = now
 
-    cache[user_id] = conv_state
+    await get_backplane().set_conversation(user_id, conv_state)
     _save_to_db(access_token, user_id, conv_state)
 
 
@@ -0,0 +1,146 @@
+"""
+Per-user turn scheduling for streamed chat.
+
+Two /api/chat/stream requests from the same user (a double-submit, a
+reconnect retry) used to run concurrent workflows over the same
+conversation: both paid for the full LLM work and the last
+commit_conversation won. The TurnScheduler gives each user one turn at a
+time:
+
+- a message identical to one already running or queued (same text, mode
+  and UI changes) is coalesced onto that turn; the caller streams the
+  existing job's channel instead of creating a job
+- a distinct message is queued behind the running turn and runs in order,
+  reading the conversation the previous turn committed
+- at most MAX_QUEUED_TURNS wait per user; past that the oldest waiting
+  turn is superseded and cancelled before any LLM work is done. A chat
+  reset supersedes everything still waiting.
+
+Coalescing and ordering are per process. Exclusion across workers comes
+from the backplane's turn_lock, which every turn holds while it runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from alfred_kitchen.web.backplane import get_backplane
+
+logger = logging.getLogger(__name__)
+
+# Turns allowed to wait behind the running one, per user
+MAX_QUEUED_TURNS = 2
+
+SUPERSEDED = "Superseded by a newer message"
+RESET = "Conversation was reset"
+
+
+def turn_key(**request: Any) -> str:
+    """Identity of a chat request, for coalescing duplicates."""
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class Turn:
+    """One chat turn: how to run it, and how to tell its listeners it won't."""
+
+    user_id: str
+    key: str
+    job_id: str | None
+    channel: str
+    run: Callable[[], Awaitable[None]]
+    cancel: Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class _UserTurns:
+    running: Turn | None = None
+    queued: deque[Turn] = field(default_factory=deque)
+    runner: asyncio.Task | None = None
+
+    def in_flight(self) -> list[Turn]:
+        return ([self.running] if self.running else []) + list(self.queued)
+
+
+class TurnScheduler:
+    """Runs each user's turns one at a time, in arrival order."""
+
+    def __init__(self, max_queued: int = MAX_QUEUED_TURNS) -> None:
+        self.max_queued = max_queued
+        self._users: dict[str, _UserTurns] = {}
+        self._counts: Counter = Counter()
+
+    def coalesce(self, user_id: str, key: str) -> Turn | None:
+        """The running or queued turn for an identical request, if any."""
+        user = self._users.get(user_id)
+        if user is None:
+            return None
+        for turn in user.in_flight():
+            if turn.key == key:
+                self._counts["coalesced"] += 1
+                return turn
+        return None
+
+    def submit(self, turn: Turn) -> None:
+        """Run a turn now, or queue it behind the user's running one (needs a running loop)."""
+        user = self._users.setdefault(turn.user_id, _UserTurns())
+        self._counts["submitted"] += 1
+        if user.runner is None:
+            user.running = turn
+            user.runner = asyncio.create_task(self._drain(turn.user_id, user))
+            return
+        user.queued.append(turn)
+        while len(user.queued) > self.max_queued:
+            self._supersede(user.queued.popleft(), SUPERSEDED)
+
+    def cancel_queued(self, user_id: str, reason: str = RESET) -> None:
+        """Supersede every turn still waiting for this user."""
+        user = self._users.get(user_id)
+        while user is not None and user.queued:
+            self._supersede(user.queued.popleft(), reason)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": sum(1 for u in self._users.values() if u.running),
+            "queued": sum(len(u.queued) for u in self._users.values()),
+            **{k: self._counts[k] for k in ("submitted", "coalesced", "superseded")},
+        }
+
+    def _supersede(self, turn: Turn, reason: str) -> None:
+        self._counts["superseded"] += 1
+        logger.info(f"Turn {turn.job_id or turn.channel} for {turn.user_id} cancelled: {reason}")
+        task = asyncio.create_task(turn.cancel(reason))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _drain(self, user_id: str, user: _UserTurns) -> None:
+        try:
+            while user.running is not None:
+                turn = user.running
+                try:
+                    async with get_backplane().turn_lock(user_id):
+                        await turn.run()
+                except Exception:
+                    logger.exception(f"Turn {turn.job_id or turn.channel} for {user_id} failed")
+                finally:
+                    user.running = user.queued.popleft() if user.queued else None
+        finally:
+            user.runner = None
+            if user.running is None and self._users.get(user_id) is user:
+                del self._users[user_id]
+
+
+_scheduler: TurnScheduler | None = None
+
+
+def get_turn_scheduler() -> TurnScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TurnScheduler()
+    return _scheduler
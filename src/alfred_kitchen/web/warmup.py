@@ -0,0 +1,63 @@
+"""
+Deferred imports and post-startup warmup for the web server.
+
+Importing web/app.py no longer pulls in the LangGraph workflow, the OpenAI
+and Supabase clients or the recipe scrapers: each is imported where it is
+first used. That keeps cold start (and `alfred` CLI commands that never
+touch them) fast, but would move the cost onto the first chat request.
+
+warmup() imports them in a worker thread once the server is up, so /health
+answers immediately and the first user request finds them loaded.
+`alfred startup-profile` shows what an import still costs;
+tests/kitchen/test_startup.py fails if the deferred stacks creep back into
+module load.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Third-party stacks no module imports at load time
+DEFERRED_MODULES = ("openai", "instructor", "langgraph", "supabase", "recipe_scrapers", "extruct")
+
+# Imported by warmup(), in order: what the first chat / import request needs
+WARMUP_MODULES = (
+    "supabase",
+    "openai",
+    "alfred.graph.workflow",
+    "alfred_kitchen.web.background_worker",
+    "recipe_scrapers",
+    "extruct",
+)
+
+_status: dict[str, Any] = {"done": False, "modules_ms": {}}
+
+
+def _import(name: str) -> float | None:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError as e:
+        # Optional extras (extruct) degrade where they're used
+        logger.info(f"Warmup: {name} not available ({e})")
+        return None
+    return (time.perf_counter() - start) * 1000
+
+
+async def warmup() -> dict[str, Any]:
+    """Import the deferred modules off the event loop, one at a time."""
+    for name in WARMUP_MODULES:
+        elapsed = await asyncio.to_thread(_import, name)
+        if elapsed is not None:
+            _status["modules_ms"][name] = round(elapsed, 1)
+    _status["done"] = True
+    logger.info(f"Warmup: preloaded {len(_status['modules_ms'])} modules in {sum(_status['modules_ms'].values()):.0f}ms")
+    return _status
+
+
+def warmup_status() -> dict[str, Any]:
+    return {"done": _status["done"], "modules_ms": dict(_status["modules_ms"])}
@@ -5,6 +5,7 @@ Separate router from Alfred's main /chat endpoints.
 Handles the onboarding flow with persistent state management.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 
@@ -169,48 +170,25 @@ async def get_or_create_session(user_id: str) -> OnboardingState:
     """
     Load existing session or create new one.
     
-    Called at start of any onboarding endpoint.
+    Called at start of any onboarding endpoint. Served from the session
+    store's cache after the first load (see session_store.py).
     """
-    from alfred_kitchen.db.client import get_service_client
-    
-    client = get_service_client()
-    
-    try:
-        # Try to load existing session
-        result = client.table("onboarding_sessions").select("*").eq("user_id", user_id).execute()
-        
-        if result.data:
-            session_data = result.data[0]
-            state = OnboardingState.from_dict(session_data["state"])
-            return state
-    except Exception as e:
-        logger.warning(f"Failed to load onboarding session: {e}")
-    
-    # Create new session
-    state = OnboardingState(user_id=user_id)
-    await save_session(state)
-    return state
+    from .session_store import get_session_store
+
+    return await get_session_store().get(user_id)
 
 
-async def save_session(state: OnboardingState) -> None:
+async def save_session(state: OnboardingState, flush: bool = False) -> None:
     """
-    Save session state to database.
+    Save session state.
     
-    Called after every step to ensure durability.
+    Coalesced with nearby saves and written behind; phase changes (and
+    `flush`) are written before returning.
     """
-    from alfred_kitchen.db.client import get_service_client
-    
-    client = get_service_client()
-    
-    state.updated_at = datetime.utcnow().isoformat()
-    
+    from .session_store import get_session_store
+
     try:
-        client.table("onboarding_sessions").upsert({
-            "user_id": state.user_id,
-            "state": state.to_dict(),
-            "current_phase": state.current_phase.value,
-            "updated_at": state.updated_at,
-        }).execute()
+        await get_session_store().save(state, flush=flush)
     except Exception as e:
         logger.error(f"Failed to save onboarding session: {e}")
         raise HTTPException(status_code=500, detail="Failed to save session")
@@ -218,14 +196,29 @@ async def save_session(state: OnboardingState) -> None:
 
 async def clear_session(user_id: str) -> None:
     """Delete onboarding session after completion."""
-    from alfred_kitchen.db.client import get_service_client
-    
-    client = get_service_client()
-    
-    try:
-        client.table("onboarding_sessions").delete().eq("user_id", user_id).execute()
-    except Exception as e:
-        logger.warning(f"Failed to clear onboarding session: {e}")
+    from .session_store import get_session_store
+
+    await get_session_store().delete(user_id)
+
+
+def _schedule_style_samples(state: OnboardingState) -> None:
+    """Start background generation of the style samples (see style_prefetch.py)."""
+    from .style_prefetch import get_style_prefetcher
+
+    get_style_prefetcher().schedule(state)
+
+
+def _refresh_style_samples(state: OnboardingState) -> None:
+    """An earlier phase changed: drop stale samples and regenerate if they were underway."""
+    from .style_prefetch import get_style_prefetcher
+
+    get_style_prefetcher().refresh(state)
+
+
+def _cancel_style_samples(user_id: str) -> None:
+    from .style_prefetch import get_style_prefetcher
+
+    get_style_prefetcher().cancel(user_id)
 
 
 def get_completed_phases(state: OnboardingState) -> list[str]:
@@ -245,16 +238,21 @@ def get_completed_phases(state: OnboardingState) -> list[str]:
 # =============================================================================
 
 
+def _has_completed(user_id: str) -> bool:
+    from alfred_kitchen.db.client import get_service_client
+
+    completed = get_service_client().table("onboarding_data").select("user_id").eq("user_id", user_id).limit(1).execute()
+    return bool(completed.data)
+
+
 @router.get("/state", response_model=StateResponse)
 async def get_onboarding_state(user: AuthenticatedUser = Depends(get_current_user)) -> StateResponse:
     """Get current onboarding progress."""
-    from alfred_kitchen.db.client import get_service_client
-
-    client = get_service_client()
+    from .session_store import get_session_store
 
-    # First check if user already completed onboarding
-    completed = client.table("onboarding_data").select("user_id").eq("user_id", user.id).limit(1).execute()
-    if completed.data:
+    # First check if user already completed onboarding (a cached session
+    # means they haven't: completing deletes it)
+    if get_session_store().cached(user.id) is None and await asyncio.to_thread(_has_completed, user.id):
         # Already completed - don't create new session
         return StateResponse(
             user_id=user.id,
@@ -319,6 +317,9 @@ async def skip_phase(request: SkipPhaseRequest, user: AuthenticatedUser = Depend
     state.current_phase = next_phase
     await save_session(state)
     
+    if target_phase == OnboardingPhase.STAPLES:
+        _schedule_style_samples(state)
+    
     return PhaseResponse(
         success=True,
         current_phase=state.current_phase.value,
@@ -381,6 +382,9 @@ async def submit_constraints(request: ConstraintsRequest, user: AuthenticatedUse
     # Update payload draft with preferences
     state.payload_draft["preferences"] = state.constraints
     
+    # Style samples generated from the old constraints are stale
+    _refresh_style_samples(state)
+    
     # Transition to next phase
     state.current_phase = get_next_phase(state)
     await save_session(state)
@@ -427,6 +431,7 @@ async def submit_cuisines(request: CuisineRequest, user: AuthenticatedUser = Dep
     
     state.cuisine_selections = valid_cuisines
     state.payload_draft["cuisine_preferences"] = valid_cuisines
+    _refresh_style_samples(state)
     
     # Don't auto-advance - user controls when to move on
     await save_session(state)
@@ -506,6 +511,9 @@ async def submit_staples(
 
     await save_session(state)
 
+    # Style inputs are settled: generate all three sample sets in the background
+    _schedule_style_samples(state)
+
     return PhaseResponse(
         success=True,
         current_phase=state.current_phase.value,
@@ -686,79 +694,20 @@ async def get_style_samples(domain: str, user: AuthenticatedUser = Depends(get_c
     Get LLM-generated style samples for a domain.
     
     Uses user's pantry, cuisines, and constraints to generate personalized samples.
+    Served from the session when the background generation started by
+    submit_staples has finished, otherwise waits for it.
     """
-    from .style_discovery import (
-        generate_recipe_style_samples,
-        generate_meal_plan_style_samples,
-        generate_task_style_samples,
-    )
-    
-    state = await get_or_create_session(user.id)
-    
-    if domain not in ("recipes", "meal_plans", "tasks"):
+    from .style_discovery import STYLE_DOMAINS
+    from .style_prefetch import get_style_prefetcher
+
+    if domain not in STYLE_DOMAINS:
         raise HTTPException(status_code=400, detail=f"Unknown domain: {domain}")
-    
-    # Build payload_draft for LLM context
-    payload_draft = {
-        "preferences": state.constraints,
-        "initial_inventory": state.pantry_items,
-        "cuisine_preferences": state.cuisine_selections,
-    }
-    
+
+    state = await get_or_create_session(user.id)
+
+    # Usually pre-generated in the background once staples were submitted
     try:
-        if domain == "recipes":
-            proposal = await generate_recipe_style_samples(payload_draft)
-            samples = [
-                {
-                    "id": s.id,
-                    "style_name": s.style_name,
-                    "style_tags": s.style_tags,
-                    "text": s.recipe_text,
-                    "why_this_style": s.why_this_style,
-                }
-                for s in proposal.samples
-            ]
-            return {
-                "domain": domain,
-                "dish_name": proposal.dish_name,
-                "intro_message": proposal.intro_message,
-                "samples": samples,
-            }
-        
-        elif domain == "meal_plans":
-            proposal = await generate_meal_plan_style_samples(payload_draft)
-            samples = [
-                {
-                    "id": s.id,
-                    "style_name": s.style_name,
-                    "text": s.plan_text,
-                    "why_this_style": s.why_this_style,
-                }
-                for s in proposal.samples
-            ]
-            return {
-                "domain": domain,
-                "intro_message": proposal.intro_message,
-                "samples": samples,
-            }
-        
-        else:  # tasks
-            proposal = await generate_task_style_samples(payload_draft)
-            samples = [
-                {
-                    "id": s.id,
-                    "style_name": s.style_name,
-                    "text": s.task_text,
-                    "why_this_style": s.why_this_style,
-                }
-                for s in proposal.samples
-            ]
-            return {
-                "domain": domain,
-                "intro_message": proposal.intro_message,
-                "samples": samples,
-            }
-            
+        return await get_style_prefetcher().get_samples(state, domain)
     except Exception as e:
         logger.error(f"Failed to generate {domain} style samples: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate style samples: {str(e)}")
@@ -945,6 +894,9 @@ async def complete_onboarding(user: AuthenticatedUser = Depends(get_current_user
     """
     state = await get_or_create_session(user.id)
     
+    # Make sure the session is durable before applying it
+    await save_session(state, flush=True)
+    
     # Build final payload
     payload = build_payload_from_state(state)
     payload_dict = payload.to_dict()
@@ -1019,6 +971,7 @@ async def complete_onboarding(user: AuthenticatedUser = Depends(get_current_user
         logger.info(f"Onboarding completed and applied for user {user.id}")
 
         # 4. Clear session (onboarding complete)
+        _cancel_style_samples(user.id)
         await clear_session(user.id)
         
         return {
@@ -0,0 +1,386 @@
+"""
+Onboarding Session Store - Cached, write-coalescing onboarding_sessions access.
+
+Every onboarding endpoint used to select its onboarding_sessions row and
+most upserted the full state afterwards, synchronously on the service
+client, so a click cost two blocking round trips (more on interview
+pages). The session is only edited through these endpoints, so:
+
+- get() is read-through: the first request for a user loads the row in a
+  worker thread. Later requests reuse the cached OnboardingState object,
+  so concurrent handlers (and the style sample prefetch) edit one state.
+- save() marks the state dirty. Writes are debounced: saves within
+  FLUSH_DELAY_SECONDS of each other coalesce into one upsert, written
+  off the request path.
+- A save that changes current_phase (phase completion) flushes before
+  returning, so progress through the flow is durable at each step.
+  complete_onboarding flushes before applying the payload.
+- A new session isn't inserted until its first flush.
+- Entries expire after CACHE_TTL_SECONDS. A dirty entry is flushed
+  before it is dropped.
+
+Writes are conditional on the row's updated_at as last read (a new
+session is inserted only if no row exists yet). If another worker wrote
+in between, the flush reloads the row, keeps every field this worker
+changed since its read on top of the other worker's, and retries, so
+neither side's changes are lost. The TTL only bounds how stale a read
+can be. With a shared state backplane (several workers, see
+alfred_kitchen/web/backplane.py) the store doesn't cache at all: every
+get() reads the row and every save() writes through.
+
+With the cache warm, a click costs at most one round trip (the phase
+flush) and usually none on the request path.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .state import OnboardingState
+
+logger = logging.getLogger(__name__)
+
+# Saves within this window are written as one upsert
+FLUSH_DELAY_SECONDS = 2.0
+
+# Cached sessions are re-read after this long (other workers' writes)
+CACHE_TTL_SECONDS = 120.0
+
+MAX_CACHED_SESSIONS = 1000
+
+# Retry policy (per flush)
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_DELAY_SECONDS = 0.5
+
+# Reload-and-merge rounds a flush makes when other workers keep writing
+MAX_WRITE_CONFLICTS = 3
+
+
+class WriteConflictError(RuntimeError):
+    """Other workers kept writing the session while a flush retried."""
+
+
+@dataclass
+class _Entry:
+    state: OnboardingState
+    loaded_at: float
+    persisted: bool  # Row exists in onboarding_sessions
+    flushed_phase: str | None
+    # updated_at of the row as last read/written (None: insert if absent)
+    version: str | None = None
+    # to_dict() of the state as of `version`: what this worker changed since
+    base: dict = field(default_factory=dict)
+    dirty: bool = False
+    flush_task: asyncio.Task | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class OnboardingSessionStore:
+    """In-process cache of onboarding sessions with debounced write-back.
+
+    shared=True (other workers serve the same users) reads on every get()
+    and writes on every save().
+    """
+
+    def __init__(
+        self,
+        flush_delay_seconds: float = FLUSH_DELAY_SECONDS,
+        cache_ttl_seconds: float = CACHE_TTL_SECONDS,
+        max_cached_sessions: int = MAX_CACHED_SESSIONS,
+        shared: bool = False,
+    ) -> None:
+        self.shared = shared
+        self.flush_delay_seconds = flush_delay_seconds
+        self.cache_ttl_seconds = 0.0 if shared else cache_ttl_seconds
+        self._max_cached = max_cached_sessions
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        self._reads = 0
+        self._writes = 0
+        self._coalesced = 0
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def cached(self, user_id: str) -> OnboardingState | None:
+        """The cached session, without touching the database."""
+        entry = self._entries.get(user_id)
+        return entry.state if entry is not None and not self._expired(entry) else None
+
+    async def get(self, user_id: str, create: bool = True) -> OnboardingState | None:
+        """Load a user's session (cached), creating an unsaved one if there is none."""
+        entry = self._entries.get(user_id)
+        if entry is not None and self._expired(entry):
+            await self._evict(user_id)
+            entry = None
+        if entry is None:
+            entry = await self._load(user_id)
+        if entry is None:
+            if not create:
+                return None
+            entry = self._remember(user_id, OnboardingState(user_id=user_id), persisted=False)
+            entry.base = entry.state.to_dict()
+            self._mark_dirty(entry)
+        self._entries.move_to_end(user_id)
+        return entry.state
+
+    async def _load(self, user_id: str) -> _Entry | None:
+        # One select per user even when requests race on a cold cache
+        pending = self._loading.get(user_id)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return self._entries.get(user_id)
+
+        done = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = done
+        try:
+            self._reads += 1
+            try:
+                loaded = await asyncio.to_thread(_select_state, user_id)
+            except Exception as e:
+                logger.warning(f"Failed to load onboarding session: {e}")
+                loaded = None
+            if loaded is None:
+                return None
+            data, version = loaded
+            entry = self._remember(user_id, OnboardingState.from_dict(data), persisted=True)
+            entry.version = version
+            entry.base = entry.state.to_dict()
+            return entry
+        finally:
+            self._loading.pop(user_id, None)
+            done.set_result(None)
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    async def save(self, state: OnboardingState, flush: bool = False) -> None:
+        """
+        Record a change to the session.
+
+        Written behind (coalesced with nearby saves) unless `flush` is set,
+        the phase changed since the last write or the store is shared, in
+        which case the write lands before this returns. A failed durable
+        write raises.
+        """
+        state.updated_at = datetime.utcnow().isoformat()
+        entry = self._entries.get(state.user_id)
+        if entry is None or entry.state is not state:
+            # Not from get() (or evicted meanwhile): adopt it
+            previous = entry
+            entry = self._remember(state.user_id, state, persisted=previous.persisted if previous else True)
+            if previous is not None:
+                entry.flushed_phase = previous.flushed_phase
+                entry.version = previous.version
+                entry.base = previous.base
+        self._mark_dirty(entry)
+        if flush or self.shared or state.current_phase.value != entry.flushed_phase:
+            await self.flush(state.user_id, raise_errors=True)
+
+    async def flush(self, user_id: str, raise_errors: bool = False) -> None:
+        """Write the session now if it has unsaved changes."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        if entry.flush_task is not None:
+            # Still waiting out the debounce: this flush covers it
+            entry.flush_task.cancel()
+            entry.flush_task = None
+        async with entry.lock:
+            if not entry.dirty:
+                return
+            entry.dirty = False
+            attempt = conflicts = 0
+            while True:
+                row = {
+                    "user_id": user_id,
+                    "state": entry.state.to_dict(),
+                    "current_phase": entry.state.current_phase.value,
+                }
+                try:
+                    self._writes += 1
+                    version = await asyncio.to_thread(_write_state, row, entry.version)
+                    if version is not None:
+                        break
+                    # Another worker wrote since our read: merge and retry
+                    conflicts += 1
+                    if conflicts <= MAX_WRITE_CONFLICTS:
+                        await self._rebase(entry)
+                        continue
+                    error: Exception = WriteConflictError(f"onboarding session for {user_id} kept changing")
+                except Exception as e:
+                    attempt += 1
+                    if attempt < WRITE_ATTEMPTS:
+                        await asyncio.sleep(WRITE_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+                        continue
+                    error = e
+                entry.dirty = True  # Retried by the next save / flush
+                logger.error(f"Failed to save onboarding session for {user_id}: {error}")
+                if raise_errors:
+                    raise error
+                return
+            entry.persisted = True
+            entry.flushed_phase = row["current_phase"]
+            entry.version = version
+            entry.base = row["state"]
+
+    async def flush_all(self) -> None:
+        """Write every dirty session (shutdown)."""
+        await asyncio.gather(
+            *(self.flush(user_id) for user_id, entry in list(self._entries.items()) if entry.dirty)
+        )
+
+    async def delete(self, user_id: str) -> None:
+        """Drop the session (onboarding complete) from cache and database."""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            await self._delete(user_id)
+            return
+        if entry.flush_task is not None:
+            entry.flush_task.cancel()
+        entry.dirty = False
+        async with entry.lock:  # An upsert in flight lands first, then the delete
+            if entry.persisted:
+                await self._delete(user_id)
+
+    async def _delete(self, user_id: str) -> None:
+        try:
+            await asyncio.to_thread(_delete_state, user_id)
+        except Exception as e:
+            logger.warning(f"Failed to clear onboarding session: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "cached": len(self._entries),
+            "dirty": sum(entry.dirty for entry in self._entries.values()),
+            "reads": self._reads,
+            "writes": self._writes,
+            "coalesced": self._coalesced,
+        }
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    async def _rebase(self, entry: _Entry) -> None:
+        """Reload the row and put this worker's changes (since `base`) on top."""
+        self._reads += 1
+        loaded = await asyncio.to_thread(_select_state, entry.state.user_id)
+        if loaded is None:
+            # Deleted meanwhile: write ours as a new row
+            entry.version = None
+            entry.base = {}
+            return
+        remote, version = loaded
+        local = entry.state.to_dict()
+        merged = {**remote, **{k: v for k, v in local.items() if entry.base.get(k) != v}}
+        # In place: request handlers hold this state object
+        vars(entry.state).update(vars(OnboardingState.from_dict(copy.deepcopy(merged))))
+        entry.version = version
+        entry.base = remote
+
+    def _mark_dirty(self, entry: _Entry) -> None:
+        if entry.dirty:
+            self._coalesced += 1
+        entry.dirty = True
+        if entry.flush_task is None or entry.flush_task.done():
+            entry.flush_task = asyncio.create_task(self._flush_later(entry.state.user_id))
+
+    async def _flush_later(self, user_id: str) -> None:
+        await asyncio.sleep(self.flush_delay_seconds)
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.flush_task is asyncio.current_task():
+            entry.flush_task = None  # Past the debounce; no longer cancellable
+        await self.flush(user_id)
+
+    def _remember(self, user_id: str, state: OnboardingState, persisted: bool) -> _Entry:
+        entry = _Entry(
+            state=state,
+            loaded_at=time.monotonic(),
+            persisted=persisted,
+            flushed_phase=state.current_phase.value if persisted else None,
+        )
+        previous = self._entries.get(user_id)
+        if previous is not None and previous.flush_task is not None:
+            previous.flush_task.cancel()
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        if len(self._entries) > self._max_cached:
+            # Least recently used clean entry; dirty ones leave after their flush
+            for oldest, candidate in self._entries.items():
+                if not candidate.dirty and candidate is not entry:
+                    del self._entries[oldest]
+                    break
+        return entry
+
+    def _expired(self, entry: _Entry) -> bool:
+        return not entry.dirty and time.monotonic() - entry.loaded_at > self.cache_ttl_seconds
+
+    async def _evict(self, user_id: str) -> None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return
+        if entry.dirty:
+            await self.flush(user_id)
+        if self._entries.get(user_id) is entry:
+            del self._entries[user_id]
+
+
+# =============================================================================
+# PostgREST calls (service client: onboarding runs before preferences exist)
+# =============================================================================
+
+
+def _select_state(user_id: str) -> tuple[dict, str] | None:
+    """The session's state and its updated_at (the version writes check)."""
+    from alfred_kitchen.db.client import get_service_client
+
+    result = (
+        get_service_client().table("onboarding_sessions")
+        .select("state, updated_at").eq("user_id", user_id).execute()
+    )
+    return (result.data[0]["state"], result.data[0]["updated_at"]) if result.data else None
+
+
+def _write_state(row: dict, version: str | None) -> str | None:
+    """Write the row if it is still at `version` (None: only if there is no row).
+
+    Returns the new updated_at (set by the table's trigger or default), or
+    None when another writer got there first.
+    """
+    from alfred_kitchen.db.client import get_service_client
+
+    table = get_service_client().table("onboarding_sessions")
+    if version is None:
+        result = table.upsert(row, ignore_duplicates=True).execute()
+    else:
+        result = table.update(row).eq("user_id", row["user_id"]).eq("updated_at", version).execute()
+    return result.data[0]["updated_at"] if result.data else None
+
+
+def _delete_state(user_id: str) -> None:
+    from alfred_kitchen.db.client import get_service_client
+
+    get_service_client().table("onboarding_sessions").delete().eq("user_id", user_id).execute()
+
+
+# =============================================================================
+# Module-level singleton
+# =============================================================================
+
+_store: OnboardingSessionStore | None = None
+
+
+def get_session_store() -> OnboardingSessionStore:
+    global _store
+    if _store is None:
+        from alfred_kitchen.web.backplane import get_backplane
+
+        _store = OnboardingSessionStore(shared=get_backplane().shared)
+    return _store
@@ -4,11 +4,17 @@ Staples Selection for Onboarding.
 Shows a curated set of ~40 pantry essentials ranked by anchor-list matching,
 tier weight, and cuisine affinity. Selected items are seeded into the user's
 inventory at onboarding completion so Alfred has immediate context (cold-start
-fix).
+fix). Candidates are held in an in-process index (StaplesIndex), so a
+request is ranked without a database round trip.
 """
 
+import asyncio
+import heapq
 import logging
+import time
 import uuid as _uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +78,12 @@ DIETARY_EXCLUSIONS: dict[str, dict[str, list[str]]] = {
 # Cap on essentials returned
 MAX_ESSENTIALS = 60
 
+# The candidate set is re-read after this long (catalog maintenance)
+STAPLES_REFRESH_SECONDS = 600.0
+
+# Memoized (cuisines, restrictions) rankings
+MAX_CACHED_RANKINGS = 256
+
 
 def _compute_exclusions(
     dietary_restrictions: list[str],
@@ -95,6 +107,283 @@ def _is_excluded(row: dict, excluded: dict[str, set[str]]) -> bool:
     return False
 
 
+# Anchor lookups (lowercase for case-insensitive matching)
+_CORE_LOWER = {a.lower() for a in CORE_ANCHORS}
+_EXTRA_LOWER = {a.lower() for a in EXTRA_ANCHORS}
+_ALL_ANCHORS = _CORE_LOWER | _EXTRA_LOWER
+
+
+def _family_key(row: dict) -> str:
+    """Dedupe key: the ingredient family, or its name when it has none."""
+    return (row.get("family") or row.get("name", "")).lower().strip()
+
+
+def _anchor_score(name_lower: str) -> float:
+    """Core anchors get 0.5, extra anchors 0.3, non-anchors 0."""
+    if name_lower in _CORE_LOWER:
+        return 0.5
+    if name_lower in _EXTRA_LOWER:
+        return 0.3
+    return 0.0
+
+
+@dataclass
+class _Candidate:
+    name_lower: str
+    score: float          # anchor (0-0.5) + tier_weight (0.15)
+    boosted_score: float  # ... + cuisine_boost (0.1)
+    item: dict            # Response entry (without cuisine_match)
+    tier: int
+
+
+@dataclass
+class _Family:
+    mask: int                    # Bit per member
+    tie_groups: list[list[int]]  # Members by preference: anchor, then shorter name
+
+
+class StaplesIndex:
+    """
+    Staple candidates ranked in-process for the onboarding checklist.
+
+    The checklist used to fetch the tier 1/2 staple rows and re-score,
+    sort and dedupe them on every request. The candidate set is a few
+    hundred rows and changes only with catalog maintenance, so it is
+    loaded once (refreshed every `refresh_seconds`) into:
+
+    - one bitset (Python int, bit i = candidate i) per dietary restriction
+      of the items it excludes, and one per cuisine of the items tagged
+      with it;
+    - per-candidate scores with and without the cuisine boost;
+    - family groups whose members are pre-sorted by the dedupe preference
+      (anchor, then shorter name).
+
+    A request ORs its restriction masks, picks each family's best allowed
+    member, applies the cuisine boost and takes the top MAX_ESSENTIALS.
+    The result is memoized per (cuisines, restrictions).
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = STAPLES_REFRESH_SECONDS,
+        max_cached_rankings: int = MAX_CACHED_RANKINGS,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._max_cached = max_cached_rankings
+        self._loaded_at: float | None = None
+        self._loading: asyncio.Future | None = None
+        self._candidates: list[_Candidate] = []
+        self._families: list[_Family] = []
+        self._restriction_masks: dict[str, int] = {}
+        self._cuisine_masks: dict[str, int] = {}
+        self._all = 0
+        self._rankings: OrderedDict[tuple[frozenset, frozenset], dict] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def build(self, rows: list[dict]) -> None:
+        """Replace the candidate set (rows as selected by _fetch_staple_rows)."""
+        candidates: list[_Candidate] = []
+        restriction_masks = {restriction: 0 for restriction in DIETARY_EXCLUSIONS}
+        exclusions = {
+            restriction: _compute_exclusions([restriction]) for restriction in DIETARY_EXCLUSIONS
+        }
+        cuisine_masks: dict[str, int] = {}
+        members: dict[str, list[int]] = {}
+
+        for i, row in enumerate(rows):
+            bit = 1 << i
+            name = row.get("name", "")
+            name_lower = name.lower()
+            tier_w = 1.0 if row.get("tier") == 1 else 0.5
+            anchor_score = _anchor_score(name_lower)
+            candidates.append(_Candidate(
+                name_lower=name_lower,
+                score=anchor_score + tier_w * 0.15,
+                boosted_score=anchor_score + tier_w * 0.15 + 0.1,
+                item={
+                    "id": str(row["id"]),
+                    "name": name,
+                    "default_unit": row.get("default_unit"),
+                    "parent_category": row.get("parent_category"),
+                },
+                tier=row.get("tier", 2),
+            ))
+            for restriction, excluded in exclusions.items():
+                if _is_excluded(row, excluded):
+                    restriction_masks[restriction] |= bit
+            for cuisine in {c.lower() for c in (row.get("cuisines") or [])}:
+                cuisine_masks[cuisine] = cuisine_masks.get(cuisine, 0) | bit
+            members.setdefault(_family_key(row), []).append(i)
+
+        families = []
+        for indexes in members.values():
+            mask = 0
+            groups: dict[tuple[bool, int], list[int]] = {}
+            for i in indexes:
+                mask |= 1 << i
+                preference = (candidates[i].name_lower not in _ALL_ANCHORS, len(candidates[i].item["name"]))
+                groups.setdefault(preference, []).append(i)
+            families.append(_Family(mask, [groups[key] for key in sorted(groups)]))
+
+        self._candidates = candidates
+        self._families = families
+        self._restriction_masks = restriction_masks
+        self._cuisine_masks = cuisine_masks
+        self._all = (1 << len(candidates)) - 1
+        self._rankings.clear()
+        self._loaded_at = time.monotonic()
+
+    async def _ensure_loaded(self) -> bool:
+        fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds
+        if fresh:
+            return True
+        if self._loading is not None:
+            # One fetch even when requests race on a cold index
+            await asyncio.shield(self._loading)
+            return self._loaded_at is not None
+
+        self._loading = asyncio.get_running_loop().create_future()
+        try:
+            rows = await asyncio.to_thread(_fetch_staple_rows)
+            if not rows:
+                logger.warning("No tier 1/2 staple ingredients found")
+            self.build(rows)
+        except Exception as e:
+            logger.error(f"Failed to load staples candidates: {e}")
+            if self._loaded_at is not None:
+                self._loaded_at = time.monotonic()  # Keep serving the previous set until the next refresh
+        finally:
+            self._loading.set_result(None)
+            self._loading = None
+        return self._loaded_at is not None
+
+    # -------------------------------------------------------------------------
+    # Ranking
+    # -------------------------------------------------------------------------
+
+    async def options(
+        self,
+        cuisines: list[str] | None = None,
+        dietary_restrictions: list[str] | None = None,
+    ) -> dict:
+        """The checklist for these selections (see get_staples_options)."""
+        if not await self._ensure_loaded():
+            return {"essentials": [], "pre_selected_ids": [], "cuisine_suggested_ids": []}
+        ranking = self.rank(cuisines or [], dietary_restrictions or [])
+        return {key: list(value) for key, value in ranking.items()}
+
+    def rank(self, cuisines: list[str], dietary_restrictions: list[str]) -> dict:
+        """Memoized ranking for the loaded candidates. Treat the result as read-only."""
+        # Only restrictions and cuisines that select something change the result
+        restrictions = frozenset(
+            r.lower() for r in dietary_restrictions if self._restriction_masks.get(r.lower())
+        )
+        cuisines_key = frozenset(c.lower() for c in cuisines if c.lower() in self._cuisine_masks)
+        key = (cuisines_key, restrictions)
+
+        ranking = self._rankings.get(key)
+        if ranking is not None:
+            self._hits += 1
+            self._rankings.move_to_end(key)
+            return ranking
+
+        self._misses += 1
+        ranking = self._rank(cuisines_key, restrictions)
+        self._rankings[key] = ranking
+        if len(self._rankings) > self._max_cached:
+            self._rankings.popitem(last=False)
+        return ranking
+
+    def _rank(self, cuisines: frozenset[str], restrictions: frozenset[str]) -> dict:
+        excluded = 0
+        for restriction in restrictions:
+            excluded |= self._restriction_masks[restriction]
+        allowed = self._all & ~excluded
+        matched = 0
+        for cuisine in cuisines:
+            matched |= self._cuisine_masks[cuisine]
+
+        candidates = self._candidates
+
+        def score(i: int) -> float:
+            return candidates[i].boosted_score if matched >> i & 1 else candidates[i].score
+
+        def order(i: int) -> tuple[float, str, int]:
+            # Sort order of the ranked list; the index keeps ties in row order
+            return (-score(i), candidates[i].name_lower, i)
+
+        # Best allowed member per family: first preference group with one
+        # allowed, highest ranked within it
+        best = []
+        for family in self._families:
+            if not family.mask & allowed:
+                continue
+            for group in family.tie_groups:
+                live = [i for i in group if allowed >> i & 1]
+                if live:
+                    best.append(min(live, key=order))
+                    break
+
+        essentials = []
+        pre_selected_ids = []
+        cuisine_suggested_ids = []
+        for i in heapq.nsmallest(MAX_ESSENTIALS, best, key=order):
+            candidate = candidates[i]
+            item = candidate.item
+            if matched >> i & 1 and candidate.tier == 2:
+                item = {**item, "cuisine_match": True}
+                cuisine_suggested_ids.append(item["id"])
+            essentials.append(item)
+            pre_selected_ids.append(item["id"])
+
+        return {
+            "essentials": essentials,
+            "pre_selected_ids": pre_selected_ids,
+            "cuisine_suggested_ids": cuisine_suggested_ids,
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "candidates": len(self._candidates),
+            "families": len(self._families),
+            "cached_rankings": len(self._rankings),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+def _fetch_staple_rows() -> list[dict]:
+    from alfred_kitchen.db.client import get_service_client
+
+    result = get_service_client().table("ingredients").select(
+        "id, name, parent_category, family, tier, cuisines, default_unit"
+    ).in_(
+        "tier", [1, 2]
+    ).in_(
+        "parent_category", STAPLE_CATEGORIES
+    ).execute()
+    return result.data or []
+
+
+# =============================================================================
+# Module-level singleton
+# =============================================================================
+
+_index: StaplesIndex | None = None
+
+
+def get_staples_index() -> StaplesIndex:
+    global _index
+    if _index is None:
+        _index = StaplesIndex()
+    return _index
+
+
 async def get_staples_options(
     cuisines: list[str] | None = None,
     dietary_restrictions: list[str] | None = None,
@@ -102,6 +391,9 @@ async def get_staples_options(
     """
     Get curated staple essentials for the onboarding checklist.
 
+    Ranked by anchor-list matching, tier weight and cuisine affinity, one
+    item per family, dietary exclusions removed (see StaplesIndex).
+
     Args:
         cuisines: User's selected cuisines (for highlighting cuisine-specific items)
         dietary_restrictions: User's dietary restrictions (for filtering)
@@ -117,114 +409,8 @@ async def get_staples_options(
             "cuisine_suggested_ids": ["uuid3", ...]    # Tier 2 cuisine matches
         }
     """
-    from alfred_kitchen.db.client import get_service_client
-
-    client = get_service_client()
-    cuisines = cuisines or []
-    dietary_restrictions = dietary_restrictions or []
-    cuisines_lower = [c.lower() for c in cuisines]
-    excluded = _compute_exclusions(dietary_restrictions)
-
     try:
-        # Fetch tier 1 ingredients from staple categories only
-        result = client.table("ingredients").select(
-            "id, name, parent_category, family, tier, cuisines, default_unit"
-        ).in_(
-            "tier", [1, 2]
-        ).in_(
-            "parent_category", STAPLE_CATEGORIES
-        ).execute()
-
-        if not result.data:
-            logger.warning("No tier 1/2 staple ingredients found")
-            return {"essentials": [], "pre_selected_ids": [], "cuisine_suggested_ids": []}
-
-        # Apply dietary restriction filtering
-        items = [row for row in result.data if not _is_excluded(row, excluded)]
-
-        # Build anchor lookups (lowercase for case-insensitive matching)
-        core_lower = {a.lower() for a in CORE_ANCHORS}
-        extra_lower = {a.lower() for a in EXTRA_ANCHORS}
-
-        # Score each ingredient:
-        #   anchor (0-0.5) + tier_weight (0.15) + cuisine_boost (0.1)
-        # Core anchors get 0.5, extra anchors get 0.3, non-anchors get 0.
-        cuisines_set = set(cuisines_lower)
-        scored = []
-        for ing in items:
-            name_lower = ing.get("name", "").lower()
-            if name_lower in core_lower:
-                anchor_score = 0.5
-            elif name_lower in extra_lower:
-                anchor_score = 0.3
-            else:
-                anchor_score = 0.0
-            tier_w = 1.0 if ing.get("tier") == 1 else 0.5
-            ing_cuisines = {c.lower() for c in (ing.get("cuisines") or [])}
-            cuisine_boost = 1.0 if cuisines_set & ing_cuisines else 0.0
-            score = anchor_score + tier_w * 0.15 + cuisine_boost * 0.1
-            scored.append((score, ing))
-
-        scored.sort(key=lambda x: (-x[0], x[1].get("name", "").lower()))
-
-        # Deduplicate by family: keep the highest-scored item per family.
-        # Prevents "parmesan" + "parmesan cheese" or 3x olive oil variants.
-        # Within each family, prefer anchor matches over non-anchors, then
-        # shorter names (more generic) over longer ones.
-        all_anchors = core_lower | extra_lower
-        family_best: dict[str, dict] = {}
-        for _score, ing in scored:
-            family = (ing.get("family") or ing.get("name", "")).lower().strip()
-            is_anchor = ing.get("name", "").lower() in all_anchors
-            if family not in family_best:
-                family_best[family] = ing
-            else:
-                prev = family_best[family]
-                prev_anchor = prev.get("name", "").lower() in all_anchors
-                # Prefer: anchor > non-anchor, then shorter name
-                if is_anchor and not prev_anchor:
-                    family_best[family] = ing
-                elif is_anchor == prev_anchor and len(ing.get("name", "")) < len(prev.get("name", "")):
-                    family_best[family] = ing
-
-        # Re-score with deduped items
-        deduped_set = set(id(v) for v in family_best.values())
-        scored = [(s, ing) for s, ing in scored if id(ing) in deduped_set]
-
-        items = [ing for _score, ing in scored[:MAX_ESSENTIALS]]
-
-        # Build response
-        essentials = []
-        pre_selected_ids = []
-        cuisine_suggested_ids = []
-
-        for ing in items:
-            tier = ing.get("tier", 2)
-            ing_cuisines = ing.get("cuisines") or []
-            is_cuisine_match = any(
-                c in cuisines_lower for c in [x.lower() for x in ing_cuisines]
-            )
-
-            ingredient_data = {
-                "id": str(ing["id"]),
-                "name": ing["name"],
-                "default_unit": ing.get("default_unit"),
-                "parent_category": ing.get("parent_category"),
-            }
-
-            if is_cuisine_match and tier == 2:
-                ingredient_data["cuisine_match"] = True
-                cuisine_suggested_ids.append(str(ing["id"]))
-
-            essentials.append(ingredient_data)
-            pre_selected_ids.append(str(ing["id"]))
-
-        return {
-            "essentials": essentials,
-            "pre_selected_ids": pre_selected_ids,
-            "cuisine_suggested_ids": cuisine_suggested_ids,
-        }
-
+        return await get_staples_index().options(cuisines, dietary_restrictions)
     except Exception as e:
         logger.error(f"Failed to get staples options: {e}")
         return {"essentials": [], "pre_selected_ids": [], "cuisine_suggested_ids": []}
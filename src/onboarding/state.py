@@ -88,6 +88,9 @@ class OnboardingState:
     style_tasks: StyleDiscoveryState = field(
         default_factory=lambda: StyleDiscoveryState(domain="tasks")
     )
+    # Samples pre-generated once staples are in (see style_prefetch.py):
+    # {"inputs": <fingerprint of constraints/pantry/cuisines>, "domains": {domain: samples}}
+    style_samples: dict = field(default_factory=dict)
     habits_response: str = ""
     habits_extraction: dict = field(default_factory=dict)
     
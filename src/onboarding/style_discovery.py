@@ -295,6 +295,65 @@ async def generate_task_style_samples(
     )
 
 
+STYLE_DOMAINS = ("recipes", "meal_plans", "tasks")
+
+
+async def generate_style_samples(domain: str, payload_draft: dict) -> dict:
+    """
+    Generate one domain's samples in the shape served by /style/samples/{domain}.
+
+    Plain dicts, so the result can be stored on the onboarding session.
+    """
+    if domain == "recipes":
+        proposal = await generate_recipe_style_samples(payload_draft)
+        return {
+            "domain": domain,
+            "dish_name": proposal.dish_name,
+            "intro_message": proposal.intro_message,
+            "samples": [
+                {
+                    "id": s.id,
+                    "style_name": s.style_name,
+                    "style_tags": s.style_tags,
+                    "text": s.recipe_text,
+                    "why_this_style": s.why_this_style,
+                }
+                for s in proposal.samples
+            ],
+        }
+
+    if domain == "meal_plans":
+        proposal = await generate_meal_plan_style_samples(payload_draft)
+        samples = [
+            {
+                "id": s.id,
+                "style_name": s.style_name,
+                "text": s.plan_text,
+                "why_this_style": s.why_this_style,
+            }
+            for s in proposal.samples
+        ]
+    elif domain == "tasks":
+        proposal = await generate_task_style_samples(payload_draft)
+        samples = [
+            {
+                "id": s.id,
+                "style_name": s.style_name,
+                "text": s.task_text,
+                "why_this_style": s.why_this_style,
+            }
+            for s in proposal.samples
+        ]
+    else:
+        raise ValueError(f"Unknown domain: {domain}")
+
+    return {
+        "domain": domain,
+        "intro_message": proposal.intro_message,
+        "samples": samples,
+    }
+
+
 # =============================================================================
 # Synthesis Function
 # =============================================================================
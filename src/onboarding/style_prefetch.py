@@ -0,0 +1,188 @@
+"""
+Style Sample Prefetch - Background generation of Phase 3 samples.
+
+The style pages used to generate their samples when opened, so each page
+load waited on a large LLM call. Their inputs (constraints, pantry,
+cuisines) are settled once staples are submitted, so:
+
+1. submit_staples (or skipping staples) calls schedule(): the three
+   domains are generated concurrently in one background task.
+2. The task stores the results on the session (state.style_samples),
+   tagged with a fingerprint of the inputs they came from.
+3. get_samples() serves stored samples whose fingerprint matches, waits
+   for the in-flight task if there is one, and otherwise schedules all
+   three and waits for the domain it needs.
+4. Editing constraints or cuisines changes the fingerprint: refresh()
+   drops the stale samples, cancels the running task and, if samples had
+   been requested, starts over with the new inputs.
+
+Generation is three call_llm calls, which run in worker threads: they
+overlap, and the background task never holds the event loop. A cancelled
+job's in-flight calls still finish in their threads; the results are
+dropped.
+
+Tasks live in this process. Samples stored on the session are served by
+any worker.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .state import OnboardingState
+from .style_discovery import STYLE_DOMAINS, generate_style_samples
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for sessions whose stored samples were overwritten
+MAX_FINISHED_JOBS = 1000
+
+# (user_id, fingerprint, {domain: samples}) -> persist on the session
+StoreSamples = Callable[[str, str, dict[str, dict]], Awaitable[None]]
+
+
+def style_inputs(state: OnboardingState) -> dict:
+    """The payload_draft the sample generators read."""
+    return {
+        "preferences": state.constraints,
+        "initial_inventory": state.pantry_items,
+        "cuisine_preferences": state.cuisine_selections,
+    }
+
+
+def inputs_fingerprint(inputs: dict) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+@dataclass
+class _Job:
+    fingerprint: str
+    task: asyncio.Task
+
+
+class StyleSamplePrefetcher:
+    """Per-user background generation of the three style sample sets."""
+
+    def __init__(self, store: StoreSamples | None = None) -> None:
+        self._store = store
+        self._jobs: dict[str, _Job] = {}
+
+    def schedule(self, state: OnboardingState) -> None:
+        """Start generating all domains for the current inputs (no-op if done or running)."""
+        inputs = style_inputs(state)
+        fingerprint = inputs_fingerprint(inputs)
+        stored = state.style_samples
+        if stored.get("inputs") == fingerprint and set(STYLE_DOMAINS) <= set(stored.get("domains", {})):
+            return
+        job = self._jobs.get(state.user_id)
+        if job is not None and job.fingerprint == fingerprint:
+            return
+
+        self.cancel(state.user_id)
+        self._prune()
+        task = asyncio.create_task(self._generate_all(state.user_id, fingerprint, inputs))
+        self._jobs[state.user_id] = _Job(fingerprint, task)
+
+    def refresh(self, state: OnboardingState) -> None:
+        """Call after an earlier phase changes: drop stale samples, regenerate if they were wanted."""
+        fingerprint = inputs_fingerprint(style_inputs(state))
+        job = self._jobs.get(state.user_id)
+        wanted = bool(state.style_samples) or job is not None
+
+        if state.style_samples.get("inputs") not in (None, fingerprint):
+            state.style_samples = {}
+        if job is not None and job.fingerprint != fingerprint:
+            self.cancel(state.user_id)
+        if wanted:
+            self.schedule(state)
+
+    def cancel(self, user_id: str) -> None:
+        job = self._jobs.pop(user_id, None)
+        if job is not None and not job.task.done():
+            job.task.cancel()
+
+    async def get_samples(self, state: OnboardingState, domain: str) -> dict:
+        """One domain's samples for the session's current inputs."""
+        inputs = style_inputs(state)
+        fingerprint = inputs_fingerprint(inputs)
+
+        stored = state.style_samples
+        if stored.get("inputs") == fingerprint and domain in stored.get("domains", {}):
+            return stored["domains"][domain]
+
+        self.schedule(state)
+        job = self._jobs.get(state.user_id)
+        if job is not None and job.fingerprint == fingerprint:
+            # wait() rather than shield(): a refresh() cancelling the job
+            # must not look like this request being cancelled
+            await asyncio.wait({job.task})
+            if not job.task.cancelled() and job.task.exception() is None:
+                samples = job.task.result()
+                if domain in samples:
+                    return samples[domain]
+
+        # This domain's background generation failed: one inline attempt
+        return await generate_style_samples(domain, inputs)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": sum(not job.task.done() for job in self._jobs.values()),
+            "finished": sum(job.task.done() for job in self._jobs.values()),
+        }
+
+    async def _generate_all(self, user_id: str, fingerprint: str, inputs: dict) -> dict[str, dict]:
+        results = await asyncio.gather(
+            *(generate_style_samples(domain, inputs) for domain in STYLE_DOMAINS),
+            return_exceptions=True,
+        )
+        samples = {}
+        for domain, result in zip(STYLE_DOMAINS, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Background {domain} style samples failed for {user_id}: {result}")
+            else:
+                samples[domain] = result
+
+        job = self._jobs.get(user_id)
+        if job is None or job.task is not asyncio.current_task():
+            return samples  # Cancelled or superseded after generating
+        if samples and self._store is not None:
+            try:
+                await self._store(user_id, fingerprint, samples)
+            except Exception as e:
+                # Still served from this job; the session just doesn't have them
+                logger.warning(f"Failed to store style samples for {user_id}: {e}")
+        return samples
+
+    def _prune(self) -> None:
+        finished = [user_id for user_id, job in self._jobs.items() if job.task.done()]
+        for user_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+            del self._jobs[user_id]
+
+
+async def store_on_session(user_id: str, fingerprint: str, samples: dict[str, dict]) -> None:
+    """Persist finished samples, unless the inputs changed while they were generated."""
+    from .session_store import get_session_store
+
+    store = get_session_store()
+    state = await store.get(user_id, create=False)
+    if state is None or inputs_fingerprint(style_inputs(state)) != fingerprint:
+        return
+    state.style_samples = {"inputs": fingerprint, "domains": samples}
+    await store.save(state)
+
+
+# =============================================================================
+# Module-level singleton
+# =============================================================================
+
+_prefetcher: StyleSamplePrefetcher | None = None
+
+
+def get_style_prefetcher() -> StyleSamplePrefetcher:
+    global _prefetcher
+    if _prefetcher is None:
+        _prefetcher = StyleSamplePrefetcher(store=store_on_session)
+    return _prefetcher
@@ -55,3 +55,27 @@ class TestCostTracker:
         summary = tracker.summary()
         assert summary["total_calls"] == 0
         assert tracker.total_cost == 0
+
+
+class TestPromptCacheTelemetry:
+    """Test cached_tokens accounting and per-node hit ratios."""
+
+    def test_cached_tokens_default_to_zero(self):
+        tracker = CostTracker()
+        tracker.add("gpt-4.1-mini", 1000, 500, node="think")
+
+        assert tracker.total_cached_tokens == 0
+        assert tracker.calls[0]["cached_tokens"] == 0
+        assert tracker.cache_hit_ratio == 0.0
+
+    def test_hit_ratio_by_node(self):
+        tracker = CostTracker()
+        tracker.add("gpt-4.1-mini", 2000, 100, node="act", cached_tokens=1536)
+        tracker.add("gpt-4.1-mini", 2000, 100, node="act", cached_tokens=0)
+        tracker.add("gpt-4.1-mini", 1000, 100, node="reply")
+
+        summary = tracker.summary()
+
+        assert summary["total_cached_tokens"] == 1536
+        assert summary["cache_hit_ratio"] == round(1536 / 5000, 4)
+        assert summary["cache_hit_ratio_by_node"] == {"act": 0.384, "reply": 0.0}
@@ -0,0 +1,169 @@
+"""
+Tests for batched CRUD execution — domain-agnostic (uses StubDomainConfig).
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alfred.core.id_registry import SessionIdRegistry
+from alfred.graph.nodes.act import (
+    MAX_DECISIONS_PER_STEP,
+    MAX_TOOL_CALLS_PER_DECISION,
+    ActDecision,
+    ToolCallSpec,
+    _decision_tool_calls,
+    act_node,
+)
+from alfred.tools.crud import CrudBatchError, execute_crud_batch
+
+
+class FakeDatabase:
+    """Raw-operation stand-in that logs start/finish order."""
+
+    def __init__(self, delays: dict[str, float] | None = None, fail: str | None = None):
+        self.delays = delays or {}
+        self.fail = fail
+        self.log: list[str] = []
+
+    async def __call__(self, tool, params, user_id):
+        table = params["table"]
+        self.log.append(f"start {tool} {table}")
+        await asyncio.sleep(self.delays.get(table, 0))
+        self.log.append(f"end {tool} {table}")
+        if table == self.fail:
+            raise RuntimeError(f"{table} exploded")
+        if tool == "db_create":
+            return {"id": str(uuid.uuid4()), "name": params["data"]["name"]}
+        return [{"id": str(uuid.uuid4()), "name": f"{table} row"}]
+
+
+def _blocking_client(seconds):
+    """Synchronous Supabase-style client whose execute() blocks its thread."""
+    query = MagicMock()
+    for method in ("select", "eq", "in_", "or_", "order", "limit"):
+        getattr(query, method).return_value = query
+
+    def execute():
+        time.sleep(seconds)
+        return SimpleNamespace(data=[{"id": str(uuid.uuid4()), "name": "row"}])
+
+    query.execute.side_effect = execute
+    client = MagicMock()
+    client.table.return_value = query
+    return client
+
+
+class TestExecuteCrudBatch:
+
+    async def test_reads_run_concurrently_results_in_call_order(self):
+        db = FakeDatabase(delays={"items": 0.02, "notes": 0.0})
+        calls = [("db_read", {"table": "items"}), ("db_read", {"table": "notes"})]
+        with patch("alfred.tools.crud._run_raw", db):
+            results = await execute_crud_batch(calls, user_id="u")
+
+        # Both started before either finished
+        assert db.log[:2] == ["start db_read items", "start db_read notes"]
+        assert [r[0]["name"] for r in results] == ["items row", "notes row"]
+
+    async def test_blocking_client_reads_overlap(self):
+        calls = [("db_read", {"table": table}) for table in ("items", "notes", "items")]
+        with patch("alfred.tools.crud._get_client", return_value=_blocking_client(0.2)):
+            start = time.perf_counter()
+            results = await execute_crud_batch(calls, user_id="u")
+            elapsed = time.perf_counter() - start
+
+        assert [r[0]["name"] for r in results] == ["row", "row", "row"]
+        assert elapsed < 0.45  # Not 3 x 0.2: each read ran in its own thread
+
+    async def test_refs_assigned_in_call_order(self):
+        # notes finishes first, but items was asked for first
+        db = FakeDatabase(delays={"items": 0.02, "notes": 0.0})
+        registry = SessionIdRegistry(session_id="s")
+        calls = [("db_read", {"table": "items"}), ("db_read", {"table": "notes"})]
+        with patch("alfred.tools.crud._run_raw", db):
+            results = await execute_crud_batch(calls, user_id="u", registry=registry)
+
+        assert results[0][0]["id"] == "item_1"
+        assert results[1][0]["id"] == "note_1"
+
+    async def test_write_waits_for_earlier_reads(self):
+        db = FakeDatabase(delays={"items": 0.02})
+        calls = [
+            ("db_read", {"table": "items"}),
+            ("db_create", {"table": "notes", "data": {"name": "n"}}),
+            ("db_read", {"table": "notes"}),
+        ]
+        with patch("alfred.tools.crud._run_raw", db):
+            await execute_crud_batch(calls, user_id="u")
+
+        assert db.log == [
+            "start db_read items", "end db_read items",
+            "start db_create notes", "end db_create notes",
+            "start db_read notes", "end db_read notes",
+        ]
+
+    async def test_failure_reports_index_and_completed(self):
+        db = FakeDatabase(fail="notes")
+        calls = [
+            ("db_read", {"table": "items"}),
+            ("db_read", {"table": "notes"}),
+            ("db_create", {"table": "items", "data": {"name": "never"}}),
+        ]
+        with patch("alfred.tools.crud._run_raw", db):
+            with pytest.raises(CrudBatchError) as exc_info:
+                await execute_crud_batch(calls, user_id="u")
+
+        assert exc_info.value.index == 1
+        assert len(exc_info.value.completed) == 1
+        assert "start db_create items" not in db.log
+
+
+class TestDecisionToolCalls:
+
+    def test_single_call(self):
+        decision = ActDecision(action="tool_call", tool="db_read", params={"table": "items"})
+        assert _decision_tool_calls(decision) == [("db_read", {"table": "items"})]
+
+    def test_multi_call_preferred(self):
+        decision = ActDecision(
+            action="tool_call",
+            tool_calls=[
+                ToolCallSpec(tool="db_read", params={"table": "items"}),
+                ToolCallSpec(tool="db_read", params={"table": "notes"}),
+            ],
+        )
+        assert [tool for tool, _ in _decision_tool_calls(decision)] == ["db_read", "db_read"]
+
+    def test_calls_per_decision_are_capped(self):
+        decision = ActDecision(
+            action="tool_call",
+            tool_calls=[
+                ToolCallSpec(tool="db_read", params={"table": f"t{i}"})
+                for i in range(MAX_TOOL_CALLS_PER_DECISION + 2)
+            ],
+        )
+        calls = _decision_tool_calls(decision)
+        assert [params["table"] for _, params in calls] == [f"t{i}" for i in range(MAX_TOOL_CALLS_PER_DECISION)]
+
+
+class TestStepCircuitBreaker:
+
+    async def test_counts_decisions_not_results(self):
+        results = [("db_read", f"t{i}", [{"id": i}]) for i in range(MAX_DECISIONS_PER_STEP)]
+        state = {
+            "current_step_index": 0,
+            "step_results": {},
+            "current_step_tool_results": results,
+            "current_step_decisions": MAX_DECISIONS_PER_STEP,
+        }
+
+        update = await act_node(state)
+
+        assert update["current_step_index"] == 1
+        assert update["current_step_decisions"] == 0
+        assert update["step_results"][0] == results
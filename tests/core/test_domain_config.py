@@ -7,7 +7,7 @@ and that computed properties (table_to_type, type_to_table) work.
 
 import pytest
 
-from alfred.domain import get_current_domain
+from alfred.domain import get_compiled_domain, get_current_domain
 from alfred.domain.base import DomainConfig
 
 
@@ -118,3 +118,33 @@ class TestDomainConfigDefaults:
 
     def test_get_think_domain_context_default(self, stub_domain):
         assert stub_domain.get_think_domain_context() == ""
+
+
+class TestCompiledDomain:
+    """Test the frozen lookup tables built at register_domain()."""
+
+    def test_compiled_for_registered_domain(self, stub_domain):
+        compiled = get_compiled_domain()
+        assert compiled.source is stub_domain
+        assert get_compiled_domain() is compiled  # Compiled once, not per call
+
+    def test_lookups_match_domain(self, stub_domain):
+        compiled = get_compiled_domain()
+        assert dict(compiled.table_to_type) == stub_domain.table_to_type
+        assert dict(compiled.type_to_table) == stub_domain.type_to_table
+        assert compiled.fk_fields["notes"] == ("item_id",)
+        assert compiled.fk_type("item_id") == "item"
+        assert compiled.table_type("widgets") == "widget"
+        assert compiled.user_owned_tables == frozenset(stub_domain.get_user_owned_tables())
+
+    def test_is_immutable(self, stub_domain):
+        compiled = get_compiled_domain()
+        with pytest.raises(TypeError):
+            compiled.table_to_type["items"] = "other"
+        with pytest.raises(AttributeError):
+            compiled.name = "other"
+
+    def test_ref_pattern_matches_whole_refs(self, stub_domain):
+        compiled = get_compiled_domain()
+        text = "Updated item_1 and note_12 (see gen_note_2); not items_3"
+        assert compiled.find_refs(text) == ["item_1", "note_12", "gen_note_2"]
@@ -121,6 +121,20 @@ class TestPayloadTranslation:
         assert translated["title"] == "My Note"
 
 
+class TestTouchRefs:
+    """Test ref extraction from step data."""
+
+    def test_touches_refs_mentioned_in_data(self):
+        registry = SessionIdRegistry()
+        registry.translate_read_output([{"id": "uuid-aaa", "name": "Widget"}], "items")
+        registry.set_turn(2)
+
+        touched = registry.touch_refs_from_step_data({"analysis": ["uses item_1"]}, "item_1 is best")
+
+        assert touched == 1
+        assert registry.ref_turn_last_ref["item_1"] == 2
+
+
 class TestSerialization:
     """Test to_dict / from_dict round-trip."""
 
@@ -152,3 +166,127 @@ class TestFormatForPrompt:
         registry = SessionIdRegistry()
         prompt = registry.format_for_prompt()
         assert isinstance(prompt, str)
+
+
+class TestWireFormat:
+    """Test to_wire() compact versioned serialization."""
+
+    def _populated_registry(self) -> SessionIdRegistry:
+        registry = SessionIdRegistry(session_id="sess-1")
+        registry.set_turn(3)
+        registry.translate_read_output(
+            [{"id": "uuid-aaa", "name": "Widget"}, {"id": "uuid-bbb", "name": "Gadget"}],
+            "items",
+        )
+        registry.translate_read_output(
+            [{"id": "uuid-ccc", "title": "Note", "item_id": "uuid-zzz"}], "notes"
+        )
+        registry.register_generated("item", "Draft", {"name": "Draft", "parts": [1, 2]})
+        registry.set_active_reason("item_1", "Ongoing project")
+        return registry
+
+    def test_round_trip_matches_legacy_dict(self):
+        registry = self._populated_registry()
+        restored = SessionIdRegistry.from_dict(registry.to_wire())
+
+        original = registry.to_dict()
+        decoded = restored.to_dict()
+        decoded["pending_artifacts"] = dict(decoded["pending_artifacts"].copy())
+        for key, value in original.items():
+            assert decoded[key] == value, key
+
+    def test_payload_is_versioned_and_json_safe(self):
+        import json
+
+        payload = self._populated_registry().to_wire()
+        assert payload["__v"] == 3
+        assert json.loads(json.dumps(payload)) == payload
+
+    def test_legacy_dict_still_loads(self):
+        registry = self._populated_registry()
+        restored = SessionIdRegistry.from_dict(registry.to_dict())
+        assert restored.get_uuid("item_2") == "uuid-bbb"
+
+    def test_pending_artifacts_decode_lazily(self):
+        restored = SessionIdRegistry.from_dict(self._populated_registry().to_wire())
+        assert restored.pending_artifacts.decoded_count == 0
+        assert "gen_item_1" in restored.pending_artifacts
+        assert restored.get_artifact_content("gen_item_1") == {"name": "Draft", "parts": [1, 2]}
+        assert restored.pending_artifacts.decoded_count == 1
+
+    def test_removed_and_re_registered_refs_round_trip(self):
+        registry = self._populated_registry()
+        registry.set_ref_action("item_1", "deleted")
+        registry.remove_ref("item_1")  # ref_actions outlives the ref
+        registry.uuid_to_ref["uuid-bbb"] = "item_9"  # Re-registration
+
+        restored = SessionIdRegistry.from_dict(registry.to_wire())
+        assert restored.ref_actions["item_1"] == "deleted"
+        assert "item_1" not in restored.ref_to_uuid
+        assert restored.uuid_to_ref == registry.uuid_to_ref
+
+    def test_row_per_ref_payload_still_loads(self):
+        restored = SessionIdRegistry.from_dict({
+            "__v": 2,
+            "sid": "sess-1",
+            "turn": 3,
+            "types": ["item"],
+            "actions": ["read"],
+            "refs": [
+                ["item_1", "uuid-aaa", 0, 0, "Widget", 3, 3],
+                ["gen_item_1", 1, 0, -1, 0, 3, None],
+            ],
+            "artifacts": {"gen_item_1": '{"name":"Draft"}'},
+        })
+        assert restored.get_uuid("item_1") == "uuid-aaa"
+        assert restored.ref_to_uuid["gen_item_1"] == "__pending__gen_item_1"
+        assert restored.ref_labels == {"item_1": "Widget", "gen_item_1": "gen_item_1"}
+        assert restored.get_artifact_content("gen_item_1") == {"name": "Draft"}
+
+    def test_updated_artifact_is_reencoded(self):
+        restored = SessionIdRegistry.from_dict(self._populated_registry().to_wire())
+        restored.update_entity_data("gen_item_1", {"name": "Final"})
+        again = SessionIdRegistry.from_dict(restored.to_wire())
+        assert again.get_artifact_content("gen_item_1") == {"name": "Final"}
+        assert again.ref_labels["gen_item_1"] == "Final"
+
+    def test_unchanged_registry_reuses_payload(self):
+        payload = self._populated_registry().to_wire()
+        restored = SessionIdRegistry.from_dict(payload)
+        assert restored.to_wire() is payload
+
+    def test_direct_map_writes_invalidate_cached_payload(self):
+        restored = SessionIdRegistry.from_dict(self._populated_registry().to_wire())
+        restored.ref_actions["item_1"] = "updated"  # Bypasses set_ref_action()
+        restored.ref_detail_tracking["item_2"] = {"level": "full"}
+
+        again = SessionIdRegistry.from_dict(restored.to_wire())
+        assert again.ref_actions["item_1"] == "updated"
+        assert again.ref_detail_tracking["item_2"] == {"level": "full"}
+
+    def test_artifact_edited_in_place_is_reencoded(self):
+        restored = SessionIdRegistry.from_dict(self._populated_registry().to_wire())
+        restored.get_artifact_content("gen_item_1")["parts"].append(3)
+
+        again = SessionIdRegistry.from_dict(restored.to_wire())
+        assert again.get_artifact_content("gen_item_1")["parts"] == [1, 2, 3]
+
+    def test_entity_count_reads_wire_payload(self):
+        from alfred.graph.workflow import registry_entity_count
+
+        registry = self._populated_registry()
+        registry.set_ref_action("item_1", "deleted")
+        registry.remove_ref("item_1")
+        assert registry_entity_count(registry.to_wire()) == len(registry.ref_to_uuid) == 4
+
+        for ref in list(registry.ref_to_uuid):
+            registry.remove_ref(ref)
+        assert registry_entity_count(registry.to_wire()) == 0
+
+    def test_pack_unpack_bytes(self):
+        from alfred.core.registry_codec import pack_registry, unpack_registry
+
+        registry = self._populated_registry()
+        restored = unpack_registry(pack_registry(registry))
+        assert restored.get_ref("uuid-ccc") == "note_1"
+        assert restored.ref_active_reason == {"item_1": "Ongoing project"}
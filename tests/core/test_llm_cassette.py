@@ -0,0 +1,108 @@
+"""
+Tests for LLM record/replay cassettes — domain-agnostic.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from alfred.llm.cassette import CassetteMiss, LLMCassette, request_key, use_cassette
+
+
+def _usage(prompt=100, completion=20, cached=64):
+    return SimpleNamespace(
+        prompt_tokens=prompt,
+        completion_tokens=completion,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached),
+    )
+
+
+class Answer(BaseModel):
+    text: str
+    score: int
+
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+class TestRequestKey:
+
+    def test_ignores_transport_fields(self):
+        base = {"model": "m", "messages": MESSAGES}
+        assert request_key("chat", base) == request_key("chat", {**base, "store": False, "max_retries": 3})
+
+    def test_depends_on_messages_and_kind(self):
+        base = {"model": "m", "messages": MESSAGES}
+        other = {"model": "m", "messages": [{"role": "user", "content": "bye"}]}
+        assert request_key("chat", base) != request_key("chat", other)
+        assert request_key("chat", base) != request_key("chat_stream", base)
+
+
+class TestRecordReplay:
+
+    async def test_chat_round_trip_without_client(self, tmp_path):
+        path = tmp_path / "c.jsonl"
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "Hello!"
+        response.usage = _usage()
+        mock_client = AsyncMock()
+        mock_client.chat.completions.create.return_value = response
+
+        from alfred.llm.client import call_llm_chat
+
+        with patch("alfred.llm.client.get_raw_async_client", return_value=mock_client), \
+             patch("alfred.llm.client.log_prompt"):
+            with use_cassette(path, mode="record") as cassette:
+                assert await call_llm_chat(messages=MESSAGES) == "Hello!"
+            assert cassette.stats.recorded == 1
+
+        # Replay must not touch the client at all
+        with patch("alfred.llm.client.get_raw_async_client", side_effect=AssertionError("live call")), \
+             patch("alfred.llm.client.log_prompt"):
+            with use_cassette(path, mode="replay") as cassette:
+                assert await call_llm_chat(messages=MESSAGES) == "Hello!"
+            assert cassette.stats.exact_hits == 1
+
+    async def test_structured_round_trip(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        mock_client = MagicMock()
+        mock_client.chat.completions.create_with_completion.return_value = (
+            Answer(text="ok", score=3), SimpleNamespace(usage=_usage()),
+        )
+
+        from alfred.llm.client import call_llm
+
+        with patch("alfred.llm.client.get_client", return_value=mock_client), \
+             patch("alfred.llm.client.log_prompt"):
+            with use_cassette(path, mode="record"):
+                await call_llm(response_model=Answer, system_prompt="sys", user_prompt="hi")
+
+        with patch("alfred.llm.client.get_client", side_effect=AssertionError("live call")), \
+             patch("alfred.llm.client.log_prompt"):
+            with use_cassette(path, mode="replay"):
+                result = await call_llm(response_model=Answer, system_prompt="sys", user_prompt="hi")
+        assert result == Answer(text="ok", score=3)
+
+    def test_fallback_matches_by_node_in_order(self, tmp_path):
+        path = tmp_path / "f.jsonl"
+        recorder = LLMCassette(path, "record")
+        for text in ("first", "second"):
+            recorder.record("chat", "think", {"model": "m", "messages": [{"content": text}]}, text, None, 0.1)
+
+        replay = LLMCassette(path, "replay")
+        changed = {"model": "m", "messages": [{"content": "today is a different date"}]}
+        assert replay.lookup("chat", "think", changed).response == "first"
+        assert replay.lookup("chat", "think", changed).response == "second"
+        assert replay.stats.fallback_hits == 2
+        with pytest.raises(CassetteMiss):
+            replay.lookup("chat", "think", changed)
+
+    def test_usage_replayed_for_tracking(self, tmp_path):
+        path = tmp_path / "u.jsonl"
+        LLMCassette(path, "record").record("chat", "reply", {"model": "m"}, "x", _usage(cached=32), 0.0)
+        recording = LLMCassette(path, "replay").lookup("chat", "reply", {"model": "m"})
+        usage = recording.usage_object()
+        assert (usage.prompt_tokens, usage.prompt_tokens_details.cached_tokens) == (100, 32)
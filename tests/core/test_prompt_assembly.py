@@ -0,0 +1,68 @@
+"""
+Tests for prefix-stable prompt assembly — domain-agnostic.
+
+Uses StubDomainConfig via the autouse conftest fixture.
+"""
+
+from alfred.prompts.assembly import PromptSection, Stability, assemble_prompt
+from alfred.prompts.injection import build_act_user_prompt
+
+
+class TestAssemblePrompt:
+    """Test stability ordering and section joining."""
+
+    def test_orders_static_before_volatile(self):
+        prompt = assemble_prompt([
+            PromptSection("status", "STATUS", Stability.CALL),
+            PromptSection("schema", "SCHEMA", Stability.STATIC),
+            PromptSection("task", "TASK", Stability.STEP),
+            PromptSection("profile", "PROFILE", Stability.USER, divider=False),
+        ])
+        assert prompt == "SCHEMA\n\n---\n\nPROFILE\n\nTASK\n\n---\n\nSTATUS\n\n---"
+
+    def test_ties_keep_caller_order_and_empty_sections_drop(self):
+        prompt = assemble_prompt(
+            [
+                PromptSection("b", "B", Stability.CALL, divider=False),
+                PromptSection("empty", None, Stability.STATIC),
+                PromptSection("a", "A", Stability.CALL, divider=False),
+            ],
+            trailer="DECIDE",
+        )
+        assert prompt == "B\n\nA\n\nDECIDE"
+
+
+def _act_prompt(**overrides) -> str:
+    kwargs = dict(
+        step_type="read",
+        step_index=0,
+        total_steps=2,
+        step_description="Find widgets",
+        subdomain="items",
+        user_message="show my widgets",
+        entity_context="- item_1: Widget",
+        conversation_context="",
+        prev_turn_context="",
+        prev_step_results="",
+        current_step_results="",
+        schema="items(id, name)",
+        tool_calls_made=0,
+    )
+    kwargs.update(overrides)
+    return build_act_user_prompt(**kwargs)
+
+
+class TestActPromptPrefix:
+    """Act prompts should share a byte-identical prefix across a step's tool calls."""
+
+    def test_tool_call_loop_keeps_prefix(self):
+        first = _act_prompt()
+        second = _act_prompt(tool_calls_made=1, current_step_results="[{'id': 'item_2'}]")
+
+        prefix = first[: first.index("## STATUS")]
+        assert "## 3. Schema (items)" in prefix
+        assert "## 1. Task" in prefix
+        assert second.startswith(prefix)
+
+    def test_decision_stays_last(self):
+        assert _act_prompt().rstrip().endswith("include a brief note with IDs or key info the next step might need.")
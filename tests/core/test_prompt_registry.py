@@ -0,0 +1,65 @@
+"""
+Tests for the precompiled prompt template registry — domain-agnostic.
+"""
+
+import pytest
+
+from alfred.prompts.registry import PromptRegistry, PromptTemplate, get_prompt_registry
+
+
+class TestPromptTemplate:
+    """Test segment compilation and rendering."""
+
+    def test_compiles_segments_around_placeholders(self, tmp_path):
+        template = PromptTemplate.compile("t", "A {x} B {y} C", tmp_path / "t.md")
+        assert template.segments == ("A ", " B ", " C")
+        assert template.fields == ("x", "y")
+        assert template.render(x="1", y="2") == "A 1 B 2 C"
+
+    def test_json_braces_are_not_placeholders(self, tmp_path):
+        text = 'Return `{"action": "step_complete"}` and {} then {ctx}'
+        template = PromptTemplate.compile("t", text, tmp_path / "t.md")
+        assert template.fields == ("ctx",)
+        assert template.render(ctx="!") == 'Return `{"action": "step_complete"}` and {} then !'
+
+    def test_values_are_not_substituted_twice(self, tmp_path):
+        template = PromptTemplate.compile("t", "{a}|{b}", tmp_path / "t.md")
+        assert template.render(a="{b}", b="x") == "{b}|x"
+
+    def test_missing_and_unknown_values_raise(self, tmp_path):
+        template = PromptTemplate.compile("t", "{a}", tmp_path / "t.md")
+        with pytest.raises(KeyError):
+            template.render()
+        with pytest.raises(ValueError):
+            template.render(a="1", b="2")
+
+
+class TestPromptRegistry:
+    """Test loading, naming, and reload."""
+
+    def test_core_templates_loaded(self):
+        registry = get_prompt_registry()
+        assert registry.has("think")
+        assert registry.has("act/base")
+        assert "domain_context" in registry.get("think").placeholders
+
+    def test_prefix_naming_and_reload(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "greet.md").write_text("Hi {name}", encoding="utf-8")
+        registry = PromptRegistry()
+        registry.add_root(tmp_path, prefix="demo/")
+        assert registry.render("demo/sub/greet", name="Ada") == "Hi Ada"
+
+        reloaded = []
+        registry.add_listener(lambda: reloaded.append(True))
+        assert registry.reload() == []
+        assert reloaded == []
+
+        (tmp_path / "sub" / "greet.md").write_text("Hello {name}", encoding="utf-8")
+        assert registry.reload() == ["demo/sub/greet"]
+        assert registry.render("demo/sub/greet", name="Ada") == "Hello Ada"
+        assert reloaded == [True]
+
+    def test_unknown_template_raises(self):
+        with pytest.raises(KeyError):
+            PromptRegistry().get("nope")
@@ -0,0 +1,59 @@
+"""
+Tests for the per-turn Act prompt section cache — domain-agnostic.
+"""
+
+
+from alfred.prompts.render_cache import Identity, SectionCache
+
+
+class TestIdentity:
+
+    def test_same_object_equal(self):
+        data = {"a": 1}
+        assert Identity(data) == Identity(data)
+        assert hash(Identity(data)) == hash(Identity(data))
+
+    def test_equal_content_different_object_not_equal(self):
+        assert Identity({"a": 1}) != Identity({"a": 1})
+
+
+class TestSectionCache:
+
+    def test_renders_once_per_key(self):
+        cache = SectionCache()
+        calls = []
+        data = {"step_1": "x"}
+
+        def render():
+            calls.append(1)
+            return "rendered"
+
+        assert cache.get("prev_steps", (Identity(data), 0), render) == "rendered"
+        assert cache.get("prev_steps", (Identity(data), 0), render) == "rendered"
+        assert len(calls) == 1
+        assert cache.summary()["prev_steps"] == {"hits": 1, "misses": 1}
+
+    def test_new_object_rerenders(self):
+        cache = SectionCache()
+        data = {"step_1": "x"}
+        cache.get("prev_steps", Identity(data), lambda: "old")
+        # Act writes a copy when results change
+        assert cache.get("prev_steps", Identity(data.copy()), lambda: "new") == "new"
+
+    def test_sections_are_independent(self):
+        cache = SectionCache()
+        cache.get("archive", 1, lambda: "archive")
+        assert cache.get("schema", 1, lambda: "schema") == "schema"
+        assert cache.get("archive", 1, lambda: "unused") == "archive"
+
+    async def test_aget_caches_fetch(self):
+        cache = SectionCache()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return ("profile", "guidance")
+
+        assert await cache.aget("profile", "user-1", fetch) == ("profile", "guidance")
+        assert await cache.aget("profile", "user-1", fetch) == ("profile", "guidance")
+        assert len(calls) == 1
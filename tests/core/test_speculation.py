@@ -0,0 +1,158 @@
+"""
+Tests for optimistic Understand + Think (graph/speculation.py) — domain-agnostic.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from alfred.graph import speculation
+from alfred.graph.speculation import SpeculationStats, conflict, speculative_think, speculative_understand
+from alfred.graph.state import EntityCurationDecision, UnderstandOutput
+
+
+@pytest.fixture
+def stats():
+    fresh = SpeculationStats()
+    with patch.object(speculation, "_stats", fresh), \
+         patch.object(speculation, "speculation_enabled", return_value=True):
+        yield fresh
+
+
+def _nodes(understand_output, understand_s=0.05, think_s=0.05):
+    calls = []
+
+    async def understand(state):
+        calls.append("understand")
+        await asyncio.sleep(understand_s)
+        return {"understand_output": understand_output}
+
+    async def think(state):
+        calls.append(f"think(understood={state.get('understand_output') is not None})")
+        await asyncio.sleep(think_s)
+        return {"think_output": "plan"}
+
+    return calls, speculative_understand(understand, think), speculative_think(think)
+
+
+class _Plan(BaseModel):
+    steps: list[str] = []
+
+
+class _BlockingClient:
+    """Stands in for the synchronous Instructor client: each call blocks its thread."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create_with_completion=self._create))
+
+    def _create(self, *, response_model, **kwargs):
+        time.sleep(self.seconds)
+        return response_model(), SimpleNamespace(usage=None)
+
+
+def _llm_nodes():
+    from alfred.llm.client import call_llm
+
+    async def understand(state):
+        return {"understand_output": await call_llm(response_model=UnderstandOutput, system_prompt="s", user_prompt="u")}
+
+    async def think(state):
+        return {"think_output": await call_llm(response_model=_Plan, system_prompt="s", user_prompt="t")}
+
+    return speculative_understand(understand, think), speculative_think(think)
+
+
+async def _turn(understand_node, think_node, state):
+    state = dict(state)
+    state.update(await understand_node(state))
+    if getattr(state["understand_output"], "needs_clarification", False):
+        return state  # Routed to reply
+    state.update(await think_node(state))
+    return state
+
+
+class TestSpeculation:
+
+    async def test_agreeing_understand_reuses_concurrent_think(self, stats):
+        calls, understand, think = _nodes(UnderstandOutput())
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        state = await _turn(understand, think, {"conversation": {}})
+        elapsed = loop.time() - start
+
+        assert state["think_output"] == "plan"
+        assert calls == ["understand", "think(understood=False)"]
+        assert elapsed < 0.09  # Overlapped, not 0.05 + 0.05
+        summary = stats.summary()
+        assert summary["hits"] == 1 and summary["hit_rate"] == 1.0
+        assert summary["median_saved_ms"] > 30
+
+    async def test_referenced_entities_rerun_think(self, stats):
+        calls, understand, think = _nodes(UnderstandOutput(referenced_entities=["recipe_1"]))
+
+        state = await _turn(understand, think, {"conversation": {}})
+
+        assert state["think_output"] == "plan"
+        assert calls == ["understand", "think(understood=False)", "think(understood=True)"]
+        assert stats.summary()["misses"] == {"referenced_entities": 1}
+
+    async def test_clarification_cancels_speculative_think(self, stats):
+        calls, understand, think = _nodes(UnderstandOutput(needs_clarification=True))
+
+        state = await _turn(understand, think, {"conversation": {}})
+
+        assert "think_output" not in state
+        assert stats.misses == {"needs_clarification": 1}
+
+    async def test_pending_clarification_does_not_speculate(self, stats):
+        calls, understand, think = _nodes(UnderstandOutput())
+
+        await _turn(understand, think, {"conversation": {"pending_clarification": {"type": "clarify"}}})
+
+        assert calls == ["understand", "think(understood=True)"]
+        assert stats.summary()["turns"] == 0
+
+    async def test_blocking_llm_client_calls_overlap(self, stats):
+        understand, think = _llm_nodes()
+
+        with patch("alfred.llm.client.get_client", return_value=_BlockingClient(0.2)):
+            start = time.perf_counter()
+            state = await _turn(understand, think, {"conversation": {}})
+            elapsed = time.perf_counter() - start
+
+        assert isinstance(state["think_output"], _Plan)
+        assert elapsed < 0.3  # Not 0.2 + 0.2: the calls ran in worker threads
+        assert stats.summary()["median_saved_ms"] > 100
+
+    async def test_saved_time_is_measured_overlap(self, stats):
+        async def understand(state):
+            time.sleep(0.05)  # Holds the loop: Think can't start until this returns
+            return {"understand_output": UnderstandOutput()}
+
+        async def think(state):
+            await asyncio.sleep(0.01)
+            return {"think_output": "plan"}
+
+        await _turn(speculative_understand(understand, think), speculative_think(think), {"conversation": {}})
+
+        assert stats.hits == 1
+        assert stats.summary()["median_saved_ms"] == 0.0
+
+    async def test_disabled_runs_sequentially(self):
+        calls, understand, think = _nodes(UnderstandOutput())
+        with patch.object(speculation, "speculation_enabled", return_value=False):
+            await _turn(understand, think, {"conversation": {}})
+        assert calls == ["understand", "think(understood=True)"]
+
+
+def test_conflict_reasons():
+    assert conflict(UnderstandOutput()) is None
+    assert conflict(UnderstandOutput(entity_curation=EntityCurationDecision())) is None
+    assert conflict(UnderstandOutput(quick_mode=True)) == "quick_mode"
+    assert conflict(UnderstandOutput(entity_curation=EntityCurationDecision(demote=["r1"]))) == "entity_curation"
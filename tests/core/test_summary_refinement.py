@@ -0,0 +1,183 @@
+"""
+Tests for deferred summary refinement — domain-agnostic.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from alfred.graph.nodes import summarize
+from alfred.memory.summary_refinement import (
+    RefinedSummary,
+    SummaryRefinement,
+    SummaryRefiner,
+    apply_refined_summary,
+    join_history,
+)
+
+
+def _refined(**overrides) -> RefinedSummary:
+    values = {
+        "turn_timestamp": "t2",
+        "provisional_assistant_summary": "long reply... [see step results for details]",
+        "assistant_summary": "Saved 3 recipes.",
+        "provisional_history": "Earlier. User: hi → Alfred: hello",
+        "history_summary": "Earlier, the user said hi.",
+    }
+    values.update(overrides)
+    return RefinedSummary(**values)
+
+
+def _conversation() -> dict:
+    return {
+        "history_summary": "Earlier. User: hi → Alfred: hello",
+        "recent_turns": [
+            {"timestamp": "t1", "assistant_summary": "ok"},
+            {"timestamp": "t2", "assistant_summary": "long reply... [see step results for details]"},
+        ],
+    }
+
+
+class TestApplyRefinedSummary:
+    """Test merge rules."""
+
+    def test_replaces_provisional_text(self):
+        conv = _conversation()
+        assert apply_refined_summary(conv, _refined())
+        assert conv["history_summary"] == "Earlier, the user said hi."
+        assert conv["recent_turns"][1]["assistant_summary"] == "Saved 3 recipes."
+        assert conv["recent_turns"][0]["assistant_summary"] == "ok"
+
+    def test_keeps_history_appended_after_provisional(self):
+        conv = _conversation()
+        conv["history_summary"] = join_history(conv["history_summary"], "User: next → Alfred: done")
+        apply_refined_summary(conv, _refined())
+        assert conv["history_summary"] == "Earlier, the user said hi. User: next → Alfred: done"
+
+    def test_idempotent(self):
+        conv = _conversation()
+        apply_refined_summary(conv, _refined())
+        snapshot = {**conv, "recent_turns": list(conv["recent_turns"])}
+        assert not apply_refined_summary(conv, _refined())
+        assert conv == snapshot
+
+    def test_does_not_clobber_newer_text(self):
+        conv = _conversation()
+        conv["history_summary"] = "Something rewritten since."
+        conv["recent_turns"][1]["assistant_summary"] = "edited"
+        assert not apply_refined_summary(conv, _refined())
+        assert conv["history_summary"] == "Something rewritten since."
+        assert conv["recent_turns"][1]["assistant_summary"] == "edited"
+
+
+class TestSummaryRefiner:
+    """Test background scheduling."""
+
+    async def test_sequential_refinements_rebase_on_refined_history(self, monkeypatch):
+        seen_bases = []
+
+        async def fake_compress(existing_summary, turns_to_compress):
+            seen_bases.append(existing_summary)
+            await asyncio.sleep(0)
+            return f"N({existing_summary}+{len(turns_to_compress)})"
+
+        monkeypatch.setattr(summarize, "_compress_turns_to_narrative", fake_compress)
+
+        first = SummaryRefinement(
+            turn_timestamp="t1", base_history="", turns_to_compress=[{"user": "a"}], provisional_part="P1",
+        )
+        second = SummaryRefinement(
+            turn_timestamp="t2", base_history="P1", turns_to_compress=[{"user": "b"}], provisional_part="P2",
+        )
+        conv = {"history_summary": "P1 P2", "recent_turns": []}
+
+        refiner = SummaryRefiner()
+
+        refiner.schedule("u", first)
+        refiner.schedule("u", second)
+        await refiner.drain()
+
+        assert seen_bases == ["", "N(+1)"]
+        assert refiner.apply_completed("u", conv)
+        assert conv["history_summary"] == "N(N(+1)+1)"
+        assert refiner.pending("u") == 0
+
+    async def test_callback_runs_after_result(self, monkeypatch):
+        async def fake_summary(response, is_proposal=False):
+            return "short"
+
+        monkeypatch.setattr(summarize, "_summarize_assistant_response", fake_summary)
+        results = []
+
+        refiner = SummaryRefiner()
+
+        refiner.schedule(
+            "u",
+            SummaryRefinement(turn_timestamp="t1", response="x" * 500, provisional_assistant_summary="x..."),
+            on_refined=results.append,
+        )
+        await refiner.drain()
+
+        assert [r.assistant_summary for r in results] == ["short"]
+
+
+    async def test_llm_calls_overlap_and_leave_the_loop_free(self):
+        def create_with_completion(*, response_model, **kwargs):
+            time.sleep(0.2)  # The Instructor client is synchronous
+            return response_model(summary="refined"), SimpleNamespace(usage=None)
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            create_with_completion=create_with_completion,
+        )))
+        ticks = 0
+
+        async def other_requests():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        results = []
+        refiner = SummaryRefiner()
+        with patch("alfred.llm.client.get_client", return_value=client):
+            ticker = asyncio.create_task(other_requests())
+            start = time.perf_counter()
+            refiner.schedule(
+                "u",
+                SummaryRefinement(
+                    turn_timestamp="t1",
+                    response="x" * (summarize.SUMMARIZE_THRESHOLD + 10),
+                    provisional_assistant_summary="x...",
+                    turns_to_compress=[{"user": "a", "assistant": "b"}],
+                    provisional_part="P1",
+                ),
+                on_refined=results.append,
+            )
+            await refiner.drain()
+            elapsed = time.perf_counter() - start
+            ticker.cancel()
+
+        assert (results[0].assistant_summary, results[0].history_summary) == ("refined", "refined")
+        assert elapsed < 0.35  # Both calls at once, not 0.2 + 0.2
+        assert ticks >= 10  # Later requests were still served
+
+
+class TestProvisionalSummaries:
+    """Test the deterministic (no-LLM) stand-ins."""
+
+    def test_short_responses_need_no_llm(self):
+        assert not summarize._needs_llm_summary("short", is_proposal=False)
+        assert summarize._provisional_assistant_summary("short", is_proposal=False) == "short"
+
+    def test_long_responses_get_truncated_stand_in(self):
+        response = "x" * (summarize.SUMMARIZE_THRESHOLD + 10)
+        assert summarize._needs_llm_summary(response, is_proposal=False)
+        assert summarize._provisional_assistant_summary(response, is_proposal=False).startswith("x" * 300 + "...")
+
+    def test_provisional_compression(self):
+        text = summarize._compress_turns_provisionally([
+            {"user": "add milk", "assistant_summary": "Added milk."},
+            {"user": "thanks", "assistant": "You're welcome!"},
+        ])
+        assert text == "User: add milk → Alfred: Added milk. | User: thanks → Alfred: You're welcome!"
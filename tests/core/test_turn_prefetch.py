@@ -0,0 +1,131 @@
+"""
+Tests for the per-turn speculative context prefetch — domain-agnostic.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from alfred.graph.prefetch import PROFILE, SNAPSHOT, TurnPrefetch, prefetched, schema_key
+
+
+class _FakeDomain:
+    subdomains = {"inventory": None, "recipes": None}
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def get_user_profile(self, user_id):
+        self.calls.append("profile")
+        await asyncio.sleep(0.05)
+        return "profile text"
+
+    async def get_subdomain_guidance(self, user_id):
+        self.calls.append("guidance")
+        return {"recipes": "no nuts"}
+
+    async def get_domain_snapshot(self, user_id):
+        self.calls.append("snapshot")
+        return "snapshot text"
+
+
+class _BlockingDomain(_FakeDomain):
+    """Domain whose fetches block like the synchronous Supabase client."""
+
+    async def get_user_profile(self, user_id):
+        time.sleep(0.2)
+        return "profile text"
+
+    async def get_domain_snapshot(self, user_id):
+        time.sleep(0.2)
+        return "snapshot text"
+
+
+class _Understood(BaseModel):
+    ok: bool = True
+
+
+def _blocking_llm_client(seconds):
+    def create_with_completion(*, response_model, **kwargs):
+        time.sleep(seconds)
+        return response_model(), SimpleNamespace(usage=None)
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create_with_completion=create_with_completion,
+    )))
+
+
+async def _fake_schema(subdomain):
+    return f"schema:{subdomain}"
+
+
+class TestTurnPrefetch:
+
+    async def test_fetches_overlap_with_earlier_work(self):
+        domain = _FakeDomain()
+
+        with patch("alfred.domain.get_current_domain", return_value=domain), \
+             patch("alfred.tools.schema.get_schema_with_fallback", _fake_schema):
+            prefetch = TurnPrefetch.start("user-1")
+            await asyncio.sleep(0.1)  # Understand's LLM call
+            state = {"turn_prefetch": prefetch}
+            start = asyncio.get_running_loop().time()
+            profile = await prefetched(state, PROFILE, pytest.fail)
+            elapsed = asyncio.get_running_loop().time() - start
+            snapshot = await prefetched(state, SNAPSHOT, pytest.fail)
+            schema = await prefetched(state, schema_key("recipes"), pytest.fail)
+
+        assert profile == ("profile text", {"recipes": "no nuts"})
+        assert snapshot == "snapshot text"
+        assert schema == "schema:recipes"
+        assert elapsed < 0.04  # Already fetched while "Understand" ran
+        assert sorted(domain.calls) == ["guidance", "profile", "snapshot"]
+
+    async def test_blocking_fetches_overlap_with_understand(self):
+        from alfred.llm.client import call_llm, set_current_node
+
+        set_current_node("understand")
+        with patch("alfred.domain.get_current_domain", return_value=_BlockingDomain()), \
+             patch("alfred.tools.schema.get_schema_with_fallback", _fake_schema), \
+             patch("alfred.llm.client.get_client", return_value=_blocking_llm_client(0.2)):
+            start = time.perf_counter()
+            prefetch = TurnPrefetch.start("user-1")
+            await call_llm(response_model=_Understood, system_prompt="s", user_prompt="u")
+            state = {"turn_prefetch": prefetch}
+            profile = await prefetched(state, PROFILE, pytest.fail)
+            snapshot = await prefetched(state, SNAPSHOT, pytest.fail)
+            elapsed = time.perf_counter() - start
+
+        assert profile == ("profile text", {"recipes": "no nuts"})
+        assert snapshot == "snapshot text"
+        assert elapsed < 0.35  # Not 0.2 + 0.2 + 0.2: all three ran at once
+
+    async def test_without_handle_or_key_fetches_inline(self):
+        async def fetch():
+            return "inline"
+
+        assert await prefetched({}, PROFILE, fetch) == "inline"
+        assert await prefetched({"turn_prefetch": TurnPrefetch()}, SNAPSHOT, fetch) == "inline"
+
+    async def test_failure_reraises_when_awaited(self):
+        async def boom():
+            raise RuntimeError("db down")
+
+        prefetch = TurnPrefetch()
+        prefetch.launch(PROFILE, boom())
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            await prefetch.get(PROFILE, pytest.fail)
+
+    async def test_cancel_stops_pending_fetches(self):
+        prefetch = TurnPrefetch()
+        prefetch.launch(SNAPSHOT, asyncio.sleep(10))
+        task = prefetch._tasks[SNAPSHOT]
+        prefetch.cancel()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
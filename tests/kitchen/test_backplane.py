@@ -0,0 +1,127 @@
+"""
+Tests for the web tier's state backplane (web/backplane.py).
+
+The memory and SQLite backends always run; Redis runs only when the
+redis package is installed and ALFRED_TEST_REDIS_URL points at a server.
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from alfred_kitchen.web.backplane import (
+    MemoryBackplane,
+    RedisBackplane,
+    SqliteBackplane,
+    create_backplane,
+)
+
+
+BACKENDS = ["memory", "sqlite"]
+if os.environ.get("ALFRED_TEST_REDIS_URL"):
+    BACKENDS.append("redis")
+
+
+@pytest.fixture(params=BACKENDS)
+async def backplane(request, tmp_path):
+    if request.param == "memory":
+        bp = MemoryBackplane()
+    elif request.param == "sqlite":
+        bp = SqliteBackplane(str(tmp_path / "state.db"))
+    else:
+        pytest.importorskip("redis")
+        bp = RedisBackplane(os.environ["ALFRED_TEST_REDIS_URL"], prefix=f"test-{uuid.uuid4().hex}:")
+    yield bp
+    await bp.close()
+
+
+async def _collect(backplane, channel, after="0", until="stream_end"):
+    seen = []
+    async for cursor, event in backplane.subscribe(channel, after=after, timeout=0.1):
+        if event is None:
+            continue
+        seen.append((cursor, event))
+        if event["type"] == until:
+            break
+    return seen
+
+
+class TestBackplane:
+
+    async def test_conversations_round_trip(self, backplane):
+        await backplane.set_conversation("user-1", {"turns": [{"user": "hi"}]})
+
+        assert await backplane.get_conversation("user-1") == {"turns": [{"user": "hi"}]}
+        assert await backplane.get_conversation("user-2") is None
+
+        await backplane.delete_conversation("user-1")
+        assert await backplane.get_conversation("user-1") is None
+        await backplane.delete_conversation("user-1")
+
+    async def test_subscriber_sees_events_in_order(self, backplane):
+        reader = asyncio.ensure_future(_collect(backplane, "job-1"))
+        await asyncio.sleep(0.05)
+        for i in range(3):
+            await backplane.publish("job-1", {"type": "progress", "step": i})
+        await backplane.publish("job-1", {"type": "stream_end"})
+        seen = await asyncio.wait_for(reader, 5)
+        assert [e.get("step") for _, e in seen] == [0, 1, 2, None]
+
+    async def test_resume_after_cursor_skips_seen_events(self, backplane):
+        cursors = [
+            await backplane.publish("job-2", {"type": "progress", "step": i})
+            for i in range(3)
+        ]
+        await backplane.publish("job-2", {"type": "stream_end"})
+        seen = await asyncio.wait_for(_collect(backplane, "job-2", after=cursors[0]), 5)
+        assert [e.get("step") for _, e in seen] == [1, 2, None]
+
+    async def test_idle_channel_yields_heartbeat(self, backplane):
+        stream = backplane.subscribe("job-3", timeout=0.1)
+        cursor, event = await asyncio.wait_for(stream.__anext__(), 5)
+        assert event is None
+
+    async def test_turn_lock_serializes_a_user(self, backplane):
+        order = []
+
+        async def turn(name):
+            async with backplane.turn_lock("user-1"):
+                order.append(f"{name} start")
+                await asyncio.sleep(0.1)
+                order.append(f"{name} end")
+
+        await asyncio.gather(turn("a"), turn("b"))
+        assert order in (
+            ["a start", "a end", "b start", "b end"],
+            ["b start", "b end", "a start", "a end"],
+        )
+
+
+async def test_sqlite_lock_is_shared_across_instances(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = SqliteBackplane(path), SqliteBackplane(path)
+
+    try:
+        async with first.turn_lock("user-1"):
+            waiter = asyncio.ensure_future(second.turn_lock("user-1").__aenter__())
+            await asyncio.sleep(0.2)
+            assert not waiter.done()
+        await asyncio.wait_for(waiter, 5)
+        await second.publish("job-1", {"type": "stream_end"})
+        assert await _collect(first, "job-1") == [("1", {"type": "stream_end"})]
+    finally:
+        await first.close()
+        await second.close()
+
+
+async def test_create_backplane_from_url(tmp_path):
+    assert isinstance(create_backplane("memory://"), MemoryBackplane)
+    sqlite = create_backplane(f"sqlite://{tmp_path}/state.db")
+    assert isinstance(sqlite, SqliteBackplane)
+    await sqlite.close()
+    with pytest.raises(ValueError):
+        create_backplane("sqlite://relative.db")
+    with pytest.raises(ValueError):
+        create_backplane("postgres://nope")
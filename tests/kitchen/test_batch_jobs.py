@@ -0,0 +1,182 @@
+"""
+Tests for the maintenance-script batch runner (background/batch_jobs.py).
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alfred_kitchen.background import batch_jobs
+from alfred_kitchen.background.batch_jobs import BatchJobRunner, bulk_update, with_backoff
+
+
+class _HttpError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def sleeps():
+    """Record backoff delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    with patch.object(batch_jobs.asyncio, "sleep", fake_sleep):
+        yield delays
+
+
+class TestBatchJobRunner:
+
+    async def test_batches_run_concurrently_up_to_the_limit(self):
+        in_flight = peak = 0
+        written = []
+
+        async def process(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return [n * 10 for n in batch]
+
+        runner = BatchJobRunner("job", concurrency=3)
+        stats = await runner.run(range(20), key=str, batch_size=2, process=process, write=written.extend)
+
+        assert peak == 3
+        assert sorted(written) == [n * 10 for n in range(20)]
+        assert (stats.batches, stats.completed, stats.failed) == (10, 10, 0)
+
+    async def test_interrupted_run_resumes_from_checkpoint(self, tmp_path):
+        seen = []
+
+        async def flaky(batch):
+            seen.extend(batch)
+            if 4 in batch:
+                raise _HttpError(400)  # Not retryable: the batch fails this run
+            return batch
+
+        first = await BatchJobRunner("job", checkpoint_dir=tmp_path).run(
+            range(10), key=str, batch_size=3, process=flaky,
+        )
+        assert (first.completed, first.failed) == (3, 1)
+        assert (tmp_path / "job.jsonl").exists()
+
+        seen.clear()
+
+        async def process(batch):
+            seen.extend(batch)
+            return batch
+
+        second = await BatchJobRunner("job", checkpoint_dir=tmp_path).run(
+            range(10), key=str, batch_size=3, process=process,
+        )
+        assert seen == [3, 4, 5]
+        assert (second.skipped, second.completed, second.failed) == (7, 1, 0)
+        assert not (tmp_path / "job.jsonl").exists()  # Cleared once everything is done
+
+    def test_fresh_run_ignores_checkpoint(self, tmp_path):
+        (tmp_path / "job.jsonl").write_text('{"keys": ["0", "1"]}\n{"keys": ["2"')  # Torn last line
+
+        assert BatchJobRunner("job", checkpoint_dir=tmp_path).checkpoint.done == {"0", "1"}
+        assert BatchJobRunner("job", checkpoint_dir=tmp_path, resume=False).checkpoint.done == set()
+
+    async def test_write_failure_keeps_batch_out_of_checkpoint(self, tmp_path, sleeps):
+        def write(result):
+            raise ConnectionError("database down")
+
+        async def process(batch):
+            return batch
+
+        stats = await BatchJobRunner("job", checkpoint_dir=tmp_path, attempts=2).run(
+            ["a"], key=str, batch_size=1, process=process, write=write,
+        )
+
+        assert (stats.failed, stats.retries) == (1, 1)
+        assert batch_jobs.Checkpoint(tmp_path / "job.jsonl").done == set()
+
+
+class TestBackoff:
+
+    async def test_rate_limit_waits_for_retry_after(self, sleeps):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) < 3:
+                raise _HttpError(429, {"retry-after": "7"})
+            return "ok"
+
+        assert await with_backoff(call) == "ok"
+        assert sleeps == [7.0, 7.0]
+
+    async def test_retry_after_ms_and_cap(self, sleeps):
+        calls = []
+
+        async def call():
+            calls.append(1)
+            if len(calls) == 1:
+                raise _HttpError(429, {"retry-after-ms": "1500"})
+            if len(calls) == 2:
+                raise _HttpError(429, {"retry-after": "600"})
+            return "ok"
+
+        await with_backoff(call, max_delay=30)
+        assert sleeps[0] >= 1.5
+        assert sleeps[1] == 30
+
+    async def test_client_errors_are_not_retried(self, sleeps):
+        async def call():
+            raise _HttpError(401)
+
+        with pytest.raises(_HttpError):
+            await with_backoff(call)
+        assert sleeps == []
+
+    async def test_transient_errors_back_off_then_raise(self, sleeps):
+        def call():
+            raise _HttpError(503)
+
+        with pytest.raises(_HttpError):
+            await with_backoff(call, attempts=4, base_delay=1.0)
+        assert len(sleeps) == 3
+        assert all(0 <= d <= 1.0 * 2 ** i for i, d in enumerate(sleeps))
+
+
+class TestBulkUpdate:
+
+    def test_one_rpc_per_column_set(self):
+        client = MagicMock()
+        client.rpc.return_value.execute.return_value.data = 2
+
+        updated = bulk_update(client, "ingredients", [
+            {"id": "a", "parent_category": "produce", "category": "herbs"},
+            {"id": "b", "parent_category": "pantry"},
+            {"id": "c", "category": "fruits", "parent_category": "produce"},
+            {"id": "d"},
+        ])
+
+        calls = [c.args for c in client.rpc.call_args_list]
+        assert calls == [
+            ("bulk_update", {
+                "target": "ingredients",
+                "columns": ["category", "parent_category"],
+                "rows": [
+                    {"id": "a", "parent_category": "produce", "category": "herbs"},
+                    {"id": "c", "category": "fruits", "parent_category": "produce"},
+                ],
+                "key_column": "id",
+            }),
+            ("bulk_update", {
+                "target": "ingredients",
+                "columns": ["parent_category"],
+                "rows": [{"id": "b", "parent_category": "pantry"}],
+                "key_column": "id",
+            }),
+        ]
+        assert updated == 4
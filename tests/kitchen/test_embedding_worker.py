@@ -0,0 +1,155 @@
+"""
+Tests for the background embedding worker (background/embedding_worker.py).
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alfred_kitchen.background import embedding_worker
+from alfred_kitchen.background.embedding_worker import EmbeddingWorker
+from alfred_kitchen.db.request_context import clear_request_context, get_access_token, set_request_context
+from alfred_kitchen.domain.crud_middleware import KitchenCRUDMiddleware
+
+
+class _FakeBackend:
+    """Stands in for the row fetch, embeddings API and set_embeddings RPC."""
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+        self.fail_embeds = 0
+
+    def fetch(self, table, ids):
+        self.calls.append(("fetch", table, tuple(ids)))
+        return [{"id": i, "user_id": "user-1", "name": f"name {i}"} for i in ids]
+
+    def embed(self, texts):
+        if self.fail_embeds:
+            self.fail_embeds -= 1
+            raise RuntimeError("rate limited")
+        self.calls.append(("embed", tuple(texts)))
+        return [[float(len(t))] for t in texts]
+
+    def write(self, table, ids, vectors):
+        self.calls.append(("write", table, tuple(ids)))
+
+
+@pytest.fixture
+def backend():
+    fake = _FakeBackend()
+    with patch.object(embedding_worker, "_fetch_rows", fake.fetch), \
+         patch.object(embedding_worker, "generate_embeddings", fake.embed), \
+         patch.object(embedding_worker, "_write_embeddings", fake.write), \
+         patch.object(embedding_worker, "RETRY_DELAY_SECONDS", 0):
+        yield fake
+
+
+class TestEmbeddingWorker:
+
+    async def test_pending_ids_are_deduplicated_into_one_batch(self, backend):
+        worker = EmbeddingWorker()
+
+        with patch("alfred_kitchen.domain.tools.recipe_index.invalidate_recipe_index") as invalidate:
+            worker.enqueue("recipes", ["r1", "r2"])
+            worker.enqueue("recipes", ["r2", None])
+            assert worker.backlog() == 2
+            await worker.drain()
+
+        assert backend.calls == [
+            ("fetch", "recipes", ("r1", "r2")),
+            ("embed", ("name r1", "name r2")),
+            ("write", "recipes", ("r1", "r2")),
+        ]
+        invalidate.assert_called_once_with("user-1")
+        assert worker.stats() == {"backlog": 0, "embedded": 2, "failed": 0, "retries": 0}
+
+    async def test_batches_respect_api_input_limit(self, backend):
+        worker = EmbeddingWorker()
+
+        with patch.object(embedding_worker, "MAX_BATCH_INPUTS", 2):
+            worker.enqueue("ingredients", ["i1", "i2", "i3"])
+            await worker.drain()
+
+        writes = [c for c in backend.calls if c[0] == "write"]
+        assert writes == [("write", "ingredients", ("i1", "i2")), ("write", "ingredients", ("i3",))]
+
+    def test_token_budget_splits_batches(self):
+        rows = [{"name": "x" * 30} for _ in range(3)]
+        with patch.object(embedding_worker, "MAX_BATCH_TOKENS", 25):
+            batches = list(embedding_worker._batches(rows, embedding_worker.create_recipe_text))
+        assert [len(b) for b in batches] == [2, 1]
+
+    async def test_embed_is_retried_with_backoff(self, backend):
+        backend.fail_embeds = 2
+        worker = EmbeddingWorker()
+
+        worker.enqueue("ingredients", ["i1"])
+        await worker.drain()
+
+        assert [c[0] for c in backend.calls] == ["fetch", "embed", "write"]
+        assert worker.stats()["retries"] == 2
+
+    async def test_exhausted_retries_drop_the_batch(self, backend):
+        backend.fail_embeds = embedding_worker.RETRY_ATTEMPTS
+        worker = EmbeddingWorker()
+
+        worker.enqueue("ingredients", ["i1", "i2"])
+        await worker.drain()
+
+        assert not any(c[0] == "write" for c in backend.calls)
+        assert worker.stats() == {"backlog": 0, "embedded": 0, "failed": 2, "retries": 3}
+
+    async def test_work_enqueued_by_a_request_uses_the_service_client(self):
+        tokens_seen = []
+
+        def execute():
+            tokens_seen.append(get_access_token())
+            return SimpleNamespace(data=[{"id": "r1", "user_id": "user-a", "name": "soup"}])
+
+        service = MagicMock()
+        service.table.return_value.select.return_value.in_.return_value.execute.side_effect = execute
+        worker = EmbeddingWorker()
+
+        set_request_context(access_token="USER_A_JWT", user_id="user-a")
+        try:
+            with patch.object(embedding_worker, "get_service_client", return_value=service), \
+                 patch("alfred_kitchen.db.client.get_authenticated_client",
+                       side_effect=AssertionError("user client")), \
+                 patch.object(embedding_worker, "generate_embeddings", return_value=[[0.1]]), \
+                 patch("alfred_kitchen.domain.tools.recipe_index.invalidate_recipe_index"):
+                worker.enqueue("recipes", ["r1"])
+                await worker.drain()
+        finally:
+            clear_request_context()
+
+        assert tokens_seen == [None]  # The task didn't inherit the request's token
+        assert service.rpc.call_args.args[0] == "set_embeddings"
+        assert worker.stats()["embedded"] == 1
+
+    def test_without_event_loop_nothing_is_queued(self, backend):
+        worker = EmbeddingWorker()
+        worker.enqueue("recipes", ["r1"])
+        assert worker.backlog() == 0
+        assert backend.calls == []
+
+
+def test_crud_writes_enqueue_written_rows():
+    middleware = KitchenCRUDMiddleware()
+    with patch("alfred_kitchen.background.embedding_worker.enqueue_embeddings") as enqueue, \
+         patch("alfred_kitchen.domain.tools.recipe_index.invalidate_recipe_index"):
+        middleware.after_write("recipes", "user-1", [{"id": "r1"}])
+        middleware.after_write("recipes", "user-1")  # Delete
+
+    enqueue.assert_called_once_with("recipes", [{"id": "r1"}])
+
+
+def test_recipe_updates_enqueue_only_when_text_changes():
+    middleware = KitchenCRUDMiddleware()
+    with patch("alfred_kitchen.background.embedding_worker.enqueue_embeddings") as enqueue, \
+         patch("alfred_kitchen.domain.tools.recipe_index.invalidate_recipe_index") as invalidate:
+        middleware.after_write("recipes", "user-1", [{"id": "r1"}], {"rating", "tags"})
+        middleware.after_write("recipes", "user-1", [{"id": "r2"}], {"name", "tags"})
+
+    enqueue.assert_called_once_with("recipes", [{"id": "r2"}])
+    assert invalidate.call_count == 2
@@ -0,0 +1,152 @@
+"""
+Tests for the write-behind job store (web/jobs.py).
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from alfred_kitchen.web import jobs
+from alfred_kitchen.web.jobs import JobStore
+
+
+class _FakeDb:
+    """Records PostgREST writes/reads made through the jobs module helpers."""
+
+    def __init__(self, active_row=None):
+        self.calls: list[tuple] = []
+        self.active_row = active_row
+        self.fail_inserts = 0
+
+    def insert(self, access_token, row):
+        if self.fail_inserts:
+            self.fail_inserts -= 1
+            raise RuntimeError("network blip")
+        self.calls.append(("insert", row["id"], row["status"]))
+
+    def upsert(self, access_token, row):
+        self.calls.append(("upsert", row["id"], row["status"]))
+
+    def update(self, access_token, job_id, fields):
+        self.calls.append(("update", job_id, tuple(sorted(fields))))
+
+    def select(self, access_token, job_id):
+        self.calls.append(("select", job_id))
+        return None
+
+    def select_active(self, access_token, user_id):
+        self.calls.append(("select_active", user_id))
+        return self.active_row
+
+
+@pytest.fixture
+def db():
+    fake = _FakeDb()
+    with patch.object(jobs, "_insert", fake.insert), \
+         patch.object(jobs, "_upsert", fake.upsert), \
+         patch.object(jobs, "_update", fake.update), \
+         patch.object(jobs, "_select_job", fake.select), \
+         patch.object(jobs, "_select_active_job", fake.select_active), \
+         patch.object(jobs, "WRITE_RETRY_DELAY_SECONDS", 0):
+        yield fake
+
+
+class TestJobStore:
+
+    async def test_create_returns_running_job_without_waiting_for_db(self, db):
+        store = JobStore()
+
+        job_id = await store.create("token", "user-1", {"message": "hi"})
+        assert db.calls == []  # Insert not on the request path
+        assert (await store.get_active("token", "user-1"))["status"] == "running"
+        await store.drain()
+        assert db.calls == [("insert", job_id, "running")]
+
+    async def test_terminal_state_is_durable_before_complete_returns(self, db):
+        store = JobStore()
+
+        job_id = await store.create("token", "user-1", {})
+        await store.complete("token", job_id, {"response": "done"})
+        flushed = list(db.calls)
+        await store.drain()
+        # Queued insert is superseded by the terminal upsert of the full row
+        assert flushed == [("upsert", job_id, "complete")]
+        assert db.calls == flushed
+
+    async def test_failed_job_leaves_active_index(self, db):
+        store = JobStore()
+
+        first = await store.create("token", "user-1", {})
+        await store.complete("token", first, {"response": "a"})
+        second = await store.create("token", "user-1", {})
+        await store.fail("token", second, "boom")
+        await store.drain()
+        # Most recent active job is the older, still-unacknowledged one
+        assert (await store.get_active("token", "user-1"))["id"] == first
+        assert ("select_active", "user-1") not in db.calls
+
+    async def test_acknowledge_is_written_behind_and_checks_owner(self, db):
+        store = JobStore()
+
+        job_id = await store.create("token", "user-1", {})
+        await store.complete("token", job_id, {})
+        await store.acknowledge("other-token", job_id, "user-2")  # Not theirs
+        assert (await store.get_active("token", "user-1"))["id"] == job_id
+        await store.acknowledge("token", job_id, "user-1")
+        await store.drain()
+        assert db.calls[-1] == ("update", job_id, ("acknowledged_at",))
+        assert await store.get_active("token", "user-1") is None
+        assert ("select_active", "user-1") not in db.calls
+
+    async def test_acknowledged_job_does_not_come_back_before_its_write(self, db):
+        store = JobStore()
+
+        job_id = await store.create("token", "user-1", {})
+        await store.complete("token", job_id, {"response": "done"})
+        await store.acknowledge("token", job_id, "user-1")
+        # The DB still has the row unacknowledged: the update is queued
+        db.active_row = {"id": job_id, "user_id": "user-1", "status": "complete", "acknowledged_at": None}
+
+        assert await store.get_active("token", "user-1") is None
+        assert (await store.get("token", job_id, "user-1"))["acknowledged_at"] is not None
+        await store.drain()
+
+    async def test_active_polling_reads_db_once_per_user(self, db):
+        db.active_row = {"id": "old-job", "user_id": "user-1", "status": "complete", "acknowledged_at": None}
+        store = JobStore()
+
+        assert (await store.get_active("token", "user-1"))["id"] == "old-job"
+        assert (await store.get_active("token", "user-1"))["id"] == "old-job"
+        assert db.calls == [("select_active", "user-1")]
+        assert await store.get("token", "old-job", "user-2") is None
+
+    async def test_insert_is_retried(self, db):
+        db.fail_inserts = 2
+        store = JobStore()
+
+        job_id = await store.create("token", "user-1", {})
+        await store.drain()
+        assert db.calls == [("insert", job_id, "running")]
+
+
+class TestSharedJobStore:
+    """Another worker may serve the user's next request."""
+
+    async def test_create_and_acknowledge_write_through(self, db):
+        store = JobStore(shared=True)
+
+        job_id = await store.create("token", "user-1", {})
+        assert db.calls == [("insert", job_id, "running")]
+        await store.acknowledge("token", job_id, "user-1")
+        assert db.calls[-1] == ("update", job_id, ("acknowledged_at",))
+
+    async def test_reads_always_go_to_db(self, db):
+        store = JobStore(shared=True)
+        job_id = await store.create("token", "user-1", {})
+        db.active_row = {"id": "other-worker-job", "user_id": "user-1", "status": "running", "acknowledged_at": None}
+
+        assert (await store.get_active("token", "user-1"))["id"] == "other-worker-job"
+        assert (await store.get_active("token", "user-1"))["id"] == "other-worker-job"
+        assert db.calls.count(("select_active", "user-1")) == 2
+        await store.get("token", job_id, "user-1")
+        assert db.calls[-1] == ("select", job_id)
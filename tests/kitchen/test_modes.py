@@ -20,7 +20,7 @@ import pytest
 
 def _run(coro):
     """Run an async coroutine synchronously (no pytest-asyncio needed)."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+    return asyncio.run(coro)
 
 
 def _make_chat_completion(content: str) -> MagicMock:
@@ -2,8 +2,13 @@
 Tests for profile builder functionality.
 """
 
+from unittest.mock import MagicMock, patch
+
 import pytest
+from alfred_kitchen.background import profile_builder
 from alfred_kitchen.background.profile_builder import (
+    build_kitchen_dashboard,
+    format_dashboard_for_prompt,
     UserProfile,
     format_profile_for_prompt,
 )
@@ -145,3 +150,50 @@ class TestFormatProfileForPrompt:
         assert "peanuts" in result
         assert "italian" in result or "indian" in result
         assert "high-protein" in result
+
+
+class TestBuildKitchenDashboard:
+    """Tests for the kitchen_dashboard RPC path and its fallback."""
+
+    PAYLOAD = {
+        "inventory_count": 4,
+        "inventory_by_location": {"fridge": 3, "unknown": 1},
+        "recipe_count": 5,
+        "recipes_by_cuisine": {"Italian": 4, "Other": 1},
+        "recipe_names_by_cuisine": {"Italian": ["P4", "P3", "P2"], "Other": ["Unnamed"]},
+        "meal_plan_next_7_days": 3,
+        "meal_plan_days_with_meals": 2,
+        "shopping_list_count": 1,
+        "tasks_incomplete": 2,
+    }
+
+    async def test_single_rpc_builds_dashboard(self):
+        """One kitchen_dashboard call, no per-table queries."""
+        client = MagicMock()
+        client.rpc.return_value.execute.return_value.data = self.PAYLOAD
+        with patch.object(profile_builder, "get_client", return_value=client):
+            dashboard = await build_kitchen_dashboard("user-1")
+
+        client.rpc.assert_called_once()
+        name, params = client.rpc.call_args.args
+        assert name == "kitchen_dashboard"
+        assert params["user_id_filter"] == "user-1"
+        client.table.assert_not_called()
+        assert dashboard.inventory_by_location == {"fridge": 3, "unknown": 1}
+        assert dashboard.recipe_names_by_cuisine["Italian"] == ["P4", "P3", "P2"]
+        assert dashboard.tasks_incomplete == 2
+        assert dashboard.last_updated is not None
+        assert "2 of next 7 days planned (3 meals)" in format_dashboard_for_prompt(dashboard)
+
+    async def test_falls_back_to_table_queries(self):
+        """Missing RPC (migration 043 not applied) uses the per-table path."""
+        client = MagicMock()
+        client.rpc.return_value.execute.side_effect = Exception("function kitchen_dashboard does not exist")
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+            {"id": "1", "location": "pantry", "name": "Soup", "cuisine": None},
+        ]
+        with patch.object(profile_builder, "get_client", return_value=client):
+            dashboard = await build_kitchen_dashboard("user-1")
+
+        assert dashboard.inventory_by_location == {"pantry": 1}
+        assert dashboard.recipes_by_cuisine == {"Other": 1}
@@ -0,0 +1,132 @@
+"""
+Tests for the per-user in-process recipe vector index.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from alfred_kitchen.domain.crud_middleware import KitchenCRUDMiddleware  # noqa: E402
+from alfred_kitchen.domain.tools import recipe_index  # noqa: E402
+from alfred_kitchen.domain.tools.recipe_index import RecipeVectorIndex, top_k  # noqa: E402
+
+
+def _rows(vectors):
+    return [{"id": f"r{i}", "embedding": v} for i, v in enumerate(vectors)]
+
+
+class TestTopK:
+
+    def test_matches_exact_ranking(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(200, 32)).astype(np.float32)
+        query = rng.normal(size=32)
+        index = RecipeVectorIndex()
+        entry = index.load("u", _rows(vectors.tolist()))
+
+        got = top_k(entry.ids, entry.matrix, query, limit=10, max_distance=2.0)
+
+        cos = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+        expected = [f"r{i}" for i in np.argsort(-cos)[:10]]
+        assert got == expected
+
+    def test_max_distance_filters(self):
+        index = RecipeVectorIndex()
+        entry = index.load("u", _rows([[1.0, 0.0], [0.0, 1.0], [-1.0, 0.0]]))
+        assert top_k(entry.ids, entry.matrix, [1.0, 0.1], limit=5, max_distance=0.6) == ["r0"]
+
+    def test_parses_pgvector_strings_and_skips_missing(self):
+        index = RecipeVectorIndex()
+        entry = index.load("u", [
+            {"id": "a", "embedding": "[1,0]"},
+            {"id": "b", "embedding": None},
+        ])
+        assert entry.ids == ["a"]
+        assert entry.matrix.dtype == np.float32
+
+
+class TestRecipeVectorIndex:
+
+    async def test_loads_lazily_once_and_reloads_after_invalidate(self):
+        index = RecipeVectorIndex()
+        with patch.object(recipe_index, "_fetch_recipe_embeddings", return_value=_rows([[1.0, 0.0]])) as fetch:
+            await index.search("u", [1.0, 0.0])
+            await index.search("u", [1.0, 0.0])
+            assert fetch.call_count == 1
+
+            index.invalidate("u")
+            await index.search("u", [1.0, 0.0])
+            assert fetch.call_count == 2
+
+    async def test_ttl_expiry_reloads(self):
+        index = RecipeVectorIndex(ttl_seconds=0)
+        with patch.object(recipe_index, "_fetch_recipe_embeddings", return_value=_rows([[1.0, 0.0]])) as fetch:
+            await index.search("u", [1.0, 0.0])
+            await index.search("u", [1.0, 0.0])
+            assert fetch.call_count == 2
+
+    async def test_write_during_load_is_not_cached_over(self):
+        index = RecipeVectorIndex()
+
+        def fetch(user_id):
+            index.invalidate(user_id)  # A recipe write lands while the thread reads
+            return _rows([[1.0, 0.0]])
+
+        with patch.object(recipe_index, "_fetch_recipe_embeddings", fetch):
+            assert await index.search("u", [1.0, 0.0]) == ["r0"]
+        assert "u" not in index._users
+
+    def test_fetch_pages_past_postgrest_max_rows(self):
+        pages = {0: _rows([[1.0, 0.0]] * 2), 2: _rows([[0.0, 1.0]])}
+        query = MagicMock()
+        for method in ("select", "eq", "is_", "order"):
+            getattr(query, method).return_value = query
+        query.not_ = query
+        query.range.side_effect = lambda start, end: MagicMock(
+            execute=MagicMock(return_value=MagicMock(data=pages.get(start, []))),
+        )
+        client = MagicMock()
+        client.table.return_value = query
+
+        with patch.object(recipe_index, "FETCH_PAGE", 2), \
+             patch("alfred_kitchen.db.client.get_client", return_value=client):
+            rows = recipe_index._fetch_recipe_embeddings("u")
+
+        assert len(rows) == 3
+        assert [c.args for c in query.range.call_args_list] == [(0, 1), (2, 3)]
+
+    def test_lru_evicts_oldest_user(self):
+        index = RecipeVectorIndex(max_users=2)
+        for user in ("a", "b", "c"):
+            index.load(user, _rows([[1.0, 0.0]]))
+        assert list(index._users) == ["b", "c"]
+
+    async def test_load_failure_falls_back_to_sql(self):
+        index = RecipeVectorIndex()
+        with patch.object(recipe_index, "_fetch_recipe_embeddings", side_effect=RuntimeError("db down")):
+            assert await index.search("u", [1.0, 0.0]) is None
+
+
+class TestInvalidationOnWrite:
+
+    def test_crud_write_to_recipes_invalidates_user(self):
+        index = RecipeVectorIndex()
+        index.load("u", _rows([[1.0, 0.0]]))
+        with patch.object(recipe_index, "_index", index):
+            KitchenCRUDMiddleware().after_write("inventory", "u")
+            assert "u" in index._users
+            KitchenCRUDMiddleware().after_write("recipes", "u")
+            assert "u" not in index._users
+
+    async def test_semantic_search_prefers_index(self):
+        from alfred_kitchen.domain.crud_middleware import _semantic_search_recipes
+
+        index = MagicMock()
+        index.search = AsyncMock(return_value=["r1"])
+        with patch("alfred_kitchen.domain.tools.ingredient_lookup.generate_embedding", return_value=[1.0]), \
+             patch("alfred_kitchen.domain.tools.recipe_index.get_recipe_index", return_value=index), \
+             patch("alfred_kitchen.db.client.get_client", side_effect=AssertionError("SQL used")):
+            ids = await _semantic_search_recipes("curry", "u")
+        assert ids == ["r1"]
@@ -0,0 +1,202 @@
+"""
+Tests for the cached, write-coalescing onboarding session store (onboarding/session_store.py).
+"""
+
+import asyncio
+import copy
+from unittest.mock import patch
+
+import pytest
+
+from onboarding import session_store
+from onboarding.session_store import OnboardingSessionStore
+from onboarding.state import OnboardingPhase, OnboardingState
+
+
+class _Table:
+    """Stands in for onboarding_sessions; counts round trips."""
+
+    def __init__(self, rows=None):
+        self.rows = {user_id: {"updated_at": "v0", **row} for user_id, row in (rows or {}).items()}
+        self.selects = []
+        self.writes = []
+        self.conflicts = 0
+        self.deletes = []
+        self.fail_writes = 0
+        self._clock = 0
+
+    def select(self, user_id):
+        self.selects.append(user_id)
+        row = self.rows.get(user_id)
+        return (copy.deepcopy(row["state"]), row["updated_at"]) if row else None
+
+    def write(self, row, version):
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise ConnectionError("database down")
+        current = self.rows.get(row["user_id"])
+        if (current["updated_at"] if current else None) != version:
+            self.conflicts += 1
+            return None
+        self.writes.append(row)
+        return self.put(row["user_id"], row["state"])
+
+    def put(self, user_id, state):
+        """A write as another worker would make it (bumps the version)."""
+        self._clock += 1
+        self.rows[user_id] = {
+            "user_id": user_id,
+            "state": copy.deepcopy(state),
+            "current_phase": state["current_phase"],
+            "updated_at": f"v{self._clock}",
+        }
+        return self.rows[user_id]["updated_at"]
+
+    def delete(self, user_id):
+        self.deletes.append(user_id)
+        self.rows.pop(user_id, None)
+
+
+@pytest.fixture
+def table():
+    fake = _Table({"u1": {"state": OnboardingState(user_id="u1", cuisine_selections=["thai"]).to_dict()}})
+    with patch.object(session_store, "_select_state", fake.select), \
+         patch.object(session_store, "_write_state", fake.write), \
+         patch.object(session_store, "_delete_state", fake.delete), \
+         patch.object(session_store, "WRITE_RETRY_DELAY_SECONDS", 0):
+        yield fake
+
+
+def _store(**kwargs):
+    return OnboardingSessionStore(flush_delay_seconds=kwargs.pop("flush_delay_seconds", 0.01), **kwargs)
+
+
+class TestOnboardingSessionStore:
+
+    async def test_reads_are_cached_and_cold_loads_deduplicated(self, table):
+        store = _store()
+        first, second = await asyncio.gather(store.get("u1"), store.get("u1"))
+        third = await store.get("u1")
+
+        assert table.selects == ["u1"]
+        assert first is second is third
+        assert first.cuisine_selections == ["thai"]
+
+    async def test_saves_in_one_phase_coalesce_into_one_write(self, table):
+        store = _store()
+        state = await store.get("u1")
+        for page in range(1, 4):
+            state.payload_draft.setdefault("interview_answers", []).append({"page": page})
+            await store.save(state)
+        assert table.writes == []  # Nothing on the request path
+        await asyncio.sleep(0.05)
+        stats = store.stats()
+
+        assert len(table.writes) == 1
+        assert [a["page"] for a in table.writes[0]["state"]["payload_draft"]["interview_answers"]] == [1, 2, 3]
+        assert stats["coalesced"] == 2 and stats["dirty"] == 0
+
+    async def test_phase_change_is_written_before_save_returns(self, table):
+        store = _store(flush_delay_seconds=60)
+        state = await store.get("u1")
+        state.constraints = {"cooking_skill_level": "beginner"}
+        await store.save(state)
+        assert table.writes == []
+
+        state.current_phase = OnboardingPhase.DISCOVERY
+        await store.save(state)
+        assert len(table.writes) == 1
+        assert table.writes[0]["current_phase"] == "discovery"
+        assert table.writes[0]["state"]["constraints"] == {"cooking_skill_level": "beginner"}
+
+        await store.flush("u1")  # Nothing new to write
+        stats = store.stats()
+        assert stats["writes"] == 1
+
+    async def test_new_session_is_written_on_first_flush_only(self, table):
+        store = _store(flush_delay_seconds=60)
+        state = await store.get("new-user")
+        assert table.writes == []
+        await store.delete("new-user")  # Never written: nothing to delete
+
+        assert state.current_phase == OnboardingPhase.CONSTRAINTS
+        assert table.writes == [] and table.deletes == []
+        assert await _store().get("new-user", create=False) is None
+
+    async def test_delete_cancels_pending_write(self, table):
+        store = _store(flush_delay_seconds=0.01)
+        state = await store.get("u1")
+        state.cuisine_selections = ["korean"]
+        await store.save(state)
+        await store.delete("u1")
+        await asyncio.sleep(0.05)
+
+        assert table.writes == []
+        assert table.deletes == ["u1"]
+        assert "u1" not in table.rows
+
+    async def test_failed_durable_write_raises_and_stays_dirty(self, table):
+        table.fail_writes = session_store.WRITE_ATTEMPTS
+
+        store = _store(flush_delay_seconds=60)
+        state = await store.get("u1")
+        state.current_phase = OnboardingPhase.DISCOVERY
+        with pytest.raises(ConnectionError):
+            await store.save(state)
+        assert store.stats()["dirty"] == 1
+
+        await store.flush_all()
+        stats = store.stats()
+
+        assert stats["dirty"] == 0
+        assert table.rows["u1"]["current_phase"] == "discovery"
+
+    async def test_expired_entries_are_reloaded(self, table):
+        store = _store(cache_ttl_seconds=0)
+        await store.get("u1")
+        table.rows["u1"]["state"]["cuisine_selections"] = ["mexican"]  # Another worker wrote
+        state = await store.get("u1")
+
+        assert table.selects == ["u1", "u1"]
+        assert state.cuisine_selections == ["mexican"]
+
+    async def test_write_after_another_workers_write_keeps_both(self, table):
+        store = _store(flush_delay_seconds=60)
+        state = await store.get("u1")
+        other = OnboardingState.from_dict(copy.deepcopy(table.rows["u1"]["state"]))
+        other.constraints = {"allergies": ["peanuts"]}
+        table.put("u1", other.to_dict())  # Another worker, inside our cache TTL
+
+        state.staple_selections = ["salt"]
+        await store.save(state, flush=True)
+
+        assert table.conflicts == 1
+        saved = table.rows["u1"]["state"]
+        assert saved["constraints"] == {"allergies": ["peanuts"]}
+        assert saved["staple_selections"] == ["salt"]
+        assert saved["cuisine_selections"] == ["thai"]
+        # The cached state object picked up the other worker's change
+        assert state.constraints == {"allergies": ["peanuts"]}
+
+    async def test_racing_inserts_of_a_new_session_merge(self, table):
+        store = _store(flush_delay_seconds=60)
+        state = await store.get("new-user")
+        table.put("new-user", OnboardingState(user_id="new-user", cuisine_selections=["thai"]).to_dict())
+
+        state.constraints = {"cooking_skill_level": "beginner"}
+        await store.save(state, flush=True)
+
+        saved = table.rows["new-user"]["state"]
+        assert saved["cuisine_selections"] == ["thai"]
+        assert saved["constraints"] == {"cooking_skill_level": "beginner"}
+
+    async def test_shared_store_reads_and_writes_through(self, table):
+        store = _store(shared=True)
+        state = await store.get("u1")
+        state.cuisine_selections = ["korean"]
+        await store.save(state)
+        assert table.rows["u1"]["state"]["cuisine_selections"] == ["korean"]
+
+        table.put("u1", {**table.rows["u1"]["state"], "cuisine_selections": ["mexican"]})
+        assert (await store.get("u1")).cuisine_selections == ["mexican"]
+        assert table.selects == ["u1", "u1"]
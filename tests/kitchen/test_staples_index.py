@@ -0,0 +1,155 @@
+"""
+Tests for the in-process staples ranking index (onboarding/staples.py).
+"""
+
+import asyncio
+import random
+from unittest.mock import patch
+
+from onboarding import staples
+from onboarding.staples import (
+    CORE_ANCHORS,
+    EXTRA_ANCHORS,
+    MAX_ESSENTIALS,
+    StaplesIndex,
+    _compute_exclusions,
+    _is_excluded,
+)
+
+
+def _reference(rows, cuisines, dietary_restrictions):
+    """The per-request ranking the index replaced (score, sort, family dedupe, cap)."""
+    cuisines_lower = [c.lower() for c in cuisines]
+    excluded = _compute_exclusions(dietary_restrictions)
+    items = [row for row in rows if not _is_excluded(row, excluded)]
+    core = {a.lower() for a in CORE_ANCHORS}
+    extra = {a.lower() for a in EXTRA_ANCHORS}
+
+    scored = []
+    for ing in items:
+        name_lower = ing["name"].lower()
+        anchor = 0.5 if name_lower in core else 0.3 if name_lower in extra else 0.0
+        tier_w = 1.0 if ing["tier"] == 1 else 0.5
+        boost = 1.0 if set(cuisines_lower) & {c.lower() for c in ing["cuisines"] or []} else 0.0
+        scored.append((anchor + tier_w * 0.15 + boost * 0.1, ing))
+    scored.sort(key=lambda x: (-x[0], x[1]["name"].lower()))
+
+    best = {}
+    for _score, ing in scored:
+        family = (ing["family"] or ing["name"]).lower().strip()
+        is_anchor = ing["name"].lower() in core | extra
+        prev = best.get(family)
+        if prev is None:
+            best[family] = ing
+            continue
+        prev_anchor = prev["name"].lower() in core | extra
+        if (is_anchor and not prev_anchor) or (is_anchor == prev_anchor and len(ing["name"]) < len(prev["name"])):
+            best[family] = ing
+    kept = {id(v) for v in best.values()}
+    top = [ing for _score, ing in scored if id(ing) in kept][:MAX_ESSENTIALS]
+
+    essentials, suggested = [], []
+    for ing in top:
+        entry = {"id": ing["id"], "name": ing["name"], "default_unit": ing["default_unit"],
+                 "parent_category": ing["parent_category"]}
+        if set(cuisines_lower) & {c.lower() for c in ing["cuisines"] or []} and ing["tier"] == 2:
+            entry["cuisine_match"] = True
+            suggested.append(ing["id"])
+        essentials.append(entry)
+    return {"essentials": essentials, "pre_selected_ids": [e["id"] for e in essentials],
+            "cuisine_suggested_ids": suggested}
+
+
+def _catalog(seed=3, size=400):
+    rng = random.Random(seed)
+    anchors = sorted(CORE_ANCHORS | EXTRA_ANCHORS)
+    families = ["flour", "pasta", "honey", "anchovy", "olive oil", "rice", "bread", None]
+    cuisines = ["Italian", "thai", "mexican", "indian", "japanese"]
+    rows = []
+    for i in range(size):
+        name = rng.choice(anchors) if rng.random() < 0.3 else f"item {rng.randrange(size // 2)}"
+        if rng.random() < 0.3:
+            name = f"{name} {rng.choice(['extra', 'x', 'organic'])}"
+        rows.append({
+            "id": f"id-{i}",
+            "name": name,
+            "parent_category": rng.choice(staples.STAPLE_CATEGORIES),
+            "family": rng.choice(families),
+            "tier": rng.choice([1, 2]),
+            "cuisines": rng.sample(cuisines, rng.randrange(3)) or None,
+            "default_unit": "container",
+        })
+    return rows
+
+
+class TestStaplesIndex:
+
+    def test_matches_reference_ranking(self):
+        rows = _catalog()
+        index = StaplesIndex()
+        index.build(rows)
+        selections = [
+            ([], []),
+            (["italian"], []),
+            (["Thai", "mexican"], ["Vegan"]),
+            (["indian"], ["gluten-free", "vegetarian"]),
+            (["japanese", "korean"], ["dairy-free", "keto"]),
+        ]
+        for cuisines, restrictions in selections:
+            assert index.rank(cuisines, restrictions) == _reference(rows, cuisines, restrictions), (
+                cuisines, restrictions)
+
+    def test_rankings_are_memoized_per_selection(self):
+        index = StaplesIndex()
+        index.build(_catalog())
+
+        first = index.rank(["Thai", "mexican"], ["vegan", "keto"])
+        again = index.rank(["mexican", "thai", "korean"], ["Vegan"])  # Same effective selection
+        index.rank(["thai"], ["vegan"])
+
+        assert again is first
+        assert index.stats()["hits"] == 1 and index.stats()["misses"] == 2
+
+    async def test_loads_once_and_serves_copies(self):
+        rows = _catalog(size=50)
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            return rows
+
+        with patch.object(staples, "_fetch_staple_rows", fetch):
+            index = StaplesIndex()
+            first, second = await asyncio.gather(index.options(["thai"], []), index.options(["thai"], []))
+            first["essentials"].clear()
+            third = await index.options(["thai"], [])
+
+        assert fetches == [1]
+        assert third == second == _reference(rows, ["thai"], [])
+
+    async def test_failed_refresh_keeps_previous_candidates(self):
+        rows = _catalog(size=50)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                raise ConnectionError("database down")
+            return rows
+
+        with patch.object(staples, "_fetch_staple_rows", fetch):
+            index = StaplesIndex(refresh_seconds=0)
+            await index.options([], [])
+            result = await index.options([], [])
+
+        assert len(calls) == 2
+        assert result == _reference(rows, [], [])
+
+    async def test_unavailable_catalog_returns_empty_checklist(self):
+        def fetch():
+            raise ConnectionError("database down")
+
+        with patch.object(staples, "_fetch_staple_rows", fetch):
+            result = await StaplesIndex().options(["thai"], ["vegan"])
+
+        assert result == {"essentials": [], "pre_selected_ids": [], "cuisine_suggested_ids": []}
@@ -0,0 +1,55 @@
+"""
+Cold-start regression tests: heavy stacks stay deferred, imports stay in budget.
+
+The deferral checks always run. The time budgets are wall time net of
+interpreter startup, so they depend on the machine and only run on
+request; ALFRED_IMPORT_BUDGET_SCALE multiplies them:
+
+    ALFRED_TEST_IMPORT_BUDGETS=1 pytest tests/kitchen/test_startup.py
+"""
+
+import os
+
+import pytest
+
+from alfred.observability.import_profile import cold_import_seconds, parse_importtime, profile_import
+from alfred_kitchen.web.warmup import DEFERRED_MODULES
+
+BUDGET_SCALE = float(os.environ.get("ALFRED_IMPORT_BUDGET_SCALE", "1"))
+
+# Seconds. Before deferral the server took ~4s, the CLI ~0.3s
+IMPORT_BUDGETS = {
+    "alfred_kitchen.web.app": 2.0,
+    "alfred_kitchen.main": 0.75,
+}
+
+
+@pytest.mark.parametrize("module", IMPORT_BUDGETS)
+def test_import_does_not_load_deferred_modules(module):
+    assert profile_import(module).loaded(*DEFERRED_MODULES) == []
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ALFRED_TEST_IMPORT_BUDGETS"),
+    reason="ALFRED_TEST_IMPORT_BUDGETS not set (wall-clock budgets, machine-dependent)",
+)
+@pytest.mark.parametrize("module, budget", IMPORT_BUDGETS.items())
+def test_cold_import_within_budget(module, budget):
+    elapsed = cold_import_seconds(module)
+    assert elapsed < budget * BUDGET_SCALE, (
+        f"import {module} took {elapsed:.2f}s (budget {budget * BUDGET_SCALE:.2f}s); "
+        f"run `alfred startup-profile {module}` to see where"
+    )
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   json.decoder\n"
+        "import time:       250 |        350 | json\n"
+    )
+    timings = parse_importtime(stderr)
+    assert [(t.module, t.depth, t.cumulative_ms) for t in timings] == [
+        ("json.decoder", 1, 0.1),
+        ("json", 0, 0.35),
+    ]
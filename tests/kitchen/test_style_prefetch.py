@@ -0,0 +1,176 @@
+"""
+Tests for background generation of onboarding style samples (onboarding/style_prefetch.py).
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from onboarding import style_prefetch
+from onboarding.state import OnboardingState
+from onboarding.style_prefetch import StyleSamplePrefetcher, inputs_fingerprint, style_inputs
+
+
+class _Generator:
+    """Stands in for generate_style_samples(); records calls and concurrency."""
+
+    def __init__(self, delay=0.02, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.in_flight = self.peak = 0
+        self.cancelled = 0
+
+    async def __call__(self, domain, inputs):
+        self.calls.append((domain, tuple(inputs["cuisine_preferences"])))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        if domain in self.fail:
+            self.fail.discard(domain)
+            raise RuntimeError("LLM error")
+        return {"domain": domain, "cuisines": inputs["cuisine_preferences"]}
+
+
+def _blocking_llm_client(seconds):
+    """Stands in for the synchronous Instructor client: each call blocks its thread."""
+    def create_with_completion(*, response_model, **kwargs):
+        time.sleep(seconds)
+        proposal = response_model.model_validate({"dish_name": "curry", "intro_message": "hi", "samples": []})
+        return proposal, SimpleNamespace(usage=None)
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create_with_completion=create_with_completion,
+    )))
+
+
+def _state(cuisines=("thai",)):
+    return OnboardingState(
+        user_id="u1",
+        constraints={"cooking_skill_level": "beginner"},
+        cuisine_selections=list(cuisines),
+    )
+
+
+class _Sessions:
+    """Stands in for the onboarding_sessions row the store callback writes."""
+
+    def __init__(self, state):
+        self.state = state
+        self.stores = 0
+
+    async def store(self, user_id, fingerprint, samples):
+        self.stores += 1
+        if inputs_fingerprint(style_inputs(self.state)) == fingerprint:
+            self.state.style_samples = {"inputs": fingerprint, "domains": samples}
+
+
+class TestStyleSamplePrefetcher:
+
+    async def test_generates_all_domains_concurrently_and_stores_on_session(self):
+        generator = _Generator()
+        state = _state()
+        sessions = _Sessions(state)
+
+        with patch.object(style_prefetch, "generate_style_samples", generator):
+            prefetcher = StyleSamplePrefetcher(store=sessions.store)
+            prefetcher.schedule(state)
+            prefetcher.schedule(state)  # Idempotent while running
+            recipes = await prefetcher.get_samples(state, "recipes")
+            await asyncio.sleep(0)
+            tasks = await prefetcher.get_samples(state, "tasks")
+
+        assert recipes["domain"] == "recipes" and tasks["domain"] == "tasks"
+        assert sorted(d for d, _ in generator.calls) == ["meal_plans", "recipes", "tasks"]
+        assert generator.peak == 3
+        assert sessions.stores == 1
+        assert set(state.style_samples["domains"]) == {"recipes", "meal_plans", "tasks"}
+
+    async def test_blocking_llm_calls_overlap_and_leave_the_loop_free(self):
+        ticks = 0
+
+        async def other_requests():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        state = _state()
+        with patch("alfred.llm.client.get_client", return_value=_blocking_llm_client(0.2)):
+            ticker = asyncio.create_task(other_requests())
+            start = time.perf_counter()
+            prefetcher = StyleSamplePrefetcher()
+            prefetcher.schedule(state)
+            samples = [await prefetcher.get_samples(state, domain) for domain in style_prefetch.STYLE_DOMAINS]
+            elapsed = time.perf_counter() - start
+            ticker.cancel()
+
+        assert [s["domain"] for s in samples] == ["recipes", "meal_plans", "tasks"]
+        assert elapsed < 0.4  # Not 3 x 0.2
+        assert ticks >= 10  # The loop kept serving while the three generated
+
+    async def test_stored_samples_are_served_without_generating(self):
+        generator = _Generator()
+        state = _state()
+        fingerprint = inputs_fingerprint(style_inputs(state))
+        state.style_samples = {"inputs": fingerprint, "domains": {"recipes": {"domain": "recipes"}}}
+
+        with patch.object(style_prefetch, "generate_style_samples", generator):
+            result = await StyleSamplePrefetcher().get_samples(state, "recipes")
+
+        assert result == {"domain": "recipes"}
+        assert generator.calls == []
+
+    async def test_editing_an_earlier_phase_cancels_and_regenerates(self):
+        generator = _Generator(delay=0.05)
+        state = _state(["thai"])
+        sessions = _Sessions(state)
+
+        with patch.object(style_prefetch, "generate_style_samples", generator):
+            prefetcher = StyleSamplePrefetcher(store=sessions.store)
+            prefetcher.schedule(state)
+            await asyncio.sleep(0.01)
+
+            state.cuisine_selections = ["korean"]
+            prefetcher.refresh(state)
+            result = await prefetcher.get_samples(state, "meal_plans")
+
+        assert result["cuisines"] == ["korean"]
+        assert generator.cancelled == 3
+        assert state.style_samples["inputs"] == inputs_fingerprint(style_inputs(state))
+        assert sessions.stores == 1  # The cancelled run stored nothing
+
+    async def test_refresh_drops_stale_samples(self):
+        state = _state(["thai"])
+        state.style_samples = {"inputs": inputs_fingerprint(style_inputs(state)), "domains": {}}
+        state.cuisine_selections = ["korean"]
+        generator = _Generator()
+
+        with patch.object(style_prefetch, "generate_style_samples", generator):
+            prefetcher = StyleSamplePrefetcher()
+            prefetcher.refresh(state)
+            assert state.style_samples == {}
+            assert prefetcher.stats()["running"] == 1  # Samples had been generated: regenerate
+            prefetcher.cancel(state.user_id)
+
+    async def test_refresh_before_staples_does_not_generate(self):
+        prefetcher = StyleSamplePrefetcher()
+        prefetcher.refresh(_state())
+        assert prefetcher.stats() == {"running": 0, "finished": 0}
+
+    async def test_failed_domain_is_retried_inline(self):
+        generator = _Generator(fail={"tasks"})
+        state = _state()
+
+        with patch.object(style_prefetch, "generate_style_samples", generator):
+            result = await StyleSamplePrefetcher().get_samples(state, "tasks")
+
+        assert result["domain"] == "tasks"
+        assert [d for d, _ in generator.calls].count("tasks") == 2
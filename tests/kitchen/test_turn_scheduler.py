@@ -0,0 +1,114 @@
+"""
+Tests for per-user turn scheduling (web/turns.py).
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from alfred_kitchen.web import turns
+from alfred_kitchen.web.backplane import MemoryBackplane
+from alfred_kitchen.web.turns import RESET, SUPERSEDED, Turn, TurnScheduler, turn_key
+
+
+@pytest.fixture(autouse=True)
+def backplane():
+    with patch.object(turns, "get_backplane", return_value=MemoryBackplane()):
+        yield
+
+
+class _Log:
+    def __init__(self):
+        self.events: list[tuple] = []
+
+    def turn(self, name, user_id="user-1", duration=0.05, key=None):
+        async def run():
+            self.events.append(("start", name))
+            await asyncio.sleep(duration)
+            self.events.append(("end", name))
+
+        async def cancel(reason):
+            self.events.append(("cancel", name, reason))
+
+        return Turn(
+            user_id=user_id, key=key or turn_key(message=name), job_id=name,
+            channel=name, run=run, cancel=cancel,
+        )
+
+
+async def _settle(scheduler):
+    while scheduler.stats()["running"] or scheduler.stats()["queued"]:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0)
+
+
+class TestTurnScheduler:
+
+    async def test_distinct_turns_run_one_at_a_time_in_order(self):
+        log, scheduler = _Log(), TurnScheduler()
+
+        for name in ("a", "b", "c"):
+            scheduler.submit(log.turn(name))
+        await _settle(scheduler)
+        assert log.events == [
+            ("start", "a"), ("end", "a"),
+            ("start", "b"), ("end", "b"),
+            ("start", "c"), ("end", "c"),
+        ]
+
+    async def test_users_do_not_wait_for_each_other(self):
+        log, scheduler = _Log(), TurnScheduler()
+
+        scheduler.submit(log.turn("a", user_id="user-1"))
+        scheduler.submit(log.turn("b", user_id="user-2"))
+        await _settle(scheduler)
+        assert log.events[:2] == [("start", "a"), ("start", "b")]
+
+    async def test_identical_message_coalesces_onto_in_flight_turn(self):
+        log, scheduler = _Log(), TurnScheduler()
+        key = turn_key(message="add eggs", mode="plan")
+
+        scheduler.submit(log.turn("a", key=key))
+        await asyncio.sleep(0)
+        running = scheduler.coalesce("user-1", turn_key(mode="plan", message="add eggs"))
+        other_user = scheduler.coalesce("user-2", key)
+        await _settle(scheduler)
+        after = scheduler.coalesce("user-1", key)
+        assert running.job_id == "a"
+        assert other_user is None
+        assert after is None  # Finished turns don't absorb a repeat
+        assert scheduler.stats()["coalesced"] == 1
+
+    async def test_full_queue_supersedes_oldest_waiting_turn(self):
+        log, scheduler = _Log(), TurnScheduler(max_queued=1)
+
+        for name in ("a", "b", "c"):
+            scheduler.submit(log.turn(name))
+            await asyncio.sleep(0)
+        await _settle(scheduler)
+        assert ("cancel", "b", SUPERSEDED) in log.events
+        assert ("start", "b") not in log.events
+        assert [e[1] for e in log.events if e[0] == "start"] == ["a", "c"]
+        assert scheduler.stats()["superseded"] == 1
+
+    async def test_reset_cancels_waiting_turns_but_not_the_running_one(self):
+        log, scheduler = _Log(), TurnScheduler()
+
+        scheduler.submit(log.turn("a"))
+        scheduler.submit(log.turn("b"))
+        await asyncio.sleep(0)
+        scheduler.cancel_queued("user-1")
+        await _settle(scheduler)
+        assert log.events == [("start", "a"), ("cancel", "b", RESET), ("end", "a")]
+
+    async def test_failed_turn_does_not_block_the_next(self):
+        log, scheduler = _Log(), TurnScheduler()
+
+        async def boom():
+            raise RuntimeError("LLM down")
+
+        scheduler.submit(Turn("user-1", "k", "x", "x", run=boom, cancel=pytest.fail))
+        scheduler.submit(log.turn("b"))
+        await _settle(scheduler)
+        assert log.events == [("start", "b"), ("end", "b")]
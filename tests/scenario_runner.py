@@ -6,11 +6,18 @@ Usage:
     python tests/scenario_runner.py gen_artifact_flow            # Run specific scenario
     python tests/scenario_runner.py --list                       # List available scenarios
     python tests/scenario_runner.py --user <user_id> <scenario>  # Use specific user ID
+    python tests/scenario_runner.py --record <scenario>          # Record LLM calls to a cassette
+    python tests/scenario_runner.py --replay <scenario>          # Replay LLM calls, report per-node CPU
+    python tests/scenario_runner.py --replay --latency 1.0 ...   # Replay with recorded model latency
 
 Environment:
     ALFRED_TEST_USER_ID  - Default user ID for testing (if --user not provided)
 
 Logs are written to: tests/scenario_logs/<scenario_name>_<timestamp>/
+Cassettes are written to: tests/cassettes/<scenario_name>.jsonl
+
+Replay serves every LLM call from the cassette (no OpenAI traffic), so turn
+time is the orchestration engine itself. Database calls still go to Supabase.
 """
 
 import asyncio
@@ -29,12 +36,17 @@ if sys.platform == "win32":
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from alfred.core.id_registry import SessionIdRegistry
 from alfred.graph.workflow import run_alfred
+from alfred.llm.cassette import use_cassette
 from alfred.memory.conversation import initialize_conversation
+from alfred.observability.node_profiler import enable_node_profiling
 
 # Default test user - override with --user or ALFRED_TEST_USER_ID env var
 DEFAULT_TEST_USER = "00000000-0000-0000-0000-000000000001"
 
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
 
 @dataclass
 class Turn:
@@ -159,18 +171,48 @@ async def run_scenario(
     log_dir: Path,
     user_id: str,
     verbose: bool = True,
+    cassette_mode: str | None = None,
+    latency_scale: float = 0.0,
 ) -> bool:
     """
     Run a scenario and log results.
 
+    cassette_mode: None (live), "record", or "replay" (see alfred.llm.cassette)
+
     Returns True if all turns completed successfully.
     """
     print(f"\n{'='*60}")
     print(f"Scenario: {scenario.name}")
     print(f"Description: {scenario.description}")
     print(f"User ID: {user_id}")
+    if cassette_mode:
+        print(f"LLM: {cassette_mode} ({CASSETTE_DIR / f'{scenario.name}.jsonl'})")
     print(f"{'='*60}")
 
+    if cassette_mode is None:
+        return await _run_turns(scenario, log_dir, user_id, verbose)
+
+    profiler = enable_node_profiling(cassette_mode == "replay")
+    profiler.reset()
+    with use_cassette(CASSETTE_DIR / f"{scenario.name}.jsonl", cassette_mode, latency_scale) as cassette:
+        passed = await _run_turns(scenario, log_dir, user_id, verbose, profiler if cassette.replaying else None)
+    stats = cassette.stats
+    if cassette.replaying:
+        print(f"\nCassette: {stats.exact_hits} exact, {stats.fallback_hits} fallback, {stats.misses} missed")
+        print(f"\nPer-node time (LLM replayed):\n{profiler.format_table()}")
+    else:
+        print(f"\nCassette: recorded {stats.recorded} LLM calls")
+    return passed
+
+
+async def _run_turns(
+    scenario: Scenario,
+    log_dir: Path,
+    user_id: str,
+    verbose: bool,
+    profiler=None,
+) -> bool:
+
     conversation = initialize_conversation()
 
     # Create scenario log directory
@@ -212,16 +254,14 @@ async def run_scenario(
             }
 
             # Try to get registry state
-            if "id_registry" in conversation:
-                registry_data = conversation["id_registry"]
+            if conversation.get("id_registry"):
+                registry = SessionIdRegistry.from_dict(conversation["id_registry"])
                 state_snapshot["id_registry"] = {
-                    "ref_to_uuid": registry_data.get("ref_to_uuid", {}),
-                    "ref_actions": registry_data.get("ref_actions", {}),
-                    "ref_labels": registry_data.get("ref_labels", {}),
+                    "ref_to_uuid": registry.ref_to_uuid,
+                    "ref_actions": registry.ref_actions,
+                    "ref_labels": registry.ref_labels,
                 }
-                state_snapshot["pending_artifacts"] = list(
-                    registry_data.get("pending_artifacts", {}).keys()
-                )
+                state_snapshot["pending_artifacts"] = list(registry.pending_artifacts.keys())
 
             turn_result["state_snapshot"] = state_snapshot
 
@@ -265,6 +305,8 @@ async def run_scenario(
         "turn_count": len(scenario.turns),
         "results": results,
     }
+    if profiler is not None:
+        summary["node_timings"] = profiler.summary()
 
     summary_path = scenario_log_dir / "summary.json"
     with open(summary_path, "w", encoding="utf-8") as f:
@@ -300,6 +342,25 @@ async def main():
             print("Error: --user requires a user ID")
             return
 
+    # Parse --record / --replay / --latency flags
+    cassette_mode = None
+    if "--record" in args and "--replay" in args:
+        print("Error: --record and --replay are mutually exclusive")
+        return
+    if "--record" in args:
+        cassette_mode = "record"
+    elif "--replay" in args:
+        cassette_mode = "replay"
+    latency_scale = 0.0
+    if "--latency" in args:
+        idx = args.index("--latency")
+        try:
+            latency_scale = float(args[idx + 1])
+        except (IndexError, ValueError):
+            print("Error: --latency requires a number (e.g. 1.0 = recorded model latency)")
+            return
+        args = args[:idx] + args[idx + 2:]
+
     # Determine which scenarios to run
     scenario_names = [a for a in args if not a.startswith("--")]
     if scenario_names:
@@ -321,7 +382,10 @@ async def main():
     # Run scenarios
     results = {}
     for scenario in scenarios_to_run:
-        passed = await run_scenario(scenario, log_dir, user_id)
+        passed = await run_scenario(
+            scenario, log_dir, user_id,
+            cassette_mode=cassette_mode, latency_scale=latency_scale,
+        )
         results[scenario.name] = passed
 
     # Print final summary